@@ -41,6 +41,8 @@ if not isinstance(sys.stderr, FilteredStderr):
 
 from dotenv import load_dotenv
 
+from core.db_pool import async_pool_kwargs, asyncpg_connect_args, register_pool
+
 # Suppress dotenv parsing warnings for malformed lines
 load_dotenv(override=False)
 
@@ -64,7 +66,7 @@ new_parsed = parsed._replace(query="")
 DATABASE_URL = urlunparse(new_parsed)
 
 # Configure SSL for asyncpg (only parameter we support)
-connect_args = {}
+connect_args = asyncpg_connect_args()
 if sslmode:
     # Convert sslmode to asyncpg's SSL format
     if sslmode in ["require", "prefer", "allow", "verify-ca", "verify-full"]:
@@ -79,16 +81,14 @@ if DATABASE_URL.startswith("postgresql://") or DATABASE_URL.startswith("postgres
     elif "postgresql://" in DATABASE_URL and "+asyncpg" not in DATABASE_URL:
         DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-# Create async engine with SSL configuration
+# Create async engine; pool sizes are this engine's share of the process budget
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    connect_args=connect_args if connect_args else {},
+    connect_args=connect_args,
+    **async_pool_kwargs(),
 )
+register_pool("async", engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -26,6 +26,8 @@ class User(Base):
     ssn = Column(String, nullable=True)
     password = Column(String, nullable=True)
     profile_pic_url = Column(String, nullable=True)
+    profile_pic_rendition_key = Column(String, nullable=True)
+    profile_pic_upload_id = Column(String, nullable=True)
     notification_on = Column(Boolean, default=True)
     street_1 = Column(String, nullable=True)
     street_2 = Column(String, nullable=True)
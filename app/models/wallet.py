@@ -10,10 +10,12 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -40,6 +42,15 @@ class WalletTransaction(Base):
     # Relationships
     user = relationship("User", back_populates="wallet_transactions")
 
+    __table_args__ = (
+        # Per-user ledger scans in id order (reconciliation).
+        Index("ix_wallet_transactions_user_id_id", "user_id", "id"),
+        # Newest-first history pages and exports (keyset on created_at, id).
+        Index("ix_wallet_transactions_user_created_id", "user_id", "created_at", "id"),
+        # One ledger row per idempotency key; batch credits rely on ON CONFLICT.
+        Index("ix_wallet_transactions_event_id", "event_id", unique=True),
+    )
+
 
 class IapReceipt(Base):
     __tablename__ = "iap_receipts"
@@ -112,12 +123,21 @@ class StripeWebhookEvent(Base):
     id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
     event_id = Column(String, unique=True, nullable=False)
     event_type = Column(String, nullable=False)
-    status = Column(String, default="received", nullable=False)  # received, processed, failed
+    status = Column(String, default="received", nullable=False)  # received, processed, failed, dead_letter
     stripe_object_id = Column(String, nullable=True)
     livemode = Column(Boolean, default=False, nullable=False)
     attempts = Column(Integer, default=0, nullable=False)
     received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)  # NULL once processed / dead_letter
+
+    __table_args__ = (
+        Index(
+            "ix_stripe_webhook_events_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL"),
+        ),
+    )
 
 
 class PayPalCheckout(Base):
@@ -163,13 +183,22 @@ class PayPalWebhookEvent(Base):
     id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
     event_id = Column(String, unique=True, nullable=False)
     event_type = Column(String, nullable=False)
-    status = Column(String, default="received", nullable=False)  # received, processed, failed
+    status = Column(String, default="received", nullable=False)  # received, processed, failed, dead_letter
     resource_id = Column(String, nullable=True)
     raw_payload = Column(Text, nullable=True)
     livemode = Column(Boolean, default=False, nullable=False)
     attempts = Column(Integer, default=0, nullable=False)
     received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)  # NULL once processed / dead_letter
+
+    __table_args__ = (
+        Index(
+            "ix_paypal_webhook_events_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL"),
+        ),
+    )
 
 
 class IapEvent(Base):
@@ -182,7 +211,40 @@ class IapEvent(Base):
     subtype = Column(String, nullable=True)
     transaction_id = Column(String, nullable=True)
     purchase_token = Column(String, nullable=True)
-    status = Column(String, nullable=False, default="received")
+    status = Column(String, nullable=False, default="received")  # received, processed, failed, dead_letter
     raw_payload = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
     received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)  # NULL once processed / dead_letter
+
+    __table_args__ = (
+        Index(
+            "ix_iap_events_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL"),
+        ),
+    )
+
+
+class WalletReconciliationCheckpoint(Base):
+    """Ledger sum per user folded up to `last_transaction_id` (inclusive)."""
+
+    __tablename__ = "wallet_reconciliation_checkpoints"
+
+    user_id = Column(BigInteger, ForeignKey("users.account_id"), primary_key=True)
+    last_transaction_id = Column(BigInteger, nullable=False, default=0)
+    ledger_sum_minor = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class WalletReconciliationMismatch(Base):
+    __tablename__ = "wallet_reconciliation_mismatches"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    run_id = Column(String, nullable=False, index=True)
+    user_id = Column(BigInteger, ForeignKey("users.account_id"), nullable=False)
+    expected_minor = Column(BigInteger, nullable=False)
+    actual_minor = Column(BigInteger, nullable=False)
+    diff_minor = Column(BigInteger, nullable=False)
+    detected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
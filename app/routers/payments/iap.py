@@ -11,8 +11,8 @@ from app.models.user import User
 
 from .schemas import AppleVerifyRequest, GoogleVerifyRequest, IapVerifyResponse
 from .service import (
-    process_apple_notification as service_process_apple_notification,
-    process_google_notification as service_process_google_notification,
+    ingest_apple_notification as service_ingest_apple_notification,
+    ingest_google_notification as service_ingest_google_notification,
     verify_apple_purchase as service_verify_apple_purchase,
     verify_google_purchase as service_verify_google_purchase,
 )
@@ -96,7 +96,7 @@ async def verify_google_purchase(
         "**Rate limit:** 100 requests / 60 seconds per IP."
     ),
     responses={
-        200: {"description": "Notification processed or already processed"},
+        200: {"description": "Notification accepted for processing or already processed"},
         400: {"description": "Missing signedPayload in request body"},
     },
 )
@@ -109,7 +109,7 @@ async def apple_webhook(
     signed_payload = payload.get("signedPayload")
     if not signed_payload:
         return {"status": "error", "message": "missing signedPayload"}
-    return await service_process_apple_notification(db, signed_payload=signed_payload)
+    return await service_ingest_apple_notification(db, signed_payload=signed_payload)
 
 
 @router.post(
@@ -126,7 +126,7 @@ async def apple_webhook(
         "**Rate limit:** 100 requests / 60 seconds per IP."
     ),
     responses={
-        200: {"description": "Notification processed or already processed"},
+        200: {"description": "Notification accepted for processing or already processed"},
         401: {"description": "Invalid Pub/Sub push token (when verification enabled)"},
     },
 )
@@ -143,4 +143,4 @@ async def google_webhook(
         await verify_pubsub_push_token(authorization)
 
     payload = await request.json()
-    return await service_process_google_notification(db, payload=payload)
+    return await service_ingest_google_notification(db, payload=payload)
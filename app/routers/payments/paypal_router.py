@@ -18,8 +18,8 @@ from app.services.paypal_service import (
     create_paypal_order,
     get_order_status,
     get_subscription_config,
+    ingest_paypal_webhook,
     paypal_client,
-    process_paypal_webhook,
     record_subscription_approval,
 )
 from core.config import PAYPAL_CLIENT_ID, PAYPAL_MODE, PAYPAL_WEBHOOK_ID
@@ -381,6 +381,7 @@ async def subscription_approved(
         "- `BILLING.SUBSCRIPTION.EXPIRED` — deactivates subscription\n"
         "- `BILLING.SUBSCRIPTION.SUSPENDED` — suspends subscription\n\n"
         "**No user authentication** — PayPal signs the payload.\n\n"
+        "Responds as soon as the event is recorded; handlers run asynchronously.\n\n"
         "Configure this URL in PayPal Developer Dashboard > "
         "Webhooks.\n\n"
         "**Rate limit:** 100 requests / 60 seconds per IP."
@@ -392,7 +393,6 @@ async def subscription_approved(
 )
 async def paypal_webhook(
     request: Request,
-    db: AsyncSession = Depends(get_async_db),
     _rl=Depends(_webhook_rate_limit),
 ):
     body = await request.body()
@@ -430,9 +430,9 @@ async def paypal_webhook(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-    await process_paypal_webhook(db, event_body, body)
-
-    # Always return 200 — retry job recovers failures
+    # Ack once the event is persisted; handlers run on the webhook worker pool
+    # and the retry job recovers failures.
+    await ingest_paypal_webhook(event_body, body)
     return {"status": "ok"}
 
 
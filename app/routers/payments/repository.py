@@ -1,8 +1,20 @@
 """Payments/Wallet/IAP repository layer."""
 
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Tuple
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import and_, desc, func, or_, select
+
+# (created_at, id) of the last row already returned; rows strictly after it come next.
+HistoryCursor = Tuple[datetime, int]
+
+
+def _after_cursor(created_col, id_col, cursor: HistoryCursor):
+    created_at, row_id = cursor
+    return or_(
+        created_col < created_at,
+        and_(created_col == created_at, id_col < row_id),
+    )
 
 
 async def list_recent_wallet_transactions(db, *, user_id: int, limit: int = 10):
@@ -33,7 +45,7 @@ async def list_wallet_transactions_paginated(
     stmt = (
         select(WalletTransaction)
         .where(*filters)
-        .order_by(desc(WalletTransaction.created_at))
+        .order_by(desc(WalletTransaction.created_at), desc(WalletTransaction.id))
         .offset((page - 1) * page_size)
         .limit(page_size)
     )
@@ -41,6 +53,35 @@ async def list_wallet_transactions_paginated(
     return result.scalars().all(), total
 
 
+async def list_wallet_transactions_keyset(
+    db,
+    *,
+    user_id: int,
+    limit: int,
+    kind: Optional[str] = None,
+    after: Optional[HistoryCursor] = None,
+):
+    """Newest-first ledger rows after `after`, served from ix_wallet_transactions_user_created_id."""
+    from app.models.wallet import WalletTransaction
+
+    filters = [WalletTransaction.user_id == user_id]
+    if kind:
+        filters.append(WalletTransaction.kind == kind)
+    if after is not None:
+        filters.append(
+            _after_cursor(WalletTransaction.created_at, WalletTransaction.id, after)
+        )
+
+    stmt = (
+        select(WalletTransaction)
+        .where(*filters)
+        .order_by(desc(WalletTransaction.created_at), desc(WalletTransaction.id))
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
 async def list_withdrawals_paginated(
     db, *, account_id: int, page: int = 1, page_size: int = 20
 ):
@@ -54,7 +95,7 @@ async def list_withdrawals_paginated(
     stmt = (
         select(Withdrawal)
         .where(*filters)
-        .order_by(desc(Withdrawal.requested_at))
+        .order_by(desc(Withdrawal.requested_at), desc(Withdrawal.id))
         .offset((page - 1) * page_size)
         .limit(page_size)
     )
@@ -62,6 +103,26 @@ async def list_withdrawals_paginated(
     return result.scalars().all(), total
 
 
+async def list_withdrawals_keyset(
+    db, *, account_id: int, limit: int, after: Optional[HistoryCursor] = None
+):
+    """Newest-first withdrawals after `after`, served from ix_withdrawals_account_requested_id."""
+    from models import Withdrawal
+
+    filters = [Withdrawal.account_id == account_id]
+    if after is not None:
+        filters.append(_after_cursor(Withdrawal.requested_at, Withdrawal.id, after))
+
+    stmt = (
+        select(Withdrawal)
+        .where(*filters)
+        .order_by(desc(Withdrawal.requested_at), desc(Withdrawal.id))
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
 async def create_withdrawal(db, *, account_id: int, amount: float, method: str):
     from datetime import datetime
 
@@ -81,11 +81,23 @@ class PaginatedTransactionsResponse(BaseModel):
     transactions: List[WalletTransactionResponse] = Field(
         ..., description="List of transactions for the requested page"
     )
-    total: int = Field(
-        ..., description="Total number of transactions matching the filter", example=87
+    total: Optional[int] = Field(
+        None,
+        description=(
+            "Total number of transactions matching the filter "
+            "(page-based requests only; null when paging by cursor)"
+        ),
+        example=87,
+    )
+    page: Optional[int] = Field(
+        None, description="Current page number (1-based); null when paging by cursor", example=1
     )
-    page: int = Field(..., description="Current page number (1-based)", example=1)
     page_size: int = Field(..., description="Number of items per page", example=20)
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `cursor` to fetch the next page; null on the last page",
+        example="2026-04-04T12:30:00|142",
+    )
 
     class Config:
         json_schema_extra = {
@@ -103,6 +115,7 @@ class PaginatedTransactionsResponse(BaseModel):
                 "total": 87,
                 "page": 1,
                 "page_size": 20,
+                "next_cursor": "2026-04-04T12:30:00|142",
             }
         }
 
@@ -194,11 +207,23 @@ class PaginatedWithdrawalsResponse(BaseModel):
     withdrawals: List[WithdrawalResponse] = Field(
         ..., description="List of withdrawals for the requested page"
     )
-    total: int = Field(
-        ..., description="Total number of withdrawals for this user", example=3
+    total: Optional[int] = Field(
+        None,
+        description=(
+            "Total number of withdrawals for this user "
+            "(page-based requests only; null when paging by cursor)"
+        ),
+        example=3,
+    )
+    page: Optional[int] = Field(
+        None, description="Current page number (1-based); null when paging by cursor", example=1
     )
-    page: int = Field(..., description="Current page number (1-based)", example=1)
     page_size: int = Field(..., description="Number of items per page", example=20)
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `cursor` to fetch the next page; null on the last page",
+        example="2026-04-04T14:00:00|7",
+    )
 
 
 # ──────────────────────────────────────────────
@@ -15,7 +15,7 @@ import core.config as config
 from app.models.wallet import IapEvent, IapReceipt
 import logging
 
-from app.services.apple_iap_service import process_apple_iap, verify_signed_transaction_info
+from app.services.apple_iap_service import process_apple_iap, verify_signed_transaction_info_async
 from app.services.google_iap_service import get_google_subscription_state, process_google_iap
 from app.services.subscription_iap_service import (
     activate_subscription_from_iap,
@@ -27,6 +27,12 @@ from app.services.wallet_service import (
     adjust_wallet_balance,
     get_wallet_balance as wallet_service_get_wallet_balance,
 )
+from app.services.webhook_intake import (
+    claim_due_webhook_events,
+    dispatch_webhook,
+    initial_attempt_at,
+    mark_webhook_row,
+)
 
 from . import repository as payments_repository
 from .schemas import (
@@ -41,6 +47,34 @@ from .schemas import (
 logger = logging.getLogger(__name__)
 
 
+def _transaction_response(t) -> WalletTransactionResponse:
+    return WalletTransactionResponse(
+        id=t.id,
+        amount_minor=t.amount_minor,
+        amount_usd=t.amount_minor / 100.0,
+        currency=t.currency,
+        kind=t.kind,
+        created_at=t.created_at.isoformat() if t.created_at else None,
+    )
+
+
+def _encode_history_cursor(created_at: Optional[datetime], row_id: int) -> Optional[str]:
+    if created_at is None:
+        return None
+    return f"{created_at.isoformat()}|{row_id}"
+
+
+def _decode_history_cursor(cursor: str):
+    try:
+        created_raw, id_raw = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_raw), int(id_raw)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
 async def get_wallet_info(db, *, user, include_transactions: bool):
     currency = user.wallet_currency or "usd"
     balance_minor = await wallet_service_get_wallet_balance(db, user.account_id, currency)
@@ -50,17 +84,7 @@ async def get_wallet_info(db, *, user, include_transactions: bool):
         transactions = await payments_repository.list_recent_wallet_transactions(
             db, user_id=user.account_id, limit=10
         )
-        recent_transactions = [
-            WalletTransactionResponse(
-                id=t.id,
-                amount_minor=t.amount_minor,
-                amount_usd=t.amount_minor / 100.0,
-                currency=t.currency,
-                kind=t.kind,
-                created_at=t.created_at.isoformat() if t.created_at else None,
-            )
-            for t in transactions
-        ]
+        recent_transactions = [_transaction_response(t) for t in transactions]
 
     return WalletBalanceResponse(
         balance_minor=balance_minor,
@@ -175,36 +199,47 @@ async def _try_activate_subscription(
         return None
 
 
-async def process_apple_notification(db, *, signed_payload: str):
-    payload = verify_signed_transaction_info(signed_payload)
+async def _parse_apple_notification(signed_payload: str) -> dict:
+    """Verify the notification JWS (and nested transaction) and extract routing fields."""
+    payload = await verify_signed_transaction_info_async(signed_payload)
     notification_type = payload.get("notificationType")
     subtype = payload.get("subtype")
     event_id = payload.get("notificationUUID") or payload.get("notificationId")
     data = payload.get("data", {}) if isinstance(payload.get("data", {}), dict) else {}
     signed_tx = data.get("signedTransactionInfo")
-    tx_payload = verify_signed_transaction_info(signed_tx) if signed_tx else {}
+    tx_payload = await verify_signed_transaction_info_async(signed_tx) if signed_tx else {}
     transaction_id = tx_payload.get("transactionId")
 
     if not event_id:
         event_id = f"apple:{transaction_id or 'unknown'}:{notification_type or 'unknown'}"
 
-    event = IapEvent(
+    return {
+        "event_id": event_id,
+        "notification_type": notification_type,
+        "subtype": subtype,
+        "transaction_id": transaction_id,
+        "tx_payload": tx_payload,
+    }
+
+
+def _new_apple_event(parsed: dict, signed_payload: str) -> IapEvent:
+    return IapEvent(
         platform="apple",
-        event_id=event_id,
-        notification_type=notification_type,
-        subtype=subtype,
-        transaction_id=transaction_id,
+        event_id=parsed["event_id"],
+        notification_type=parsed["notification_type"],
+        subtype=parsed["subtype"],
+        transaction_id=parsed["transaction_id"],
         status="received",
         raw_payload=signed_payload,
         received_at=datetime.now(timezone.utc),
+        next_attempt_at=initial_attempt_at(datetime.utcnow()),
     )
 
-    try:
-        db.add(event)
-        await db.flush()
-    except IntegrityError:
-        await db.rollback()
-        return {"status": "already_processed", "event_id": event_id}
+
+async def _apply_apple_notification(
+    db, event: IapEvent, *, notification_type, subtype, transaction_id, tx_payload: dict
+):
+    event_id = event.event_id
 
     # Handle subscription renewal notifications
     if notification_type == "DID_RENEW" and transaction_id:
@@ -337,11 +372,70 @@ async def process_apple_notification(db, *, signed_payload: str):
 
     event.status = "processed"
     event.processed_at = datetime.now(timezone.utc)
+    event.next_attempt_at = None
     await db.commit()
     return {"status": "processed", "event_id": event_id}
 
 
-async def process_google_notification(db, *, payload: dict):
+async def process_apple_notification(db, *, signed_payload: str):
+    parsed = await _parse_apple_notification(signed_payload)
+    event = _new_apple_event(parsed, signed_payload)
+
+    try:
+        db.add(event)
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        return {"status": "already_processed", "event_id": parsed["event_id"]}
+
+    return await _apply_apple_notification(
+        db,
+        event,
+        notification_type=parsed["notification_type"],
+        subtype=parsed["subtype"],
+        transaction_id=parsed["transaction_id"],
+        tx_payload=parsed["tx_payload"],
+    )
+
+
+def _apple_applier(parsed: dict):
+    return lambda session, event: _apply_apple_notification(
+        session,
+        event,
+        notification_type=parsed["notification_type"],
+        subtype=parsed["subtype"],
+        transaction_id=parsed["transaction_id"],
+        tx_payload=parsed["tx_payload"],
+    )
+
+
+async def ingest_apple_notification(db, *, signed_payload: str):
+    """
+    Fast-ack intake: verify, persist the raw notification, queue its processing.
+
+    A notification that cannot be queued, or whose processing fails, stays due in
+    `iap_events` and is replayed by `retry_failed_iap_events`.
+    """
+    parsed = await _parse_apple_notification(signed_payload)
+    event_id = parsed["event_id"]
+
+    try:
+        db.add(_new_apple_event(parsed, signed_payload))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return {"status": "already_processed", "event_id": event_id}
+
+    async def _process() -> None:
+        await _run_recorded_iap_event(event_id, _apple_applier(parsed))
+
+    tx_payload = parsed["tx_payload"]
+    partition_key = tx_payload.get("originalTransactionId") or parsed["transaction_id"]
+    dispatch_webhook("apple", partition_key, event_id, _process)
+    return {"status": "accepted", "event_id": event_id}
+
+
+def _parse_google_notification(payload: dict) -> dict:
     message = payload.get("message", {}) if isinstance(payload, dict) else {}
     event_id = message.get("messageId") or payload.get("eventId")
     data_b64 = message.get("data")
@@ -367,23 +461,35 @@ async def process_google_notification(db, *, payload: dict):
     if not event_id:
         event_id = f"google:{purchase_token or 'unknown'}:{notification_type or 'unknown'}"
 
-    event = IapEvent(
+    return {
+        "event_id": event_id,
+        "raw_payload": raw_payload,
+        "notification_type": notification_type,
+        "purchase_token": purchase_token,
+        "product_id": product_id,
+        "sub_notification": sub_notification,
+    }
+
+
+def _new_google_event(parsed: dict) -> IapEvent:
+    notification_type = parsed["notification_type"]
+    return IapEvent(
         platform="google",
-        event_id=event_id,
+        event_id=parsed["event_id"],
         notification_type=str(notification_type) if notification_type is not None else None,
         transaction_id=None,
-        purchase_token=purchase_token,
+        purchase_token=parsed["purchase_token"],
         status="received",
-        raw_payload=raw_payload,
+        raw_payload=parsed["raw_payload"],
         received_at=datetime.now(timezone.utc),
+        next_attempt_at=initial_attempt_at(datetime.utcnow()),
     )
 
-    try:
-        db.add(event)
-        await db.flush()
-    except IntegrityError:
-        await db.rollback()
-        return {"status": "already_processed", "event_id": event_id}
+
+async def _apply_google_notification(
+    db, event: IapEvent, *, notification_type, purchase_token, product_id, sub_notification: dict
+):
+    event_id = event.event_id
 
     # Handle subscription notifications — re-query Google for authoritative state
     google_sub_signal_types = {2, 4, 5, 7, 12, 13}  # renewal, recovery, expiry, revoke signals
@@ -502,32 +608,212 @@ async def process_google_notification(db, *, payload: dict):
 
     event.status = "processed"
     event.processed_at = datetime.now(timezone.utc)
+    event.next_attempt_at = None
     await db.commit()
     return {"status": "processed", "event_id": event_id, "product_id": product_id}
 
 
-async def get_transaction_history(db, *, user_id: int, page: int, page_size: int, kind: Optional[str]):
-    transactions, total = await payments_repository.list_wallet_transactions_paginated(
-        db, user_id=user_id, page=page, page_size=page_size, kind=kind
+async def process_google_notification(db, *, payload: dict):
+    parsed = _parse_google_notification(payload)
+    event = _new_google_event(parsed)
+
+    try:
+        db.add(event)
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        return {"status": "already_processed", "event_id": parsed["event_id"]}
+
+    return await _apply_google_notification(
+        db,
+        event,
+        notification_type=parsed["notification_type"],
+        purchase_token=parsed["purchase_token"],
+        product_id=parsed["product_id"],
+        sub_notification=parsed["sub_notification"],
+    )
+
+
+def _google_applier(parsed: dict):
+    return lambda session, event: _apply_google_notification(
+        session,
+        event,
+        notification_type=parsed["notification_type"],
+        purchase_token=parsed["purchase_token"],
+        product_id=parsed["product_id"],
+        sub_notification=parsed["sub_notification"],
     )
+
+
+async def ingest_google_notification(db, *, payload: dict):
+    """
+    Fast-ack intake: persist the raw notification, queue its processing.
+
+    A notification that cannot be queued, or whose processing fails, stays due in
+    `iap_events` and is replayed by `retry_failed_iap_events`.
+    """
+    parsed = _parse_google_notification(payload)
+    event_id = parsed["event_id"]
+
+    try:
+        db.add(_new_google_event(parsed))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return {"status": "already_processed", "event_id": event_id}
+
+    async def _process() -> None:
+        await _run_recorded_iap_event(event_id, _google_applier(parsed))
+
+    dispatch_webhook("google", parsed["purchase_token"], event_id, _process)
+    return {"status": "accepted", "event_id": event_id}
+
+
+async def _mark_iap_event_failed(event_id: str, *, increment_attempts: bool) -> None:
+    """Reschedule (or dead-letter) a recorded IapEvent in its own session."""
+    from app.db import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(IapEvent).where(IapEvent.event_id == event_id))
+            event = result.scalar_one_or_none()
+            if event:
+                mark_webhook_row(
+                    event, False, increment_attempts=increment_attempts, now=datetime.utcnow()
+                )
+                await session.commit()
+    except Exception:
+        logger.exception("Failed to mark IAP event %s as failed", event_id)
+
+
+async def _run_recorded_iap_event(event_id: str, apply, *, increment_attempts: bool = False) -> bool:
+    """Apply a recorded IapEvent in its own session; reschedule it if handling raises.
+
+    Returns True once the event is processed.
+    """
+    from app.db import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(IapEvent).where(IapEvent.event_id == event_id))
+        event = result.scalar_one_or_none()
+        if event is None or event.status in ("processed", "dead_letter"):
+            return False
+        try:
+            if increment_attempts:
+                event.attempts = (event.attempts or 0) + 1
+            await apply(session, event)
+            return True
+        except Exception:
+            await session.rollback()
+            logger.exception("IAP notification processing failed for event %s", event_id)
+
+    # Attempts count retries only, as for Stripe/PayPal events.
+    await _mark_iap_event_failed(event_id, increment_attempts=increment_attempts)
+    return False
+
+
+async def _iap_applier_from_payload(platform: str, raw_payload: str):
+    if platform == "apple":
+        return _apple_applier(await _parse_apple_notification(raw_payload))
+    if platform == "google":
+        return _google_applier(_parse_google_notification(json.loads(raw_payload)))
+    raise ValueError(f"Unknown IAP platform: {platform}")
+
+
+async def retry_failed_iap_events(db) -> int:
+    """
+    Replay due IAP notifications (failed, or stuck in "received") from their raw
+    payload. Returns count of events processed successfully.
+
+    Batches are claimed with FOR UPDATE SKIP LOCKED and leased, so several workers
+    can drain the queue in parallel. Failures are rescheduled with backoff until
+    they dead-letter.
+    """
+    retried = 0
+    while True:
+        claimed = await claim_due_webhook_events(db, IapEvent, now=datetime.utcnow())
+        for event_id, platform, raw_payload in [
+            (e.event_id, e.platform, e.raw_payload) for e in claimed
+        ]:
+            try:
+                apply = await _iap_applier_from_payload(platform, raw_payload)
+            except Exception:
+                logger.exception("Cannot replay IAP notification %s", event_id)
+                await _mark_iap_event_failed(event_id, increment_attempts=True)
+                continue
+            if await _run_recorded_iap_event(event_id, apply, increment_attempts=True):
+                retried += 1
+                logger.info("Retried IAP event %s successfully", event_id)
+        if len(claimed) < config.WEBHOOK_RETRY_BATCH_SIZE:
+            break
+
+    return retried
+
+
+async def get_transaction_history(
+    db,
+    *,
+    user_id: int,
+    page: int,
+    page_size: int,
+    kind: Optional[str],
+    cursor: Optional[str] = None,
+):
+    """Offset pages (with total) when `cursor` is absent, keyset pages after it otherwise."""
+    if cursor:
+        rows = await payments_repository.list_wallet_transactions_keyset(
+            db,
+            user_id=user_id,
+            limit=page_size + 1,
+            kind=kind,
+            after=_decode_history_cursor(cursor),
+        )
+        transactions, has_more = rows[:page_size], len(rows) > page_size
+        total, page = None, None
+    else:
+        transactions, total = await payments_repository.list_wallet_transactions_paginated(
+            db, user_id=user_id, page=page, page_size=page_size, kind=kind
+        )
+        has_more = page * page_size < total
+
+    last = transactions[-1] if has_more and transactions else None
     return {
-        "transactions": [
-            WalletTransactionResponse(
-                id=t.id,
-                amount_minor=t.amount_minor,
-                amount_usd=t.amount_minor / 100.0,
-                currency=t.currency,
-                kind=t.kind,
-                created_at=t.created_at.isoformat() if t.created_at else None,
-            )
-            for t in transactions
-        ],
+        "transactions": [_transaction_response(t) for t in transactions],
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": _encode_history_cursor(last.created_at, last.id) if last else None,
     }
 
 
+async def stream_transaction_history_ndjson(*, user_id: int, kind: Optional[str]):
+    """Yield the full ledger as NDJSON, newest first, one keyset chunk at a time.
+
+    Uses its own session (the request session is closed before a streaming body is
+    sent) and ends the read transaction after every chunk, so a slow download does
+    not pin a pooled connection.
+    """
+    from app.db import AsyncSessionLocal
+
+    chunk_size = config.WALLET_HISTORY_EXPORT_CHUNK_SIZE
+    after = None
+    async with AsyncSessionLocal() as session:
+        while True:
+            rows = await payments_repository.list_wallet_transactions_keyset(
+                session, user_id=user_id, limit=chunk_size, kind=kind, after=after
+            )
+            await session.commit()
+            session.expunge_all()
+            if not rows:
+                return
+            yield "".join(
+                json.dumps(_transaction_response(t).model_dump()) + "\n" for t in rows
+            )
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+
+
 async def request_withdrawal(db, *, user, amount_usd: float, method: str, details: Optional[str]):
     amount_minor = int(amount_usd * 100)
     currency = user.wallet_currency or "usd"
@@ -573,10 +859,26 @@ async def request_withdrawal(db, *, user, amount_usd: float, method: str, detail
     }
 
 
-async def get_withdrawal_history(db, *, account_id: int, page: int, page_size: int):
-    withdrawals, total = await payments_repository.list_withdrawals_paginated(
-        db, account_id=account_id, page=page, page_size=page_size
-    )
+async def get_withdrawal_history(
+    db, *, account_id: int, page: int, page_size: int, cursor: Optional[str] = None
+):
+    """Offset pages (with total) when `cursor` is absent, keyset pages after it otherwise."""
+    if cursor:
+        rows = await payments_repository.list_withdrawals_keyset(
+            db,
+            account_id=account_id,
+            limit=page_size + 1,
+            after=_decode_history_cursor(cursor),
+        )
+        withdrawals, has_more = rows[:page_size], len(rows) > page_size
+        total, page = None, None
+    else:
+        withdrawals, total = await payments_repository.list_withdrawals_paginated(
+            db, account_id=account_id, page=page, page_size=page_size
+        )
+        has_more = page * page_size < total
+
+    last = withdrawals[-1] if has_more and withdrawals else None
     return {
         "withdrawals": [
             {
@@ -592,6 +894,7 @@ async def get_withdrawal_history(db, *, account_id: int, page: int, page_size: i
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": _encode_history_cursor(last.requested_at, last.id) if last else None,
     }
 
 
@@ -16,7 +16,7 @@ from app.models.user import User
 from app.services.stripe_service import (
     create_checkout_session,
     get_session_status,
-    process_webhook_event,
+    ingest_webhook_event,
 )
 from core.config import STRIPE_WEBHOOK_SECRET
 
@@ -122,6 +122,7 @@ async def create_stripe_checkout_session(
         "- `customer.subscription.deleted` — deactivates expired subscriptions\n"
         "- `charge.refunded` — reverses wallet credits\n\n"
         "**No user authentication** — Stripe signs the payload.\n\n"
+        "Responds as soon as the event is recorded; handlers run asynchronously.\n\n"
         "Configure this URL in Stripe Dashboard > Developers > Webhooks.\n\n"
         "**Rate limit:** 100 requests / 60 seconds per IP."
     ),
@@ -132,7 +133,6 @@ async def create_stripe_checkout_session(
 )
 async def stripe_webhook(
     request: Request,
-    db: AsyncSession = Depends(get_async_db),
     _rl=Depends(_webhook_rate_limit),
 ):
     body = await request.body()
@@ -150,9 +150,9 @@ async def stripe_webhook(
         logger.error("Webhook signature verification failed: %s", e)
         raise HTTPException(status_code=400, detail="Invalid payload")
 
-    await process_webhook_event(db, event)
-
-    # Always return 200 — retry job recovers failures
+    # Ack once the event is persisted; handlers run on the webhook worker pool
+    # and the retry job recovers failures.
+    await ingest_webhook_event(event)
     return {"status": "ok"}
 
 
@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_async_db
@@ -21,6 +22,7 @@ from .service import (
     get_wallet_info as service_get_wallet_info,
     get_withdrawal_history as service_get_withdrawal_history,
     request_withdrawal as service_request_withdrawal,
+    stream_transaction_history_ndjson as service_stream_transaction_history_ndjson,
 )
 
 router = APIRouter(prefix="/wallet", tags=["Wallet"])
@@ -65,7 +67,9 @@ async def get_wallet_info(
         "Returns a paginated list of all wallet transactions for the "
         "authenticated user, ordered newest-first. "
         "Use the `kind` filter to show only specific transaction types "
-        "(e.g., only withdrawals or only rewards)."
+        "(e.g., only withdrawals or only rewards).\n\n"
+        "Pass the returned `next_cursor` as `cursor` to fetch the next page; "
+        "cursor pages cost the same at any depth (`page` and `total` are then null)."
     ),
     responses={
         200: {"description": "Transaction list retrieved successfully"},
@@ -94,9 +98,49 @@ async def get_transactions(
         ),
         example="trivia_reward",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="`next_cursor` from the previous page. When set, `page` is ignored.",
+    ),
 ):
     return await service_get_transaction_history(
-        db, user_id=user.account_id, page=page, page_size=page_size, kind=kind
+        db,
+        user_id=user.account_id,
+        page=page,
+        page_size=page_size,
+        kind=kind,
+        cursor=cursor,
+    )
+
+
+@router.get(
+    "/transactions/export",
+    summary="Export full transaction history",
+    description=(
+        "Streams every wallet transaction for the authenticated user as "
+        "newline-delimited JSON (one transaction object per line, newest-first)."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "NDJSON stream of transactions",
+            "content": {"application/x-ndjson": {}},
+        },
+        401: {"description": "Not authenticated"},
+    },
+)
+async def export_transactions(
+    user: User = Depends(get_current_user),
+    kind: Optional[str] = Query(
+        None, description="Optional transaction kind filter (same values as `/transactions`)."
+    ),
+):
+    return StreamingResponse(
+        service_stream_transaction_history_ndjson(user_id=user.account_id, kind=kind),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="wallet-transactions-{user.account_id}.ndjson"'
+        },
     )
 
 
@@ -141,7 +185,8 @@ async def request_withdraw(
     description=(
         "Returns a paginated list of all withdrawal requests for the "
         "authenticated user, ordered newest-first. "
-        "Use this to track the status of pending and completed withdrawals."
+        "Use this to track the status of pending and completed withdrawals. "
+        "Pass the returned `next_cursor` as `cursor` to fetch the next page."
     ),
     responses={
         200: {"description": "Withdrawal list retrieved successfully"},
@@ -158,7 +203,11 @@ async def get_withdrawals(
         le=100,
         description="Number of withdrawals per page (max 100).",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="`next_cursor` from the previous page. When set, `page` is ignored.",
+    ),
 ):
     return await service_get_withdrawal_history(
-        db, account_id=user.account_id, page=page, page_size=page_size
+        db, account_id=user.account_id, page=page, page_size=page_size, cursor=cursor
     )
@@ -2,10 +2,16 @@
 Apple IAP Service - StoreKit 2 signed transaction verification
 """
 
+import asyncio
 import base64
+import hashlib
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 
 import jwt
 from cryptography import x509
@@ -34,6 +40,15 @@ APPLE_PRODUCT_TYPE_MAP = {
 }
 
 
+# JWS verification is CPU-bound; async callers run it here instead of on the loop.
+_executor = ThreadPoolExecutor(max_workers=4)
+
+# Chains Apple reuses across transactions, keyed by the x5c fingerprints:
+# fingerprints -> (earliest not_valid_after in the chain, leaf public key).
+_verified_chains: "OrderedDict[Tuple[str, ...], Tuple[datetime, Any]]" = OrderedDict()
+_verified_chains_lock = Lock()
+
+
 def _load_root_certs() -> List[x509.Certificate]:
     paths = config.APPLE_ROOT_CERT_PATHS
     if not paths:
@@ -41,7 +56,12 @@ def _load_root_certs() -> List[x509.Certificate]:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Apple root certs not configured (APPLE_ROOT_CERT_PATHS)",
         )
+    return list(_load_trust_store(tuple(paths)))
+
 
+@lru_cache(maxsize=4)
+def _load_trust_store(paths: Tuple[str, ...]) -> Tuple[x509.Certificate, ...]:
+    """Read and parse the configured roots once per distinct path list."""
     certs: List[x509.Certificate] = []
     for path in paths:
         try:
@@ -52,7 +72,32 @@ def _load_root_certs() -> List[x509.Certificate]:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to load Apple root cert: {path} ({exc})",
             )
-    return certs
+    return tuple(certs)
+
+
+def _get_verified_chain_key(fingerprints: Tuple[str, ...]) -> Optional[Any]:
+    now = datetime.now(timezone.utc)
+    with _verified_chains_lock:
+        entry = _verified_chains.get(fingerprints)
+        if entry is None:
+            return None
+        valid_until, leaf_key = entry
+        if valid_until < now:
+            _verified_chains.pop(fingerprints, None)
+            return None
+        _verified_chains.move_to_end(fingerprints)
+        return leaf_key
+
+
+def _remember_verified_chain(
+    fingerprints: Tuple[str, ...], chain: List[x509.Certificate]
+) -> None:
+    valid_until = min(cert.not_valid_after_utc for cert in chain)
+    with _verified_chains_lock:
+        _verified_chains[fingerprints] = (valid_until, chain[0].public_key())
+        _verified_chains.move_to_end(fingerprints)
+        while len(_verified_chains) > config.APPLE_VERIFIED_CHAIN_CACHE_SIZE:
+            _verified_chains.popitem(last=False)
 
 
 def _verify_cert_signature(cert: x509.Certificate, issuer: x509.Certificate) -> None:
@@ -85,7 +130,7 @@ def _verify_cert_chain(chain: List[x509.Certificate], roots: List[x509.Certifica
 
     now = datetime.now(timezone.utc)
     for cert in chain:
-        if cert.not_valid_before > now or cert.not_valid_after < now:
+        if cert.not_valid_before_utc > now or cert.not_valid_after_utc < now:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Certificate in chain is not valid at current time",
@@ -127,10 +172,7 @@ def verify_signed_transaction_info(signed_transaction_info: str) -> Dict[str, An
         )
 
     try:
-        chain = [
-            x509.load_der_x509_certificate(base64.b64decode(cert))
-            for cert in x5c
-        ]
+        der_chain = [base64.b64decode(cert) for cert in x5c]
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -138,12 +180,27 @@ def verify_signed_transaction_info(signed_transaction_info: str) -> Dict[str, An
         )
 
     roots = _load_root_certs()
-    _verify_cert_chain(chain, roots)
+    fingerprints = tuple(
+        [hashlib.sha256(der).hexdigest() for der in der_chain]
+        + [str(path) for path in config.APPLE_ROOT_CERT_PATHS]
+    )
+    leaf_key = _get_verified_chain_key(fingerprints)
+    if leaf_key is None:
+        try:
+            chain = [x509.load_der_x509_certificate(der) for der in der_chain]
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to parse x5c certificate chain",
+            )
+        _verify_cert_chain(chain, roots)
+        _remember_verified_chain(fingerprints, chain)
+        leaf_key = chain[0].public_key()
 
     try:
         payload = jwt.decode(
             signed_transaction_info,
-            key=chain[0].public_key(),
+            key=leaf_key,
             algorithms=[header.get("alg", "RS256")],
             options={
                 "verify_aud": False,
@@ -160,6 +217,14 @@ def verify_signed_transaction_info(signed_transaction_info: str) -> Dict[str, An
     return payload
 
 
+async def verify_signed_transaction_info_async(signed_transaction_info: str) -> Dict[str, Any]:
+    """`verify_signed_transaction_info` on the verification thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, verify_signed_transaction_info, signed_transaction_info
+    )
+
+
 def _normalize_environment(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
@@ -188,7 +253,7 @@ async def process_apple_iap(
             detail="signed_transaction_info is required",
         )
 
-    payload = verify_signed_transaction_info(signed_transaction_info)
+    payload = await verify_signed_transaction_info_async(signed_transaction_info)
 
     bundle_id = payload.get("bundleId")
     if config.APPLE_APP_BUNDLE_ID and bundle_id != config.APPLE_APP_BUNDLE_ID:
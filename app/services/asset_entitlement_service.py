@@ -3,6 +3,7 @@ Asset Entitlement Service — async grant/revoke for avatars & frames.
 
 Uses the async UserAvatar/UserFrame models from app.models.products.
 Idempotent: duplicate grants succeed with already_owned=True.
+Ownership checks read the per-user entitlement cache (`utils.entitlement_cache`).
 """
 
 import logging
@@ -14,6 +15,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.products import Avatar, Frame, UserAvatar, UserFrame
 from app.models.user import User
+from core.model_events import run_after_commit
+from utils.entitlement_cache import get_entitlements_async, invalidate_entitlements
 
 logger = logging.getLogger(__name__)
 
@@ -22,37 +25,10 @@ async def check_already_owned(
     db: AsyncSession, *, user_id: int, product_id: str
 ) -> bool:
     """Return True if the user already owns this avatar or frame."""
-    if product_id.startswith("AV"):
-        result = await db.execute(
-            select(Avatar).where(Avatar.product_id == product_id)
-        )
-        avatar = result.scalar_one_or_none()
-        if not avatar:
-            return False
-        existing = await db.execute(
-            select(UserAvatar).where(
-                UserAvatar.user_id == user_id,
-                UserAvatar.avatar_id == avatar.id,
-            )
-        )
-        return existing.scalar_one_or_none() is not None
-
-    elif product_id.startswith("FR"):
-        result = await db.execute(
-            select(Frame).where(Frame.product_id == product_id)
-        )
-        frame = result.scalar_one_or_none()
-        if not frame:
-            return False
-        existing = await db.execute(
-            select(UserFrame).where(
-                UserFrame.user_id == user_id,
-                UserFrame.frame_id == frame.id,
-            )
-        )
-        return existing.scalar_one_or_none() is not None
-
-    return False
+    if not product_id.startswith(("AV", "FR")):
+        return False
+    entitlements = await get_entitlements_async(db, user_id)
+    return entitlements.owns_product(product_id)
 
 
 async def grant_asset(
@@ -148,6 +124,8 @@ async def revoke_asset(
         was_owned = del_result.rowcount > 0
 
         if was_owned:
+            # Core DELETE bypasses the ORM change hooks.
+            run_after_commit(db, invalidate_entitlements, {user_id})
             # Clear selection if the revoked avatar was active
             user_result = await db.execute(
                 select(User).where(User.account_id == user_id)
@@ -179,6 +157,8 @@ async def revoke_asset(
         was_owned = del_result.rowcount > 0
 
         if was_owned:
+            # Core DELETE bypasses the ORM change hooks.
+            run_after_commit(db, invalidate_entitlements, {user_id})
             user_result = await db.execute(
                 select(User).where(User.account_id == user_id)
             )
@@ -6,15 +6,12 @@ import asyncio
 import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 import google.auth
 from fastapi import HTTPException, status
 from google.oauth2 import service_account
-from googleapiclient import discovery
-from googleapiclient.errors import HttpError
 from sqlalchemy import and_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import core.config as config
 from app.models.user import User
 from app.models.wallet import IapEvent, IapReceipt
+from app.services.google_play_client import GooglePlayApiError, get_google_play_client
 from app.services.product_pricing import get_product_info
 from app.services.wallet_service import adjust_wallet_balance
 
@@ -32,9 +30,6 @@ GOOGLE_PURCHASE_STATE_PURCHASED = 0
 GOOGLE_PURCHASE_STATE_CANCELLED = 1
 GOOGLE_PURCHASE_STATE_PENDING = 2
 
-# Thread pool for Google API calls (sync API wrapped in async)
-_executor = ThreadPoolExecutor(max_workers=5)
-
 
 def get_google_credentials_from_env() -> google.auth.credentials.Credentials:
     """
@@ -87,29 +82,6 @@ def get_google_credentials_from_env() -> google.auth.credentials.Credentials:
         )
 
 
-def get_android_publisher_client(credentials) -> Any:
-    """
-    Create a Google AndroidPublisher API client.
-
-    Args:
-        credentials: Google service account credentials
-
-    Returns:
-        Service object with .purchases().products() access
-    """
-    try:
-        service = discovery.build(
-            "androidpublisher", "v3", credentials=credentials, cache_discovery=False
-        )
-        return service
-    except Exception as e:
-        logger.error(f"Failed to create Android Publisher client: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create Android Publisher client",
-        )
-
-
 async def get_google_subscription_state(
     package_name: str, purchase_token: str
 ) -> Dict[str, Any]:
@@ -117,35 +89,14 @@ async def get_google_subscription_state(
 
     Returns the full subscription resource including ``subscriptionState``.
     """
-    credentials = get_google_credentials_from_env()
-    service = get_android_publisher_client(credentials)
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(
-        _executor,
-        lambda: service.purchases()
-        .subscriptionsv2()
-        .get(packageName=package_name, token=purchase_token)
-        .execute(),
-    )
+    return await get_google_play_client().get_subscription_v2(package_name, purchase_token)
 
 
 async def acknowledge_google_purchase(
     package_name: str, product_id: str, purchase_token: str
 ) -> None:
-    credentials = get_google_credentials_from_env()
-    service = get_android_publisher_client(credentials)
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(
-        _executor,
-        lambda: service.purchases()
-        .products()
-        .acknowledge(
-            packageName=package_name,
-            productId=product_id,
-            token=purchase_token,
-            body={},
-        )
-        .execute(),
+    await get_google_play_client().acknowledge_product(
+        package_name, product_id, purchase_token
     )
 
 
@@ -157,40 +108,16 @@ async def acknowledge_google_subscription(
     Uses purchases.subscriptions.acknowledge (v3) which is the correct
     endpoint for subscription acknowledgement (distinct from products.acknowledge).
     """
-    credentials = get_google_credentials_from_env()
-    service = get_android_publisher_client(credentials)
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(
-        _executor,
-        lambda: service.purchases()
-        .subscriptions()
-        .acknowledge(
-            packageName=package_name,
-            subscriptionId=subscription_id,
-            token=purchase_token,
-            body={},
-        )
-        .execute(),
+    await get_google_play_client().acknowledge_subscription(
+        package_name, subscription_id, purchase_token
     )
 
 
 async def consume_google_purchase(
     package_name: str, product_id: str, purchase_token: str
 ) -> None:
-    credentials = get_google_credentials_from_env()
-    service = get_android_publisher_client(credentials)
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(
-        _executor,
-        lambda: service.purchases()
-        .products()
-        .consume(
-            packageName=package_name,
-            productId=product_id,
-            token=purchase_token,
-            body={},
-        )
-        .execute(),
+    await get_google_play_client().consume_product(
+        package_name, product_id, purchase_token
     )
 
 
@@ -215,17 +142,8 @@ async def verify_google_purchase_token(
         HTTPException(502, ...) if Google API call fails
     """
     try:
-        credentials = get_google_credentials_from_env()
-        service = get_android_publisher_client(credentials)
-
-        # Wrap sync Google API call in async executor
-        loop = asyncio.get_running_loop()
-        purchase = await loop.run_in_executor(
-            _executor,
-            lambda: service.purchases()
-            .products()
-            .get(packageName=package_name, productId=product_id, token=purchase_token)
-            .execute(),
+        purchase = await get_google_play_client().get_product_purchase(
+            package_name, product_id, purchase_token
         )
 
         # Validate purchase state
@@ -244,24 +162,21 @@ async def verify_google_purchase_token(
 
         return purchase
 
-    except HttpError as e:
-        error_details = json.loads(e.content.decode("utf-8")) if e.content else {}
-        error_reason = error_details.get("error", {}).get("message", str(e))
-
-        if e.resp.status == 404:
+    except GooglePlayApiError as e:
+        if e.status_code == 404:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Purchase not found: {error_reason}",
+                detail=f"Purchase not found: {e.message}",
             )
-        elif e.resp.status == 401:
+        elif e.status_code == 401:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Google API authentication failed: {error_reason}",
+                detail=f"Google API authentication failed: {e.message}",
             )
         else:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Google Play API error: {error_reason}",
+                detail=f"Google Play API error: {e.message}",
             )
     except HTTPException:
         raise
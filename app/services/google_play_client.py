@@ -0,0 +1,254 @@
+"""
+Google Play Developer API client.
+
+Long-lived async REST client for the androidpublisher v3 endpoints used by IAP
+verification. The service-account access token is cached until shortly before it
+expires, HTTP connections are pooled, in-flight calls are capped by a semaphore, and
+429/5xx/transport failures are retried with exponential backoff and full jitter.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import quote
+
+import httpx
+
+import core.config as config
+
+logger = logging.getLogger(__name__)
+
+TokenProvider = Callable[[], Awaitable[tuple]]
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+
+class GooglePlayApiError(Exception):
+    """Non-retryable (or retries exhausted) error response from the Play API."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+async def _service_account_token() -> tuple:
+    """Refresh service-account credentials off the loop; returns (token, expires_at)."""
+    import google.auth.transport.requests
+
+    from app.services.google_iap_service import get_google_credentials_from_env
+
+    credentials = get_google_credentials_from_env()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        None, credentials.refresh, google.auth.transport.requests.Request()
+    )
+    expires_at = (
+        credentials.expiry.timestamp() if credentials.expiry else time.time() + 3300
+    )
+    return credentials.token, expires_at
+
+
+class GooglePlayClient:
+    """Async androidpublisher v3 client with token caching, pooling and retries."""
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        token_provider: Optional[TokenProvider] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base_seconds: float = 0.2,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self.base_url = (base_url or config.GOOGLE_PLAY_API_BASE_URL).rstrip("/")
+        self._token_provider = token_provider or _service_account_token
+        self._transport = transport
+        self._max_concurrency = max_concurrency or config.GOOGLE_PLAY_MAX_CONCURRENCY
+        self._max_retries = (
+            config.GOOGLE_PLAY_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self._backoff_base_seconds = backoff_base_seconds
+        self._timeout_seconds = timeout_seconds or config.GOOGLE_PLAY_TIMEOUT_SECONDS
+        self._access_token: Optional[str] = None
+        self._token_expires_at: float = 0
+        # httpx clients, semaphores and locks belong to one event loop; worker jobs
+        # that call asyncio.run() get fresh ones.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+
+    async def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._http is not None:
+            return
+        if self._http is not None:
+            await self._close_http()
+        self._loop = loop
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=self._transport,
+            timeout=self._timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self._max_concurrency,
+                max_keepalive_connections=self._max_concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._token_lock = asyncio.Lock()
+
+    async def _close_http(self) -> None:
+        http, self._http = self._http, None
+        try:
+            await http.aclose()
+        except Exception as exc:
+            # Connections opened on a loop that has since closed cannot be shut
+            # down cleanly; they are released with the client object.
+            logger.debug("Closing stale Google Play HTTP client failed: %s", exc)
+
+    async def aclose(self) -> None:
+        """Close pooled connections; the next call opens a new pool."""
+        if self._http is not None:
+            await self._close_http()
+        self._loop = None
+
+    async def _get_access_token(self, *, force: bool = False) -> str:
+        if (
+            not force
+            and self._access_token
+            and time.time() < self._token_expires_at - _TOKEN_REFRESH_MARGIN_SECONDS
+        ):
+            return self._access_token
+        async with self._token_lock:
+            if (
+                not force
+                and self._access_token
+                and time.time() < self._token_expires_at - _TOKEN_REFRESH_MARGIN_SECONDS
+            ):
+                return self._access_token
+            self._access_token, self._token_expires_at = await self._token_provider()
+        return self._access_token
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, self._backoff_base_seconds * (2**attempt))
+
+    async def _request(
+        self, method: str, path: str, *, json: Any = None
+    ) -> Dict[str, Any]:
+        await self._bind_loop()
+        token_refreshed = False
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                token = await self._get_access_token()
+                try:
+                    resp = await self._http.request(
+                        method,
+                        path,
+                        json=json,
+                        headers={"Authorization": f"Bearer {token}"},
+                    )
+                except httpx.TransportError as exc:
+                    if attempt >= self._max_retries:
+                        raise GooglePlayApiError(
+                            502, f"Google Play API unreachable: {exc}"
+                        )
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+
+                if resp.status_code == 401 and not token_refreshed:
+                    token_refreshed = True
+                    await self._get_access_token(force=True)
+                    continue
+                if resp.status_code in _RETRY_STATUSES and attempt < self._max_retries:
+                    logger.info(
+                        "Google Play API %s %s returned %s; retrying",
+                        method,
+                        path,
+                        resp.status_code,
+                    )
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+                if resp.status_code >= 400:
+                    try:
+                        message = resp.json().get("error", {}).get("message")
+                    except ValueError:
+                        message = None
+                    raise GooglePlayApiError(resp.status_code, message or resp.text)
+                if not resp.content:
+                    return {}
+                return resp.json()
+
+    @staticmethod
+    def _purchases_path(package_name: str) -> str:
+        return f"/androidpublisher/v3/applications/{quote(package_name, safe='')}/purchases"
+
+    async def get_product_purchase(
+        self, package_name: str, product_id: str, purchase_token: str
+    ) -> Dict[str, Any]:
+        return await self._request(
+            "GET",
+            f"{self._purchases_path(package_name)}/products/"
+            f"{quote(product_id, safe='')}/tokens/{quote(purchase_token, safe='')}",
+        )
+
+    async def acknowledge_product(
+        self, package_name: str, product_id: str, purchase_token: str
+    ) -> None:
+        await self._request(
+            "POST",
+            f"{self._purchases_path(package_name)}/products/"
+            f"{quote(product_id, safe='')}/tokens/{quote(purchase_token, safe='')}:acknowledge",
+            json={},
+        )
+
+    async def consume_product(
+        self, package_name: str, product_id: str, purchase_token: str
+    ) -> None:
+        await self._request(
+            "POST",
+            f"{self._purchases_path(package_name)}/products/"
+            f"{quote(product_id, safe='')}/tokens/{quote(purchase_token, safe='')}:consume",
+        )
+
+    async def acknowledge_subscription(
+        self, package_name: str, subscription_id: str, purchase_token: str
+    ) -> None:
+        await self._request(
+            "POST",
+            f"{self._purchases_path(package_name)}/subscriptions/"
+            f"{quote(subscription_id, safe='')}/tokens/{quote(purchase_token, safe='')}:acknowledge",
+            json={},
+        )
+
+    async def get_subscription_v2(
+        self, package_name: str, purchase_token: str
+    ) -> Dict[str, Any]:
+        return await self._request(
+            "GET",
+            f"{self._purchases_path(package_name)}/subscriptionsv2/tokens/"
+            f"{quote(purchase_token, safe='')}",
+        )
+
+
+_client: Optional[GooglePlayClient] = None
+
+
+def get_google_play_client() -> GooglePlayClient:
+    global _client
+    if _client is None:
+        _client = GooglePlayClient()
+    return _client
+
+
+async def close_google_play_client() -> None:
+    if _client is not None:
+        await _client.aclose()
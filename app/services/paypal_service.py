@@ -31,11 +31,18 @@ from app.services.paypal_subscription_service import (
     cancel_subscription_from_paypal,
 )
 from app.services.product_pricing import get_product_info
+from app.services.webhook_intake import (
+    claim_due_webhook_events,
+    dispatch_webhook,
+    initial_attempt_at,
+    mark_webhook_row,
+)
 from core.config import (
     PAYPAL_CLIENT_ID,
     PAYPAL_CLIENT_SECRET,
     PAYPAL_MODE,
     PAYPAL_WEBHOOK_ID,
+    WEBHOOK_RETRY_BATCH_SIZE,
 )
 from models import SubscriptionPlan, UserSubscription
 
@@ -373,6 +380,7 @@ async def record_paypal_webhook_event(
             resource_id=resource_id,
             raw_payload=raw_body.decode("utf-8", errors="replace"),
             livemode=livemode,
+            next_attempt_at=initial_attempt_at(datetime.utcnow()),
         )
         session.add(evt)
         try:
@@ -980,11 +988,12 @@ async def _update_paypal_webhook_event_status(
             result = await session.execute(stmt)
             evt_row = result.scalar_one_or_none()
             if evt_row:
-                evt_row.status = new_status
-                if increment_attempts:
-                    evt_row.attempts += 1
-                if new_status == "processed":
-                    evt_row.processed_at = datetime.utcnow()
+                mark_webhook_row(
+                    evt_row,
+                    new_status == "processed",
+                    increment_attempts=increment_attempts,
+                    now=datetime.utcnow(),
+                )
                 await session.commit()
     except Exception:
         logger.exception(
@@ -994,26 +1003,10 @@ async def _update_paypal_webhook_event_status(
         )
 
 
-async def process_paypal_webhook(
-    db: AsyncSession, event_body: Dict[str, Any], raw_body: bytes
+async def _apply_paypal_webhook(
+    db: AsyncSession, event_id: str, event_type: str, resource: Dict[str, Any]
 ) -> None:
-    """Full webhook processing pipeline."""
-    event_id = event_body.get("id", "")
-    event_type = event_body.get("event_type", "")
-    resource = event_body.get("resource", {})
-    resource_id = resource.get("id")
-
-    is_new = await record_paypal_webhook_event(
-        event_id=event_id,
-        event_type=event_type,
-        resource_id=resource_id,
-        raw_body=raw_body,
-        livemode=event_body.get("resource", {}).get("livemode", False),
-    )
-    if not is_new:
-        logger.info("Duplicate PayPal webhook event %s, skipping", event_id)
-        return
-
+    """Run the handler for an already-recorded event and mark it processed / failed."""
     handler = _EVENT_HANDLERS.get(event_type)
     if not handler:
         logger.info("Unhandled PayPal event type: %s", event_type)
@@ -1030,6 +1023,63 @@ async def process_paypal_webhook(
         logger.exception("PayPal webhook processing failed for event %s", event_id)
 
 
+async def _record_paypal_webhook(event_body: Dict[str, Any], raw_body: bytes) -> bool:
+    return await record_paypal_webhook_event(
+        event_id=event_body.get("id", ""),
+        event_type=event_body.get("event_type", ""),
+        resource_id=event_body.get("resource", {}).get("id"),
+        raw_body=raw_body,
+        livemode=event_body.get("resource", {}).get("livemode", False),
+    )
+
+
+async def process_paypal_webhook(
+    db: AsyncSession, event_body: Dict[str, Any], raw_body: bytes
+) -> None:
+    """Full webhook processing pipeline."""
+    event_id = event_body.get("id", "")
+    if not await _record_paypal_webhook(event_body, raw_body):
+        logger.info("Duplicate PayPal webhook event %s, skipping", event_id)
+        return
+
+    await _apply_paypal_webhook(
+        db, event_id, event_body.get("event_type", ""), event_body.get("resource", {})
+    )
+
+
+def _paypal_partition_key(resource: Dict[str, Any]) -> Optional[str]:
+    """Buyer account (from custom_id) or the subscription/billing agreement id."""
+    custom_id = resource.get("custom_id") or ""
+    if ":" in custom_id:
+        return f"user:{custom_id.split(':', 1)[0]}"
+    return resource.get("billing_agreement_id") or resource.get("id")
+
+
+async def ingest_paypal_webhook(event_body: Dict[str, Any], raw_body: bytes) -> bool:
+    """
+    Fast-ack intake: record the verified event and queue its processing.
+
+    Returns False for duplicates. A crash before the queued job runs leaves the row
+    in "received" for the retry job, which replays it from raw_payload.
+    """
+    event_id = event_body.get("id", "")
+    if not await _record_paypal_webhook(event_body, raw_body):
+        logger.info("Duplicate PayPal webhook event %s, skipping", event_id)
+        return False
+
+    event_type = event_body.get("event_type", "")
+    resource = event_body.get("resource", {})
+
+    async def _process() -> None:
+        from app.db import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            await _apply_paypal_webhook(db, event_id, event_type, resource)
+
+    dispatch_webhook("paypal", _paypal_partition_key(resource), event_id, _process)
+    return True
+
+
 # ---------------------------------------------------------------------------
 # Order status
 # ---------------------------------------------------------------------------
@@ -1068,78 +1118,56 @@ async def get_order_status(
 
 async def retry_failed_paypal_events(db: AsyncSession) -> int:
     """
-    Retry failed or stuck PayPal webhook events.
+    Retry due PayPal webhook events (failed, or stuck in "received").
     Replays from raw_payload first; falls back to PayPal event API.
-    Called by APScheduler every 10 minutes.
-    """
-    now = datetime.utcnow()
-    cutoff_stale = now - timedelta(minutes=5)
-    cutoff_old = now - timedelta(hours=24)
-    max_attempts = 3
-    batch_size = 50
-
-    stmt = (
-        select(PayPalWebhookEvent)
-        .where(
-            PayPalWebhookEvent.attempts < max_attempts,
-            PayPalWebhookEvent.received_at > cutoff_old,
-            or_(
-                PayPalWebhookEvent.status == "failed",
-                (
-                    (PayPalWebhookEvent.status == "received")
-                    & (PayPalWebhookEvent.received_at < cutoff_stale)
-                ),
-            ),
-        )
-        .limit(batch_size)
-    )
-    result = await db.execute(stmt)
-    events = result.scalars().all()
-    event_data = [
-        (e.event_id, e.raw_payload, e.attempts) for e in events
-    ]
 
-    retried = 0
+    Batches are claimed with FOR UPDATE SKIP LOCKED and leased, so several workers
+    can drain the queue in parallel. Failures are rescheduled with backoff until
+    they dead-letter.
+    """
     from app.db import AsyncSessionLocal
 
-    for event_id, raw_payload, current_attempts in event_data:
-        try:
-            # Precedence: raw_payload first, then PayPal API fallback
-            event_body = None
-            if raw_payload:
-                try:
-                    event_body = json.loads(raw_payload)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            if not event_body:
-                fetched = await paypal_client.get_webhook_event(event_id)
-                event_body = fetched
-
-            event_type = event_body.get("event_type", "")
-            resource = event_body.get("resource", {})
-            handler = _EVENT_HANDLERS.get(event_type)
-
-            if handler:
-                async with AsyncSessionLocal() as retry_session:
-                    await handler(retry_session, resource)
-                    await retry_session.commit()
-
-            await _update_paypal_webhook_event_status(
-                event_id, "processed", increment_attempts=True
-            )
-            retried += 1
-            logger.info("Retried PayPal event %s successfully", event_id)
-        except Exception:
-            await _update_paypal_webhook_event_status(
-                event_id, "failed", increment_attempts=True
-            )
-            if current_attempts + 1 >= max_attempts:
-                logger.error(
-                    "PayPal event %s exceeded max retries (%d), needs manual intervention",
-                    event_id,
-                    max_attempts,
+    retried = 0
+    while True:
+        claimed = await claim_due_webhook_events(
+            db, PayPalWebhookEvent, now=datetime.utcnow()
+        )
+        event_data = [(e.event_id, e.raw_payload) for e in claimed]
+
+        for event_id, raw_payload in event_data:
+            try:
+                # Precedence: raw_payload first, then PayPal API fallback
+                event_body = None
+                if raw_payload:
+                    try:
+                        event_body = json.loads(raw_payload)
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+
+                if not event_body:
+                    fetched = await paypal_client.get_webhook_event(event_id)
+                    event_body = fetched
+
+                event_type = event_body.get("event_type", "")
+                resource = event_body.get("resource", {})
+                handler = _EVENT_HANDLERS.get(event_type)
+
+                if handler:
+                    async with AsyncSessionLocal() as retry_session:
+                        await handler(retry_session, resource)
+                        await retry_session.commit()
+
+                await _update_paypal_webhook_event_status(
+                    event_id, "processed", increment_attempts=True
+                )
+                retried += 1
+                logger.info("Retried PayPal event %s successfully", event_id)
+            except Exception:
+                await _update_paypal_webhook_event_status(
+                    event_id, "failed", increment_attempts=True
                 )
-            logger.exception("Retry failed for PayPal event %s", event_id)
+                logger.exception("Retry failed for PayPal event %s", event_id)
+        if len(claimed) < WEBHOOK_RETRY_BATCH_SIZE:
+            break
 
     return retried
@@ -0,0 +1,155 @@
+"""
+In-memory product catalog for IAP / checkout pricing.
+
+Gem packages, avatars, frames, badges and subscription plans are loaded in bulk and
+indexed by product id (subscriptions also by their Apple/Google/Stripe/PayPal ids),
+so price and product-type lookups are dict accesses instead of per-request queries.
+
+The catalog is versioned by `CATALOG_GENERATION`: commits touching any catalog table
+(admin CRUD in `routers.auth.service`, JSON imports, plan edits) bump it, and the
+next lookup in any worker reloads. Workers compare their version with Redis at most
+every `PRODUCT_CATALOG_VERSION_CHECK_SECONDS`; the whole catalog is also reloaded
+after `PRODUCT_CATALOG_MAX_AGE_SECONDS` as a safety net. The store listing snapshots
+(`utils.catalog_snapshot`) are keyed by the same generation.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.products import Avatar, Frame, GemPackageConfig
+from core.config import (
+    PRODUCT_CATALOG_MAX_AGE_SECONDS,
+    PRODUCT_CATALOG_VERSION_CHECK_SECONDS,
+)
+from core.model_events import on_committed_change
+from core.read_models import SharedGeneration
+from models import SubscriptionPlan
+
+logger = logging.getLogger(__name__)
+
+# Badge model import — table may not exist in production
+try:
+    from app.models.products import Badge
+
+    _BADGE_AVAILABLE = True
+except Exception:
+    _BADGE_AVAILABLE = False
+
+CATALOG_TABLES = (
+    "gem_package_config",
+    "avatars",
+    "frames",
+    "badges",
+    "subscription_plans",
+)
+
+_SUBSCRIPTION_ID_FIELDS = (
+    "product_id",
+    "apple_product_id",
+    "google_product_id",
+    "stripe_product_id",
+    "paypal_product_id",
+)
+
+CATALOG_GENERATION = SharedGeneration(
+    "product_catalog:generation", check_seconds=PRODUCT_CATALOG_VERSION_CHECK_SECONDS
+)
+
+_catalog: Optional[Dict[str, Any]] = None
+
+
+def _product_entry(product) -> Dict[str, Any]:
+    return {
+        "price_minor": product.price_minor,
+        "product_type": getattr(product, "product_type", None) or "consumable",
+        "product_name": getattr(product, "description", None) or product.product_id,
+        "gems_amount": getattr(product, "gems_amount", None),
+        "paypal_plan_id": getattr(product, "paypal_plan_id", None),
+    }
+
+
+def _subscription_entry(plan) -> Dict[str, Any]:
+    return {
+        "price_minor": plan.unit_amount_minor,
+        "product_name": plan.name,
+        "plan_id": plan.id,
+        "stripe_price_id": getattr(plan, "stripe_price_id", None),
+        "paypal_plan_id": getattr(plan, "paypal_plan_id", None),
+    }
+
+
+async def _load_badges(db: AsyncSession):
+    global _BADGE_AVAILABLE
+    if not _BADGE_AVAILABLE:
+        return []
+    try:
+        return (await db.execute(select(Badge))).scalars().all()
+    except Exception:
+        # Badge table doesn't exist — rollback to clear failed transaction
+        await db.rollback()
+        _BADGE_AVAILABLE = False
+        logger.warning("Badges table unavailable; catalog loaded without badges")
+        return []
+
+
+async def _load_catalog(db: AsyncSession, version: int) -> Dict[str, Any]:
+    products: Dict[str, Dict[str, Any]] = {}
+    # Later tables never override earlier ones (same precedence as the old
+    # per-table fallback: gems, avatars, frames, badges).
+    for model in (GemPackageConfig, Avatar, Frame):
+        for product in (await db.execute(select(model))).scalars().all():
+            products.setdefault(product.product_id, _product_entry(product))
+    for badge in await _load_badges(db):
+        products.setdefault(badge.product_id, _product_entry(badge))
+
+    subscriptions: Dict[str, Dict[str, Any]] = {}
+    for plan in (await db.execute(select(SubscriptionPlan))).scalars().all():
+        entry = _subscription_entry(plan)
+        for field in _SUBSCRIPTION_ID_FIELDS:
+            value = getattr(plan, field, None)
+            if value:
+                subscriptions.setdefault(value, entry)
+
+    logger.info(
+        "Product catalog v%s loaded: %d products, %d subscription ids",
+        version,
+        len(products),
+        len(subscriptions),
+    )
+    return {
+        "version": version,
+        "loaded_at": time.monotonic(),
+        "products": products,
+        "subscriptions": subscriptions,
+    }
+
+
+async def get_product_catalog(db: AsyncSession) -> Dict[str, Any]:
+    """Return the current catalog (`{"version", "products", "subscriptions"}`), loading if stale."""
+    global _catalog
+    version = CATALOG_GENERATION.current()
+    catalog = _catalog
+    if (
+        catalog is not None
+        and catalog["version"] == version
+        and time.monotonic() - catalog["loaded_at"] < PRODUCT_CATALOG_MAX_AGE_SECONDS
+    ):
+        return catalog
+    catalog = await _load_catalog(db, version)
+    # A commit may have bumped the generation while we were loading; keep the
+    # result for this call but let the next lookup reload.
+    if catalog["version"] == CATALOG_GENERATION.current():
+        _catalog = catalog
+    return catalog
+
+
+def invalidate_product_catalog(_changed: Optional[Set[Any]] = None) -> None:
+    CATALOG_GENERATION.bump()
+
+
+for _table in CATALOG_TABLES:
+    on_committed_change(_table, invalidate_product_catalog)
@@ -1,78 +1,31 @@
 """
-Product Pricing Service - Provides product price lookup from database
+Product Pricing Service - Provides product price lookup from the in-memory product catalog
 """
 
 import logging
 from typing import Any, Dict
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.products import Avatar, Frame, GemPackageConfig
-from models import SubscriptionPlan
+from app.services.product_catalog import get_product_catalog
 
 logger = logging.getLogger(__name__)
 
-# Badge model import — table may not exist in production
-try:
-    from app.models.products import Badge
-
-    _BADGE_AVAILABLE = True
-except Exception:
-    _BADGE_AVAILABLE = False
-
-# Prefix → model mapping for fast-path lookups.
-# DB uses: G001 (gems), A001 (avatars), FR001 (frames), BD001 (badges)
-_PREFIX_MODEL_MAP = {
-    "G": GemPackageConfig,
-    "A": Avatar,
-    "FR": Frame,
-}
-
-
-async def _safe_badge_lookup(db: AsyncSession, product_id: str):
-    """Query the badges table, returning None if table doesn't exist."""
-    if not _BADGE_AVAILABLE:
-        return None
-    try:
-        stmt = select(Badge).where(Badge.product_id == product_id)
-        result = await db.execute(stmt)
-        return result.scalar_one_or_none()
-    except Exception:
-        # Badge table doesn't exist — rollback to clear failed transaction
-        await db.rollback()
-        return None
-
-
-async def _lookup_subscription(db: AsyncSession, product_id: str):
-    """Look up a subscription plan by product_id or platform-specific IDs."""
-    sub_stmt = select(SubscriptionPlan).where(
-        (SubscriptionPlan.product_id == product_id)
-        | (SubscriptionPlan.apple_product_id == product_id)
-        | (SubscriptionPlan.google_product_id == product_id)
-        | (SubscriptionPlan.stripe_product_id == product_id)
-        | (SubscriptionPlan.paypal_product_id == product_id)
-    )
-    sub_result = await db.execute(sub_stmt)
-    return sub_result.scalar_one_or_none()
-
 
-def _resolve_prefix(product_id: str):
-    """Return the model class for a product_id prefix, or None."""
-    # Check longer prefixes first (FR, BD) then single-char (G, A)
-    for prefix, model in _PREFIX_MODEL_MAP.items():
-        if product_id.startswith(prefix):
-            return model
-    return None
+def _not_found(product_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Product ID '{product_id}' not found or has no price set",
+    )
 
 
 async def get_price_minor_for_product_id(db: AsyncSession, product_id: str) -> int:
     """
-    Look up the correct price in cents from the database.
+    Look up the correct price in cents from the product catalog.
 
     Args:
-        db: Async database session
+        db: Async database session (only used when the catalog needs reloading)
         product_id: Product ID (e.g., "A001", "G001", "FR001", "SUB001")
 
     Returns:
@@ -81,47 +34,17 @@ async def get_price_minor_for_product_id(db: AsyncSession, product_id: str) -> i
     Raises:
         HTTPException(400) if product_id is unknown or price_minor is None
     """
-    # Subscription fast path
-    if product_id.startswith("SUB"):
-        sub = await _lookup_subscription(db, product_id)
-        if sub and sub.unit_amount_minor is not None:
-            return sub.unit_amount_minor
-
-    # Badge fast path
-    elif product_id.startswith("BD"):
-        product = await _safe_badge_lookup(db, product_id)
-        if product and product.price_minor is not None:
-            return product.price_minor
-
-    else:
-        # Try prefix-based model lookup
-        model = _resolve_prefix(product_id)
-        if model:
-            stmt = select(model).where(model.product_id == product_id)
-            result = await db.execute(stmt)
-            product = result.scalar_one_or_none()
-            if product and product.price_minor is not None:
-                return product.price_minor
-        else:
-            # Unknown prefix — try all tables
-            for m in (GemPackageConfig, Avatar, Frame):
-                stmt = select(m).where(m.product_id == product_id)
-                result = await db.execute(stmt)
-                product = result.scalar_one_or_none()
-                if product and product.price_minor is not None:
-                    return product.price_minor
-            product = await _safe_badge_lookup(db, product_id)
-            if product and product.price_minor is not None:
-                return product.price_minor
-            # Last resort: subscription by platform ID
-            sub = await _lookup_subscription(db, product_id)
-            if sub and sub.unit_amount_minor is not None:
-                return sub.unit_amount_minor
-
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        detail=f"Product ID '{product_id}' not found or has no price set",
-    )
+    catalog = await get_product_catalog(db)
+    if not product_id.startswith("SUB"):
+        product = catalog["products"].get(product_id)
+        if product and product["price_minor"] is not None:
+            return product["price_minor"]
+    # Subscriptions by product_id or platform-specific IDs
+    sub = catalog["subscriptions"].get(product_id)
+    if sub and sub["price_minor"] is not None:
+        return sub["price_minor"]
+
+    raise _not_found(product_id)
 
 
 async def get_product_info(db: AsyncSession, product_id: str) -> Dict[str, Any]:
@@ -135,81 +58,49 @@ async def get_product_info(db: AsyncSession, product_id: str) -> Dict[str, Any]:
             "product_type": str
         }
     """
-    product = None
-
-    # Subscription fast path
-    if product_id.startswith("SUB"):
-        sub = await _lookup_subscription(db, product_id)
-        if sub:
-            return _build_subscription_response(product_id, sub)
+    catalog = await get_product_catalog(db)
+    product = None if product_id.startswith("SUB") else catalog["products"].get(product_id)
 
-    # Badge fast path
-    elif product_id.startswith("BD"):
-        product = await _safe_badge_lookup(db, product_id)
-
-    else:
-        # Try prefix-based model lookup
-        model = _resolve_prefix(product_id)
-        if model:
-            stmt = select(model).where(model.product_id == product_id)
-            result = await db.execute(stmt)
-            product = result.scalar_one_or_none()
-        else:
-            # Unknown prefix — try all tables
-            for m in (GemPackageConfig, Avatar, Frame):
-                stmt = select(m).where(m.product_id == product_id)
-                result = await db.execute(stmt)
-                product = result.scalar_one_or_none()
-                if product:
-                    break
-            if not product:
-                product = await _safe_badge_lookup(db, product_id)
-
-    if not product or product.price_minor is None:
+    if not product or product["price_minor"] is None:
         # Try subscription plans (by product_id or platform-specific IDs)
-        sub = await _lookup_subscription(db, product_id)
+        sub = catalog["subscriptions"].get(product_id)
         if sub:
             return _build_subscription_response(product_id, sub)
 
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Product ID '{product_id}' not found or has no price set",
-        )
+        raise _not_found(product_id)
 
-    if product.price_minor <= 0:
+    if product["price_minor"] <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Product '{product_id}' has invalid price",
         )
 
-    product_type = getattr(product, "product_type", None) or "consumable"
-
     return {
         "product_id": product_id,
-        "price_minor": product.price_minor,
-        "product_type": product_type,
-        "product_name": getattr(product, "description", None) or product_id,
-        "gems_amount": getattr(product, "gems_amount", None),
+        "price_minor": product["price_minor"],
+        "product_type": product["product_type"],
+        "product_name": product["product_name"],
+        "gems_amount": product["gems_amount"],
         "plan_id": None,
         "stripe_price_id": None,
-        "paypal_plan_id": getattr(product, "paypal_plan_id", None),
+        "paypal_plan_id": product["paypal_plan_id"],
     }
 
 
-def _build_subscription_response(product_id: str, sub_plan) -> Dict[str, Any]:
-    """Build a standardised product-info dict for a SubscriptionPlan."""
-    if sub_plan.unit_amount_minor is None or sub_plan.unit_amount_minor <= 0:
+def _build_subscription_response(product_id: str, sub_plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a standardised product-info dict for a catalog subscription entry."""
+    if sub_plan["price_minor"] is None or sub_plan["price_minor"] <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Product '{product_id}' has invalid price",
         )
     return {
         "product_id": product_id,
-        "price_minor": sub_plan.unit_amount_minor,
+        "price_minor": sub_plan["price_minor"],
         "product_type": "subscription",
-        "product_name": sub_plan.name,
-        "plan_id": sub_plan.id,
-        "stripe_price_id": getattr(sub_plan, "stripe_price_id", None),
-        "paypal_plan_id": getattr(sub_plan, "paypal_plan_id", None),
+        "product_name": sub_plan["product_name"],
+        "plan_id": sub_plan["plan_id"],
+        "stripe_price_id": sub_plan["stripe_price_id"],
+        "paypal_plan_id": sub_plan["paypal_plan_id"],
         "gems_amount": None,
     }
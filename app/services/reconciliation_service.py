@@ -1,114 +1,215 @@
 """Wallet reconciliation service.
 
-Compares User.wallet_balance_minor against the sum of all
-WalletTransaction records to detect drift. Report-only — does not
-auto-correct balances.
+Compares User.wallet_balance_minor against the WalletTransaction ledger to
+detect drift. Report-only — does not auto-correct balances.
+
+Users are walked with keyset pagination on ``account_id``. Each user has a
+checkpoint holding the ledger sum folded up to a transaction id, so a run only
+reads ledger rows newer than the checkpoint. Rows younger than the settle
+window are counted but not folded: ids are allocated before commit, so a slow
+transaction can land below an id that was already visible. Mismatches are
+written to ``wallet_reconciliation_mismatches`` page by page, tagged with the
+run id.
 """
 
 from __future__ import annotations
 
 import logging
+import uuid
+from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-from sqlalchemy import func, select, text
+from sqlalchemy import case, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
-from app.models.wallet import WalletTransaction
+from app.models.wallet import (
+    WalletReconciliationCheckpoint,
+    WalletReconciliationMismatch,
+    WalletTransaction,
+)
+from core.config import (
+    WALLET_RECONCILIATION_BATCH_SIZE,
+    WALLET_RECONCILIATION_MISMATCH_SAMPLE,
+    WALLET_RECONCILIATION_SETTLE_SECONDS,
+)
 
 logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 500
+BATCH_SIZE = WALLET_RECONCILIATION_BATCH_SIZE
 
 
-async def run_wallet_reconciliation(db: AsyncSession) -> Dict[str, Any]:
-    """Run a full wallet reconciliation.
+async def _settled_watermark(db: AsyncSession, now: datetime) -> int:
+    """Highest ledger id old enough to fold into checkpoints (0 when none)."""
+    cutoff = now - timedelta(seconds=WALLET_RECONCILIATION_SETTLE_SECONDS)
+    result = await db.execute(
+        select(func.max(WalletTransaction.id)).where(WalletTransaction.created_at < cutoff)
+    )
+    return int(result.scalar() or 0)
+
+
+async def _reconcile_page(
+    db: AsyncSession,
+    users,
+    *,
+    run_id: str,
+    watermark: int,
+    full: bool,
+    now: datetime,
+) -> List[Dict[str, Any]]:
+    user_ids = [u.account_id for u in users]
+
+    checkpoint_result = await db.execute(
+        select(
+            WalletReconciliationCheckpoint.user_id,
+            WalletReconciliationCheckpoint.last_transaction_id,
+            WalletReconciliationCheckpoint.ledger_sum_minor,
+        ).where(WalletReconciliationCheckpoint.user_id.in_(user_ids))
+    )
+    stored = {row.user_id: row for row in checkpoint_result.all()}
+    checkpoints = {} if full else stored
+
+    folded = WalletTransaction.id <= watermark
+    delta_stmt = select(
+        WalletTransaction.user_id,
+        func.coalesce(func.sum(WalletTransaction.amount_minor), 0).label("delta_all"),
+        func.coalesce(
+            func.sum(case((folded, WalletTransaction.amount_minor), else_=0)), 0
+        ).label("delta_folded"),
+        func.max(case((folded, WalletTransaction.id))).label("folded_max_id"),
+    ).where(WalletTransaction.user_id.in_(user_ids))
+    if not full:
+        # Range scan on (user_id, id) past each user's checkpoint.
+        delta_stmt = delta_stmt.outerjoin(
+            WalletReconciliationCheckpoint,
+            WalletReconciliationCheckpoint.user_id == WalletTransaction.user_id,
+        ).where(
+            WalletTransaction.id
+            > func.coalesce(WalletReconciliationCheckpoint.last_transaction_id, 0)
+        )
+    delta_result = await db.execute(delta_stmt.group_by(WalletTransaction.user_id))
+    deltas = {row.user_id: row for row in delta_result.all()}
 
-    Compares each user's ``wallet_balance_minor`` against
-    ``SUM(wallet_transactions.amount_minor)``.
+    mismatches: List[Dict[str, Any]] = []
+    checkpoint_updates: List[Dict[str, Any]] = []
+    checkpoint_inserts: List[Dict[str, Any]] = []
+    for user in users:
+        uid = user.account_id
+        checkpoint = checkpoints.get(uid)
+        base_sum = int(checkpoint.ledger_sum_minor) if checkpoint else 0
+        delta = deltas.get(uid)
+
+        actual = user.wallet_balance_minor or 0
+        expected = base_sum + (int(delta.delta_all) if delta else 0)
+        if actual != expected:
+            mismatches.append({
+                "user_id": uid,
+                "expected": expected,
+                "actual": actual,
+                "diff": actual - expected,
+            })
+
+        if delta is None or delta.folded_max_id is None:
+            continue
+        values = {
+            "user_id": uid,
+            "last_transaction_id": int(delta.folded_max_id),
+            "ledger_sum_minor": base_sum + int(delta.delta_folded),
+            "updated_at": now,
+        }
+        if uid in stored:
+            checkpoint_updates.append(values)
+        else:
+            checkpoint_inserts.append(values)
+
+    if checkpoint_updates:
+        await db.execute(update(WalletReconciliationCheckpoint), checkpoint_updates)
+    if checkpoint_inserts:
+        await db.execute(insert(WalletReconciliationCheckpoint), checkpoint_inserts)
+    if mismatches:
+        await db.execute(
+            insert(WalletReconciliationMismatch),
+            [
+                {
+                    "run_id": run_id,
+                    "user_id": m["user_id"],
+                    "expected_minor": m["expected"],
+                    "actual_minor": m["actual"],
+                    "diff_minor": m["diff"],
+                    "detected_at": now,
+                }
+                for m in mismatches
+            ],
+        )
+        for m in mismatches:
+            logger.warning(
+                "Wallet mismatch: run=%s user=%s expected=%s actual=%s diff=%s",
+                run_id, m["user_id"], m["expected"], m["actual"], m["diff"],
+            )
+    await db.commit()
+    return mismatches
+
+
+async def run_wallet_reconciliation(
+    db: AsyncSession, *, full: bool = False
+) -> Dict[str, Any]:
+    """Run a wallet reconciliation.
+
+    Compares each user's ``wallet_balance_minor`` against their checkpointed
+    ledger sum plus any newer ``wallet_transactions`` rows. ``full=True``
+    ignores existing checkpoints and rebuilds them from the whole ledger.
 
     Returns:
         {
+            "run_id": str,
             "checked": int,
             "matched": int,
-            "mismatches": [{"user_id", "expected", "actual", "diff"}],
+            "mismatch_count": int,
+            "mismatches": [{"user_id", "expected", "actual", "diff"}],  # capped sample
         }
     """
-    # Compute expected balances from the transaction ledger
-    ledger_stmt = (
-        select(
-            WalletTransaction.user_id,
-            func.coalesce(func.sum(WalletTransaction.amount_minor), 0).label("expected"),
-        )
-        .group_by(WalletTransaction.user_id)
-    )
+    run_id = uuid.uuid4().hex
+    now = datetime.utcnow()
+    watermark = await _settled_watermark(db, now)
 
-    mismatches: List[Dict[str, Any]] = []
+    sample: List[Dict[str, Any]] = []
     checked = 0
-    matched = 0
+    mismatch_count = 0
+    last_account_id = None
 
-    # Stream through users in batches
-    offset = 0
     while True:
-        user_stmt = (
-            select(User.account_id, User.wallet_balance_minor)
-            .order_by(User.account_id)
-            .offset(offset)
-            .limit(BATCH_SIZE)
+        user_stmt = select(User.account_id, User.wallet_balance_minor)
+        if last_account_id is not None:
+            user_stmt = user_stmt.where(User.account_id > last_account_id)
+        user_result = await db.execute(
+            user_stmt.order_by(User.account_id).limit(BATCH_SIZE)
         )
-        user_result = await db.execute(user_stmt)
         users = user_result.all()
-
         if not users:
             break
 
-        user_ids = [u.account_id for u in users]
-        user_balances = {u.account_id: (u.wallet_balance_minor or 0) for u in users}
-
-        # Get ledger sums for this batch
-        batch_ledger_stmt = (
-            select(
-                WalletTransaction.user_id,
-                func.coalesce(func.sum(WalletTransaction.amount_minor), 0).label("expected"),
-            )
-            .where(WalletTransaction.user_id.in_(user_ids))
-            .group_by(WalletTransaction.user_id)
+        page_mismatches = await _reconcile_page(
+            db, users, run_id=run_id, watermark=watermark, full=full, now=now
         )
-        ledger_result = await db.execute(batch_ledger_stmt)
-        ledger_sums = {row.user_id: int(row.expected) for row in ledger_result.all()}
-
-        for uid in user_ids:
-            actual = user_balances[uid]
-            expected = ledger_sums.get(uid, 0)
-            checked += 1
-
-            if actual != expected:
-                diff = actual - expected
-                mismatches.append({
-                    "user_id": uid,
-                    "expected": expected,
-                    "actual": actual,
-                    "diff": diff,
-                })
-                logger.warning(
-                    "Wallet mismatch: user=%s expected=%s actual=%s diff=%s",
-                    uid, expected, actual, diff,
-                )
-            else:
-                matched += 1
-
-        offset += BATCH_SIZE
+        checked += len(users)
+        mismatch_count += len(page_mismatches)
+        room = WALLET_RECONCILIATION_MISMATCH_SAMPLE - len(sample)
+        if room > 0:
+            sample.extend(page_mismatches[:room])
+        last_account_id = users[-1].account_id
 
     summary = {
+        "run_id": run_id,
         "checked": checked,
-        "matched": matched,
-        "mismatches": mismatches,
+        "matched": checked - mismatch_count,
+        "mismatch_count": mismatch_count,
+        "mismatches": sample,
     }
 
-    if mismatches:
+    if mismatch_count:
         logger.error(
-            "Wallet reconciliation found %d mismatches out of %d users",
-            len(mismatches), checked,
+            "Wallet reconciliation %s found %d mismatches out of %d users",
+            run_id, mismatch_count, checked,
         )
     else:
         logger.info("Wallet reconciliation passed: %d users checked, all matched", checked)
@@ -7,12 +7,12 @@ Credit units: gems (user.gems), NOT wallet cents (wallet_balance_minor).
 
 import logging
 import math
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, Optional
 
 import stripe
 from fastapi import HTTPException, status
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -25,11 +25,18 @@ from app.services.stripe_subscription_service import (
     activate_subscription_from_stripe,
     cancel_subscription_from_stripe,
 )
+from app.services.webhook_intake import (
+    claim_due_webhook_events,
+    dispatch_webhook,
+    initial_attempt_at,
+    mark_webhook_row,
+)
 from core.config import (
     STRIPE_CANCEL_URL,
     STRIPE_SECRET_KEY,
     STRIPE_SUCCESS_URL,
     STRIPE_WEBHOOK_SECRET,
+    WEBHOOK_RETRY_BATCH_SIZE,
 )
 from models import SubscriptionPlan
 
@@ -188,6 +195,7 @@ async def record_webhook_event(
             event_type=event.type,
             stripe_object_id=getattr(event.data.object, "id", None),
             livemode=event.livemode,
+            next_attempt_at=initial_attempt_at(datetime.utcnow()),
         )
         session.add(evt)
         try:
@@ -567,6 +575,20 @@ async def _process_event(db: AsyncSession, event: stripe.Event) -> None:
         await handler(db, event.data.object)
 
 
+async def _apply_recorded_event(db: AsyncSession, event: stripe.Event) -> None:
+    """Run handlers for an already-recorded event and mark it processed / failed."""
+    try:
+        await _process_event(db, event)
+        await db.commit()
+        # Mark processed in separate session (event row is in a different transaction)
+        await _update_webhook_event_status(event.id, "processed")
+    except Exception:
+        await db.rollback()
+        # Don't increment attempts here — retries do that, so max_attempts=3 means 3 retries
+        await _update_webhook_event_status(event.id, "failed")
+        logger.exception("Webhook processing failed for event %s", event.id)
+
+
 async def process_webhook_event(db: AsyncSession, event: stripe.Event) -> None:
     """
     Full webhook processing pipeline (Section 7a).
@@ -580,16 +602,40 @@ async def process_webhook_event(db: AsyncSession, event: stripe.Event) -> None:
         logger.info("Duplicate webhook event %s, skipping", event.id)
         return
 
-    try:
-        await _process_event(db, event)
-        await db.commit()
-        # Mark processed in separate session (event row is in a different transaction)
-        await _update_webhook_event_status(event.id, "processed")
-    except Exception:
-        await db.rollback()
-        # Don't increment attempts here — retries do that, so max_attempts=3 means 3 retries
-        await _update_webhook_event_status(event.id, "failed")
-        logger.exception("Webhook processing failed for event %s", event.id)
+    await _apply_recorded_event(db, event)
+
+
+def _webhook_partition_key(event: stripe.Event) -> Optional[str]:
+    """Customer (or subscription) the event belongs to, so its events apply in order."""
+    obj = event.data.object
+    for attr in ("customer", "subscription"):
+        value = getattr(obj, attr, None)
+        if value:
+            return value if isinstance(value, str) else getattr(value, "id", None)
+    return getattr(obj, "id", None)
+
+
+async def ingest_webhook_event(event: stripe.Event) -> bool:
+    """
+    Fast-ack intake: record the verified event and queue its processing.
+
+    Returns False for duplicates. Processing runs on the shared webhook worker pool
+    in its own session; a crash before it runs leaves the row in "received" for the
+    retry job.
+    """
+    is_new = await record_webhook_event(event)
+    if not is_new:
+        logger.info("Duplicate webhook event %s, skipping", event.id)
+        return False
+
+    async def _process() -> None:
+        from app.db import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            await _apply_recorded_event(db, event)
+
+    dispatch_webhook("stripe", _webhook_partition_key(event), event.id, _process)
+    return True
 
 
 async def _update_webhook_event_status(
@@ -606,11 +652,12 @@ async def _update_webhook_event_status(
             result = await session.execute(stmt)
             evt_row = result.scalar_one_or_none()
             if evt_row:
-                evt_row.status = new_status
-                if increment_attempts:
-                    evt_row.attempts += 1
-                if new_status == "processed":
-                    evt_row.processed_at = datetime.utcnow()
+                mark_webhook_row(
+                    evt_row,
+                    new_status == "processed",
+                    increment_attempts=increment_attempts,
+                    now=datetime.utcnow(),
+                )
                 await session.commit()
     except Exception:
         logger.exception(
@@ -620,66 +667,43 @@ async def _update_webhook_event_status(
 
 async def retry_failed_stripe_events(db: AsyncSession) -> int:
     """
-    Retry failed or stuck webhook events. Returns count of events retried.
-    Called by APScheduler every 10 minutes.
-    """
-    now = datetime.utcnow()
-    cutoff_stale = now - timedelta(minutes=5)
-    cutoff_old = now - timedelta(hours=24)
-    max_attempts = 3
-    batch_size = 50
-
-    stmt = (
-        select(StripeWebhookEvent)
-        .where(
-            StripeWebhookEvent.attempts < max_attempts,
-            StripeWebhookEvent.received_at > cutoff_old,
-            or_(
-                StripeWebhookEvent.status == "failed",
-                # Stuck in "received" for > 5 min = likely crashed
-                (
-                    (StripeWebhookEvent.status == "received")
-                    & (StripeWebhookEvent.received_at < cutoff_stale)
-                ),
-            ),
-        )
-        .limit(batch_size)
-    )
-    result = await db.execute(stmt)
-    events = result.scalars().all()
-    # Detach from session before processing (each retry uses its own session)
-    event_ids = [(e.event_id, e.attempts) for e in events]
+    Retry due webhook events (failed, or stuck in "received"). Returns count of
+    events retried successfully.
 
-    retried = 0
+    Batches are claimed with FOR UPDATE SKIP LOCKED and leased, so several workers
+    can drain the queue in parallel. Failures are rescheduled with backoff until
+    they dead-letter.
+    """
     from app.db import AsyncSessionLocal
 
-    for event_id, current_attempts in event_ids:
-        try:
-            stripe_event = stripe.Event.retrieve(
-                event_id, api_key=STRIPE_SECRET_KEY
-            )
+    retried = 0
+    while True:
+        claimed = await claim_due_webhook_events(
+            db, StripeWebhookEvent, now=datetime.utcnow()
+        )
+        for event_id in [e.event_id for e in claimed]:
+            try:
+                stripe_event = stripe.Event.retrieve(
+                    event_id, api_key=STRIPE_SECRET_KEY
+                )
 
-            handler = _EVENT_HANDLERS.get(stripe_event.type)
-            if handler:
-                async with AsyncSessionLocal() as retry_session:
-                    await handler(retry_session, stripe_event.data.object)
-                    await retry_session.commit()
+                handler = _EVENT_HANDLERS.get(stripe_event.type)
+                if handler:
+                    async with AsyncSessionLocal() as retry_session:
+                        await handler(retry_session, stripe_event.data.object)
+                        await retry_session.commit()
 
-            await _update_webhook_event_status(
-                event_id, "processed", increment_attempts=True
-            )
-            retried += 1
-            logger.info("Retried event %s successfully", event_id)
-        except Exception:
-            await _update_webhook_event_status(
-                event_id, "failed", increment_attempts=True
-            )
-            if current_attempts + 1 >= max_attempts:
-                logger.error(
-                    "Event %s exceeded max retries (%d), needs manual intervention",
-                    event_id,
-                    max_attempts,
+                await _update_webhook_event_status(
+                    event_id, "processed", increment_attempts=True
+                )
+                retried += 1
+                logger.info("Retried event %s successfully", event_id)
+            except Exception:
+                await _update_webhook_event_status(
+                    event_id, "failed", increment_attempts=True
                 )
-            logger.exception("Retry failed for event %s", event_id)
+                logger.exception("Retry failed for event %s", event_id)
+        if len(claimed) < WEBHOOK_RETRY_BATCH_SIZE:
+            break
 
     return retried
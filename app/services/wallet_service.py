@@ -4,16 +4,30 @@ Wallet Service - Handles wallet balance adjustments and queries
 
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Sequence
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.models.wallet import WalletTransaction
+from core.model_events import run_after_commit
+from utils.wallet_balance_snapshot import (
+    get_wallet_snapshot_async,
+    invalidate_wallet_snapshots,
+)
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_CURRENCIES = ["usd", "eur", "gbp", "cad", "aud"]
+
+
+class WalletCredit(NamedTuple):
+    user_id: int
+    amount_minor: int
+    idempotency_key: str
+
 
 async def adjust_wallet_balance(
     db: AsyncSession,
@@ -59,7 +73,7 @@ async def adjust_wallet_balance(
     currency = currency.lower()
 
     # Validate currency is supported
-    supported_currencies = ["usd", "eur", "gbp", "cad", "aud"]
+    supported_currencies = SUPPORTED_CURRENCIES
     if currency not in supported_currencies:
         raise ValueError(
             f"Unsupported currency: {currency}. Supported: {', '.join(supported_currencies)}"
@@ -206,6 +220,7 @@ async def get_wallet_balance(
     """
     Get wallet balance for a user in a specific currency.
 
+    Served from the wallet balance read model (`utils/wallet_balance_snapshot.py`).
     Validates currency code and prevents cross-currency operations.
 
     Args:
@@ -226,17 +241,166 @@ async def get_wallet_balance(
     currency = currency.lower()
 
     # Supported currencies (add more as needed)
-    supported_currencies = ["usd", "eur", "gbp", "cad", "aud"]
+    supported_currencies = SUPPORTED_CURRENCIES
     if currency not in supported_currencies:
         raise ValueError(
             f"Unsupported currency: {currency}. Supported: {', '.join(supported_currencies)}"
         )
 
-    stmt = select(User).where(User.account_id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-
-    if user and user.wallet_balance_minor is not None:
-        return user.wallet_balance_minor
+    snapshot = await get_wallet_snapshot_async(db, user_id)
+    if snapshot and snapshot.balance_minor is not None:
+        return snapshot.balance_minor
 
     return 0
+
+
+async def credit_wallets_batch(
+    db: AsyncSession,
+    credits: Sequence[WalletCredit],
+    *,
+    currency: str = "usd",
+    kind: str = "deposit",
+    external_ref_type: Optional[str] = None,
+    external_ref_id: Optional[str] = None,
+    livemode: bool = False,
+) -> Dict[str, object]:
+    """
+    Credit many wallets in one transaction (e.g. all payouts of a draw).
+
+    Each credit's idempotency key is stored as the ledger ``event_id``, the same
+    column ``adjust_wallet_balance`` dedupes on, so retries of either path are safe.
+    Existing keys are filtered with one query, user rows are locked in account_id
+    order (so concurrent batches cannot deadlock), ledger rows are inserted in bulk
+    with ``ON CONFLICT (event_id) DO NOTHING`` and balances are bumped with a single
+    UPDATE covering only the rows actually inserted, so a key committed concurrently
+    by another transaction is skipped rather than credited twice. Does not commit.
+
+    Args:
+        db: Async database session
+        credits: (user_id, amount_minor, idempotency_key) entries; amounts must be positive
+        currency: Currency code shared by every credit
+        kind: Ledger entry kind
+        external_ref_type: Type of external reference
+        external_ref_id: External reference ID shared by the batch
+        livemode: Whether this is a live mode transaction
+
+    Returns:
+        {"credited": [idempotency keys applied], "skipped": [duplicate keys],
+         "balances": {user_id: new balance}}
+
+    Raises:
+        ValueError: If currency is invalid, an amount is not positive, a user is
+            missing or a wallet is in another currency
+    """
+    currency = (currency or "").lower()
+    if currency not in SUPPORTED_CURRENCIES:
+        raise ValueError(
+            f"Unsupported currency: {currency}. Supported: {', '.join(SUPPORTED_CURRENCIES)}"
+        )
+
+    pending: Dict[str, WalletCredit] = {}
+    skipped: List[str] = []
+    for credit in credits:
+        if credit.amount_minor <= 0:
+            raise ValueError(f"Credit amount must be positive: {credit}")
+        if credit.idempotency_key in pending:
+            skipped.append(credit.idempotency_key)
+        else:
+            pending[credit.idempotency_key] = credit
+    if not pending:
+        return {"credited": [], "skipped": skipped, "balances": {}}
+
+    existing = await db.execute(
+        select(WalletTransaction.event_id).where(
+            WalletTransaction.event_id.in_(list(pending))
+        )
+    )
+    for key in existing.scalars().all():
+        skipped.append(key)
+        pending.pop(key, None)
+    if not pending:
+        logger.info("Wallet credit batch: all %d credits already applied", len(skipped))
+        return {"credited": [], "skipped": skipped, "balances": {}}
+
+    user_ids = {credit.user_id for credit in pending.values()}
+    locked = await db.execute(
+        select(User.account_id, User.wallet_currency)
+        .where(User.account_id.in_(list(user_ids)))
+        .order_by(User.account_id)
+        .with_for_update()
+    )
+    wallets = {row.account_id: (row.wallet_currency or "usd").lower() for row in locked.all()}
+    missing = sorted(user_ids - set(wallets))
+    if missing:
+        raise ValueError(f"Users not found: {missing}")
+    mismatched = sorted(uid for uid, cur in wallets.items() if cur != currency)
+    if mismatched:
+        raise ValueError(
+            f"Currency mismatch for users {mismatched}: operation is for {currency}. "
+            "Cross-currency operations are not allowed."
+        )
+
+    now = datetime.now(timezone.utc)
+    connection = await db.connection()
+    dialect_insert = (
+        postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    )
+    inserted = await db.execute(
+        dialect_insert(WalletTransaction)
+        .values(
+            [
+                {
+                    "user_id": credit.user_id,
+                    "amount_minor": credit.amount_minor,
+                    "currency": currency,
+                    "kind": kind,
+                    "external_ref_type": external_ref_type,
+                    "external_ref_id": external_ref_id,
+                    "event_id": credit.idempotency_key,
+                    "livemode": livemode,
+                    "created_at": now,
+                }
+                for credit in pending.values()
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["event_id"])
+        .returning(WalletTransaction.event_id)
+    )
+    # Keys committed by a concurrent transaction since the check above.
+    applied = set(inserted.scalars().all())
+    for key in list(pending):
+        if key not in applied:
+            skipped.append(key)
+            del pending[key]
+    if not pending:
+        logger.info("Wallet credit batch: all %d credits already applied", len(skipped))
+        return {"credited": [], "skipped": skipped, "balances": {}}
+
+    deltas: Dict[int, int] = {}
+    for credit in pending.values():
+        deltas[credit.user_id] = deltas.get(credit.user_id, 0) + credit.amount_minor
+
+    result = await db.execute(
+        update(User)
+        .where(User.account_id.in_(list(deltas)))
+        .values(
+            wallet_balance_minor=func.coalesce(User.wallet_balance_minor, 0)
+            + case(deltas, value=User.account_id, else_=0),
+            last_wallet_update=now,
+        )
+        .returning(User.account_id, User.wallet_balance_minor)
+        .execution_options(synchronize_session="fetch")
+    )
+    balances = {row.account_id: row.wallet_balance_minor for row in result.all()}
+    # Core UPDATE bypasses the ORM change hooks; refresh the read model on commit.
+    run_after_commit(db, invalidate_wallet_snapshots, set(balances))
+
+    logger.info(
+        "Wallet credit batch: credited=%d users=%d skipped=%d total_minor=%d kind=%s",
+        len(pending),
+        len(deltas),
+        len(skipped),
+        sum(deltas.values()),
+        kind,
+    )
+    return {"credited": list(pending), "skipped": skipped, "balances": balances}
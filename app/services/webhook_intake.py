@@ -0,0 +1,123 @@
+"""
+Shared worker pool for payment webhooks (Stripe, PayPal, Apple, Google).
+
+Webhook endpoints verify the signature, persist the raw event idempotently and return
+200 straight away; the business handling runs here afterwards. Events are partitioned
+by customer/subscription key so events for the same purchase are applied in arrival
+order. An event that cannot be queued (partition full, process restarted) stays in
+its "received" state and is picked up by the provider retry jobs.
+
+Retry scheduling is shared too: every unfinished event row carries `next_attempt_at`
+(set on receipt to the stale window, then pushed out with jittered exponential backoff
+after each failure). Retry jobs claim due rows with `FOR UPDATE SKIP LOCKED`
+and lease them, so several workers can drain the queue in parallel. After
+`WEBHOOK_RETRY_MAX_ATTEMPTS` failed retries an event moves to "dead_letter".
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import (
+    WEBHOOK_RETRY_BACKOFF_BASE_SECONDS,
+    WEBHOOK_RETRY_BACKOFF_MAX_SECONDS,
+    WEBHOOK_RETRY_BATCH_SIZE,
+    WEBHOOK_RETRY_LEASE_SECONDS,
+    WEBHOOK_RETRY_MAX_ATTEMPTS,
+    WEBHOOK_RETRY_STALE_SECONDS,
+    WEBHOOK_WORKER_PARTITIONS,
+    WEBHOOK_WORKER_QUEUE_SIZE,
+)
+from core.partitioned_dispatcher import Job, PartitionedDispatcher
+
+logger = logging.getLogger(__name__)
+
+webhook_dispatcher = PartitionedDispatcher(
+    "payments-webhooks",
+    partitions=WEBHOOK_WORKER_PARTITIONS,
+    max_queue_size=WEBHOOK_WORKER_QUEUE_SIZE,
+)
+
+
+def dispatch_webhook(
+    provider: str, partition_key: Optional[str], event_id: str, job: Job
+) -> bool:
+    """Queue processing of a persisted webhook event; ordered per `partition_key`."""
+    key = f"{provider}:{partition_key or event_id}"
+    queued = webhook_dispatcher.submit(key, job)
+    if not queued:
+        logger.warning("%s webhook %s left for the retry job", provider, event_id)
+    return queued
+
+
+def initial_attempt_at(now: datetime) -> datetime:
+    """When a just-received event counts as stuck if no worker has finished it."""
+    return now + timedelta(seconds=WEBHOOK_RETRY_STALE_SECONDS)
+
+
+def backoff_delay_seconds(attempts: int) -> float:
+    """Jittered exponential backoff: uniform between the base and base * 2**attempts (capped)."""
+    ceiling = max(
+        WEBHOOK_RETRY_BACKOFF_BASE_SECONDS,
+        min(
+            WEBHOOK_RETRY_BACKOFF_MAX_SECONDS,
+            WEBHOOK_RETRY_BACKOFF_BASE_SECONDS * (2 ** max(attempts, 0)),
+        ),
+    )
+    return random.uniform(WEBHOOK_RETRY_BACKOFF_BASE_SECONDS, ceiling)
+
+
+def mark_webhook_row(
+    row: Any, succeeded: bool, *, increment_attempts: bool, now: datetime
+) -> None:
+    """Move an event row to processed, failed (with its next attempt) or dead_letter."""
+    if increment_attempts:
+        row.attempts = (row.attempts or 0) + 1
+    if succeeded:
+        row.status = "processed"
+        row.processed_at = now
+        row.next_attempt_at = None
+    elif (row.attempts or 0) >= WEBHOOK_RETRY_MAX_ATTEMPTS:
+        row.status = "dead_letter"
+        row.next_attempt_at = None
+        logger.error(
+            "%s %s exceeded max retries (%d), moved to dead_letter",
+            row.__tablename__,
+            row.event_id,
+            WEBHOOK_RETRY_MAX_ATTEMPTS,
+        )
+    else:
+        row.status = "failed"
+        row.next_attempt_at = now + timedelta(
+            seconds=backoff_delay_seconds(row.attempts or 0)
+        )
+
+
+async def claim_due_webhook_events(
+    db: AsyncSession, model, *, now: datetime, batch_size: Optional[int] = None
+) -> List[Any]:
+    """
+    Lock up to `batch_size` due events (skipping rows other workers hold), lease them
+    and commit. Returns the claimed rows; the lease keeps them out of other claims
+    until the caller records the outcome.
+    """
+    stmt = (
+        select(model)
+        .where(
+            model.next_attempt_at <= now,
+            model.status.in_(("received", "failed")),
+        )
+        .order_by(model.next_attempt_at)
+        .limit(batch_size or WEBHOOK_RETRY_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    rows = (await db.execute(stmt)).scalars().all()
+    lease_until = now + timedelta(seconds=WEBHOOK_RETRY_LEASE_SECONDS)
+    for row in rows:
+        row.next_attempt_at = lease_until
+    await db.commit()
+    return list(rows)
@@ -7,6 +7,7 @@ introducing a hard dependency on Redis.
 from __future__ import annotations
 
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from threading import Lock
 from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
@@ -54,5 +55,59 @@ class TTLCache:
         return value
 
 
+class LRUCache:
+    """Size-bounded LRU with a per-entry expiry time.
+
+    Expired entries are dropped when read; when full, least recently used entries are
+    evicted one at a time (never the whole cache). Hit/miss/eviction counters are kept
+    for monitoring; dropping an already-expired entry is not counted as an eviction.
+    """
+
+    def __init__(self, *, max_keys: int = 10_000):
+        self._max_keys = max(int(max_keys), 1)
+        self._lock = Lock()
+        self._data: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any, *, now: Optional[float] = None) -> Optional[Any]:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Any, value: Any, *, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._data[key] = _Entry(value=value, expires_at=expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_keys:
+                _cold_key, cold = self._data.popitem(last=False)
+                if cold.expires_at > now:
+                    self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self._max_keys,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
 default_cache = TTLCache()
 
@@ -42,6 +42,17 @@ DEBUG = ENVIRONMENT == "development"
 
 # Database settings
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Connection budget for the whole process, split between the sync and async engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_ASYNC_POOL_SHARE = float(
+    os.getenv("DB_ASYNC_POOL_SHARE", "0.5")
+)  # Fraction of the budget given to the asyncpg engine
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "300"))
+DB_PGBOUNCER = (
+    os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+)  # PgBouncer in transaction mode: no server-side prepared statements
 
 # IAP (In-App Purchase) settings
 APPLE_IAP_SHARED_SECRET = os.getenv("APPLE_IAP_SHARED_SECRET", "")
@@ -52,6 +63,7 @@ APPLE_ROOT_CERT_PATHS = [
     for p in os.getenv("APPLE_ROOT_CERT_PATHS", "").split(",")
     if p.strip()
 ]
+APPLE_VERIFIED_CHAIN_CACHE_SIZE = int(os.getenv("APPLE_VERIFIED_CHAIN_CACHE_SIZE", "256"))
 GOOGLE_IAP_SERVICE_ACCOUNT_JSON = os.getenv("GOOGLE_IAP_SERVICE_ACCOUNT_JSON", "")
 GOOGLE_IAP_PACKAGE_NAME = os.getenv("GOOGLE_IAP_PACKAGE_NAME", "com.triviapay.app")
 GOOGLE_IAP_REFUND_NOTIFICATION_TYPES = [
@@ -59,6 +71,12 @@ GOOGLE_IAP_REFUND_NOTIFICATION_TYPES = [
     for x in os.getenv("GOOGLE_IAP_REFUND_NOTIFICATION_TYPES", "2,3,4,5").split(",")
     if x.strip().isdigit()
 ]
+GOOGLE_PLAY_API_BASE_URL = os.getenv(
+    "GOOGLE_PLAY_API_BASE_URL", "https://androidpublisher.googleapis.com"
+)
+GOOGLE_PLAY_MAX_CONCURRENCY = int(os.getenv("GOOGLE_PLAY_MAX_CONCURRENCY", "32"))
+GOOGLE_PLAY_MAX_RETRIES = int(os.getenv("GOOGLE_PLAY_MAX_RETRIES", "3"))
+GOOGLE_PLAY_TIMEOUT_SECONDS = float(os.getenv("GOOGLE_PLAY_TIMEOUT_SECONDS", "10"))
 
 # Google Pub/Sub webhook authentication
 GOOGLE_PUBSUB_VERIFY_ENABLED = (
@@ -130,6 +148,10 @@ AWS_PROFILE_PIC_BUCKET = os.getenv(
     "AWS_PROFILE_PIC_BUCKET", "triviapics"
 )  # S3 bucket for custom profile pictures
 
+# Image Renditions (thumbnails for profile pictures, avatars and frames)
+IMAGE_PIPELINE_MAX_WORKERS = int(os.getenv("IMAGE_PIPELINE_MAX_WORKERS", "2"))
+IMAGE_RENDITION_WEBP_QUALITY = int(os.getenv("IMAGE_RENDITION_WEBP_QUALITY", "80"))
+
 # Referral Settings
 REFERRAL_APP_LINK = os.getenv(
     "REFERRAL_APP_LINK", "https://triviapay.app"
@@ -249,6 +271,30 @@ PRIVATE_CHAT_PROFILE_CACHE_SECONDS = int(
 FREE_MODE_LEADERBOARD_CACHE_SECONDS = int(
     os.getenv("FREE_MODE_LEADERBOARD_CACHE_SECONDS", "15")
 )
+FREE_MODE_QUESTION_PACK_CACHE_SECONDS = int(
+    os.getenv("FREE_MODE_QUESTION_PACK_CACHE_SECONDS", "300")
+)
+FREE_MODE_QUESTION_PACK_VERSION_CHECK_SECONDS = float(
+    os.getenv("FREE_MODE_QUESTION_PACK_VERSION_CHECK_SECONDS", "2")
+)  # How often a worker compares its question pack version with Redis
+DAILY_USER_STATE_CACHE_SECONDS = int(
+    os.getenv("DAILY_USER_STATE_CACHE_SECONDS", "60")
+)  # Upper bound; submissions and subscription changes invalidate earlier
+DAILY_USER_STATE_VERSION_CHECK_SECONDS = float(
+    os.getenv("DAILY_USER_STATE_VERSION_CHECK_SECONDS", "2")
+)  # How often a worker re-reads the all-users generation from Redis
+TRIVIA_REMINDER_PAGE_SIZE = int(
+    os.getenv("TRIVIA_REMINDER_PAGE_SIZE", "2000")
+)  # Recipients per page; one OneSignal batch per page (API max 2000)
+TRIVIA_REMINDER_MAX_CONCURRENT_BATCHES = int(
+    os.getenv("TRIVIA_REMINDER_MAX_CONCURRENT_BATCHES", "4")
+)
+QUESTION_IMPORT_CHUNK_ROWS = int(
+    os.getenv("QUESTION_IMPORT_CHUNK_ROWS", "2000")
+)  # CSV rows staged and merged per transaction by the question importer
+QUESTION_IMPORT_MAX_ERRORS = int(
+    os.getenv("QUESTION_IMPORT_MAX_ERRORS", "100")
+)  # Per-row error messages kept in the import result; counts are not capped
 
 # Trivia Live Chat Settings
 TRIVIA_LIVE_CHAT_ENABLED = (
@@ -262,6 +308,9 @@ TRIVIA_LIVE_CHAT_MAX_MESSAGES_PER_MINUTE = int(
 TRIVIA_LIVE_CHAT_MAX_MESSAGE_LENGTH = int(
     os.getenv("TRIVIA_LIVE_CHAT_MAX_MESSAGE_LENGTH", "1000")
 )
+TRIVIA_LIVE_CHAT_LIKE_BROADCAST_INTERVAL_MS = int(
+    os.getenv("TRIVIA_LIVE_CHAT_LIKE_BROADCAST_INTERVAL_MS", "1000")
+)  # At most one `like-update` broadcast per draw date per interval
 
 # Message Sanitization
 MESSAGE_SANITIZE_ENABLED = (
@@ -306,8 +355,67 @@ STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
 STRIPE_SUCCESS_URL = os.getenv("STRIPE_SUCCESS_URL", "")
 STRIPE_CANCEL_URL = os.getenv("STRIPE_CANCEL_URL", "")
 
+# Payment Webhook Intake
+WEBHOOK_WORKER_PARTITIONS = int(os.getenv("WEBHOOK_WORKER_PARTITIONS", "16"))
+WEBHOOK_WORKER_QUEUE_SIZE = int(os.getenv("WEBHOOK_WORKER_QUEUE_SIZE", "1000"))
+WEBHOOK_SHUTDOWN_DRAIN_SECONDS = float(os.getenv("WEBHOOK_SHUTDOWN_DRAIN_SECONDS", "10"))
+WEBHOOK_RETRY_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_RETRY_MAX_ATTEMPTS", "8"))
+WEBHOOK_RETRY_BACKOFF_BASE_SECONDS = int(os.getenv("WEBHOOK_RETRY_BACKOFF_BASE_SECONDS", "60"))
+WEBHOOK_RETRY_BACKOFF_MAX_SECONDS = int(os.getenv("WEBHOOK_RETRY_BACKOFF_MAX_SECONDS", "21600"))
+WEBHOOK_RETRY_STALE_SECONDS = int(
+    os.getenv("WEBHOOK_RETRY_STALE_SECONDS", "300")
+)  # "received" events not finished by then are retried
+WEBHOOK_RETRY_LEASE_SECONDS = int(os.getenv("WEBHOOK_RETRY_LEASE_SECONDS", "300"))
+WEBHOOK_RETRY_BATCH_SIZE = int(os.getenv("WEBHOOK_RETRY_BATCH_SIZE", "50"))
+
 # PayPal Settings
 PAYPAL_CLIENT_ID = os.getenv("PAYPAL_CLIENT_ID", "")
 PAYPAL_CLIENT_SECRET = os.getenv("PAYPAL_CLIENT_SECRET", "")
 PAYPAL_WEBHOOK_ID = os.getenv("PAYPAL_WEBHOOK_ID", "")
 PAYPAL_MODE = os.getenv("PAYPAL_MODE", "sandbox")  # "sandbox" or "live"
+
+# Wallet Reconciliation
+WALLET_RECONCILIATION_BATCH_SIZE = int(os.getenv("WALLET_RECONCILIATION_BATCH_SIZE", "500"))
+WALLET_RECONCILIATION_SETTLE_SECONDS = int(
+    os.getenv("WALLET_RECONCILIATION_SETTLE_SECONDS", "600")
+)  # Ledger rows younger than this are checked but not folded into checkpoints
+WALLET_RECONCILIATION_MISMATCH_SAMPLE = int(
+    os.getenv("WALLET_RECONCILIATION_MISMATCH_SAMPLE", "100")
+)
+
+# Wallet Balance Read Model
+WALLET_BALANCE_CACHE_SECONDS = int(
+    os.getenv("WALLET_BALANCE_CACHE_SECONDS", "300")
+)  # Upper bound on a snapshot's life if an invalidation is ever lost
+
+# Wallet History
+WALLET_HISTORY_EXPORT_CHUNK_SIZE = int(
+    os.getenv("WALLET_HISTORY_EXPORT_CHUNK_SIZE", "500")
+)  # Ledger rows fetched per keyset query in the NDJSON export
+
+# Product Catalog
+PRODUCT_CATALOG_MAX_AGE_SECONDS = int(os.getenv("PRODUCT_CATALOG_MAX_AGE_SECONDS", "300"))
+PRODUCT_CATALOG_VERSION_CHECK_SECONDS = float(
+    os.getenv("PRODUCT_CATALOG_VERSION_CHECK_SECONDS", "5")
+)  # How often a worker compares its catalog version with Redis
+
+# Entitlement Cache
+ENTITLEMENT_CACHE_SECONDS = int(
+    os.getenv("ENTITLEMENT_CACHE_SECONDS", "600")
+)  # Upper bound on a cached ownership set's life if an invalidation is ever lost
+
+# Profile View
+PROFILE_VIEW_CACHE_SECONDS = int(
+    os.getenv("PROFILE_VIEW_CACHE_SECONDS", "600")
+)  # Upper bound on a cached profile composite's life if an invalidation is ever lost
+
+# Subscription Tiers
+SUBSCRIPTION_TIER_CACHE_SECONDS = int(
+    os.getenv("SUBSCRIPTION_TIER_CACHE_SECONDS", "600")
+)  # Upper bound on a cached tier set's life if an invalidation is ever lost
+BADGE_DEFINITIONS_MAX_AGE_SECONDS = int(
+    os.getenv("BADGE_DEFINITIONS_MAX_AGE_SECONDS", "300")
+)  # Full reload of the badge definitions even without a change
+BADGE_DEFINITIONS_VERSION_CHECK_SECONDS = float(
+    os.getenv("BADGE_DEFINITIONS_VERSION_CHECK_SECONDS", "5")
+)  # How often a worker compares its badge definitions version with Redis
@@ -2,7 +2,6 @@ import io
 import logging
 import os
 import re
-import ssl
 import sys
 import time
 import urllib.parse
@@ -44,6 +43,8 @@ if not isinstance(sys.stderr, FilteredStderr):
 
 from dotenv import load_dotenv
 
+from core.db_pool import psycopg_connect_args, register_pool, sync_pool_kwargs
+
 # Load environment variables
 load_dotenv(override=False)
 
@@ -74,7 +75,7 @@ if DATABASE_URL and not DATABASE_URL.startswith("sqlite"):
     # Get SSL mode from URL or default based on environment
     ssl_mode = query_params.get("sslmode", [None])[0]
 
-    # Modify URL to use pg8000 instead of psycopg2
+    # Use the psycopg (v3) driver
     if "postgresql" in DATABASE_URL and "driver=" not in DATABASE_URL:
         # Extract all parts of the connection URL
         pattern = r"postgresql://([^:]+):([^@]+)@([^:/]+):?(\d*)/?([^?]*)"
@@ -87,9 +88,9 @@ if DATABASE_URL and not DATABASE_URL.startswith("sqlite"):
             if not port:
                 port = "5432"
 
-            # Reconstruct URL with pg8000 driver (without URL-level SSL params)
+            # Reconstruct URL with psycopg driver (SSL goes through connect_args)
             DATABASE_URL = (
-                f"postgresql+pg8000://{username}:{password}@{host}:{port}/{dbname}"
+                f"postgresql+psycopg://{username}:{password}@{host}:{port}/{dbname}"
             )
 
 # Create engine with appropriate settings
@@ -99,35 +100,29 @@ if DATABASE_URL.startswith("sqlite"):
         DATABASE_URL, echo=False, connect_args={"check_same_thread": False}
     )
 else:
-    # PostgreSQL settings with SSL support for pg8000
-    connect_args = {}
-    pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
-    max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
-    pool_timeout = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
-    pool_recycle = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "300"))
+    # PostgreSQL settings; pool sizes are this engine's share of the process budget
+    # pg8000 always negotiated UTF8; keep that regardless of the server default
+    connect_args = {"client_encoding": "utf8", **psycopg_connect_args()}
 
     # Handle SSL configuration based on environment and URL parameters
     if ssl_mode == "disable" or TESTING:
         # No SSL for testing or when explicitly disabled
-        pass
+        connect_args["sslmode"] = "disable"
     elif ssl_mode == "require" or not ssl_mode:
         # Use SSL for production (default) or when explicitly required
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        connect_args["ssl_context"] = ssl_context
+        connect_args["sslmode"] = "require"
+    else:
+        connect_args["sslmode"] = ssl_mode
 
     engine = create_engine(
         DATABASE_URL,
-        pool_size=pool_size,
-        max_overflow=max_overflow,
-        pool_timeout=pool_timeout,
-        pool_pre_ping=True,
         echo=False,
-        pool_recycle=pool_recycle,
         connect_args=connect_args,
+        **sync_pool_kwargs(),
     )
 
+register_pool("sync", engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,131 @@
+"""
+Database connection budget shared by the sync (`core.db`) and async (`app.db`) engines.
+
+`DB_POOL_SIZE` / `DB_MAX_OVERFLOW` are the budget for the whole process and are split
+between the two engines by `DB_ASYNC_POOL_SHARE`, so one worker holds at most
+`DB_POOL_SIZE + DB_MAX_OVERFLOW` Postgres connections.
+
+With `DB_PGBOUNCER=true` neither driver keeps server-side prepared statements, which
+PgBouncer in transaction mode cannot route to the backend that prepared them.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event
+
+from core.config import (
+    DB_ASYNC_POOL_SHARE,
+    DB_MAX_OVERFLOW,
+    DB_PGBOUNCER,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_engines: Dict[str, Any] = {}
+_counters: Dict[str, Dict[str, int]] = {}
+
+
+def _split(total: int, *, minimum: int) -> Tuple[int, int]:
+    """Return (sync, async) shares of `total`, each at least `minimum`.
+
+    Raises ValueError when `total` cannot give both engines `minimum`, rather than
+    quietly opening more connections than the budget allows.
+    """
+    if total < 2 * minimum:
+        raise ValueError(
+            f"Connection budget {total} is below {2 * minimum}: the sync and async "
+            f"engines need at least {minimum} each"
+        )
+    share = min(max(DB_ASYNC_POOL_SHARE, 0.0), 1.0)
+    async_part = min(max(minimum, round(total * share)), total - minimum)
+    return total - async_part, async_part
+
+
+def _pool_kwargs(index: int) -> Dict[str, Any]:
+    pool_size = _split(DB_POOL_SIZE, minimum=1)[index]
+    max_overflow = _split(DB_MAX_OVERFLOW, minimum=0)[index]
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
+
+
+def sync_pool_kwargs() -> Dict[str, Any]:
+    return _pool_kwargs(0)
+
+
+def async_pool_kwargs() -> Dict[str, Any]:
+    return _pool_kwargs(1)
+
+
+def psycopg_connect_args() -> Dict[str, Any]:
+    if not DB_PGBOUNCER:
+        return {}
+    # psycopg 3 auto-prepares statements after a few executions; disable it.
+    return {"prepare_threshold": None}
+
+
+def asyncpg_connect_args() -> Dict[str, Any]:
+    if not DB_PGBOUNCER:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        # Unnamed-per-backend names would collide across PgBouncer backends.
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+def register_pool(name: str, engine) -> None:
+    """Track checkout/connect counters for `engine` (sync Engine or AsyncEngine)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    counters = {"connects": 0, "checkouts": 0, "invalidations": 0}
+    _engines[name] = sync_engine
+    _counters[name] = counters
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        counters["connects"] += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        counters["checkouts"] += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        counters["invalidations"] += 1
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Current gauges and lifetime counters for each registered pool."""
+    stats = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        entry = dict(_counters[name])
+        if hasattr(pool, "checkedout"):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                limit=pool.size() + max(getattr(pool, "_max_overflow", 0), 0),
+            )
+        stats[name] = entry
+    return stats
+
+
+def format_pool_stats() -> str:
+    parts = []
+    for name, entry in pool_stats().items():
+        parts.append(
+            f"{name} " + " ".join(f"{key}={value}" for key, value in entry.items())
+        )
+    return " | ".join(parts)
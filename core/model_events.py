@@ -0,0 +1,109 @@
+"""Post-commit change hooks keyed by table name.
+
+Read models and caches use this to invalidate themselves after a transaction that
+wrote a given table commits, no matter which domain (or which of the sync/async model
+sets) performed the write. Listeners are attached to the SQLAlchemy `Session` class,
+so they also fire for `AsyncSession`, which wraps a sync `Session`.
+
+Callbacks receive the set of keys extracted from the changed rows during flush (the
+rows themselves are expired after commit and must not be touched from the hook).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+KeyFn = Callable[[Any], Optional[Hashable]]
+Callback = Callable[[Set[Hashable]], None]
+
+_SESSION_INFO_KEY = "_committed_change_keys"
+_SESSION_QUEUE_KEY = "_committed_change_callbacks"
+
+_listeners: Dict[str, List[Tuple[KeyFn, Callback]]] = {}
+
+
+def on_committed_change(
+    table_name: str, callback: Callback, *, key: Optional[KeyFn] = None
+) -> None:
+    """Register `callback` to run after commits that changed rows of `table_name`.
+
+    `key` is evaluated per changed row while the flush is still in progress; rows for
+    which it returns None are ignored. Without `key` the callback just receives the
+    table name.
+    """
+    _listeners.setdefault(table_name, []).append(
+        (key or (lambda _obj: table_name), callback)
+    )
+
+
+def run_after_commit(session: Any, callback: Callback, keys: Set[Hashable]) -> None:
+    """Queue `callback(keys)` for after `session` commits; dropped on rollback.
+
+    For writes that bypass the ORM unit of work (Core `UPDATE`/`INSERT` statements),
+    which the table listeners above never see. Accepts a `Session` or `AsyncSession`.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    queued: List[Tuple[Callback, Set[Hashable]]] = sync_session.info.setdefault(
+        _SESSION_QUEUE_KEY, []
+    )
+    queued.append((callback, set(keys)))
+
+
+def _table_name(obj: Any) -> Optional[str]:
+    table = getattr(obj, "__table__", None)
+    return getattr(table, "name", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    if not _listeners:
+        return
+    pending: Dict[Tuple[str, int], Set[Hashable]] = session.info.setdefault(
+        _SESSION_INFO_KEY, {}
+    )
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table_name = _table_name(obj) or ""
+        registered = _listeners.get(table_name)
+        if not registered:
+            continue
+        for index, (key_fn, _callback) in enumerate(registered):
+            try:
+                value = key_fn(obj)
+            except Exception:
+                logger.debug("committed-change key extraction failed", exc_info=True)
+                continue
+            if value is None:
+                continue
+            pending.setdefault((table_name, index), set()).add(value)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    pending: Dict[Tuple[str, int], Set[Hashable]] = (
+        session.info.pop(_SESSION_INFO_KEY, None) or {}
+    )
+    for (table_name, index), keys in pending.items():
+        _key_fn, callback = _listeners[table_name][index]
+        if not keys:
+            continue
+        try:
+            callback(keys)
+        except Exception:
+            logger.warning("committed-change callback failed", exc_info=True)
+    for callback, keys in session.info.pop(_SESSION_QUEUE_KEY, None) or []:
+        try:
+            callback(keys)
+        except Exception:
+            logger.warning("after-commit callback failed", exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+    session.info.pop(_SESSION_QUEUE_KEY, None)
@@ -0,0 +1,92 @@
+"""
+In-process ordered worker pool.
+
+Jobs are routed to one of N asyncio queues by a partition key (customer, subscription,
+purchase token, ...). Each queue is drained by a single worker, so jobs sharing a key
+run one at a time in submission order while different keys run in parallel. Queues are
+bounded; `submit` returns False instead of blocking when a partition is full, so callers
+must only submit work that is already durable (e.g. a persisted webhook row that a
+retry job will pick up).
+"""
+
+import asyncio
+import logging
+import zlib
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class PartitionedDispatcher:
+    def __init__(self, name: str, *, partitions: int, max_queue_size: int):
+        self.name = name
+        self._partitions = max(1, partitions)
+        self._max_queue_size = max_queue_size
+        # Queues and worker tasks belong to one event loop; a new loop gets fresh ones.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queues = [
+            asyncio.Queue(maxsize=self._max_queue_size) for _ in range(self._partitions)
+        ]
+        self._workers = [
+            loop.create_task(self._run(index, queue), name=f"{self.name}-{index}")
+            for index, queue in enumerate(self._queues)
+        ]
+
+    def _partition(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self._partitions
+
+    async def _run(self, index: int, queue: asyncio.Queue) -> None:
+        while True:
+            key, job = await queue.get()
+            try:
+                await job()
+            except Exception:
+                logger.exception(
+                    "%s partition %s job failed (key=%s)", self.name, index, key
+                )
+            finally:
+                queue.task_done()
+
+    def submit(self, key: str, job: Job) -> bool:
+        """Queue `job` behind earlier jobs with the same key.
+
+        Returns False when the partition is full.
+        """
+        self._bind_loop()
+        try:
+            self._queues[self._partition(key)].put_nowait((key, job))
+        except asyncio.QueueFull:
+            logger.warning(
+                "%s partition for key=%s is full; deferring to retry", self.name, key
+            )
+            return False
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued job has finished."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def shutdown(self, timeout: float) -> None:
+        """Drain for up to `timeout` seconds, then cancel the workers."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:
+            pending = sum(queue.qsize() for queue in self._queues)
+            logger.warning("%s shutdown with %d jobs still queued", self.name, pending)
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
@@ -0,0 +1,226 @@
+"""Building blocks for Redis-backed read models (optional Redis).
+
+`SharedGeneration` versions in-process maps (product catalog, badge definitions,
+question packs): commits bump it in this process immediately and in Redis, and other
+workers pick the new value up within `check_seconds`. Without Redis it only covers
+the current process.
+
+`TokenReadModel` caches one Redis entry per key (usually an account id). Every entry
+is stored with the key's current invalidation token; commits that change the
+underlying rows replace the token with a fresh random one, so an entry filled from a
+read that raced such a commit no longer matches and is treated as a miss. Tokens are
+never reused. An optional global generation retires every entry at once (shared
+definitions changed). Without Redis every read goes to the database.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, Mapping, NamedTuple, Optional, Set
+
+from core.redis_sync import get_sync_redis, mark_sync_redis_failed
+
+logger = logging.getLogger(__name__)
+
+
+class SharedGeneration:
+    """Monotonically increasing version shared by all workers through one Redis key."""
+
+    def __init__(self, redis_key: str, *, check_seconds: float):
+        self.redis_key = redis_key
+        self._check_seconds = check_seconds
+        self._lock = Lock()
+        self._local = 0
+        self._shared = 0
+        self._checked_at: Optional[float] = None
+
+    def _refresh_shared(self) -> int:
+        now = time.monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self._check_seconds
+        ):
+            return self._shared
+        self._checked_at = now
+        client = get_sync_redis()
+        if client is None:
+            return self._shared
+        try:
+            shared = int(client.get(self.redis_key) or 0)
+        except Exception as exc:
+            logger.warning("Generation read failed for %s: %s", self.redis_key, exc)
+            mark_sync_redis_failed()
+            return self._shared
+        with self._lock:
+            self._shared = max(self._shared, shared)
+        return self._shared
+
+    def current(self) -> int:
+        """Version as seen by this worker (never decreases)."""
+        return max(self._local, self._refresh_shared())
+
+    def bump(self, _changed: Optional[Set[Any]] = None) -> None:
+        """Start a new version; usable directly as an `on_committed_change` callback."""
+        with self._lock:
+            self._local = max(self._local, self._shared) + 1
+        client = get_sync_redis()
+        if client is None:
+            return
+        try:
+            shared = int(client.incr(self.redis_key))
+        except Exception as exc:
+            logger.warning("Generation bump failed for %s: %s", self.redis_key, exc)
+            mark_sync_redis_failed()
+            return
+        with self._lock:
+            self._shared = max(self._shared, shared)
+            self._local = max(self._local, shared)
+
+
+# Tokens must outlive every entry stored under them.
+_TOKEN_TTL_SECONDS = 7 * 24 * 3600
+
+
+class ReadModelLookup(NamedTuple):
+    client: Any  # None when Redis is unusable; nothing is stored then
+    generation: str
+    tokens: Dict[Hashable, str]
+    entries: Dict[Hashable, Any]  # payloads still valid, by key
+
+
+class TokenReadModel:
+    """Per-key Redis entries invalidated by token rotation.
+
+    Keys are `{name}:token:{key}`, `{name}:{entry_name}:{key}` and `{name}:generation`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl_seconds: int,
+        entry_name: str = "entry",
+        generation: bool = False,
+    ):
+        self.name = name
+        self._ttl_seconds = ttl_seconds
+        self._entry_name = entry_name
+        self._generation_key = f"{name}:generation" if generation else None
+
+    def token_key(self, key: Hashable) -> str:
+        return f"{self.name}:token:{key}"
+
+    def entry_key(self, key: Hashable) -> str:
+        return f"{self.name}:{self._entry_name}:{key}"
+
+    def lookup(self, keys: Iterable[Hashable]) -> ReadModelLookup:
+        """Tokens and valid cached payloads of `keys`, in one pipeline round trip."""
+        keys = list(keys)
+        client = get_sync_redis()
+        if client is None:
+            return ReadModelLookup(None, "", {}, {})
+        try:
+            pipe = client.pipeline()
+            if self._generation_key:
+                pipe.get(self._generation_key)
+            for key in keys:
+                pipe.get(self.token_key(key))
+                pipe.get(self.entry_key(key))
+            values = pipe.execute()
+        except Exception as exc:
+            logger.warning("Read model %s lookup failed: %s", self.name, exc)
+            mark_sync_redis_failed()
+            return ReadModelLookup(None, "", {}, {})
+
+        generation = str(values.pop(0) or 0) if self._generation_key else ""
+        now = datetime.utcnow()
+        tokens: Dict[Hashable, str] = {}
+        entries: Dict[Hashable, Any] = {}
+        for key, token, raw in zip(keys, values[::2], values[1::2]):
+            tokens[key] = token or ""
+            if not raw:
+                continue
+            try:
+                stored = json.loads(raw)
+                valid_until = stored["valid_until"]
+                if (
+                    stored["token"] == tokens[key]
+                    and stored["generation"] == generation
+                    and (
+                        valid_until is None or datetime.fromisoformat(valid_until) > now
+                    )
+                ):
+                    entries[key] = stored["value"]
+            except (ValueError, KeyError, TypeError):
+                continue
+        return ReadModelLookup(client, generation, tokens, entries)
+
+    def store(
+        self,
+        lookup: ReadModelLookup,
+        payloads: Mapping[Hashable, Any],
+        *,
+        valid_until: Optional[Mapping[Hashable, Optional[datetime]]] = None,
+    ) -> None:
+        """Cache JSON-serializable `payloads` under the tokens seen by `lookup`.
+
+        An entry is a miss after its `valid_until` (UTC) even if no commit retired it.
+        """
+        if lookup.client is None or not payloads:
+            return
+        valid_until = valid_until or {}
+        try:
+            pipe = lookup.client.pipeline()
+            for key, payload in payloads.items():
+                until = valid_until.get(key)
+                pipe.set(
+                    self.entry_key(key),
+                    json.dumps(
+                        {
+                            "token": lookup.tokens.get(key, ""),
+                            "generation": lookup.generation,
+                            "valid_until": until.isoformat() if until else None,
+                            "value": payload,
+                        }
+                    ),
+                    ex=self._ttl_seconds,
+                )
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("Read model %s write failed: %s", self.name, exc)
+            mark_sync_redis_failed()
+
+    def invalidate(self, keys: Set[Hashable]) -> None:
+        """Retire the current token (and entry) of every key in `keys`."""
+        if not keys:
+            return
+        client = get_sync_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            for key in keys:
+                pipe.set(self.token_key(key), uuid.uuid4().hex, ex=_TOKEN_TTL_SECONDS)
+                pipe.delete(self.entry_key(key))
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("Read model %s invalidation failed: %s", self.name, exc)
+            mark_sync_redis_failed()
+
+    def bump_generation(self, _changed: Optional[Set[Any]] = None) -> None:
+        """Retire every entry; usable directly as an `on_committed_change` callback."""
+        if not self._generation_key:
+            raise ValueError(f"Read model {self.name} has no generation")
+        client = get_sync_redis()
+        if client is None:
+            return
+        try:
+            client.incr(self._generation_key)
+        except Exception as exc:
+            logger.warning("Read model %s generation bump failed: %s", self.name, exc)
+            mark_sync_redis_failed()
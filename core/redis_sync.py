@@ -0,0 +1,60 @@
+"""Shared synchronous Redis client (optional).
+
+Sync request handlers and jobs that want Redis-backed state call `get_sync_redis()`
+instead of building a new client per call. Returns None while Redis is unavailable
+and only retries the connection every `REDIS_RETRY_INTERVAL_SECONDS`, so callers can
+fall back to the database without paying a connect timeout on every request.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from threading import Lock
+from typing import Optional
+
+import redis  # type: ignore
+
+from core.config import REDIS_RETRY_INTERVAL_SECONDS, REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+_lock = Lock()
+_last_failure_at = 0.0
+
+
+def get_sync_redis() -> Optional[redis.Redis]:
+    global _client, _last_failure_at
+    if _client is not None:
+        return _client
+    if (
+        _last_failure_at
+        and time.time() - _last_failure_at < REDIS_RETRY_INTERVAL_SECONDS
+    ):
+        return None
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            client = redis.Redis.from_url(
+                REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            client.ping()
+        except Exception as exc:
+            _last_failure_at = time.time()
+            logger.debug("Sync Redis unavailable: %s", exc)
+            return None
+        _client = client
+        return _client
+
+
+def mark_sync_redis_failed() -> None:
+    """Drop the shared client after a command error so the next call backs off."""
+    global _client, _last_failure_at
+    with _lock:
+        _client = None
+        _last_failure_at = time.time()
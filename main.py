@@ -151,7 +151,9 @@ import time
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from core.db_pool import format_pool_stats
 from core.latency import LatencyTracker
+from utils.storage import presign_cache_stats
 
 _latency_tracker = LatencyTracker(
     window=int(os.getenv("LATENCY_STATS_WINDOW", "200"))
@@ -281,6 +283,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                         for s in top
                     ]
                     logger.info("LATENCY_TOP | " + " | ".join(lines))
+                logger.info("DB_POOL | " + format_pool_stats())
 
             if elapsed_ms >= slow_ms:
                 extra = {
@@ -454,6 +457,11 @@ async def startup_event():
             logger.info(f"{methods:8} {route.path}")
     logger.info("=== End of Routes ===")
 
+    # Resolve S3 bucket regions/clients before serving, not on first user requests
+    from utils.storage_bootstrap import bootstrap_storage
+
+    await bootstrap_storage()
+
     # Only start scheduler in local development
     if os.getenv("ENVIRONMENT", "development") == "development":
         from updated_scheduler import start_scheduler
@@ -464,6 +472,17 @@ async def startup_event():
         logger.info("Production mode - using external cron for scheduling")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Give acked payment webhooks a chance to finish before the worker exits."""
+    from app.services.google_play_client import close_google_play_client
+    from app.services.webhook_intake import webhook_dispatcher
+    from core.config import WEBHOOK_SHUTDOWN_DRAIN_SECONDS
+
+    await webhook_dispatcher.shutdown(WEBHOOK_SHUTDOWN_DRAIN_SECONDS)
+    await close_google_play_client()
+
+
 @app.get("/")
 async def read_root():
     """
@@ -483,7 +502,10 @@ async def health_check():
     """
     Health check endpoint for monitoring.
     """
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "presign_cache": presign_cache_stats(),
+    }
 
 
 # Include async wallet routers with /api/v1 prefix
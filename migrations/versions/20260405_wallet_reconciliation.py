@@ -0,0 +1,53 @@
+"""Add wallet reconciliation checkpoints, mismatch report and ledger keyset index.
+
+Revision ID: 20260405_wallet_reconciliation
+Revises: 20260404_withdrawals
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260405_wallet_reconciliation"
+down_revision = "20260404_withdrawals"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_wallet_transactions_user_id_id",
+        "wallet_transactions",
+        ["user_id", "id"],
+    )
+    op.create_table(
+        "wallet_reconciliation_checkpoints",
+        sa.Column("user_id", sa.BigInteger, sa.ForeignKey("users.account_id"), primary_key=True),
+        sa.Column("last_transaction_id", sa.BigInteger, nullable=False),
+        sa.Column("ledger_sum_minor", sa.BigInteger, nullable=False),
+        sa.Column("updated_at", sa.DateTime, nullable=False),
+    )
+    op.create_table(
+        "wallet_reconciliation_mismatches",
+        sa.Column("id", sa.BigInteger, primary_key=True),
+        sa.Column("run_id", sa.String, nullable=False),
+        sa.Column("user_id", sa.BigInteger, sa.ForeignKey("users.account_id"), nullable=False),
+        sa.Column("expected_minor", sa.BigInteger, nullable=False),
+        sa.Column("actual_minor", sa.BigInteger, nullable=False),
+        sa.Column("diff_minor", sa.BigInteger, nullable=False),
+        sa.Column("detected_at", sa.DateTime, nullable=False),
+    )
+    op.create_index(
+        "ix_wallet_reconciliation_mismatches_run_id",
+        "wallet_reconciliation_mismatches",
+        ["run_id"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_wallet_reconciliation_mismatches_run_id",
+        table_name="wallet_reconciliation_mismatches",
+    )
+    op.drop_table("wallet_reconciliation_mismatches")
+    op.drop_table("wallet_reconciliation_checkpoints")
+    op.drop_index("ix_wallet_transactions_user_id_id", table_name="wallet_transactions")
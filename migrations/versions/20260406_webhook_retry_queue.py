@@ -0,0 +1,44 @@
+"""Add next_attempt_at retry scheduling to payment webhook events.
+
+Revision ID: 20260406_webhook_retry_queue
+Revises: 20260405_wallet_reconciliation
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260406_webhook_retry_queue"
+down_revision = "20260405_wallet_reconciliation"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("stripe_webhook_events", "paypal_webhook_events")
+
+
+def upgrade():
+    for table in _TABLES:
+        op.add_column(table, sa.Column("next_attempt_at", sa.DateTime, nullable=True))
+        # Unfinished events from the last day (the old retry window) become due now;
+        # older ones were already abandoned by the previous job.
+        op.execute(
+            f"UPDATE {table} SET next_attempt_at = received_at "
+            "WHERE status IN ('received', 'failed') "
+            "AND received_at > now() - interval '24 hours'"
+        )
+        op.execute(
+            f"UPDATE {table} SET status = 'dead_letter' "
+            "WHERE status IN ('received', 'failed') AND next_attempt_at IS NULL"
+        )
+        op.create_index(
+            f"ix_{table}_next_attempt_at",
+            table,
+            ["next_attempt_at"],
+            postgresql_where=sa.text("next_attempt_at IS NOT NULL"),
+        )
+
+
+def downgrade():
+    for table in _TABLES:
+        op.execute(f"UPDATE {table} SET status = 'failed' WHERE status = 'dead_letter'")
+        op.drop_index(f"ix_{table}_next_attempt_at", table_name=table)
+        op.drop_column(table, "next_attempt_at")
@@ -0,0 +1,33 @@
+"""Add (user, created, id) indexes for keyset wallet/withdrawal history.
+
+Revision ID: 20260407_history_keyset_indexes
+Revises: 20260406_webhook_retry_queue
+"""
+
+from alembic import op
+
+revision = "20260407_history_keyset_indexes"
+down_revision = "20260406_webhook_retry_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_wallet_transactions_user_created_id",
+        "wallet_transactions",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_withdrawals_account_requested_id",
+        "withdrawals",
+        ["account_id", "requested_at", "id"],
+    )
+    # Leading column of the new index; the single-column index is redundant.
+    op.drop_index("ix_withdrawals_account_id", table_name="withdrawals")
+
+
+def downgrade():
+    op.create_index("ix_withdrawals_account_id", "withdrawals", ["account_id"])
+    op.drop_index("ix_withdrawals_account_requested_id", table_name="withdrawals")
+    op.drop_index("ix_wallet_transactions_user_created_id", table_name="wallet_transactions")
@@ -0,0 +1,27 @@
+"""Record generated thumbnail renditions for profile pictures, avatars and frames.
+
+Revision ID: 20260408_image_renditions
+Revises: 20260407_history_keyset_indexes
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260408_image_renditions"
+down_revision = "20260407_history_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("avatars", sa.Column("rendition_key", sa.String, nullable=True))
+    op.add_column("frames", sa.Column("rendition_key", sa.String, nullable=True))
+    op.add_column(
+        "users", sa.Column("profile_pic_rendition_key", sa.String, nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("users", "profile_pic_rendition_key")
+    op.drop_column("frames", "rendition_key")
+    op.drop_column("avatars", "rendition_key")
@@ -0,0 +1,33 @@
+"""Make wallet_transactions.event_id unique.
+
+Revision ID: 20260409_wallet_event_id_unique
+Revises: 20260408_image_renditions
+
+Batch wallet credits insert ledger rows with ON CONFLICT (event_id) DO NOTHING, so
+two transactions can no longer both credit the same idempotency key. The upgrade
+fails if duplicate event_ids already exist; those must be reconciled by hand first.
+"""
+
+from alembic import op
+
+revision = "20260409_wallet_event_id_unique"
+down_revision = "20260408_image_renditions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("ix_wallet_transactions_event_id", table_name="wallet_transactions")
+    op.create_index(
+        "ix_wallet_transactions_event_id",
+        "wallet_transactions",
+        ["event_id"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_wallet_transactions_event_id", table_name="wallet_transactions")
+    op.create_index(
+        "ix_wallet_transactions_event_id", "wallet_transactions", ["event_id"]
+    )
@@ -0,0 +1,45 @@
+"""Add attempts and next_attempt_at retry scheduling to IAP notification events.
+
+Revision ID: 20260410_iap_event_retry_queue
+Revises: 20260409_wallet_event_id_unique
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260410_iap_event_retry_queue"
+down_revision = "20260409_wallet_event_id_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "iap_events",
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.add_column("iap_events", sa.Column("next_attempt_at", sa.DateTime, nullable=True))
+    # Unfinished notifications from the last day become due now; older ones are kept
+    # (with their raw payload) for manual replay.
+    op.execute(
+        "UPDATE iap_events SET next_attempt_at = received_at "
+        "WHERE status IN ('received', 'failed') "
+        "AND received_at > now() - interval '24 hours'"
+    )
+    op.execute(
+        "UPDATE iap_events SET status = 'dead_letter' "
+        "WHERE status IN ('received', 'failed') AND next_attempt_at IS NULL"
+    )
+    op.create_index(
+        "ix_iap_events_next_attempt_at",
+        "iap_events",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("next_attempt_at IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.execute("UPDATE iap_events SET status = 'failed' WHERE status = 'dead_letter'")
+    op.drop_index("ix_iap_events_next_attempt_at", table_name="iap_events")
+    op.drop_column("iap_events", "next_attempt_at")
+    op.drop_column("iap_events", "attempts")
@@ -0,0 +1,21 @@
+"""Record a token per profile picture upload for the thumbnail rendition job.
+
+Revision ID: 20260411_profile_pic_upload_id
+Revises: 20260410_iap_event_retry_queue
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260411_profile_pic_upload_id"
+down_revision = "20260410_iap_event_retry_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("profile_pic_upload_id", sa.String, nullable=True))
+
+
+def downgrade():
+    op.drop_column("users", "profile_pic_upload_id")
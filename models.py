@@ -14,6 +14,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
 from sqlalchemy.dialects.postgresql import JSONB, UUID
@@ -54,6 +55,12 @@ class User(Base):
     ssn = Column(String, nullable=True)
     password = Column(String, nullable=True)
     profile_pic_url = Column(String, nullable=True)
+    profile_pic_rendition_key = Column(
+        String, nullable=True
+    )  # Base key of WebP thumbnails of the custom profile picture
+    profile_pic_upload_id = Column(
+        String, nullable=True
+    )  # Token of the latest profile picture upload, checked by the rendition job
     notification_on = Column(Boolean, default=True)
     street_1 = Column(String, nullable=True)
     street_2 = Column(String, nullable=True)
@@ -177,6 +184,11 @@ class Withdrawal(Base):
     # Note: Withdrawal table is legacy and currently unused
     user = relationship("User", backref="withdrawals")
 
+    __table_args__ = (
+        # Newest-first history pages (keyset on requested_at, id).
+        Index("ix_withdrawals_account_requested_id", "account_id", "requested_at", "id"),
+    )
+
 
 # =================================
 #  Legacy Daily Questions Tables - REMOVED
@@ -238,6 +250,9 @@ class Avatar(Base):
     price_minor = Column(BigInteger, nullable=True)  # Price in minor units (cents)
     product_type = Column(String, nullable=False, default="non_consumable")
     is_premium = Column(Boolean, default=False)  # Whether it's a premium avatar
+    rendition_key = Column(
+        String, nullable=True
+    )  # Base key of WebP thumbnails (utils/image_derivatives.py)
     created_at = Column(
         DateTime, default=datetime.utcnow, nullable=False
     )  # When the avatar was added
@@ -274,6 +289,9 @@ class Frame(Base):
     price_minor = Column(BigInteger, nullable=True)  # Price in minor units (cents)
     product_type = Column(String, nullable=False, default="non_consumable")
     is_premium = Column(Boolean, default=False)  # Whether it's a premium frame
+    rendition_key = Column(
+        String, nullable=True
+    )  # Base key of WebP thumbnails (utils/image_derivatives.py)
     created_at = Column(
         DateTime, default=datetime.utcnow, nullable=False
     )  # When the frame was added
@@ -889,6 +907,12 @@ class WalletTransaction(Base):
     # Relationships
     user = relationship("User", back_populates="wallet_transactions")
 
+    __table_args__ = (
+        Index("ix_wallet_transactions_user_id_id", "user_id", "id"),
+        Index("ix_wallet_transactions_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_wallet_transactions_event_id", "event_id", unique=True),
+    )
+
 
 # =================================
 #  IAP Receipt Table
@@ -949,8 +973,18 @@ class IapEvent(Base):
     purchase_token = Column(String, nullable=True)
     status = Column(String, nullable=False, default="received")
     raw_payload = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
     received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_iap_events_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL"),
+        ),
+    )
 
 
 # =================================
@@ -1,7 +1,9 @@
 import logging
 
 from core.db import SessionLocal
+from core.model_events import run_after_commit
 from models import GemPackageConfig, User, UserGemPurchase
+from utils.entitlement_cache import invalidate_entitlements
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -59,11 +61,20 @@ def reset_one_time_purchases():
 
         # Correct approach: Just delete all purchase records of one-time packages
         # Each user will get a fresh chance to purchase one-time offers
+        one_time_ids = [p.id for p in one_time_packages]
+        buyer_ids = {
+            user_id
+            for (user_id,) in db.query(UserGemPurchase.user_id)
+            .filter(UserGemPurchase.package_id.in_(one_time_ids))
+            .distinct()
+        }
         total_deleted = (
             db.query(UserGemPurchase)
-            .filter(UserGemPurchase.package_id.in_([p.id for p in one_time_packages]))
+            .filter(UserGemPurchase.package_id.in_(one_time_ids))
             .delete(synchronize_session=False)
         )
+        # Bulk delete bypasses the ORM change hooks; drop cached ownership sets.
+        run_after_commit(db, invalidate_entitlements, buyer_ids)
 
         db.commit()
         logger.info(f"Reset {total_deleted} one-time purchase records")
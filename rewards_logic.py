@@ -179,13 +179,17 @@ def calculate_prize_pool(
     return round(daily_prize_pool, 2)
 
 
-def calculate_mode_prize_pool(db: Session, draw_date: date, mode_id: str) -> Dict[str, Any]:
+def calculate_mode_prize_pool(
+    db: Session, draw_date: date, mode_id: str, *, raise_errors: bool = False
+) -> Dict[str, Any]:
     """
     Calculate a mode-specific prize pool for subscription-gated modes (e.g. bronze/silver).
 
     This is separate from the legacy "global" prize pool and is based on:
     - active subscriber count for the mode (matched by required subscription amount)
     - daily_pool = (subscriber_count * subscription_amount * prize_pool_share) / days_in_month
+
+    Failures are logged and reported as an empty pool unless `raise_errors` is set.
     """
     from models import SubscriptionPlan, TriviaModeConfig, UserSubscription
 
@@ -247,6 +251,8 @@ def calculate_mode_prize_pool(db: Session, draw_date: date, mode_id: str) -> Dic
             "prize_pool_share": prize_pool_share,
         }
     except Exception as exc:
+        if raise_errors:
+            raise
         logger.error("Failed calculating mode prize pool for %s: %s", mode_id, exc, exc_info=True)
         return {"mode_id": mode_id, "daily_pool": 0.0, "subscriber_count": 0}
 
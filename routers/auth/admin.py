@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Body,
     Depends,
     File,
@@ -14,6 +15,7 @@ from fastapi import (
 from sqlalchemy.orm import Session
 
 from core.db import get_db
+from core.db_pool import pool_stats
 from routers.dependencies import get_admin_user, get_current_user, verify_admin
 
 from .schemas import (
@@ -72,7 +74,7 @@ from .service import upload_questions_csv as admin_upload_questions_csv
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 MAX_QUESTION_UPLOAD_BYTES = int(
-    os.getenv("MAX_QUESTION_UPLOAD_BYTES", str(5 * 1024 * 1024))
+    os.getenv("MAX_QUESTION_UPLOAD_BYTES", str(64 * 1024 * 1024))
 )
 
 
@@ -163,9 +165,8 @@ async def upload_questions_csv(
     fill_in_answer, hint, explanation, category, country, difficulty_level, picture_url
     """
     verify_admin(db, current_user)
-    file_content = await file.read(MAX_QUESTION_UPLOAD_BYTES + 1)
     return await admin_upload_questions_csv(
-        db, mode_id, file_content, MAX_QUESTION_UPLOAD_BYTES
+        db, mode_id, file, MAX_QUESTION_UPLOAD_BYTES
     )
 
 
@@ -448,13 +449,14 @@ async def create_avatar(
 
 @router.put("/avatars/{avatar_id}", response_model=AvatarResponse)
 async def update_avatar(
+    background_tasks: BackgroundTasks,
     avatar_id: str = Path(..., description="The ID of the avatar to update"),
     avatar_update: AvatarCreate = Body(..., description="Updated avatar data"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_admin_user),
 ):
     """Admin endpoint to update an existing avatar"""
-    return admin_update_avatar(db, avatar_id, avatar_update)
+    return admin_update_avatar(db, avatar_id, avatar_update, background_tasks)
 
 
 @router.delete("/avatars/{avatar_id}", response_model=dict)
@@ -479,13 +481,14 @@ async def create_frame(
 
 @router.put("/frames/{frame_id}", response_model=FrameResponse)
 async def update_frame(
+    background_tasks: BackgroundTasks,
     frame_id: str = Path(..., description="The ID of the frame to update"),
     frame_update: FrameCreate = Body(..., description="Updated frame data"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_admin_user),
 ):
     """Admin endpoint to update an existing frame"""
-    return admin_update_frame(db, frame_id, frame_update)
+    return admin_update_frame(db, frame_id, frame_update, background_tasks)
 
 
 @router.delete("/frames/{frame_id}", response_model=dict)
@@ -500,23 +503,25 @@ async def delete_frame(
 
 @router.post("/avatars/import", response_model=BulkImportResponse)
 async def import_avatars_from_json(
+    background_tasks: BackgroundTasks,
     json_data: Dict[str, Any] = Body(...),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_admin_user),
 ):
     """Bulk import avatars from a JSON file or import a single avatar."""
-    payload = admin_import_avatars_from_json(db, json_data)
+    payload = admin_import_avatars_from_json(db, json_data, background_tasks)
     return BulkImportResponse(**payload)
 
 
 @router.post("/frames/import", response_model=BulkImportResponse)
 async def import_frames_from_json(
+    background_tasks: BackgroundTasks,
     json_data: Dict[str, Any] = Body(...),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_admin_user),
 ):
     """Bulk import frames from a JSON file or import a single frame."""
-    payload = admin_import_frames_from_json(db, json_data)
+    payload = admin_import_frames_from_json(db, json_data, background_tasks)
     return BulkImportResponse(**payload)
 
 
@@ -528,6 +533,12 @@ async def get_avatar_stats(
     return admin_get_avatar_stats(db)
 
 
+@router.get("/metrics/db-pool", response_model=Dict[str, Any])
+async def get_db_pool_metrics(current_user: dict = Depends(get_admin_user)):
+    """Admin endpoint to get checkout/overflow gauges of this worker's DB pools"""
+    return pool_stats()
+
+
 @router.get(
     "/users/{account_id}/transactions",
     summary="Get user's transaction history (admin)",
@@ -554,6 +565,9 @@ async def get_user_transactions(
         ),
         example="trivia_reward",
     ),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` from the previous page; overrides `page`"
+    ),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -563,7 +577,12 @@ async def get_user_transactions(
 
     async with AsyncSessionLocal() as async_db:
         return await get_transaction_history(
-            async_db, user_id=account_id, page=page, page_size=page_size, kind=kind
+            async_db,
+            user_id=account_id,
+            page=page,
+            page_size=page_size,
+            kind=kind,
+            cursor=cursor,
         )
 
 
@@ -584,6 +603,9 @@ async def get_user_withdrawals(
     account_id: int = Path(..., description="Target user's account ID", example=1142961859),
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page (max 100)"),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` from the previous page; overrides `page`"
+    ),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -593,12 +615,13 @@ async def get_user_withdrawals(
 
     async with AsyncSessionLocal() as async_db:
         return await get_withdrawal_history(
-            async_db, account_id=account_id, page=page, page_size=page_size
+            async_db, account_id=account_id, page=page, page_size=page_size, cursor=cursor
         )
 
 
 @router.post("/reconciliation/run", response_model=Dict[str, Any])
 async def run_reconciliation(
+    full: bool = Query(False, description="Ignore checkpoints and rescan the whole ledger"),
     current_user: dict = Depends(get_admin_user),
 ):
     """Trigger a wallet reconciliation check. Compares user balances against transaction ledger."""
@@ -606,4 +629,4 @@ async def run_reconciliation(
     from app.services.reconciliation_service import run_wallet_reconciliation
 
     async with AsyncSessionLocal() as session:
-        return await run_wallet_reconciliation(session)
+        return await run_wallet_reconciliation(session, full=full)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Request, UploadFile
 from sqlalchemy.orm import Session
 
 from core.db import get_db
@@ -71,11 +71,12 @@ async def send_referral_endpoint(
 
 @router.post("/upload-profile-pic", status_code=200)
 async def upload_profile_picture_endpoint(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return await upload_profile_picture(file, db, current_user)
+    return await upload_profile_picture(file, db, current_user, background_tasks)
 
 
 @router.get("/modes/status", status_code=200)
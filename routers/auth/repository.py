@@ -1,22 +1,16 @@
 """Domain repository layer."""
 
-from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import and_, func, or_, select, union_all
+from sqlalchemy import func, select, union_all
 from sqlalchemy.orm import Session
 
 from models import (
     AdminUser,
-    Avatar,
-    Frame,
-    SubscriptionPlan,
     TriviaBronzeModeLeaderboard,
     TriviaFreeModeWinners,
-    TriviaModeConfig,
     TriviaSilverModeLeaderboard,
     User,
-    UserSubscription,
 )
 
 
@@ -98,61 +92,6 @@ def search_users(
     return query.order_by(User.account_id).offset(skip).limit(limit).all()
 
 
-def get_mode_config_by_id(db: Session, mode_id: str):
-    return (
-        db.query(TriviaModeConfig).filter(TriviaModeConfig.mode_id == mode_id).first()
-    )
-
-
-def get_active_subscription_prices(db: Session, user_id: int):
-    return (
-        db.query(SubscriptionPlan.unit_amount_minor, SubscriptionPlan.price_usd)
-        .join(UserSubscription)
-        .filter(
-            and_(
-                UserSubscription.user_id == user_id,
-                UserSubscription.status == "active",
-                UserSubscription.current_period_end > datetime.utcnow(),
-                or_(
-                    SubscriptionPlan.unit_amount_minor.in_([500, 1000]),
-                    SubscriptionPlan.price_usd.in_([5.0, 10.0]),
-                ),
-            )
-        )
-        .all()
-    )
-
-
-def get_badges_by_mode_ids(db: Session, mode_ids):
-    return (
-        db.query(TriviaModeConfig)
-        .filter(
-            TriviaModeConfig.mode_id.in_(mode_ids),
-            TriviaModeConfig.badge_image_url.isnot(None),
-        )
-        .all()
-    )
-
-
-def get_badge_by_mode_name_like(db: Session, name_pattern: str):
-    return (
-        db.query(TriviaModeConfig)
-        .filter(
-            TriviaModeConfig.mode_name.ilike(name_pattern),
-            TriviaModeConfig.badge_image_url.isnot(None),
-        )
-        .first()
-    )
-
-
-def get_avatar_by_id(db: Session, avatar_id: int):
-    return db.query(Avatar).filter(Avatar.id == avatar_id).first()
-
-
-def get_frame_by_id(db: Session, frame_id: int):
-    return db.query(Frame).filter(Frame.id == frame_id).first()
-
-
 def get_recent_draw_earnings_sum(db: Session, account_id: int, draw_date):
     bronze_query = select(
         TriviaBronzeModeLeaderboard.money_awarded.label("amount")
@@ -16,13 +16,15 @@ from typing import Any, Deque, Dict, Optional, Tuple
 
 import redis  # type: ignore
 from descope.descope_client import DescopeClient
-from fastapi import HTTPException, Request, UploadFile, status
+from fastapi import BackgroundTasks, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from passlib.context import CryptContext
 from redis.exceptions import ConnectionError, RedisError, TimeoutError  # type: ignore
 from sqlalchemy import func, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from core.model_events import run_after_commit
 from core.security import validate_descope_jwt
 from core.config import (
     AWS_DEFAULT_PROFILE_PIC_BASE_URL,
@@ -55,18 +57,27 @@ from utils.free_mode_rewards import (
     get_eligible_participants_free_mode,
     rank_participants_by_completion,
 )
-from utils.question_upload_service import parse_csv_questions, save_questions_to_mode
+from utils.question_upload_service import import_questions_csv
+from utils.image_derivatives import (
+    generate_cosmetic_renditions,
+    generate_profile_picture_renditions,
+)
 from utils.referrals import get_unique_referral_code
 from utils.admin_chat import ensure_admin_conversation_and_message
-from utils.storage import delete_file, presign_get, upload_file
-from utils.subscription_service import get_modes_access_status
+from utils.storage import (
+    delete_files_in_background,
+    presign_get,
+    upload_fileobj_async,
+)
+from utils.daily_user_state import get_daily_user_state
+from utils.entitlement_cache import invalidate_entitlements
 from utils.trivia_mode_service import (
     get_active_draw_date,
     get_mode_config,
     get_reset_window_status,
-    get_today_in_app_timezone,
 )
-from utils.user_level_service import count_total_correct_answers, get_level_progress
+from utils.profile_view import cosmetic_image_urls, get_profile_view
+from utils.user_level_service import get_level_progress
 
 from . import repository as auth_repository
 
@@ -1144,27 +1155,14 @@ def _ensure_gender_column(db: Session) -> None:
 
 
 def get_badge_info(user: User, db: Session):
-    if not user.badge_id:
-        return None
-    mode_config = auth_repository.get_mode_config_by_id(db, user.badge_id)
-    if not mode_config or not mode_config.badge_image_url:
-        return None
-    return {
-        "id": mode_config.mode_id,
-        "name": mode_config.mode_name,
-        "image_url": mode_config.badge_image_url,
-    }
+    view = get_profile_view(db, user.account_id)
+    return view.badge if view else None
 
 
 def get_recent_draw_earnings(user: User, db: Session) -> float:
     try:
-        active_date = get_active_draw_date()
-        today = get_today_in_app_timezone()
-        draw_date = active_date if active_date == today else active_date
-        total = auth_repository.get_recent_draw_earnings_sum(
-            db, user.account_id, draw_date
-        )
-        return round(float(total or 0.0), 2)
+        view = get_profile_view(db, user.account_id)
+        return view.recent_draw_earnings if view else 0.0
     except Exception as exc:
         logging.error(
             f"Error getting recent draw earnings for user {user.account_id}: {str(exc)}"
@@ -1173,74 +1171,8 @@ def get_recent_draw_earnings(user: User, db: Session) -> float:
 
 
 def get_subscription_badges(user: User, db: Session):
-    subscription_badges = []
-    active_subscriptions = auth_repository.get_active_subscription_prices(
-        db, user.account_id
-    )
-
-    has_bronze = any(
-        unit_amount_minor == 500 or price_usd == 5.0
-        for unit_amount_minor, price_usd in active_subscriptions
-    )
-    has_silver = any(
-        unit_amount_minor == 1000 or price_usd == 10.0
-        for unit_amount_minor, price_usd in active_subscriptions
-    )
-
-    badge_map = {}
-    if has_bronze or has_silver:
-        badge_candidates = [
-            "bronze",
-            "bronze_badge",
-            "brone_badge",
-            "brone",
-            "silver",
-            "silver_badge",
-        ]
-        badges = auth_repository.get_badges_by_mode_ids(db, badge_candidates)
-        badge_map = {badge.mode_id: badge for badge in badges}
-
-    bronze_badge = None
-    if has_bronze:
-        for mode_id in ["bronze", "bronze_badge", "brone_badge", "brone"]:
-            bronze_badge = badge_map.get(mode_id)
-            if bronze_badge:
-                break
-        if not bronze_badge:
-            bronze_badge = auth_repository.get_badge_by_mode_name_like(db, "%bronze%")
-
-    if bronze_badge and bronze_badge.badge_image_url:
-        subscription_badges.append(
-            {
-                "id": bronze_badge.mode_id,
-                "name": bronze_badge.mode_name,
-                "image_url": bronze_badge.badge_image_url,
-                "subscription_type": "bronze",
-                "price": 5.0,
-            }
-        )
-
-    silver_badge = None
-    if has_silver:
-        for mode_id in ["silver", "silver_badge"]:
-            silver_badge = badge_map.get(mode_id)
-            if silver_badge:
-                break
-        if not silver_badge:
-            silver_badge = auth_repository.get_badge_by_mode_name_like(db, "%silver%")
-
-    if silver_badge and silver_badge.badge_image_url:
-        subscription_badges.append(
-            {
-                "id": silver_badge.mode_id,
-                "name": silver_badge.mode_name,
-                "image_url": silver_badge.badge_image_url,
-                "subscription_type": "silver",
-                "price": 10.0,
-            }
-        )
-
-    return subscription_badges
+    view = get_profile_view(db, user.account_id)
+    return view.subscription_badges if view else []
 
 
 def get_user_gems(db: Session, current_user: User):
@@ -1249,17 +1181,15 @@ def get_user_gems(db: Session, current_user: User):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        badge_info = get_badge_info(user, db)
-        subscription_badges = get_subscription_badges(user, db)
-        recent_draw_earnings = get_recent_draw_earnings(user, db)
+        view = get_profile_view(db, user.account_id)
 
         return {
             "status": "success",
             "username": user.username,
             "gems": user.gems,
-            "badge": badge_info,
-            "subscription_badges": subscription_badges,
-            "recent_draw_earnings": recent_draw_earnings,
+            "badge": view.badge,
+            "subscription_badges": view.subscription_badges,
+            "recent_draw_earnings": view.recent_draw_earnings,
         }
     except HTTPException:
         raise
@@ -1321,10 +1251,6 @@ async def update_extended_profile(
                 wallet_balance_minor / 100.0 if wallet_balance_minor else 0.0
             )
 
-            total_correct = count_total_correct_answers(user, db)
-            level_info = get_level_progress(user, db, total_correct=total_correct)
-            recent_draw_earnings = get_recent_draw_earnings(user, db)
-
             return {
                 "status": "success",
                 "message": "Profile updated successfully",
@@ -1372,8 +1298,9 @@ async def update_extended_profile(
 
 async def get_complete_profile(db: Session, current_user: User):
     try:
-        user = auth_repository.get_user_by_account_id(db, current_user.account_id)
-        if not user:
+        user = current_user
+        view = get_profile_view(db, user.account_id)
+        if view is None:
             raise HTTPException(status_code=404, detail="User not found")
 
         def _safe_iso_format(value):
@@ -1388,9 +1315,6 @@ async def get_complete_profile(db: Session, current_user: User):
         dob_formatted = _safe_iso_format(user.date_of_birth)
         signup_date_formatted = _safe_iso_format(user.sign_up_date)
 
-        badge_info = get_badge_info(user, db)
-        subscription_badges = get_subscription_badges(user, db)
-
         wallet_balance_minor = (
             user.wallet_balance_minor
             if hasattr(user, "wallet_balance_minor")
@@ -1401,9 +1325,7 @@ async def get_complete_profile(db: Session, current_user: User):
             wallet_balance_minor / 100.0 if wallet_balance_minor else 0.0
         )
 
-        total_correct = count_total_correct_answers(user, db)
-        level_info = get_level_progress(user, db, total_correct=total_correct)
-        recent_draw_earnings = get_recent_draw_earnings(user, db)
+        level_info = get_level_progress(user, db, total_correct=view.total_correct)
 
         return {
             "status": "success",
@@ -1432,13 +1354,13 @@ async def get_complete_profile(db: Session, current_user: User):
                 "username_updated": user.username_updated,
                 "referral_code": user.referral_code,
                 "is_referred": bool(user.referred_by),
-                "badge": badge_info,
-                "subscription_badges": subscription_badges,
+                "badge": view.badge,
+                "subscription_badges": view.subscription_badges,
                 "total_gems": user.gems or 0,
                 "total_trivia_coins": wallet_balance_usd,
                 "level": level_info["level"],
                 "level_progress": level_info["progress"],
-                "recent_draw_earnings": recent_draw_earnings,
+                "recent_draw_earnings": view.recent_draw_earnings,
             },
         }
     except HTTPException:
@@ -1474,75 +1396,33 @@ def change_username(new_username: str, user: User, db: Session):
 
 async def get_profile_summary(db: Session, current_user: User):
     try:
-        user = auth_repository.get_user_by_account_id(db, current_user.account_id)
-        if not user:
+        user = current_user
+        view = get_profile_view(db, user.account_id)
+        if view is None:
             raise HTTPException(status_code=404, detail="User not found")
 
-        avatar_obj = None
-        frame_obj = None
-
-        if user.selected_avatar_id:
-            avatar_obj = auth_repository.get_avatar_by_id(db, user.selected_avatar_id)
-        if user.selected_frame_id:
-            frame_obj = auth_repository.get_frame_by_id(db, user.selected_frame_id)
+        avatar_url, frame_url = cosmetic_image_urls(view)
 
-        avatar_payload = None
-        if avatar_obj:
-            signed = None
-            bucket = getattr(avatar_obj, "bucket", None)
-            object_key = getattr(avatar_obj, "object_key", None)
-            if bucket and object_key:
-                try:
-                    signed = presign_get(bucket, object_key, expires=900)
-                    if not signed:
-                        logging.warning(
-                            f"presign_get returned None for avatar {avatar_obj.id} with bucket={bucket}, key={object_key}"
-                        )
-                except Exception as exc:
-                    logging.error(
-                        f"Failed to presign avatar {avatar_obj.id}: {exc}",
-                        exc_info=True,
-                    )
-            else:
+        def _cosmetic_payload(kind, item, signed):
+            if item is None:
+                return None
+            if not item["bucket"] or not item["object_key"]:
                 logging.debug(
-                    f"Avatar {avatar_obj.id} missing bucket/object_key: bucket={bucket}, object_key={object_key}"
+                    f"{kind} {item['id']} missing bucket/object_key: bucket={item['bucket']}, object_key={item['object_key']}"
                 )
-            avatar_payload = {
-                "id": avatar_obj.id,
-                "name": avatar_obj.name,
-                "url": signed,
-                "mime_type": getattr(avatar_obj, "mime_type", None),
-            }
-
-        frame_payload = None
-        if frame_obj:
-            signed = None
-            bucket = getattr(frame_obj, "bucket", None)
-            object_key = getattr(frame_obj, "object_key", None)
-            if bucket and object_key:
-                try:
-                    signed = presign_get(bucket, object_key, expires=900)
-                    if not signed:
-                        logging.warning(
-                            f"presign_get returned None for frame {frame_obj.id} with bucket={bucket}, key={object_key}"
-                        )
-                except Exception as exc:
-                    logging.error(
-                        f"Failed to presign frame {frame_obj.id}: {exc}", exc_info=True
-                    )
-            else:
-                logging.debug(
-                    f"Frame {frame_obj.id} missing bucket/object_key: bucket={bucket}, object_key={object_key}"
+            elif not signed:
+                logging.warning(
+                    f"Presigning failed for {kind.lower()} {item['id']} with bucket={item['bucket']}, key={item['object_key']}"
                 )
-            frame_payload = {
-                "id": frame_obj.id,
-                "name": frame_obj.name,
+            return {
+                "id": item["id"],
+                "name": item["name"],
                 "url": signed,
-                "mime_type": getattr(frame_obj, "mime_type", None),
+                "mime_type": item["mime_type"],
             }
 
-        badge_info = get_badge_info(user, db)
-        subscription_badges = get_subscription_badges(user, db)
+        avatar_payload = _cosmetic_payload("Avatar", view.avatar, avatar_url)
+        frame_payload = _cosmetic_payload("Frame", view.frame, frame_url)
 
         wallet_balance_minor = (
             user.wallet_balance_minor
@@ -1554,7 +1434,6 @@ async def get_profile_summary(db: Session, current_user: User):
             wallet_balance_minor / 100.0 if wallet_balance_minor else 0.0
         )
 
-        recent_draw_earnings = get_recent_draw_earnings(user, db)
         profile_pic_type = None
         if user.profile_pic_url:
             profile_pic_type = "custom"
@@ -1591,13 +1470,15 @@ async def get_profile_summary(db: Session, current_user: User):
                 "profile_pic_type": profile_pic_type,
                 "avatar": avatar_payload,
                 "frame": frame_payload,
-                "badge": badge_info,
-                "subscription_badges": subscription_badges,
+                "badge": view.badge,
+                "subscription_badges": view.subscription_badges,
                 "total_gems": user.gems or 0,
                 "total_trivia_coins": wallet_balance_usd,
                 "level": user.level if user.level else 1,
-                "level_progress": get_level_progress(user, db)["progress"],
-                "recent_draw_earnings": recent_draw_earnings,
+                "level_progress": get_level_progress(
+                    user, db, total_correct=view.total_correct
+                )["progress"],
+                "recent_draw_earnings": view.recent_draw_earnings,
             },
         }
     except HTTPException:
@@ -1648,7 +1529,19 @@ async def send_referral(db: Session, current_user: User):
         )
 
 
-async def upload_profile_picture(file: UploadFile, db: Session, current_user: User):
+def _spooled_file_size(fileobj) -> int:
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+async def upload_profile_picture(
+    file: UploadFile,
+    db: Session,
+    current_user: User,
+    background_tasks: BackgroundTasks,
+):
     try:
         if not AWS_PROFILE_PIC_BUCKET:
             raise HTTPException(
@@ -1669,9 +1562,11 @@ async def upload_profile_picture(file: UploadFile, db: Session, current_user: Us
                 detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}",
             )
 
-        file_content = await file.read()
         max_size = 5 * 1024 * 1024
-        if len(file_content) > max_size:
+        file_size = file.size
+        if file_size is None:
+            file_size = await run_in_threadpool(_spooled_file_size, file.file)
+        if file_size > max_size:
             raise HTTPException(
                 status_code=400, detail="File size exceeds maximum allowed size of 5MB"
             )
@@ -1694,17 +1589,9 @@ async def upload_profile_picture(file: UploadFile, db: Session, current_user: Us
 
         s3_key = f"profile_pic/{identifier}.jpg"
 
-        old_extensions = ["png", "jpeg", "gif", "webp"]
-        for ext in old_extensions:
-            old_key = f"profile_pic/{identifier}.{ext}"
-            if old_key != s3_key:
-                delete_file(bucket=AWS_PROFILE_PIC_BUCKET, key=old_key)
-
-        upload_success = upload_file(
-            bucket=AWS_PROFILE_PIC_BUCKET,
-            key=s3_key,
-            file_content=file_content,
-            content_type=file.content_type,
+        await file.seek(0)
+        upload_success = await upload_fileobj_async(
+            AWS_PROFILE_PIC_BUCKET, s3_key, file.file, file.content_type
         )
 
         if not upload_success:
@@ -1728,8 +1615,29 @@ async def upload_profile_picture(file: UploadFile, db: Session, current_user: Us
 
         user.selected_avatar_id = None
         user.profile_pic_url = profile_pic_url
+        # Thumbnails of the previous picture no longer apply; list screens use the
+        # original until the rendition job has recorded the new ones. The key and
+        # (time-bucketed) presigned URL repeat across uploads, so the job is tied to
+        # this upload by its own token.
+        user.profile_pic_rendition_key = None
+        user.profile_pic_upload_id = uuid.uuid4().hex
         db.commit()
 
+        background_tasks.add_task(
+            generate_profile_picture_renditions,
+            user.account_id,
+            AWS_PROFILE_PIC_BUCKET,
+            s3_key,
+            user.profile_pic_upload_id,
+        )
+
+        # Pictures uploaded under older extensions; one batched delete, off the request.
+        old_extensions = ["png", "jpeg", "gif", "webp"]
+        delete_files_in_background(
+            AWS_PROFILE_PIC_BUCKET,
+            [f"profile_pic/{identifier}.{ext}" for ext in old_extensions],
+        )
+
         badge_info = get_badge_info(user, db)
         logging.info(
             f"Profile picture uploaded successfully for user {user.account_id}"
@@ -1760,43 +1668,19 @@ def get_all_modes_status(user: User, db: Session):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    access_map = get_modes_access_status(db, user, ["free_mode", "bronze", "silver"])
-    free_mode_access = access_map.get("free_mode", {})
-    bronze_mode_access = access_map.get("bronze", {})
-    silver_mode_access = access_map.get("silver", {})
     target_date = get_active_draw_date()
+    daily_state = get_daily_user_state(db, user, target_date)
+    free_mode_access = daily_state["free_mode"]["access"]
+    bronze_mode_access = daily_state["bronze"]["access"]
+    silver_mode_access = daily_state["silver"]["access"]
     reset_status = get_reset_window_status()
     in_reset_window = reset_status["in_reset_window"]
     reset_minutes_left = reset_status["minutes_left"] if in_reset_window else 0
 
-    from routers.trivia import repository as trivia_repository
-
-    def _build_mode_progress(mode_id: str, total_questions: int):
-        if mode_id == "free_mode":
-            attempts = trivia_repository.list_free_mode_attempts(
-                db, account_id=user.account_id, target_date=target_date
-            )
-            question_orders = set(range(1, total_questions + 1))
-            answered_attempts = [
-                a
-                for a in attempts
-                if a.question_order in question_orders
-                and a.status in ["answered_correct", "answered_wrong"]
-            ]
-            questions_answered = len(answered_attempts)
-        elif mode_id == "bronze":
-            attempt = trivia_repository.get_bronze_attempt(
-                db, account_id=user.account_id, target_date=target_date
-            )
-            questions_answered = 1 if attempt and attempt.submitted_at else 0
-        elif mode_id == "silver":
-            attempt = trivia_repository.get_silver_attempt(
-                db, account_id=user.account_id, target_date=target_date
-            )
-            questions_answered = 1 if attempt and attempt.submitted_at else 0
-        else:
-            questions_answered = 0
-
+    def _build_mode_progress(mode_id: str):
+        mode_state = daily_state[mode_id]
+        total_questions = mode_state["questions_total"]
+        questions_answered = mode_state["questions_answered"]
         remaining = max(total_questions - questions_answered, 0)
         completed = questions_answered >= total_questions
         message = (
@@ -1810,15 +1694,9 @@ def get_all_modes_status(user: User, db: Session):
             "message": message,
         }
 
-    free_mode_config = get_mode_config(db, "free_mode")
-    bronze_mode_config = get_mode_config(db, "bronze")
-    silver_mode_config = get_mode_config(db, "silver")
-    free_total = free_mode_config.questions_count if free_mode_config else 3
-    bronze_total = bronze_mode_config.questions_count if bronze_mode_config else 1
-    silver_total = silver_mode_config.questions_count if silver_mode_config else 1
-    free_progress = _build_mode_progress("free_mode", free_total)
-    bronze_progress = _build_mode_progress("bronze", bronze_total)
-    silver_progress = _build_mode_progress("silver", silver_total)
+    free_progress = _build_mode_progress("free_mode")
+    bronze_progress = _build_mode_progress("bronze")
+    silver_progress = _build_mode_progress("silver")
 
     return {
         "free_mode": {
@@ -1977,23 +1855,27 @@ def create_or_update_trivia_mode(
 
 
 async def upload_questions_csv(
-    db: Session, mode_id: str, file_content: bytes, max_bytes: int
+    db: Session, mode_id: str, file: UploadFile, max_bytes: int
 ):
     mode_config = get_mode_config(db, mode_id)
     if not mode_config:
         raise HTTPException(status_code=404, detail=f"Mode '{mode_id}' not found")
 
-    if len(file_content) > max_bytes:
+    file_size = file.size
+    if file_size is None:
+        file_size = await run_in_threadpool(_spooled_file_size, file.file)
+    if file_size > max_bytes:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"CSV file too large (max {max_bytes} bytes)",
         )
 
     try:
-        questions = parse_csv_questions(file_content, mode_id)
-        result = save_questions_to_mode(db, questions, mode_id)
+        await run_in_threadpool(file.file.seek, 0)
+        result = await run_in_threadpool(import_questions_csv, db, file.file, mode_id)
         return {
             "success": True,
+            "rows_processed": result["rows_processed"],
             "saved_count": result["saved_count"],
             "duplicate_count": result["duplicate_count"],
             "error_count": result["error_count"],
@@ -2892,7 +2774,7 @@ def create_avatar(db: Session, avatar):
     return new_avatar
 
 
-def update_avatar(db: Session, avatar_id: str, avatar_update):
+def update_avatar(db: Session, avatar_id: str, avatar_update, background_tasks=None):
     avatar = auth_repository.query(db, Avatar).filter(Avatar.id == avatar_id).first()
     if not avatar:
         raise HTTPException(
@@ -2906,12 +2788,18 @@ def update_avatar(db: Session, avatar_id: str, avatar_update):
     if getattr(avatar_update, "product_type", None):
         avatar.product_type = avatar_update.product_type
     avatar.is_premium = avatar_update.is_premium
+    source = (avatar.bucket, avatar.object_key)
     avatar.bucket = avatar_update.bucket
     avatar.object_key = avatar_update.object_key
     avatar.mime_type = avatar_update.mime_type
+    source_changed = (avatar.bucket, avatar.object_key) != source
+    if source_changed:
+        avatar.rendition_key = None
 
     db.commit()
     db.refresh(avatar)
+    if source_changed:
+        _schedule_cosmetic_renditions(background_tasks, "avatars", [avatar_id])
     return avatar
 
 
@@ -2922,9 +2810,18 @@ def delete_avatar(db: Session, avatar_id: str):
             status_code=404, detail=f"Avatar with ID {avatar_id} not found"
         )
 
+    # The bulk delete skips the ORM hooks, so owners' cached entitlements are retired
+    # explicitly once the delete commits.
+    owners = {
+        user_id
+        for (user_id,) in auth_repository.query(db, UserAvatar.user_id).filter(
+            UserAvatar.avatar_id == avatar_id
+        )
+    }
     auth_repository.query(db, UserAvatar).filter(UserAvatar.avatar_id == avatar_id).delete(
         synchronize_session=False
     )
+    run_after_commit(db, invalidate_entitlements, owners)
     auth_repository.query(db, User).filter(User.selected_avatar_id == avatar_id).update(
         {User.selected_avatar_id: None}, synchronize_session=False
     )
@@ -2965,7 +2862,7 @@ def create_frame(db: Session, frame):
     return new_frame
 
 
-def update_frame(db: Session, frame_id: str, frame_update):
+def update_frame(db: Session, frame_id: str, frame_update, background_tasks=None):
     frame = auth_repository.query(db, Frame).filter(Frame.id == frame_id).first()
     if not frame:
         raise HTTPException(
@@ -2979,12 +2876,18 @@ def update_frame(db: Session, frame_id: str, frame_update):
     if getattr(frame_update, "product_type", None):
         frame.product_type = frame_update.product_type
     frame.is_premium = frame_update.is_premium
+    source = (frame.bucket, frame.object_key)
     frame.bucket = frame_update.bucket
     frame.object_key = frame_update.object_key
     frame.mime_type = frame_update.mime_type
+    source_changed = (frame.bucket, frame.object_key) != source
+    if source_changed:
+        frame.rendition_key = None
 
     db.commit()
     db.refresh(frame)
+    if source_changed:
+        _schedule_cosmetic_renditions(background_tasks, "frames", [frame_id])
     return frame
 
 
@@ -2995,9 +2898,18 @@ def delete_frame(db: Session, frame_id: str):
             status_code=404, detail=f"Frame with ID {frame_id} not found"
         )
 
+    # The bulk delete skips the ORM hooks, so owners' cached entitlements are retired
+    # explicitly once the delete commits.
+    owners = {
+        user_id
+        for (user_id,) in auth_repository.query(db, UserFrame.user_id).filter(
+            UserFrame.frame_id == frame_id
+        )
+    }
     auth_repository.query(db, UserFrame).filter(UserFrame.frame_id == frame_id).delete(
         synchronize_session=False
     )
+    run_after_commit(db, invalidate_entitlements, owners)
     auth_repository.query(db, User).filter(User.selected_frame_id == frame_id).update(
         {User.selected_frame_id: None}, synchronize_session=False
     )
@@ -3009,7 +2921,18 @@ def delete_frame(db: Session, frame_id: str):
     }
 
 
-def import_avatars_from_json(db: Session, json_data: Dict[str, Any]):
+def _schedule_cosmetic_renditions(background_tasks, kind: str, ids) -> None:
+    if not ids:
+        return
+    if background_tasks is None:
+        generate_cosmetic_renditions(kind, ids)
+        return
+    background_tasks.add_task(generate_cosmetic_renditions, kind, ids)
+
+
+def import_avatars_from_json(
+    db: Session, json_data: Dict[str, Any], background_tasks=None
+):
     if "avatars" in json_data:
         avatars = json_data.get("avatars", [])
     elif "id" in json_data and "name" in json_data:
@@ -3025,6 +2948,7 @@ def import_avatars_from_json(db: Session, json_data: Dict[str, Any]):
         }
 
     imported = 0
+    imported_ids = []
     errors = []
 
     for avatar_data in avatars:
@@ -3032,9 +2956,12 @@ def import_avatars_from_json(db: Session, json_data: Dict[str, Any]):
             avatar_id = avatar_data.get("id", str(uuid.uuid4()))
             existing = auth_repository.query(db, Avatar).filter(Avatar.id == avatar_id).first()
             if existing:
+                source = (existing.bucket, existing.object_key)
                 for key, value in avatar_data.items():
                     if key != "id" and hasattr(existing, key):
                         setattr(existing, key, value)
+                if (existing.bucket, existing.object_key) != source:
+                    existing.rendition_key = None
             else:
                 new_avatar = Avatar(
                     id=avatar_id,
@@ -3050,6 +2977,7 @@ def import_avatars_from_json(db: Session, json_data: Dict[str, Any]):
                 )
                 db.add(new_avatar)
             imported += 1
+            imported_ids.append(avatar_id)
         except Exception:
             name = avatar_data.get("name", "unknown")
             logging.error(f"Error importing avatar {name}", exc_info=True)
@@ -3067,6 +2995,8 @@ def import_avatars_from_json(db: Session, json_data: Dict[str, Any]):
             "errors": ["Database error"],
         }
 
+    _schedule_cosmetic_renditions(background_tasks, "avatars", imported_ids)
+
     return {
         "status": "success",
         "message": f"Successfully imported {imported} avatars",
@@ -3075,7 +3005,9 @@ def import_avatars_from_json(db: Session, json_data: Dict[str, Any]):
     }
 
 
-def import_frames_from_json(db: Session, json_data: Dict[str, Any]):
+def import_frames_from_json(
+    db: Session, json_data: Dict[str, Any], background_tasks=None
+):
     if "frames" in json_data:
         frames = json_data.get("frames", [])
     elif "id" in json_data and "name" in json_data:
@@ -3091,6 +3023,7 @@ def import_frames_from_json(db: Session, json_data: Dict[str, Any]):
         }
 
     imported = 0
+    imported_ids = []
     errors = []
 
     for frame_data in frames:
@@ -3098,9 +3031,12 @@ def import_frames_from_json(db: Session, json_data: Dict[str, Any]):
             frame_id = frame_data.get("id", str(uuid.uuid4()))
             existing = auth_repository.query(db, Frame).filter(Frame.id == frame_id).first()
             if existing:
+                source = (existing.bucket, existing.object_key)
                 for key, value in frame_data.items():
                     if key != "id" and hasattr(existing, key):
                         setattr(existing, key, value)
+                if (existing.bucket, existing.object_key) != source:
+                    existing.rendition_key = None
             else:
                 new_frame = Frame(
                     id=frame_id,
@@ -3116,6 +3052,7 @@ def import_frames_from_json(db: Session, json_data: Dict[str, Any]):
                 )
                 db.add(new_frame)
             imported += 1
+            imported_ids.append(frame_id)
         except Exception:
             name = frame_data.get("name", "unknown")
             logging.error(f"Error importing frame {name}", exc_info=True)
@@ -3133,6 +3070,8 @@ def import_frames_from_json(db: Session, json_data: Dict[str, Any]):
             "errors": ["Database error"],
         }
 
+    _schedule_cosmetic_renditions(background_tasks, "frames", imported_ids)
+
     return {
         "status": "success",
         "message": f"Successfully imported {imported} frames",
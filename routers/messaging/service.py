@@ -1197,17 +1197,9 @@ def _get_user_presence_info(db, *, user_id: int, conversation_id: Optional[int]
 
 
 def _batch_get_user_profile_data(users, db):
-    from sqlalchemy import and_
-    from sqlalchemy.orm import joinedload
-
-    from models import (
-        Avatar,
-        Frame,
-        SubscriptionPlan,
-        TriviaModeConfig,
-        UserSubscription,
-    )
-    from utils.storage import presign_get
+    from models import Avatar, Frame
+    from utils.storage import presign_many
+    from utils.subscription_badges import get_badge_definitions, get_subscription_tiers
     from utils.user_level_service import get_level_progress_for_users
 
     if not users:
@@ -1246,91 +1238,23 @@ def _batch_get_user_profile_data(users, db):
             for f in messaging_repository.query(db, Frame).filter(Frame.id.in_(list(frame_ids))).all()
         }
 
-    badge_ids = {u.badge_id for u in users if u.badge_id}
-    badges = {}
-    if badge_ids:
-        mode_configs = (
-            messaging_repository.query(db, TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_id.in_(list(badge_ids)),
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .all()
-        )
-        badges = {mc.mode_id: mc for mc in mode_configs}
-
-    active_subscriptions = {}
-    if user_ids:
-        subs = (
-            messaging_repository.query(db, UserSubscription)
-            .options(joinedload(UserSubscription.plan))
-            .join(SubscriptionPlan)
-            .filter(
-                and_(
-                    UserSubscription.user_id.in_(list(user_ids)),
-                    UserSubscription.status == "active",
-                    UserSubscription.current_period_end > datetime.utcnow(),
-                )
-            )
-            .all()
-        )
-        for sub in subs:
-            active_subscriptions.setdefault(sub.user_id, []).append(sub)
-
-    subscription_badge_ids = [
-        "bronze",
-        "bronze_badge",
-        "brone_badge",
-        "brone",
-        "silver",
-        "silver_badge",
-    ]
-    subscription_badges_dict = {
-        mc.mode_id: mc
-        for mc in messaging_repository.query(db, TriviaModeConfig)
-        .filter(
-            TriviaModeConfig.mode_id.in_(list(subscription_badge_ids)),
-            TriviaModeConfig.badge_image_url.isnot(None),
-        )
-        .all()
+    badge_definitions = get_badge_definitions(db)
+    subscription_tiers = get_subscription_tiers(db, user_ids)
+
+    presigned = presign_many(
+        (getattr(obj, "bucket", None), getattr(obj, "object_key", None))
+        for obj in list(avatars.values()) + list(frames.values())
+    )
+    presigned_avatars = {
+        avatar_id: presigned.get((avatar.bucket, avatar.object_key))
+        for avatar_id, avatar in avatars.items()
+        if getattr(avatar, "bucket", None) and getattr(avatar, "object_key", None)
     }
-    name_based_badges = {
-        mc.mode_id: mc
-        for mc in messaging_repository.query(db, TriviaModeConfig)
-        .filter(
-            (
-                TriviaModeConfig.mode_name.ilike("%bronze%")
-                | TriviaModeConfig.mode_name.ilike("%silver%")
-            ),
-            TriviaModeConfig.badge_image_url.isnot(None),
-        )
-        .all()
+    presigned_frames = {
+        frame_id: presigned.get((frame.bucket, frame.object_key))
+        for frame_id, frame in frames.items()
+        if getattr(frame, "bucket", None) and getattr(frame, "object_key", None)
     }
-    subscription_badges_dict.update(name_based_badges)
-
-    presigned_avatars = {}
-    presigned_frames = {}
-    for avatar_id, avatar in avatars.items():
-        bucket = getattr(avatar, "bucket", None)
-        object_key = getattr(avatar, "object_key", None)
-        if bucket and object_key:
-            try:
-                presigned_avatars[avatar_id] = presign_get(
-                    bucket, object_key, expires=900
-                )
-            except Exception as exc:
-                logger.warning(f"Failed to presign avatar {avatar_id}: {exc}")
-
-    for frame_id, frame in frames.items():
-        bucket = getattr(frame, "bucket", None)
-        object_key = getattr(frame, "object_key", None)
-        if bucket and object_key:
-            try:
-                presigned_frames[frame_id] = presign_get(
-                    bucket, object_key, expires=900
-                )
-            except Exception as exc:
-                logger.warning(f"Failed to presign frame {frame_id}: {exc}")
 
     level_progress_map = get_level_progress_for_users(users, db)
 
@@ -1343,70 +1267,10 @@ def _batch_get_user_profile_data(users, db):
         if user.selected_frame_id and user.selected_frame_id in presigned_frames:
             frame_url = presigned_frames[user.selected_frame_id]
 
-        badge_info = None
-        if user.badge_id and user.badge_id in badges:
-            mode_config = badges[user.badge_id]
-            badge_info = {
-                "id": mode_config.mode_id,
-                "name": mode_config.mode_name,
-                "image_url": mode_config.badge_image_url,
-            }
-
-        subscription_badges = []
-        user_subs = active_subscriptions.get(user.account_id, [])
-        for sub in user_subs:
-            plan = sub.plan
-            if not plan:
-                continue
-
-            if (
-                getattr(plan, "unit_amount_minor", None) == 500
-                or getattr(plan, "price_usd", None) == 5.0
-            ):
-                bronze_badge = (
-                    subscription_badges_dict.get("bronze")
-                    or subscription_badges_dict.get("bronze_badge")
-                    or subscription_badges_dict.get("brone_badge")
-                    or subscription_badges_dict.get("brone")
-                )
-                if not bronze_badge:
-                    for _, mc in subscription_badges_dict.items():
-                        if "bronze" in mc.mode_name.lower():
-                            bronze_badge = mc
-                            break
-                if bronze_badge and bronze_badge.badge_image_url:
-                    subscription_badges.append(
-                        {
-                            "id": bronze_badge.mode_id,
-                            "name": bronze_badge.mode_name,
-                            "image_url": bronze_badge.badge_image_url,
-                            "subscription_type": "bronze",
-                            "price": 5.0,
-                        }
-                    )
-
-            if (
-                getattr(plan, "unit_amount_minor", None) == 1000
-                or getattr(plan, "price_usd", None) == 10.0
-            ):
-                silver_badge = subscription_badges_dict.get(
-                    "silver"
-                ) or subscription_badges_dict.get("silver_badge")
-                if not silver_badge:
-                    for _, mc in subscription_badges_dict.items():
-                        if "silver" in mc.mode_name.lower():
-                            silver_badge = mc
-                            break
-                if silver_badge and silver_badge.badge_image_url:
-                    subscription_badges.append(
-                        {
-                            "id": silver_badge.mode_id,
-                            "name": silver_badge.mode_name,
-                            "image_url": silver_badge.badge_image_url,
-                            "subscription_type": "silver",
-                            "price": 10.0,
-                        }
-                    )
+        badge_info = badge_definitions.badge(user.badge_id)
+        subscription_badges = badge_definitions.subscription_badges(
+            subscription_tiers.get(user.account_id, ())
+        )
 
         level_progress = level_progress_map.get(
             user.account_id,
@@ -1,10 +1,11 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Header, Path, Query
 from sqlalchemy.orm import Session
 
 from core.db import get_db
 from routers.dependencies import get_current_user
+from utils.catalog_snapshot import catalog_snapshot_response
 
 from .schemas import (
     AvatarResponse,
@@ -34,14 +35,16 @@ def get_all_avatars(
     skip: int = 0,
     limit: int = 100,
     include_urls: bool = Query(True, description="Include presigned URLs"),
+    if_none_match: Optional[str] = Header(None),
 ):
-    return service_list_avatars(
+    snapshot = service_list_avatars(
         db,
         current_user=current_user,
         skip=skip,
         limit=limit,
         include_urls=include_urls,
     )
+    return catalog_snapshot_response(snapshot, if_none_match)
 
 
 @router.get("/avatars/owned", response_model=List[UserCosmeticResponse])
@@ -86,14 +89,16 @@ def get_all_frames(
     skip: int = 0,
     limit: int = 100,
     include_urls: bool = Query(True, description="Include presigned URLs"),
+    if_none_match: Optional[str] = Header(None),
 ):
-    return service_list_frames(
+    snapshot = service_list_frames(
         db,
         current_user=current_user,
         skip=skip,
         limit=limit,
         include_urls=include_urls,
     )
+    return catalog_snapshot_response(snapshot, if_none_match)
 
 
 @router.get("/frames/owned", response_model=List[UserCosmeticResponse])
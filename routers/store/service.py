@@ -1,14 +1,22 @@
 """Store/Cosmetics service layer."""
 
 from datetime import datetime
+from typing import List
 
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 
-from core.cache import default_cache
-from utils.storage import presign_get
+from utils.catalog_snapshot import CatalogSnapshot, get_catalog_snapshot
+from utils.entitlement_cache import get_entitlements
+from utils.storage import presign_bucket_end, presign_get, presign_many
 
 from . import repository as store_repository
-from .schemas import GemPackageResponse, PurchaseResponse
+from .schemas import AvatarResponse, FrameResponse, GemPackageResponse, PurchaseResponse
+
+# Catalog listings are serialized once per snapshot through their response models.
+_gem_packages_adapter = TypeAdapter(List[GemPackageResponse])
+_avatars_adapter = TypeAdapter(List[AvatarResponse])
+_frames_adapter = TypeAdapter(List[FrameResponse])
 
 
 def buy_gems_with_wallet(db, user, package_id: int) -> PurchaseResponse:
@@ -38,15 +46,13 @@ def buy_gems_with_wallet(db, user, package_id: int) -> PurchaseResponse:
         )
 
     if gem_package.is_one_time:
-        existing_purchase = store_repository.get_user_gem_purchase(
-            db, user_id=user.account_id, package_id=gem_package.id
-        )
-        if existing_purchase:
+        purchased_at = get_entitlements(db, user.account_id).packages.get(gem_package.id)
+        if purchased_at:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=(
                     "You have already purchased this one-time offer on "
-                    f"{existing_purchase.purchase_date}"
+                    f"{purchased_at}"
                 ),
             )
 
@@ -86,14 +92,15 @@ def buy_gems_with_wallet(db, user, package_id: int) -> PurchaseResponse:
     )
 
 
-def get_gem_packages(db):
+def get_gem_packages(db) -> CatalogSnapshot:
     def _build():
         packages = store_repository.list_gem_packages(db)
+        presigned = presign_many((pkg.bucket, pkg.object_key) for pkg in packages)
         result = []
         for pkg in packages:
             signed_url = None
             if pkg.bucket and pkg.object_key:
-                signed_url = presign_get(pkg.bucket, pkg.object_key, expires=900)
+                signed_url = presigned.get((pkg.bucket, pkg.object_key))
 
             price_minor = pkg.price_minor if pkg.price_minor is not None else 0
             price_usd_display = price_minor / 100.0 if price_minor else 0.0
@@ -112,29 +119,33 @@ def get_gem_packages(db):
                     updated_at=pkg.updated_at,
                 )
             )
-        return result
-
-    return default_cache.get_or_set("store:gem_packages:v1", ttl_seconds=60, factory=_build)
+        return _gem_packages_adapter.dump_json(result)
 
+    return get_catalog_snapshot(
+        "gem_packages", None, _build, expires_at=presign_bucket_end()
+    )
 
-def list_avatars(db, *, current_user, skip: int, limit: int, include_urls: bool):
-    key = f"store:avatars:v1:skip={skip}:limit={limit}:urls={int(bool(include_urls))}"
 
+def list_avatars(
+    db, *, current_user, skip: int, limit: int, include_urls: bool
+) -> CatalogSnapshot:
     def _build():
         avatars = store_repository.list_avatars(db, skip=skip, limit=limit)
         out = []
-        presign_cache = {}
+        presigned = (
+            presign_many(
+                (getattr(av, "bucket", None), getattr(av, "object_key", None))
+                for av in avatars
+            )
+            if include_urls
+            else {}
+        )
         for av in avatars:
             signed = None
             bucket = getattr(av, "bucket", None)
             object_key = getattr(av, "object_key", None)
             if include_urls and bucket and object_key:
-                cache_key = (bucket, object_key)
-                if cache_key in presign_cache:
-                    signed = presign_cache[cache_key]
-                else:
-                    signed = presign_get(bucket, object_key, expires=900)
-                    presign_cache[cache_key] = signed
+                signed = presigned.get((bucket, object_key))
 
             out.append(
                 {
@@ -153,26 +164,35 @@ def list_avatars(db, *, current_user, skip: int, limit: int, include_urls: bool)
                     "url": signed,
                 }
             )
-        return out
+        return _avatars_adapter.dump_json(_avatars_adapter.validate_python(out))
 
-    return default_cache.get_or_set(key, ttl_seconds=60, factory=_build)
+    return get_catalog_snapshot(
+        "avatars",
+        (skip, limit, bool(include_urls)),
+        _build,
+        expires_at=presign_bucket_end() if include_urls else None,
+    )
 
 
 def list_owned_avatars(db, *, current_user, include_urls: bool):
+    if not get_entitlements(db, current_user.account_id).avatars:
+        return []
     rows = store_repository.list_user_owned_avatars(db, user_id=current_user.account_id)
     out = []
-    presign_cache = {}
+    presigned = (
+        presign_many(
+            (getattr(av, "bucket", None), getattr(av, "object_key", None))
+            for av, _ in rows
+        )
+        if include_urls
+        else {}
+    )
     for av, purchased_at in rows:
         signed = None
         bucket = getattr(av, "bucket", None)
         object_key = getattr(av, "object_key", None)
         if include_urls and bucket and object_key:
-            cache_key = (bucket, object_key)
-            if cache_key in presign_cache:
-                signed = presign_cache[cache_key]
-            else:
-                signed = presign_get(bucket, object_key, expires=900)
-                presign_cache[cache_key] = signed
+            signed = presigned.get((bucket, object_key))
         out.append(
             {
                 "id": av.id,
@@ -201,15 +221,13 @@ def buy_avatar(db, *, current_user, avatar_id: str, payment_method: str):
             detail=f"Avatar with ID {avatar_id} not found",
         )
 
-    existing = store_repository.get_user_avatar_ownership(
-        db, user_id=current_user.account_id, avatar_id=avatar_id
-    )
-    if existing:
+    purchased_at = get_entitlements(db, current_user.account_id).avatars.get(avatar_id)
+    if purchased_at:
         return {
             "status": "error",
             "message": f"You already own the avatar '{avatar.name}'",
             "item_id": avatar_id,
-            "purchase_date": existing.purchase_date,
+            "purchase_date": purchased_at,
         }
 
     if payment_method == "gems":
@@ -285,16 +303,15 @@ def select_avatar(db, *, current_user, avatar_id: str):
             detail=f"Avatar with ID {avatar_id} not found",
         )
 
-    ownership = store_repository.get_user_avatar_ownership(
-        db, user_id=current_user.account_id, avatar_id=avatar_id
-    )
-    if not ownership:
+    if avatar_id not in get_entitlements(db, current_user.account_id).avatars:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"You don't own the avatar with ID {avatar_id}",
         )
 
     current_user.profile_pic_url = None
+    current_user.profile_pic_rendition_key = None
+    current_user.profile_pic_upload_id = None
     current_user.selected_avatar_id = avatar_id
     db.commit()
 
@@ -305,24 +322,26 @@ def select_avatar(db, *, current_user, avatar_id: str):
     }
 
 
-def list_frames(db, *, current_user, skip: int, limit: int, include_urls: bool):
-    key = f"store:frames:v1:skip={skip}:limit={limit}:urls={int(bool(include_urls))}"
-
+def list_frames(
+    db, *, current_user, skip: int, limit: int, include_urls: bool
+) -> CatalogSnapshot:
     def _build():
         frames = store_repository.list_frames(db, skip=skip, limit=limit)
         out = []
-        presign_cache = {}
+        presigned = (
+            presign_many(
+                (getattr(fr, "bucket", None), getattr(fr, "object_key", None))
+                for fr in frames
+            )
+            if include_urls
+            else {}
+        )
         for fr in frames:
             signed = None
             bucket = getattr(fr, "bucket", None)
             object_key = getattr(fr, "object_key", None)
             if include_urls and bucket and object_key:
-                cache_key = (bucket, object_key)
-                if cache_key in presign_cache:
-                    signed = presign_cache[cache_key]
-                else:
-                    signed = presign_get(bucket, object_key, expires=900)
-                    presign_cache[cache_key] = signed
+                signed = presigned.get((bucket, object_key))
 
             out.append(
                 {
@@ -341,9 +360,14 @@ def list_frames(db, *, current_user, skip: int, limit: int, include_urls: bool):
                     "url": signed,
                 }
             )
-        return out
+        return _frames_adapter.dump_json(_frames_adapter.validate_python(out))
 
-    return default_cache.get_or_set(key, ttl_seconds=60, factory=_build)
+    return get_catalog_snapshot(
+        "frames",
+        (skip, limit, bool(include_urls)),
+        _build,
+        expires_at=presign_bucket_end() if include_urls else None,
+    )
     frames = store_repository.list_frames(db, skip=skip, limit=limit)
     out = []
     presign_cache = {}
@@ -379,20 +403,24 @@ def list_frames(db, *, current_user, skip: int, limit: int, include_urls: bool):
 
 
 def list_owned_frames(db, *, current_user, include_urls: bool):
+    if not get_entitlements(db, current_user.account_id).frames:
+        return []
     rows = store_repository.list_user_owned_frames(db, user_id=current_user.account_id)
     out = []
-    presign_cache = {}
+    presigned = (
+        presign_many(
+            (getattr(fr, "bucket", None), getattr(fr, "object_key", None))
+            for fr, _ in rows
+        )
+        if include_urls
+        else {}
+    )
     for fr, purchased_at in rows:
         signed = None
         bucket = getattr(fr, "bucket", None)
         object_key = getattr(fr, "object_key", None)
         if include_urls and bucket and object_key:
-            cache_key = (bucket, object_key)
-            if cache_key in presign_cache:
-                signed = presign_cache[cache_key]
-            else:
-                signed = presign_get(bucket, object_key, expires=900)
-                presign_cache[cache_key] = signed
+            signed = presigned.get((bucket, object_key))
         out.append(
             {
                 "id": fr.id,
@@ -421,15 +449,13 @@ def buy_frame(db, *, current_user, frame_id: str, payment_method: str):
             detail=f"Frame with ID {frame_id} not found",
         )
 
-    existing = store_repository.get_user_frame_ownership(
-        db, user_id=current_user.account_id, frame_id=frame_id
-    )
-    if existing:
+    purchased_at = get_entitlements(db, current_user.account_id).frames.get(frame_id)
+    if purchased_at:
         return {
             "status": "error",
             "message": f"You already own the frame '{frame.name}'",
             "item_id": frame_id,
-            "purchase_date": existing.purchase_date,
+            "purchase_date": purchased_at,
         }
 
     if payment_method == "gems":
@@ -505,10 +531,7 @@ def select_frame(db, *, current_user, frame_id: str):
             detail=f"Frame with ID {frame_id} not found",
         )
 
-    ownership = store_repository.get_user_frame_ownership(
-        db, user_id=current_user.account_id, frame_id=frame_id
-    )
-    if not ownership:
+    if frame_id not in get_entitlements(db, current_user.account_id).frames:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"You don't own the frame with ID {frame_id}",
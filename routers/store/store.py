@@ -1,10 +1,11 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
 
 from core.db import get_db
 from routers.dependencies import get_current_user
+from utils.catalog_snapshot import catalog_snapshot_response
 
 from .schemas import BuyGemsRequest, GemPackageResponse, PurchaseResponse
 from .service import buy_gems_with_wallet as service_buy_gems_with_wallet
@@ -27,7 +28,9 @@ async def buy_gems_with_wallet(
 
 @router.get("/gem-packages", response_model=List[GemPackageResponse])
 async def get_gem_packages(
-    user = Depends(get_current_user), db: Session = Depends(get_db)
+    user = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
 ):
     """Get all available gem packages with presigned URLs for images"""
-    return service_get_gem_packages(db)
+    return catalog_snapshot_response(service_get_gem_packages(db), if_none_match)
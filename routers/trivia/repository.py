@@ -1,5 +1,7 @@
 """Trivia/Draws/Rewards repository layer."""
 
+from typing import Optional, Tuple
+
 from sqlalchemy.orm import Session
 
 
@@ -63,18 +65,34 @@ def list_mode_leaderboard_entries(db: Session, *, leaderboard_model, draw_date):
     )
 
 
-def try_advisory_lock(db: Session, *, key: int) -> bool:
-    from sqlalchemy import text
+def try_advisory_lock(db: Session, *, key: int):
+    """Take a transaction-scoped advisory lock on a dedicated connection.
 
-    return bool(
-        db.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
-    )
+    Returns the connection holding the lock (its open transaction keeps the lock,
+    which stays correct behind PgBouncer in transaction mode, unlike a session lock
+    that could be released on a different backend), or None if the lock is taken.
+    """
+    from sqlalchemy import text
 
+    conn = db.get_bind().connect()
+    try:
+        conn.begin()
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}
+        ).scalar()
+    except Exception:
+        conn.close()
+        raise
+    if not acquired:
+        conn.close()
+        return None
+    return conn
 
-def advisory_unlock(db: Session, *, key: int) -> None:
-    from sqlalchemy import text
 
-    db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+def advisory_unlock(lock_conn) -> None:
+    # Ending the transaction releases the lock.
+    lock_conn.rollback()
+    lock_conn.close()
 
 
 def get_user_daily_rewards_for_week(db: Session, account_id: int, week_start_date):
@@ -540,7 +558,8 @@ def get_any_silver_winner_for_draw(db: Session, *, draw_date):
     return db.query(TriviaSilverModeWinners).filter(TriviaSilverModeWinners.draw_date == draw_date).first()
 
 
-def list_onesignal_players_for_reminder(db: Session, *, only_incomplete_users: bool, active_draw_date):
+def _filter_reminder_players(query, *, only_incomplete_users: bool, active_draw_date):
+    """Valid players of users who have not opted out (and, optionally, not finished today)."""
     from sqlalchemy import select, union_all
 
     from models import (
@@ -548,13 +567,15 @@ def list_onesignal_players_for_reminder(db: Session, *, only_incomplete_users: b
         TriviaUserBronzeModeDaily,
         TriviaUserFreeModeDaily,
         TriviaUserSilverModeDaily,
+        User,
     )
 
-    base_q = db.query(OneSignalPlayer.player_id, OneSignalPlayer.user_id).filter(
-        OneSignalPlayer.is_valid == True
+    query = query.join(User, User.account_id == OneSignalPlayer.user_id).filter(
+        OneSignalPlayer.is_valid == True,
+        User.notification_on.isnot(False),
     )
     if not only_incomplete_users:
-        return base_q
+        return query
 
     free_q = select(TriviaUserFreeModeDaily.account_id).where(
         TriviaUserFreeModeDaily.date == active_draw_date,
@@ -570,11 +591,53 @@ def list_onesignal_players_for_reminder(db: Session, *, only_incomplete_users: b
     )
 
     correct_user_ids_subq = union_all(free_q, bronze_q, silver_q).subquery()
-    return base_q.filter(
+    return query.filter(
         ~OneSignalPlayer.user_id.in_(select(correct_user_ids_subq.c.account_id))
     )
 
 
+def list_onesignal_players_for_reminder(db: Session, *, only_incomplete_users: bool, active_draw_date):
+    from models import OneSignalPlayer
+
+    return _filter_reminder_players(
+        db.query(OneSignalPlayer.player_id, OneSignalPlayer.user_id),
+        only_incomplete_users=only_incomplete_users,
+        active_draw_date=active_draw_date,
+    )
+
+
+def list_reminder_players_page(
+    db: Session,
+    *,
+    only_incomplete_users: bool,
+    active_draw_date,
+    after: Optional[Tuple[int, int]],
+    limit: int,
+):
+    """
+    Keyset page of reminder recipients ordered by (user_id, id).
+
+    `after` is the (user_id, id) of the last row already handed out, so every page is
+    an index range scan regardless of how far the job has progressed.
+    """
+    from sqlalchemy import tuple_
+
+    from models import OneSignalPlayer
+
+    query = _filter_reminder_players(
+        db.query(OneSignalPlayer.id, OneSignalPlayer.user_id, OneSignalPlayer.player_id),
+        only_incomplete_users=only_incomplete_users,
+        active_draw_date=active_draw_date,
+    )
+    if after is not None:
+        query = query.filter(
+            tuple_(OneSignalPlayer.user_id, OneSignalPlayer.id) > tuple_(*after)
+        )
+    return (
+        query.order_by(OneSignalPlayer.user_id, OneSignalPlayer.id).limit(limit).all()
+    )
+
+
 def list_valid_onesignal_players_excluding_user(db: Session, *, excluded_user_id: int):
     from models import OneSignalPlayer
 
@@ -2,13 +2,21 @@
 
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import hashlib
 import json
+import logging
 
 from utils.draw_calculations import get_next_draw_time
+from utils.job_checkpoint import clear_checkpoint, load_checkpoint, save_checkpoint
+from utils.prize_pool_snapshot import get_mode_prize_pool_snapshot
 from utils.trivia_mode_service import get_today_in_app_timezone
 
 from . import repository as trivia_repository
 
+logger = logging.getLogger(__name__)
+
+
 def get_next_draw_with_prize_pool(db, current_user=None):
     next_draw_time = get_next_draw_time()
 
@@ -49,12 +57,12 @@ def _get_mode_prize_pools(db):
     """
     Best-effort mode-wise pools for display/telemetry.
 
-    - Bronze/Silver use the subscription-derived pool from `rewards_logic.calculate_mode_prize_pool`.
+    - Bronze/Silver use the subscription-derived pool from `rewards_logic.calculate_mode_prize_pool`,
+      read from the daily snapshot (recomputed per draw date and on subscription changes).
     """
-    from rewards_logic import calculate_mode_prize_pool
-
-    bronze_calc = calculate_mode_prize_pool(db, get_today_in_app_timezone(), "bronze")
-    silver_calc = calculate_mode_prize_pool(db, get_today_in_app_timezone(), "silver")
+    snapshot = get_mode_prize_pool_snapshot(db, get_today_in_app_timezone())
+    bronze_calc = snapshot.get("bronze") or {}
+    silver_calc = snapshot.get("silver") or {}
 
     return {
         "bronze": {
@@ -771,7 +779,11 @@ async def trivia_live_chat_get_messages(db, *, current_user, limit: int):
     active_viewers = trivia_repository.count_trivia_live_chat_active_viewers(
         db, draw_date=draw_date, cutoff_dt=cutoff_time
     )
-    total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
+    from utils.trivia_live_chat_likes import get_session_like_count
+
+    total_likes = get_session_like_count(db, draw_date=draw_date)
+    if total_likes is None:
+        total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
 
     reply_message_ids = {msg.reply_to_message_id for msg in messages if msg.reply_to_message_id}
     replied_messages = {}
@@ -899,6 +911,19 @@ async def trivia_live_chat_debug_config():
     }
 
 
+def _trivia_live_like_state(db, *, user_id: int, draw_date):
+    from utils.trivia_live_chat_likes import get_session_like_state
+
+    state = get_session_like_state(db, user_id=user_id, draw_date=draw_date)
+    if state is not None:
+        return state
+    total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
+    user_liked = trivia_repository.has_trivia_live_chat_session_like(
+        db, user_id=user_id, draw_date=draw_date
+    )
+    return total_likes, user_liked
+
+
 async def trivia_live_chat_status(db, *, current_user):
     from config import TRIVIA_LIVE_CHAT_ENABLED
     from fastapi import HTTPException, status
@@ -932,8 +957,7 @@ async def trivia_live_chat_status(db, *, current_user):
     else:
         draw_date = next_draw_time.astimezone(pytz.UTC).replace(tzinfo=None).date()
 
-    total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
-    user_liked = trivia_repository.has_trivia_live_chat_session_like(
+    total_likes, user_liked = _trivia_live_like_state(
         db, user_id=current_user.account_id, draw_date=draw_date
     )
     info["like_count"] = total_likes
@@ -941,7 +965,7 @@ async def trivia_live_chat_status(db, *, current_user):
     return info
 
 
-async def trivia_live_chat_like(db, *, current_user):
+async def trivia_live_chat_like(db, *, current_user, background_tasks=None):
     import os
     from datetime import datetime, timedelta
 
@@ -953,9 +977,8 @@ async def trivia_live_chat_like(db, *, current_user):
         TRIVIA_LIVE_CHAT_POST_HOURS,
         TRIVIA_LIVE_CHAT_PRE_HOURS,
     )
-    from models import TriviaLiveChatLike
     from utils.draw_calculations import get_next_draw_time
-    from utils.pusher_client import publish_chat_message_sync
+    from utils.trivia_live_chat_likes import add_session_like
 
     if not TRIVIA_LIVE_CHAT_ENABLED:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Trivia live chat is disabled")
@@ -975,33 +998,114 @@ async def trivia_live_chat_like(db, *, current_user):
     else:
         draw_date = next_draw_time.astimezone(pytz.UTC).replace(tzinfo=None).date()
 
-    existing_like = trivia_repository.get_trivia_live_chat_session_like(
-        db, user_id=current_user.account_id, draw_date=draw_date
-    )
-    total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
-    if existing_like:
-        return {"message": "Already liked", "total_likes": total_likes, "already_liked": True, "draw_date": draw_date.isoformat()}
+    counter = add_session_like(db, user_id=current_user.account_id, draw_date=draw_date)
+    if counter is not None:
+        added, total_likes = counter
+        if not added:
+            return {"message": "Already liked", "total_likes": total_likes, "already_liked": True, "draw_date": draw_date.isoformat()}
+        _schedule_trivia_live_like_persist(
+            background_tasks, user_id=current_user.account_id, draw_date=draw_date
+        )
+    else:
+        existing_like = trivia_repository.get_trivia_live_chat_session_like(
+            db, user_id=current_user.account_id, draw_date=draw_date
+        )
+        if existing_like:
+            total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
+            return {"message": "Already liked", "total_likes": total_likes, "already_liked": True, "draw_date": draw_date.isoformat()}
 
-    trivia_repository.create_trivia_live_chat_session_like(
-        db, user_id=current_user.account_id, draw_date=draw_date
-    )
-    db.commit()
+        trivia_repository.create_trivia_live_chat_session_like(
+            db, user_id=current_user.account_id, draw_date=draw_date
+        )
+        db.commit()
+        total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
 
-    total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
+    _schedule_trivia_live_like_broadcast(background_tasks, draw_date=draw_date)
+
+    return {"message": "Trivia live chat liked successfully", "total_likes": total_likes, "already_liked": False, "draw_date": draw_date.isoformat()}
+
+
+def persist_trivia_live_chat_session_like(user_id: int, draw_date) -> None:
+    """Write a like already recorded in the Redis counter to `TriviaLiveChatLike`."""
+    from db import get_db
+
+    draw_date_val = _ensure_date(draw_date)
+    db = next(get_db())
     try:
-        publish_chat_message_sync(
-            "trivia-live-chat",
-            "like-update",
-            {
-                "draw_date": draw_date.isoformat(),
-                "total_likes": total_likes,
-                "user_id": current_user.account_id,
-            },
+        if trivia_repository.has_trivia_live_chat_session_like(
+            db, user_id=user_id, draw_date=draw_date_val
+        ):
+            return
+        trivia_repository.create_trivia_live_chat_session_like(
+            db, user_id=user_id, draw_date=draw_date_val
         )
+        db.commit()
     except Exception:
-        pass
+        db.rollback()
+        logger.warning(
+            "Failed to persist trivia live like user=%s draw_date=%s",
+            user_id,
+            draw_date_val,
+            exc_info=True,
+        )
+    finally:
+        db.close()
 
-    return {"message": "Trivia live chat liked successfully", "total_likes": total_likes, "already_liked": False, "draw_date": draw_date.isoformat()}
+
+def _schedule_trivia_live_like_persist(background_tasks, *, user_id: int, draw_date) -> None:
+    import os
+
+    if background_tasks is None:
+        persist_trivia_live_chat_session_like(user_id, draw_date)
+        return
+    if os.getenv("USE_WORKER_QUEUE", "false").lower() == "true":
+        from core.queue import enqueue_task
+
+        background_tasks.add_task(
+            enqueue_task,
+            name="trivia.persist_live_chat_like",
+            payload={"user_id": user_id, "draw_date": draw_date.isoformat()},
+        )
+    else:
+        background_tasks.add_task(persist_trivia_live_chat_session_like, user_id, draw_date)
+
+
+async def broadcast_trivia_live_like_update(draw_date) -> None:
+    """Publish one `like-update` with the latest total at the end of a throttle window."""
+    import asyncio
+
+    from config import TRIVIA_LIVE_CHAT_LIKE_BROADCAST_INTERVAL_MS
+    from db import get_db
+    from utils.pusher_client import publish_chat_message_async
+    from utils.trivia_live_chat_likes import read_session_like_count
+
+    await asyncio.sleep(TRIVIA_LIVE_CHAT_LIKE_BROADCAST_INTERVAL_MS / 1000.0)
+    total_likes = read_session_like_count(draw_date)
+    if total_likes is None:
+        db = next(get_db())
+        try:
+            total_likes = trivia_repository.count_trivia_live_chat_session_likes(
+                db, draw_date=draw_date
+            )
+        finally:
+            db.close()
+    await publish_chat_message_async(
+        "trivia-live-chat",
+        "like-update",
+        {"draw_date": draw_date.isoformat(), "total_likes": total_likes},
+    )
+
+
+def _schedule_trivia_live_like_broadcast(background_tasks, *, draw_date) -> None:
+    from config import TRIVIA_LIVE_CHAT_LIKE_BROADCAST_INTERVAL_MS
+    from utils.trivia_live_chat_likes import claim_like_broadcast_slot
+
+    if background_tasks is None:
+        return
+    if claim_like_broadcast_slot(
+        draw_date, interval_ms=TRIVIA_LIVE_CHAT_LIKE_BROADCAST_INTERVAL_MS
+    ):
+        background_tasks.add_task(broadcast_trivia_live_like_update, draw_date)
 
 
 async def trivia_live_chat_get_likes(db, *, current_user):
@@ -1037,8 +1141,7 @@ async def trivia_live_chat_get_likes(db, *, current_user):
     else:
         draw_date = next_draw_time.astimezone(pytz.UTC).replace(tzinfo=None).date()
 
-    total_likes = trivia_repository.count_trivia_live_chat_session_likes(db, draw_date=draw_date)
-    user_liked = trivia_repository.has_trivia_live_chat_session_like(
+    total_likes, user_liked = _trivia_live_like_state(
         db, user_id=current_user.account_id, draw_date=draw_date
     )
     return {"total_likes": total_likes, "draw_date": draw_date.isoformat(), "user_liked": user_liked}
@@ -1891,16 +1994,17 @@ def _advisory_lock_key(value: str) -> int:
     return int.from_bytes(digest[:8], "big") % (2**63 - 1)
 
 
-def _try_advisory_lock(db, key: int) -> bool:
+def _try_advisory_lock(db, key: int):
+    """Return a lock handle, or None if the lock is held elsewhere (or unavailable)."""
     try:
-        return bool(trivia_repository.try_advisory_lock(db, key=key))
+        return trivia_repository.try_advisory_lock(db, key=key)
     except Exception:
-        return False
+        return None
 
 
-def _release_advisory_lock(db, key: int) -> None:
+def _release_advisory_lock(lock) -> None:
     try:
-        trivia_repository.advisory_unlock(db, key=key)
+        trivia_repository.advisory_unlock(lock)
     except Exception:
         return None
 
@@ -1985,11 +2089,12 @@ def internal_free_mode_draw(db, *, secret: str):
     if not _internal_is_authorized(secret):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
-    lock_key = None
+    lock = None
     try:
         draw_date = get_active_draw_date() - timedelta(days=1)
         lock_key = _advisory_lock_key(f"free_mode:{draw_date.isoformat()}")
-        if not _try_advisory_lock(db, lock_key):
+        lock = _try_advisory_lock(db, lock_key)
+        if lock is None:
             return {"status": "already_running", "draw_date": draw_date.isoformat(), "message": "Draw already running"}
 
         existing_draw = trivia_repository.get_any_free_mode_winner_for_draw(
@@ -2057,8 +2162,8 @@ def internal_free_mode_draw(db, *, secret: str):
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error in free mode draw")
     finally:
-        if lock_key is not None:
-            _release_advisory_lock(db, lock_key)
+        if lock is not None:
+            _release_advisory_lock(lock)
 
 
 def internal_mode_draw(db, *, secret: str, mode_id: str):
@@ -2070,11 +2175,12 @@ def internal_mode_draw(db, *, secret: str, mode_id: str):
     if not _internal_is_authorized(secret):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
-    lock_key = None
+    lock = None
     try:
         draw_date = get_active_draw_date() - timedelta(days=1)
         lock_key = _advisory_lock_key(f"{mode_id}:{draw_date.isoformat()}")
-        if not _try_advisory_lock(db, lock_key):
+        lock = _try_advisory_lock(db, lock_key)
+        if lock is None:
             return {"status": "already_running", "draw_date": draw_date.isoformat(), "message": "Draw already running"}
 
         if mode_id == "free_mode":
@@ -2139,8 +2245,8 @@ def internal_mode_draw(db, *, secret: str, mode_id: str):
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error in {mode_id} draw")
     finally:
-        if lock_key is not None:
-            _release_advisory_lock(db, lock_key)
+        if lock is not None:
+            _release_advisory_lock(lock)
 
 
 def _build_trivia_reminder_players_query(db, *, active_draw_date, only_incomplete_users: bool):
@@ -2149,49 +2255,82 @@ def _build_trivia_reminder_players_query(db, *, active_draw_date, only_incomplet
     )
 
 
-def _send_trivia_reminder_job(active_draw_date, heading: str, message: str, only_incomplete_users: bool):
-    import asyncio
-    import math
-    import os
-
-    from fastapi import HTTPException
-
-    from config import ONESIGNAL_APP_ID, ONESIGNAL_REST_API_KEY
-    from db import get_db
-    from utils.onesignal_client import send_push_notification_async
-    from utils.notification_storage import create_notifications_batch
+def _trivia_reminder_job_key(active_draw_date, heading: str, message: str, only_incomplete_users: bool) -> str:
+    digest = hashlib.sha1(
+        f"{heading}\x00{message}\x00{int(bool(only_incomplete_users))}".encode("utf-8")
+    ).hexdigest()[:16]
+    return f"trivia_reminder:{active_draw_date.isoformat()}:{digest}"
 
-    db = next(get_db())
-    try:
-        players_q = _build_trivia_reminder_players_query(
-            db, active_draw_date=active_draw_date, only_incomplete_users=only_incomplete_users
-        )
-        players = players_q.all()
-        player_ids = [p.player_id for p in players if p.player_id]
-        user_ids = list({p.user_id for p in players if p.user_id})
 
-        batch_size = 2000
-        batches = [player_ids[i : i + batch_size] for i in range(0, len(player_ids), batch_size)]
+async def _run_trivia_reminder_pipeline(db, active_draw_date, heading: str, message: str, only_incomplete_users: bool):
+    """
+    Stream recipients page by page and push each page as one OneSignal batch.
 
-        data = {"type": "trivia_reminder", "draw_date": active_draw_date.isoformat()}
+    At most TRIVIA_REMINDER_MAX_CONCURRENT_BATCHES sends are in flight; the next page
+    is only read once a slot frees up. The checkpoint only advances past a page when
+    that page and every page before it have been sent, so a restarted or re-triggered
+    job (same reminder, same draw date) resumes without skipping anyone.
+    """
+    from config import TRIVIA_REMINDER_MAX_CONCURRENT_BATCHES, TRIVIA_REMINDER_PAGE_SIZE
+    from utils.notification_storage import create_notifications_batch
+    from utils.onesignal_client import send_push_notification_async
 
+    data = {"type": "trivia_reminder", "draw_date": active_draw_date.isoformat()}
+    job_key = _trivia_reminder_job_key(
+        active_draw_date, heading, message, only_incomplete_users
+    )
+    cursor = load_checkpoint(job_key)
+    if cursor is not None:
+        logger.info("Resuming trivia reminder %s after %s", job_key, cursor)
+
+    slots = asyncio.Semaphore(max(1, TRIVIA_REMINDER_MAX_CONCURRENT_BATCHES))
+    in_flight = set()
+    page_done = {}
+    page_cursors = []
+    state = {"committed": 0, "sent_pages": 0, "failed_pages": 0}
+    last_notified_user_id = cursor[0] if cursor else None
+
+    def _advance_checkpoint():
+        while state["committed"] < len(page_cursors) and page_done.get(state["committed"]):
+            save_checkpoint(job_key, page_cursors[state["committed"]])
+            state["committed"] += 1
+
+    async def _send(index: int, player_ids):
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        for batch in batches:
-            loop.run_until_complete(
-                send_push_notification_async(
-                    player_ids=batch,
-                    heading=heading,
-                    content=message,
-                    data=data,
-                    is_in_app_notification=False,
-                )
+            await send_push_notification_async(
+                player_ids=player_ids,
+                heading=heading,
+                content=message,
+                data=data,
+                is_in_app_notification=False,
             )
-
+            page_done[index] = True
+            state["sent_pages"] += 1
+            _advance_checkpoint()
+        except Exception:
+            state["failed_pages"] += 1
+            logger.exception("Trivia reminder %s: batch %s failed", job_key, index)
+        finally:
+            slots.release()
+
+    while True:
+        await slots.acquire()
+        rows = trivia_repository.list_reminder_players_page(
+            db,
+            only_incomplete_users=only_incomplete_users,
+            active_draw_date=active_draw_date,
+            after=cursor,
+            limit=TRIVIA_REMINDER_PAGE_SIZE,
+        )
+        if not rows:
+            slots.release()
+            break
+
+        user_ids = []
+        for row in rows:
+            if row.user_id != last_notified_user_id and (not user_ids or user_ids[-1] != row.user_id):
+                user_ids.append(row.user_id)
+        last_notified_user_id = rows[-1].user_id
         if user_ids:
             create_notifications_batch(
                 db=db,
@@ -2201,7 +2340,40 @@ def _send_trivia_reminder_job(active_draw_date, heading: str, message: str, only
                 notification_type="trivia_reminder",
                 data=data,
             )
-            db.commit()
+
+        cursor = (rows[-1].user_id, rows[-1].id)
+        page_cursors.append(cursor)
+        task = asyncio.create_task(
+            _send(len(page_cursors) - 1, [row.player_id for row in rows if row.player_id])
+        )
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    if state["failed_pages"]:
+        # Keep the checkpoint at the first failed page so a re-run resumes there.
+        logger.warning(
+            "Trivia reminder %s incomplete: sent=%s failed=%s",
+            job_key,
+            state["sent_pages"],
+            state["failed_pages"],
+        )
+        return
+    clear_checkpoint(job_key)
+    logger.info("Trivia reminder %s finished: pages=%s", job_key, state["sent_pages"])
+
+
+def _send_trivia_reminder_job(active_draw_date, heading: str, message: str, only_incomplete_users: bool):
+    from db import get_db
+
+    db = next(get_db())
+    try:
+        asyncio.run(
+            _run_trivia_reminder_pipeline(
+                db, active_draw_date, heading, message, only_incomplete_users
+            )
+        )
     finally:
         db.close()
 
@@ -2226,9 +2398,9 @@ def internal_trivia_reminder(db, *, secret: str, request, background_tasks):
     players_subq = players_q.subquery()
     from sqlalchemy import func
 
-    total_targeted = trivia_repository.count_rows_in_subquery(db, subquery=players_subq)
+    total_targeted = trivia_repository.count_rows_in_subquery(db, subq=players_subq)
     total_users = trivia_repository.count_distinct_users_in_subquery(
-        db, subquery=players_subq
+        db, subq=players_subq
     )
     if total_targeted == 0:
         return {"status": "no_players", "sent_to": 0, "draw_date": active_draw_date.isoformat(), "only_incomplete_users": request.only_incomplete_users}
@@ -2387,7 +2559,10 @@ def get_free_mode_questions(db, user):
     return {"questions": questions}
 
 
-def submit_free_mode_answer(db, user, question_id: int, answer: str, is_ad_retry: bool = False):
+def submit_free_mode_answer(db, user, question_id: int, answer: str, is_ad_retry: bool = False, background_tasks=None):
     from utils.trivia_mode_service import submit_answer_for_mode
 
-    return submit_answer_for_mode(db, "free_mode", user, question_id, answer, is_ad_retry=is_ad_retry)
+    return submit_answer_for_mode(
+        db, "free_mode", user, question_id, answer,
+        is_ad_retry=is_ad_retry, background_tasks=background_tasks,
+    )
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 
 from core.db import get_db
@@ -39,10 +39,14 @@ async def get_current_free_mode_question(
 @router.post("/submit-answer")
 async def submit_free_mode_answer(
     request: SubmitAnswerRequest,
+    background_tasks: BackgroundTasks,
     user=Depends(get_current_user_or_guest),
     db: Session = Depends(get_db),
 ):
-    return service_submit_free_mode_answer(db, user, request.question_id, request.answer, is_ad_retry=request.is_ad_retry)
+    return service_submit_free_mode_answer(
+        db, user, request.question_id, request.answer,
+        is_ad_retry=request.is_ad_retry, background_tasks=background_tasks,
+    )
 
 
 @router.get("/leaderboard")
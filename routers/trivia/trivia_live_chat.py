@@ -54,9 +54,13 @@ async def status(
 
 @router.post("/like")
 async def like(
-    db: Session = Depends(get_db), current_user = Depends(get_current_user)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
 ):
-    return await service_trivia_live_chat_like(db, current_user=current_user)
+    return await service_trivia_live_chat_like(
+        db, current_user=current_user, background_tasks=background_tasks
+    )
 
 
 @router.get("/likes")
@@ -0,0 +1,81 @@
+"""Fixtures shared by the tests in this directory (database fixtures: root conftest)."""
+
+import pytest
+
+from core import read_models
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self._redis, name)(*a, **kw) for name, a, kw in self._calls]
+
+
+class FakeRedis:
+    """In-memory stand-in for the sync client; values are stored as strings, as with
+    `decode_responses=True`. Expiry is accepted and ignored."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def exists(self, *keys):
+        return sum(key in self.values or key in self.sets for key in keys)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value if isinstance(value, str) else str(value)
+        return True
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key) or 0) + 1)
+        return int(self.values[key])
+
+    def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            found = self.values.pop(key, None) is not None
+            found = self.sets.pop(key, None) is not None or found
+            deleted += found
+        return deleted
+
+    def expire(self, key, seconds):
+        return self.exists(key) == 1
+
+    def sadd(self, key, *members):
+        bucket = self.sets.setdefault(key, set())
+        before = len(bucket)
+        bucket.update(str(m) for m in members)
+        return len(bucket) - before
+
+    def scard(self, key):
+        return len(self.sets.get(key, ()))
+
+    def sismember(self, key, member):
+        return str(member) in self.sets.get(key, ())
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """A `FakeRedis` behind the read models; modules that import `get_sync_redis`
+    themselves are pointed at it by the tests that need them."""
+    fake = FakeRedis()
+    monkeypatch.setattr(read_models, "get_sync_redis", lambda: fake)
+    return fake
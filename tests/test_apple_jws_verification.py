@@ -0,0 +1,112 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from fastapi import HTTPException
+
+import core.config as config
+from app.services import apple_iap_service
+
+
+def _make_cert(subject, issuer_name, public_key, signing_key, *, ca, not_after):
+    now = datetime.now(timezone.utc)
+    return (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)]))
+        .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer_name)]))
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(not_after)
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+        .sign(signing_key, hashes.SHA256())
+    )
+
+
+@pytest.fixture
+def apple_chain(tmp_path, monkeypatch):
+    far = datetime.now(timezone.utc) + timedelta(days=365)
+    root_key = ec.generate_private_key(ec.SECP256R1())
+    inter_key = ec.generate_private_key(ec.SECP256R1())
+    leaf_key = ec.generate_private_key(ec.SECP256R1())
+    root = _make_cert("Root", "Root", root_key.public_key(), root_key, ca=True, not_after=far)
+    inter = _make_cert("Inter", "Root", inter_key.public_key(), root_key, ca=True, not_after=far)
+    leaf = _make_cert(
+        "Leaf", "Inter", leaf_key.public_key(), inter_key, ca=False,
+        not_after=datetime.now(timezone.utc) + timedelta(days=30),
+    )
+
+    root_path = tmp_path / "root.pem"
+    root_path.write_bytes(root.public_bytes(serialization.Encoding.PEM))
+    monkeypatch.setattr(config, "APPLE_ROOT_CERT_PATHS", [str(root_path)])
+    apple_iap_service._load_trust_store.cache_clear()
+    apple_iap_service._verified_chains.clear()
+
+    x5c = [
+        base64.b64encode(cert.public_bytes(serialization.Encoding.DER)).decode()
+        for cert in (leaf, inter)
+    ]
+
+    def _sign(payload):
+        return jwt.encode(payload, leaf_key, algorithm="ES256", headers={"x5c": x5c})
+
+    return _sign
+
+
+@pytest.fixture
+def chain_verifications(monkeypatch):
+    calls = {"count": 0}
+    real = apple_iap_service._verify_cert_chain
+
+    def _counting(chain, roots):
+        calls["count"] += 1
+        return real(chain, roots)
+
+    monkeypatch.setattr(apple_iap_service, "_verify_cert_chain", _counting)
+    return calls
+
+
+def test_verified_chain_is_reused(apple_chain, chain_verifications):
+    first = apple_iap_service.verify_signed_transaction_info(apple_chain({"transactionId": "1"}))
+    second = apple_iap_service.verify_signed_transaction_info(apple_chain({"transactionId": "2"}))
+
+    assert first["transactionId"] == "1"
+    assert second["transactionId"] == "2"
+    assert chain_verifications["count"] == 1
+    assert apple_iap_service._load_trust_store.cache_info().misses == 1
+
+
+def test_cached_chain_still_checks_signature(apple_chain, chain_verifications):
+    token = apple_chain({"transactionId": "1"})
+    apple_iap_service.verify_signed_transaction_info(token)
+
+    header, payload, signature = token.split(".")
+    with pytest.raises(HTTPException):
+        apple_iap_service.verify_signed_transaction_info(
+            f"{header}.{payload}.{signature[::-1]}"
+        )
+
+
+def test_expired_cache_entry_is_reverified(apple_chain, chain_verifications):
+    apple_iap_service.verify_signed_transaction_info(apple_chain({"transactionId": "1"}))
+    for key, (_valid_until, leaf_key) in list(apple_iap_service._verified_chains.items()):
+        apple_iap_service._verified_chains[key] = (
+            datetime.now(timezone.utc) - timedelta(seconds=1),
+            leaf_key,
+        )
+
+    apple_iap_service.verify_signed_transaction_info(apple_chain({"transactionId": "2"}))
+    assert chain_verifications["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_verification_runs_off_loop(apple_chain):
+    payload = await apple_iap_service.verify_signed_transaction_info_async(
+        apple_chain({"transactionId": "3"})
+    )
+    assert payload["transactionId"] == "3"
@@ -0,0 +1,149 @@
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+import utils.daily_user_state as daily_user_state
+from core import read_models
+from core.cache import LRUCache
+from models import (
+    SubscriptionPlan,
+    TriviaModeConfig,
+    TriviaQuestionsFreeMode,
+    TriviaUserFreeModeDaily,
+    User,
+    UserSubscription,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(test_db, monkeypatch):
+    monkeypatch.setattr(daily_user_state, "get_sync_redis", lambda: None)
+    monkeypatch.setattr(read_models, "get_sync_redis", lambda: None)
+    for mode_id, amount in (("free_mode", 0.0), ("bronze", 5.0), ("silver", 10.0)):
+        test_db.add(
+            TriviaModeConfig(
+                mode_id=mode_id,
+                mode_name=mode_id,
+                questions_count=3 if mode_id == "free_mode" else 1,
+                reward_distribution=json.dumps(
+                    {"requires_subscription": amount > 0, "subscription_amount": amount}
+                ),
+                amount=amount,
+                leaderboard_types=json.dumps(["daily"]),
+            )
+        )
+    test_db.commit()
+    daily_user_state.invalidate_daily_user_state()
+
+
+@pytest.fixture
+def query_counter(test_db):
+    calls = {"count": 0}
+
+    def _before(*_args, **_kwargs):
+        calls["count"] += 1
+
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", _before)
+    yield calls
+    event.remove(engine, "before_cursor_execute", _before)
+
+
+def _answer_free_question(test_db, user, target_date, order):
+    question = TriviaQuestionsFreeMode(
+        question=f"Q{order}",
+        option_a="a",
+        option_b="b",
+        option_c="c",
+        option_d="d",
+        correct_answer="a",
+        category="general",
+        difficulty_level="easy",
+        question_hash=f"hash-{order}",
+    )
+    test_db.add(question)
+    test_db.flush()
+    test_db.add(
+        TriviaUserFreeModeDaily(
+            account_id=user.account_id,
+            date=target_date,
+            question_order=order,
+            question_id=question.id,
+            status="answered_correct",
+            answered_at=datetime.utcnow(),
+        )
+    )
+    test_db.commit()
+
+
+def test_state_is_cached_until_a_submission(test_db, query_counter):
+    user = test_db.query(User).first()
+    target_date = date(2024, 1, 2)
+
+    first = daily_user_state.get_daily_user_state(test_db, user, target_date)
+    assert first["free_mode"]["questions_answered"] == 0
+    assert first["bronze"]["questions_answered"] == 0
+
+    query_counter["count"] = 0
+    assert daily_user_state.get_daily_user_state(test_db, user, target_date) == first
+    assert query_counter["count"] == 0
+
+    _answer_free_question(test_db, user, target_date, 1)
+
+    after = daily_user_state.get_daily_user_state(test_db, user, target_date)
+    assert after["free_mode"]["questions_answered"] == 1
+
+
+def test_subscription_commit_invalidates_only_that_user(test_db, query_counter):
+    users = test_db.query(User).order_by(User.account_id).all()
+    target_date = date(2024, 1, 2)
+    plan = SubscriptionPlan(
+        name="Bronze", price_usd=5.0, unit_amount_minor=500, billing_interval="month"
+    )
+    test_db.add(plan)
+    test_db.commit()
+
+    before = daily_user_state.get_daily_user_state(test_db, users[0], target_date)
+    daily_user_state.get_daily_user_state(test_db, users[1], target_date)
+    assert before["bronze"]["access"]["has_access"] is False
+
+    test_db.add(
+        UserSubscription(
+            user_id=users[0].account_id,
+            plan_id=plan.id,
+            status="active",
+            current_period_end=datetime.utcnow() + timedelta(days=30),
+        )
+    )
+    test_db.commit()
+
+    test_db.refresh(users[1])
+    query_counter["count"] = 0
+    daily_user_state.get_daily_user_state(test_db, users[1], target_date)
+    assert query_counter["count"] == 0
+
+    after = daily_user_state.get_daily_user_state(test_db, users[0], target_date)
+    assert after["bronze"]["access"]["has_access"] is True
+
+
+def test_local_user_generations_stay_bounded(test_db, monkeypatch):
+    monkeypatch.setattr(
+        daily_user_state, "_local_user_generations", LRUCache(max_keys=2)
+    )
+    user = test_db.query(User).first()
+    target_date = date(2024, 1, 2)
+    daily_user_state.get_daily_user_state(test_db, user, target_date)
+    cached_key = daily_user_state._cache_key(user.account_id, target_date)
+
+    daily_user_state.invalidate_daily_user_state({user.account_id})
+    bumped_key = daily_user_state._cache_key(user.account_id, target_date)
+    daily_user_state.invalidate_daily_user_state({-1, -2, -3})
+
+    assert daily_user_state._local_user_generations.stats()["size"] == 2
+    # The user's generation was evicted; neither earlier key can match again.
+    assert daily_user_state._cache_key(user.account_id, target_date) not in {
+        cached_key,
+        bumped_key,
+    }
@@ -0,0 +1,68 @@
+"""Tests for the shared sync/async database connection budget."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from core import db_pool
+
+
+@pytest.mark.parametrize(
+    "pool_size,max_overflow,share",
+    [(10, 20, 0.5), (10, 20, 0.7), (3, 0, 0.5), (2, 1, 0.9), (2, 1, 0.0)],
+)
+def test_engines_split_one_process_budget(monkeypatch, pool_size, max_overflow, share):
+    monkeypatch.setattr(db_pool, "DB_POOL_SIZE", pool_size)
+    monkeypatch.setattr(db_pool, "DB_MAX_OVERFLOW", max_overflow)
+    monkeypatch.setattr(db_pool, "DB_ASYNC_POOL_SHARE", share)
+
+    sync_kw, async_kw = db_pool.sync_pool_kwargs(), db_pool.async_pool_kwargs()
+
+    assert sync_kw["pool_size"] >= 1 and async_kw["pool_size"] >= 1
+    assert sync_kw["pool_size"] + async_kw["pool_size"] == pool_size
+    assert sync_kw["max_overflow"] + async_kw["max_overflow"] == max_overflow
+
+
+def test_budget_too_small_for_both_engines_is_rejected(monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_POOL_SIZE", 1)
+
+    with pytest.raises(ValueError):
+        db_pool.sync_pool_kwargs()
+
+
+def test_pgbouncer_mode_disables_prepared_statements(monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_PGBOUNCER", False)
+    assert db_pool.psycopg_connect_args() == {}
+    assert db_pool.asyncpg_connect_args() == {}
+
+    monkeypatch.setattr(db_pool, "DB_PGBOUNCER", True)
+    assert db_pool.psycopg_connect_args() == {"prepare_threshold": None}
+    async_args = db_pool.asyncpg_connect_args()
+    assert async_args["statement_cache_size"] == 0
+    assert async_args["prepared_statement_cache_size"] == 0
+    names = {async_args["prepared_statement_name_func"]() for _ in range(3)}
+    assert len(names) == 3
+
+
+def test_pool_stats_report_gauges_and_counters(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePool,
+        pool_size=2,
+        max_overflow=1,
+    )
+    db_pool.register_pool("test", engine)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            during = db_pool.pool_stats()["test"]
+        after = db_pool.pool_stats()["test"]
+    finally:
+        engine.dispose()
+        db_pool._engines.pop("test", None)
+        db_pool._counters.pop("test", None)
+
+    assert during["checked_out"] == 1
+    assert during["limit"] == 3
+    assert after["checked_out"] == 0
+    assert after["checkouts"] == 1 and after["connects"] == 1
@@ -50,7 +50,7 @@ class TestWalletCreditWinnerHandler:
 class TestBronzeModeEnqueues:
     """Tests that bronze mode distribute_rewards enqueues wallet credits."""
 
-    def test_enqueues_wallet_credit_for_each_winner(self):
+    def test_enqueues_one_batch_credit_for_all_winners(self):
         with patch("utils.bronze_mode_service.enqueue_task") as mock_enqueue, \
              patch("utils.bronze_mode_service.calculate_harmonic_sum_rewards") as mock_rewards:
             mock_rewards.return_value = [1.50, 0.75]
@@ -67,17 +67,22 @@ class TestBronzeModeEnqueues:
             from utils.bronze_mode_service import distribute_rewards_to_winners_bronze_mode
             distribute_rewards_to_winners_bronze_mode(mock_db, winners, date(2026, 3, 13), 2.25)
 
-            assert mock_enqueue.call_count == 2
-
-            first_call = mock_enqueue.call_args_list[0]
-            assert first_call.kwargs["name"] == "wallet.credit_winner"
-            assert first_call.kwargs["payload"]["account_id"] == 1
-            assert first_call.kwargs["payload"]["amount_minor"] == 150
-            assert first_call.kwargs["payload"]["idempotency_key"] == "draw_reward:bronze:2026-03-13:1"
-
-            second_call = mock_enqueue.call_args_list[1]
-            assert second_call.kwargs["payload"]["account_id"] == 2
-            assert second_call.kwargs["payload"]["amount_minor"] == 75
+            mock_enqueue.assert_called_once()
+            call = mock_enqueue.call_args
+            assert call.kwargs["name"] == "wallet.credit_winners_batch"
+            assert call.kwargs["payload"]["reason"] == "bronze_draw_2026-03-13"
+            assert call.kwargs["payload"]["credits"] == [
+                {
+                    "account_id": 1,
+                    "amount_minor": 150,
+                    "idempotency_key": "draw_reward:bronze:2026-03-13:1",
+                },
+                {
+                    "account_id": 2,
+                    "amount_minor": 75,
+                    "idempotency_key": "draw_reward:bronze:2026-03-13:2",
+                },
+            ]
 
     def test_skips_zero_rewards(self):
         with patch("utils.bronze_mode_service.enqueue_task") as mock_enqueue, \
@@ -116,7 +121,36 @@ class TestSilverModeEnqueues:
             distribute_rewards_to_winners_silver_mode(mock_db, winners, date(2026, 3, 13), 3.00)
 
             mock_enqueue.assert_called_once()
-            call_payload = mock_enqueue.call_args.kwargs["payload"]
-            assert call_payload["account_id"] == 5
-            assert call_payload["amount_minor"] == 300
-            assert "silver" in call_payload["idempotency_key"]
+            assert mock_enqueue.call_args.kwargs["name"] == "wallet.credit_winners_batch"
+            (credit,) = mock_enqueue.call_args.kwargs["payload"]["credits"]
+            assert credit["account_id"] == 5
+            assert credit["amount_minor"] == 300
+            assert "silver" in credit["idempotency_key"]
+
+
+def test_draw_is_not_recorded_when_the_credit_enqueue_fails(test_db):
+    from datetime import datetime
+
+    from models import TriviaBronzeModeWinners, User
+    from utils.bronze_mode_service import distribute_rewards_to_winners_bronze_mode
+
+    user = test_db.query(User).first()
+    winners = [
+        {"account_id": user.account_id, "position": 1, "submitted_at": datetime(2026, 3, 13, 10)}
+    ]
+    draw_date = date(2026, 3, 13)
+
+    with patch(
+        "utils.bronze_mode_service.enqueue_task", side_effect=ConnectionError("queue down")
+    ):
+        with pytest.raises(ConnectionError):
+            distribute_rewards_to_winners_bronze_mode(test_db, winners, draw_date, 2.0)
+    test_db.rollback()
+    assert test_db.query(TriviaBronzeModeWinners).count() == 0
+
+    # The rerun still sees an unperformed draw and pays out.
+    with patch("utils.bronze_mode_service.enqueue_task") as mock_enqueue:
+        result = distribute_rewards_to_winners_bronze_mode(test_db, winners, draw_date, 2.0)
+    assert result["status"] == "success"
+    mock_enqueue.assert_called_once()
+    assert test_db.query(TriviaBronzeModeWinners).count() == 1
@@ -0,0 +1,128 @@
+"""Tests for the per-user entitlement cache and the store flows that read it."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import utils.entitlement_cache as entitlements
+from models import Avatar, Frame, User, UserAvatar, UserFrame, UserGemPurchase
+from routers.store import service as store_service
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+    real = entitlements._load_stmt
+    monkeypatch.setattr(
+        entitlements, "_load_stmt", lambda user_id: calls.append(user_id) or real(user_id)
+    )
+    return calls
+
+
+def _add_cosmetics(db):
+    db.add_all(
+        [
+            Avatar(id="fox", product_id="AV001", name="Fox", price_gems=10, is_premium=False),
+            Frame(id="gold", product_id="FR001", name="Gold", price_gems=5, is_premium=False),
+        ]
+    )
+    db.commit()
+
+
+def test_store_flows_share_one_cached_ownership_set(test_db, fake_redis, loads):
+    _add_cosmetics(test_db)
+    user = test_db.query(User).first()
+    user.gems = 100
+    test_db.commit()
+
+    assert store_service.list_owned_avatars(test_db, current_user=user, include_urls=False) == []
+    bought = store_service.buy_avatar(
+        test_db, current_user=user, avatar_id="fox", payment_method="gems"
+    )
+    assert bought["status"] == "success"
+
+    # The purchase commit retired the cached set; one reload serves everything below.
+    loads.clear()
+    store_service.select_avatar(test_db, current_user=user, avatar_id="fox")
+    again = store_service.buy_avatar(
+        test_db, current_user=user, avatar_id="fox", payment_method="gems"
+    )
+    owned = store_service.list_owned_avatars(test_db, current_user=user, include_urls=False)
+    assert store_service.list_owned_frames(test_db, current_user=user, include_urls=False) == []
+    with pytest.raises(Exception) as denied:
+        store_service.select_frame(test_db, current_user=user, frame_id="gold")
+
+    assert again["status"] == "error"
+    assert again["purchase_date"] == bought["purchase_date"]
+    assert [item["id"] for item in owned] == ["fox"]
+    assert denied.value.status_code == 403
+    assert len(loads) == 1
+
+
+def test_fill_that_raced_a_grant_is_never_served(test_db, fake_redis):
+    _add_cosmetics(test_db)
+    user_id = test_db.query(User).first().account_id
+
+    lookup, cached = entitlements._cached(user_id)
+    stale = entitlements._from_rows(test_db.execute(entitlements._load_stmt(user_id)).all())
+    test_db.add(UserAvatar(user_id=user_id, avatar_id="fox", purchase_date=datetime.utcnow()))
+    test_db.commit()
+    entitlements._entitlements.store(lookup, {user_id: entitlements._encode(stale)})
+
+    assert cached is None and not stale.avatars
+    assert "fox" in entitlements.get_entitlements(test_db, user_id).avatars
+
+
+def test_admin_delete_retires_the_owners_cached_sets(test_db, fake_redis):
+    from routers.auth.service import delete_avatar, delete_frame
+
+    _add_cosmetics(test_db)
+    user_id = test_db.query(User).first().account_id
+    test_db.add_all(
+        [
+            UserAvatar(user_id=user_id, avatar_id="fox", purchase_date=datetime.utcnow()),
+            UserFrame(user_id=user_id, frame_id="gold", purchase_date=datetime.utcnow()),
+        ]
+    )
+    test_db.commit()
+    cached = entitlements.get_entitlements(test_db, user_id)
+    assert "fox" in cached.avatars and "gold" in cached.frames
+
+    delete_avatar(test_db, "fox")
+    delete_frame(test_db, "gold")
+
+    owned = entitlements.get_entitlements(test_db, user_id)
+    assert not owned.avatars and not owned.frames
+
+
+@pytest.mark.asyncio
+async def test_async_checks_and_core_revoke_use_the_same_cache(tmp_path, fake_redis):
+    from app.db import Base as AsyncBase
+    from app.models import products
+    from app.models.user import User as AsyncUser
+    from app.services.asset_entitlement_service import check_already_owned, revoke_asset
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'owned.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+        await conn.run_sync(lambda c: UserGemPurchase.__table__.create(c))
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with maker() as session:
+            session.add_all(
+                [
+                    AsyncUser(account_id=1, email="u1@example.com", username="user1"),
+                    products.Avatar(id="fox", product_id="AV001", name="Fox"),
+                    products.UserAvatar(user_id=1, avatar_id="fox", purchase_date=datetime.utcnow()),
+                ]
+            )
+            await session.commit()
+
+            assert await check_already_owned(session, user_id=1, product_id="AV001")
+            assert not await check_already_owned(session, user_id=1, product_id="FR001")
+            await revoke_asset(session, user_id=1, product_id="AV001")
+            await session.commit()
+            assert not await check_already_owned(session, user_id=1, product_id="AV001")
+    finally:
+        await engine.dispose()
@@ -0,0 +1,159 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+import utils.daily_user_state as daily_user_state
+import utils.user_level_service as user_level_service
+from models import (
+    TriviaQuestionsFreeMode,
+    TriviaQuestionsFreeModeDaily,
+    TriviaUserFreeModeDaily,
+    User,
+)
+from utils.trivia_mode_service import get_date_range_for_query, submit_free_mode_answer
+
+TARGET_DATE = date(2024, 1, 2)
+
+
+@pytest.fixture
+def questions(test_db, fake_redis, monkeypatch):
+    monkeypatch.setattr(user_level_service, "get_sync_redis", lambda: fake_redis)
+    monkeypatch.setattr(daily_user_state, "get_sync_redis", lambda: None)
+    start_dt, _ = get_date_range_for_query(TARGET_DATE)
+    created = []
+    for order in (1, 2, 3):
+        question = TriviaQuestionsFreeMode(
+            question=f"Free question {order}",
+            option_a="A",
+            option_b="B",
+            option_c="C",
+            option_d="D",
+            correct_answer="A",
+            category="general",
+            difficulty_level="easy",
+            question_hash=f"free-hash-{order}",
+        )
+        test_db.add(question)
+        test_db.flush()
+        test_db.add(
+            TriviaQuestionsFreeModeDaily(
+                date=start_dt, question_id=question.id, question_order=order
+            )
+        )
+        created.append(question)
+    test_db.commit()
+    return [question.id for question in created]
+
+
+def _attempt(test_db, user, order):
+    test_db.expire_all()
+    return (
+        test_db.query(TriviaUserFreeModeDaily)
+        .filter_by(account_id=user.account_id, date=TARGET_DATE, question_order=order)
+        .first()
+    )
+
+
+def test_correct_answer_upserts_attempt_once(test_db, questions):
+    user = test_db.query(User).first()
+
+    result = submit_free_mode_answer(test_db, user, questions[2], "A", TARGET_DATE)
+    assert result["status"] == "success"
+    assert result["is_correct"] is True
+    assert result["level_info"]["total_correct_answers"] == 1
+
+    attempt = _attempt(test_db, user, 3)
+    assert attempt.status == "answered_correct"
+    assert attempt.third_question_completed_at is not None
+
+    again = submit_free_mode_answer(test_db, user, questions[2], "B", TARGET_DATE)
+    assert again["message"] == "Question already answered correctly"
+    assert _attempt(test_db, user, 3).user_answer == "A"
+
+
+def test_answer_at_a_level_boundary_reports_the_new_level(test_db, questions):
+    user = test_db.query(User).first()
+    redis = user_level_service.get_sync_redis()
+    redis.set(user_level_service._correct_counter_key(user.account_id), 99)
+
+    level_info = submit_free_mode_answer(test_db, user, questions[0], "A", TARGET_DATE)[
+        "level_info"
+    ]
+
+    assert level_info["total_correct_answers"] == 100
+    assert level_info["level_increased"] is True
+    assert level_info["new_level"] == 2
+    assert level_info["progress"]["level"] == 2
+    assert level_info["progress"]["progress"] == "0/100"
+    assert level_info["correct_answers_until_next_level"] == 100
+
+
+def test_counter_seeded_concurrently_is_incremented_not_reseeded(test_db, questions):
+    user = test_db.query(User).first()
+    redis = user_level_service.get_sync_redis()
+    key = user_level_service._correct_counter_key(user.account_id)
+    real_get = redis.get
+
+    def get_then_lose_the_seed_race(name):
+        value = real_get(name)
+        if value is None:
+            redis.values[name] = "41"
+        return value
+
+    redis.get = get_then_lose_the_seed_race
+
+    level_info = user_level_service.record_answer_for_level(
+        test_db, account_id=user.account_id, current_level=1, is_correct=True
+    )
+
+    assert level_info["total_correct_answers"] == 42
+    assert redis.values[key] == "42"
+
+
+def test_ad_retry_only_after_wrong_answer(test_db, questions):
+    user = test_db.query(User).first()
+
+    early = submit_free_mode_answer(
+        test_db, user, questions[0], "A", TARGET_DATE, is_ad_retry=True
+    )
+    assert early["message"] == "Cannot use ad retry without a prior wrong answer"
+    assert _attempt(test_db, user, 1) is None
+
+    wrong = submit_free_mode_answer(test_db, user, questions[0], "B", TARGET_DATE)
+    assert wrong["is_correct"] is False
+    assert wrong["can_retry_with_ad"] is True
+
+    retry = submit_free_mode_answer(
+        test_db, user, questions[0], "A", TARGET_DATE, is_ad_retry=True
+    )
+    assert retry["is_correct"] is True
+    assert retry["ad_retry_used"] is True
+    assert _attempt(test_db, user, 1).ad_retry_used is True
+
+    second_retry = submit_free_mode_answer(
+        test_db, user, questions[0], "A", TARGET_DATE, is_ad_retry=True
+    )
+    assert second_retry["status"] == "error"
+
+
+def test_submission_is_one_statement_with_warm_pack(test_db, questions):
+    user = test_db.query(User).first()
+    submit_free_mode_answer(test_db, user, questions[0], "A", TARGET_DATE)
+    test_db.refresh(user)
+
+    statements = []
+
+    def _before(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        result = submit_free_mode_answer(test_db, user, questions[1], "A", TARGET_DATE)
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+    assert result["status"] == "success"
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
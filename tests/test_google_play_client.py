@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.google_play_client import GooglePlayApiError, GooglePlayClient
+
+PURCHASES = "/androidpublisher/v3/applications/com.triviapay.app/purchases"
+
+
+def _stub_play_api(*, fail_first=0, delay=0.0):
+    """In-process stand-in for androidpublisher; records calls and concurrency."""
+    app = FastAPI()
+    state = {"calls": [], "active": 0, "max_active": 0, "failures_left": fail_first}
+
+    @app.get(PURCHASES + "/products/{product_id}/tokens/{token}")
+    async def get_product(product_id: str, token: str, request: Request):
+        state["calls"].append(("get", product_id, token, request.headers["authorization"]))
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(delay)
+            if state["failures_left"] > 0:
+                state["failures_left"] -= 1
+                return JSONResponse({"error": {"message": "backend"}}, status_code=503)
+            if token == "missing":
+                return JSONResponse({"error": {"message": "not found"}}, status_code=404)
+            return {"purchaseState": 0, "productId": product_id}
+        finally:
+            state["active"] -= 1
+
+    @app.post(PURCHASES + "/products/{product_id}/tokens/{token}:consume")
+    async def consume(product_id: str, token: str):
+        state["calls"].append(("consume", product_id, token, None))
+        return JSONResponse(None, status_code=204)
+
+    return app, state
+
+
+def _client(app, **kwargs):
+    tokens = {"issued": 0}
+
+    async def _token():
+        tokens["issued"] += 1
+        return f"token-{tokens['issued']}", time.time() + 3600
+
+    client = GooglePlayClient(
+        base_url="http://play.test",
+        token_provider=_token,
+        transport=httpx.ASGITransport(app=app),
+        backoff_base_seconds=0.001,
+        **kwargs,
+    )
+    return client, tokens
+
+
+@pytest.mark.asyncio
+async def test_token_is_cached_across_calls():
+    app, state = _stub_play_api()
+    client, tokens = _client(app)
+
+    purchase = await client.get_product_purchase("com.triviapay.app", "gems_100", "tok-1")
+    await client.consume_product("com.triviapay.app", "gems_100", "tok-1")
+
+    assert purchase["purchaseState"] == 0
+    assert tokens["issued"] == 1
+    assert [call[0] for call in state["calls"]] == ["get", "consume"]
+    assert state["calls"][0][3] == "Bearer token-1"
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors():
+    app, state = _stub_play_api(fail_first=2)
+    client, _ = _client(app, max_retries=3)
+
+    purchase = await client.get_product_purchase("com.triviapay.app", "gems_100", "tok-1")
+
+    assert purchase["productId"] == "gems_100"
+    assert len(state["calls"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    app, state = _stub_play_api()
+    client, _ = _client(app, max_retries=3)
+
+    with pytest.raises(GooglePlayApiError) as exc_info:
+        await client.get_product_purchase("com.triviapay.app", "gems_100", "missing")
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.message == "not found"
+    assert len(state["calls"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    app, state = _stub_play_api(delay=0.01)
+    client, _ = _client(app, max_concurrency=3)
+
+    await asyncio.gather(
+        *[
+            client.get_product_purchase("com.triviapay.app", "gems_100", f"tok-{i}")
+            for i in range(12)
+        ]
+    )
+
+    assert len(state["calls"]) == 12
+    assert state["max_active"] <= 3
+
+
+def test_rebinding_to_a_new_loop_closes_the_previous_pool():
+    app, _ = _stub_play_api()
+    client, _ = _client(app)
+
+    asyncio.run(client.get_product_purchase("com.triviapay.app", "gems_100", "tok-1"))
+    first_pool = client._http
+    asyncio.run(client.get_product_purchase("com.triviapay.app", "gems_100", "tok-2"))
+
+    assert first_pool.is_closed
+    assert client._http is not first_pool
+
+    asyncio.run(client.aclose())
+    assert client._http is None
@@ -270,8 +270,8 @@ class TestIAPWebhooks:
     async def test_apple_webhook_not_implemented(self):
         """Test Apple webhook endpoint"""
         with patch(
-            "app.routers.payments.iap.service_process_apple_notification",
-            return_value={"status": "processed"},
+            "app.routers.payments.iap.service_ingest_apple_notification",
+            return_value={"status": "accepted"},
         ):
             async with AsyncClient(app=app, base_url="http://test") as ac:
                 response = await ac.post(
@@ -281,14 +281,14 @@ class TestIAPWebhooks:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "processed"
+        assert data["status"] == "accepted"
 
     @pytest.mark.asyncio
     async def test_google_webhook_not_implemented(self):
         """Test Google webhook endpoint"""
         with patch(
-            "app.routers.payments.iap.service_process_google_notification",
-            return_value={"status": "processed"},
+            "app.routers.payments.iap.service_ingest_google_notification",
+            return_value={"status": "accepted"},
         ):
             async with AsyncClient(app=app, base_url="http://test") as ac:
                 response = await ac.post(
@@ -297,7 +297,7 @@ class TestIAPWebhooks:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "processed"
+        assert data["status"] == "accepted"
 
 
 if __name__ == "__main__":
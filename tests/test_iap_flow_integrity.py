@@ -19,8 +19,7 @@ import core.config as config
 from app.db import Base as AsyncBase
 from app.models.products import GemPackageConfig
 from app.models.user import User
-from app.models.wallet import IapReceipt, WalletTransaction
-from app.routers.payments import service as payments_service
+from app.models.wallet import IapEvent, IapReceipt, WalletTransaction
 from app.routers.payments.service import (
     process_apple_notification,
     process_google_notification,
@@ -139,7 +138,6 @@ async def test_apple_idempotency_same_transaction(async_session_maker, monkeypat
         return build_apple_payload()
 
     monkeypatch.setattr(apple_iap_service, "verify_signed_transaction_info", fake_verify)
-    monkeypatch.setattr(payments_service, "verify_signed_transaction_info", fake_verify)
 
     async with async_session_maker() as session1:
         user1 = await get_user(session1)
@@ -290,7 +288,6 @@ async def test_duplicate_apple_webhook_delivery(async_session_maker, monkeypatch
         return build_apple_payload()
 
     monkeypatch.setattr(apple_iap_service, "verify_signed_transaction_info", fake_verify)
-    monkeypatch.setattr(payments_service, "verify_signed_transaction_info", fake_verify)
 
     async with async_session_maker() as session1:
         first = await process_apple_notification(session1, signed_payload="notif-jws")
@@ -367,7 +364,6 @@ async def test_webhook_before_verify_blocks_apple(async_session_maker, monkeypat
         return build_apple_payload()
 
     monkeypatch.setattr(apple_iap_service, "verify_signed_transaction_info", fake_verify)
-    monkeypatch.setattr(payments_service, "verify_signed_transaction_info", fake_verify)
     monkeypatch.setattr(config, "APPLE_APP_BUNDLE_ID", "com.triviapay.app")
 
     async with async_session_maker() as session1:
@@ -469,3 +465,107 @@ async def test_mocked_google_api_ack_consume(async_session_maker, monkeypatch):
     assert result["success"] is True
     assert mock_consume.await_count == 1
     assert mock_ack.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_google_webhook_fast_ack_then_worker_applies(async_session_maker, monkeypatch):
+    import app.db as app_db
+    from app.routers.payments.service import ingest_google_notification
+    from app.services.webhook_intake import webhook_dispatcher
+
+    monkeypatch.setattr(app_db, "AsyncSessionLocal", async_session_maker)
+    async with async_session_maker() as session:
+        await seed_user_and_product(session)
+        user = await get_user(session)
+        user.wallet_balance_minor = 499
+        session.add(
+            IapReceipt(
+                user_id=user.account_id,
+                platform="google",
+                transaction_id=GOOGLE_TEST_TRANSACTION_ID,
+                product_id=TEST_PRODUCT_GEMS,
+                purchase_token=GOOGLE_TEST_PURCHASE_TOKEN,
+                status="credited",
+                credited_amount_minor=499,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+        )
+        await session.commit()
+
+    payload = build_google_rtdn_payload()
+    async with async_session_maker() as session1:
+        first = await ingest_google_notification(session1, payload=payload)
+    async with async_session_maker() as session2:
+        second = await ingest_google_notification(session2, payload=payload)
+
+    assert first["status"] == "accepted"
+    assert second["status"] == "already_processed"
+
+    # Acked before the refund is applied; the worker pool applies it afterwards.
+    async with async_session_maker() as session3:
+        assert (await get_user(session3)).wallet_balance_minor == 499
+
+    await webhook_dispatcher.drain()
+
+    async with async_session_maker() as session4:
+        user = await get_user(session4)
+        event = (
+            await session4.execute(select(IapEvent).where(IapEvent.event_id == first["event_id"]))
+        ).scalar_one()
+    assert user.wallet_balance_minor == 0
+    assert event.status == "processed"
+
+
+@pytest.mark.asyncio
+async def test_google_webhook_left_unqueued_is_replayed_by_retry_job(
+    async_session_maker, monkeypatch
+):
+    import app.db as app_db
+    from app.routers.payments import service as payments_service
+    from app.services import webhook_intake
+
+    monkeypatch.setattr(app_db, "AsyncSessionLocal", async_session_maker)
+    # Partition full: the event is only persisted, and due straight away.
+    monkeypatch.setattr(payments_service, "dispatch_webhook", lambda *args: False)
+    monkeypatch.setattr(webhook_intake, "WEBHOOK_RETRY_STALE_SECONDS", -1)
+    async with async_session_maker() as session:
+        await seed_user_and_product(session)
+        user = await get_user(session)
+        user.wallet_balance_minor = 499
+        session.add(
+            IapReceipt(
+                user_id=user.account_id,
+                platform="google",
+                transaction_id=GOOGLE_TEST_TRANSACTION_ID,
+                product_id=TEST_PRODUCT_GEMS,
+                purchase_token=GOOGLE_TEST_PURCHASE_TOKEN,
+                status="credited",
+                credited_amount_minor=499,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+        )
+        await session.commit()
+
+    async with async_session_maker() as session:
+        accepted = await payments_service.ingest_google_notification(
+            session, payload=build_google_rtdn_payload()
+        )
+    async with async_session_maker() as session:
+        retried = await payments_service.retry_failed_iap_events(session)
+        # A processed event is not claimed again.
+        assert await payments_service.retry_failed_iap_events(session) == 0
+
+    assert retried == 1
+    async with async_session_maker() as session:
+        user = await get_user(session)
+        event = (
+            await session.execute(
+                select(IapEvent).where(IapEvent.event_id == accepted["event_id"])
+            )
+        ).scalar_one()
+    assert user.wallet_balance_minor == 0
+    assert event.status == "processed"
+    assert event.attempts == 1
+    assert event.next_attempt_at is None
@@ -0,0 +1,188 @@
+"""Tests for thumbnail renditions and their use in chat profile data."""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+import utils.image_derivatives as derivatives  # noqa: E402
+import utils.storage as storage  # noqa: E402
+from models import Avatar, Frame, User  # noqa: E402
+from utils.chat_helpers import get_user_chat_profile_data_bulk  # noqa: E402
+
+
+def _png(size, mode="RGBA"):
+    buf = io.BytesIO()
+    Image.new(mode, size, (10, 20, 30, 0) if mode == "RGBA" else (10, 20, 30)).save(
+        buf, format="PNG"
+    )
+    return buf.getvalue()
+
+
+def test_renditions_fit_the_box_keep_alpha_and_never_upscale():
+    out = derivatives.render_renditions(_png((600, 300)), sizes=(128, 256))
+    small = derivatives.render_renditions(_png((50, 40), mode="RGB"), sizes=(128,))
+
+    with Image.open(io.BytesIO(out[128])) as thumb:
+        assert (thumb.format, thumb.size, thumb.mode) == ("WEBP", (128, 64), "RGBA")
+    with Image.open(io.BytesIO(out[256])) as thumb:
+        assert thumb.size == (256, 128)
+    with Image.open(io.BytesIO(small[128])) as thumb:
+        assert (thumb.size, thumb.mode) == ((50, 40), "RGB")
+
+
+@pytest.mark.asyncio
+async def test_store_renditions_uploads_every_size_under_a_content_key(monkeypatch):
+    uploads = {}
+
+    async def _upload(bucket, key, fileobj, content_type):
+        uploads[key] = (bucket, content_type, fileobj.read())
+        return True
+
+    monkeypatch.setattr(derivatives, "upload_fileobj_async", _upload)
+    content = _png((300, 300))
+
+    base_key = await derivatives.store_renditions_async("pics", "profile_pic/7.jpg", content)
+
+    assert base_key.startswith("profile_pic/renditions/7-")
+    assert set(uploads) == {derivatives.rendition_key(base_key, s) for s in (128, 256)}
+    assert {(b, ct) for b, ct, _ in uploads.values()} == {("pics", "image/webp")}
+    other = derivatives.rendition_base_key("profile_pic/7.jpg", _png((301, 300)))
+    assert other != base_key
+
+    assert await derivatives.store_renditions_async("pics", "p/1.jpg", b"not an image") is None
+
+
+def test_chat_profiles_serve_list_renditions(test_db, monkeypatch):
+    monkeypatch.setattr(storage, "AWS_ACCESS_KEY_ID", "AKIDEXAMPLE")
+    monkeypatch.setattr(storage, "AWS_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setenv("S3_PRESIGN_ASSUME_REGION", "us-east-2")
+    test_db.add_all(
+        [
+            Avatar(id="fox", name="Fox", bucket="cosmetics", object_key="a/fox.png",
+                   rendition_key="a/renditions/fox-abc"),
+            Avatar(id="owl", name="Owl", bucket="cosmetics", object_key="a/owl.png"),
+            Frame(id="fox", name="Fox Frame", bucket="cosmetics", object_key="f/fox.png"),
+        ]
+    )
+    users = test_db.query(User).order_by(User.account_id).all()
+    users[0].selected_avatar_id, users[0].selected_frame_id = "fox", "fox"
+    users[0].profile_pic_url = "https://pics.example/original.jpg"
+    users[0].profile_pic_rendition_key = "profile_pic/renditions/1-def"
+    users[1].selected_avatar_id = "owl"
+    test_db.commit()
+
+    profiles = get_user_chat_profile_data_bulk(users, test_db)
+
+    first, second = profiles[users[0].account_id], profiles[users[1].account_id]
+    assert "/a/renditions/fox-abc_128.webp?" in first["avatar_url"]
+    assert "/f/fox.png?" in first["frame_url"]
+    assert "/profile_pic/renditions/1-def_128.webp?" in first["profile_pic_url"]
+    assert "/a/owl.png?" in second["avatar_url"]
+
+
+def test_admin_import_schedules_renditions_and_drops_stale_ones(test_db):
+    from routers.auth.service import import_avatars_from_json
+
+    class _Tasks:
+        def __init__(self):
+            self.calls = []
+
+        def add_task(self, fn, *args):
+            self.calls.append((fn, args))
+
+    test_db.add_all(
+        [
+            Avatar(id="fox", name="Fox", bucket="cosmetics", object_key="a/fox.png",
+                   rendition_key="a/renditions/fox-abc"),
+            Avatar(id="owl", name="Owl", bucket="cosmetics", object_key="a/owl.png",
+                   rendition_key="a/renditions/owl-abc"),
+        ]
+    )
+    test_db.commit()
+    tasks = _Tasks()
+
+    result = import_avatars_from_json(
+        test_db,
+        {"avatars": [
+            {"id": "fox", "name": "Fox", "object_key": "a/fox-v2.png"},
+            {"id": "owl", "name": "Owl Deluxe"},
+        ]},
+        tasks,
+    )
+
+    assert result["imported_count"] == 2
+    assert tasks.calls == [
+        (derivatives.generate_cosmetic_renditions, ("avatars", ["fox", "owl"]))
+    ]
+    assert test_db.get(Avatar, "fox").rendition_key is None
+    assert test_db.get(Avatar, "owl").rendition_key == "a/renditions/owl-abc"
+
+
+def test_profile_picture_job_records_renditions_of_the_current_picture(
+    test_db, monkeypatch
+):
+    import db as db_module
+
+    monkeypatch.setattr(db_module, "get_db", lambda: iter([test_db]))
+    monkeypatch.setattr(derivatives, "download_file", lambda bucket, key: _png((300, 300)))
+    monkeypatch.setattr(
+        derivatives, "store_renditions", lambda bucket, key, content: "profile_pic/renditions/1-new"
+    )
+    user = test_db.query(User).order_by(User.account_id).first()
+    account_id = user.account_id
+    # Same key and presigned URL as the previous upload; only the token differs.
+    user.profile_pic_url = "https://pics.example/current.jpg"
+    user.profile_pic_upload_id = "upload-2"
+    test_db.commit()
+
+    # A job for a picture that has since been replaced records nothing.
+    derivatives.generate_profile_picture_renditions(
+        account_id, "pics", "profile_pic/1.jpg", "upload-1"
+    )
+    assert test_db.get(User, account_id).profile_pic_rendition_key is None
+
+    derivatives.generate_profile_picture_renditions(
+        account_id, "pics", "profile_pic/1.jpg", "upload-2"
+    )
+    assert test_db.get(User, account_id).profile_pic_rendition_key == (
+        "profile_pic/renditions/1-new"
+    )
+
+
+def test_admin_update_reschedules_renditions_only_when_the_source_changes(test_db):
+    from routers.auth.service import update_avatar
+
+    class _Tasks:
+        def __init__(self):
+            self.calls = []
+
+        def add_task(self, fn, *args):
+            self.calls.append((fn, args))
+
+    test_db.add(
+        Avatar(id="fox", name="Fox", bucket="cosmetics", object_key="a/fox.png",
+               rendition_key="a/renditions/fox-abc")
+    )
+    test_db.commit()
+
+    def _update(object_key):
+        return SimpleNamespace(
+            name="Fox", description=None, price_gems=None, price_minor=None,
+            product_type=None, is_premium=False, bucket="cosmetics",
+            object_key=object_key, mime_type="image/png",
+        )
+
+    tasks = _Tasks()
+    update_avatar(test_db, "fox", _update("a/fox.png"), tasks)
+    assert tasks.calls == []
+    assert test_db.get(Avatar, "fox").rendition_key == "a/renditions/fox-abc"
+
+    update_avatar(test_db, "fox", _update("a/fox-v2.png"), tasks)
+    assert tasks.calls == [
+        (derivatives.generate_cosmetic_renditions, ("avatars", ["fox"]))
+    ]
+    assert test_db.get(Avatar, "fox").rendition_key is None
@@ -0,0 +1,58 @@
+"""Tests for the ordered, partitioned in-process worker pool."""
+
+import asyncio
+
+import pytest
+
+from core.partitioned_dispatcher import PartitionedDispatcher
+
+
+@pytest.mark.asyncio
+async def test_jobs_with_same_key_run_in_order_and_keys_run_in_parallel():
+    dispatcher = PartitionedDispatcher("test", partitions=8, max_queue_size=100)
+    log = []
+    running = 0
+    max_running = 0
+
+    def job(key, seq):
+        async def _run():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            log.append((key, seq))
+            running -= 1
+
+        return _run
+
+    keys = [f"cus_{i}" for i in range(4)]
+    for seq in range(5):
+        for key in keys:
+            assert dispatcher.submit(key, job(key, seq))
+
+    await dispatcher.drain()
+    await dispatcher.shutdown(timeout=1)
+
+    for key in keys:
+        assert [seq for k, seq in log if k == key] == list(range(5))
+    assert max_running > 1
+
+
+@pytest.mark.asyncio
+async def test_full_partition_rejects_and_failures_do_not_stop_worker():
+    dispatcher = PartitionedDispatcher("test", partitions=1, max_queue_size=2)
+    done = []
+
+    async def boom():
+        raise RuntimeError("handler failed")
+
+    async def ok():
+        done.append(True)
+
+    assert dispatcher.submit("k", boom)
+    assert dispatcher.submit("k", ok)
+    assert not dispatcher.submit("k", ok)
+
+    await dispatcher.drain()
+    await dispatcher.shutdown(timeout=1)
+    assert done == [True]
@@ -0,0 +1,106 @@
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import rewards_logic
+import utils.prize_pool_snapshot as prize_pool_snapshot
+from models import SubscriptionPlan, TriviaModeConfig, User, UserSubscription
+
+
+@pytest.fixture
+def counting_pool(monkeypatch):
+    calls = {"count": 0}
+    real = rewards_logic.calculate_mode_prize_pool
+
+    def _counting(db, draw_date, mode_id, **kwargs):
+        calls["count"] += 1
+        if calls.get("fail"):
+            raise RuntimeError("database unavailable")
+        return real(db, draw_date, mode_id, **kwargs)
+
+    monkeypatch.setattr(rewards_logic, "calculate_mode_prize_pool", _counting)
+    monkeypatch.setattr(prize_pool_snapshot, "get_sync_redis", lambda: None)
+    prize_pool_snapshot.invalidate_mode_prize_pool_snapshot()
+    return calls
+
+
+def _seed_bronze(test_db):
+    test_db.add(
+        TriviaModeConfig(
+            mode_id="bronze",
+            mode_name="Bronze Mode",
+            questions_count=1,
+            reward_distribution=json.dumps(
+                {"requires_subscription": True, "subscription_amount": 5.0}
+            ),
+            amount=5.0,
+            prize_pool_share=1.0,
+            leaderboard_types=json.dumps(["daily"]),
+        )
+    )
+    plan = SubscriptionPlan(
+        name="Bronze", price_usd=5.0, unit_amount_minor=500, billing_interval="month"
+    )
+    test_db.add(plan)
+    test_db.commit()
+    return plan
+
+
+def _subscribe(test_db, user, plan):
+    test_db.add(
+        UserSubscription(
+            user_id=user.account_id,
+            plan_id=plan.id,
+            status="active",
+            current_period_end=datetime.utcnow() + timedelta(days=30),
+        )
+    )
+    test_db.commit()
+
+
+def test_snapshot_computed_once_per_draw_date(test_db, counting_pool):
+    plan = _seed_bronze(test_db)
+    _subscribe(test_db, test_db.query(User).first(), plan)
+    counting_pool["count"] = 0
+
+    draw_date = date(2024, 1, 31)
+    first = prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, draw_date)
+    second = prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, draw_date)
+
+    assert first == second
+    assert first["bronze"]["subscriber_count"] == 1
+    assert counting_pool["count"] == len(prize_pool_snapshot.SNAPSHOT_MODES)
+
+    prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, date(2024, 2, 1))
+    assert counting_pool["count"] == 2 * len(prize_pool_snapshot.SNAPSHOT_MODES)
+
+
+def test_subscription_commit_invalidates_snapshot(test_db, counting_pool):
+    plan = _seed_bronze(test_db)
+    users = test_db.query(User).order_by(User.account_id).all()
+    _subscribe(test_db, users[0], plan)
+
+    draw_date = date(2024, 1, 31)
+    before = prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, draw_date)
+    assert before["bronze"]["subscriber_count"] == 1
+
+    _subscribe(test_db, users[1], plan)
+
+    after = prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, draw_date)
+    assert after["bronze"]["subscriber_count"] == 2
+
+
+def test_failed_computation_is_not_cached(test_db, counting_pool):
+    plan = _seed_bronze(test_db)
+    _subscribe(test_db, test_db.query(User).first(), plan)
+    draw_date = date(2024, 1, 31)
+
+    counting_pool["fail"] = True
+    failed = prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, draw_date)
+    assert failed["bronze"]["daily_pool"] == 0.0
+    assert failed["bronze"]["subscriber_count"] == 0
+
+    counting_pool["fail"] = False
+    recovered = prize_pool_snapshot.get_mode_prize_pool_snapshot(test_db, draw_date)
+    assert recovered["bronze"]["subscriber_count"] == 1
@@ -0,0 +1,110 @@
+"""Tests for the in-memory IAP product catalog behind product_pricing."""
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base as AsyncBase
+from app.models.products import Avatar, GemPackageConfig
+from app.models.user import User  # noqa: F401  (registers users for product FKs)
+from app.services import product_catalog
+from app.services.product_pricing import (
+    get_price_minor_for_product_id,
+    get_product_info,
+)
+from core import read_models
+from models import SubscriptionPlan
+
+
+@pytest_asyncio.fixture
+async def catalog_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(read_models, "get_sync_redis", lambda: None)
+    monkeypatch.setattr(product_catalog, "_catalog", None)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+        await conn.run_sync(lambda c: SubscriptionPlan.__table__.create(c))
+
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql),
+    )
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add_all(
+            [
+                GemPackageConfig(product_id="G001", price_minor=499, gems_amount=100),
+                Avatar(id="fox", product_id="A001", name="Fox", price_minor=199),
+                SubscriptionPlan(
+                    product_id="SUB001",
+                    name="Gold",
+                    price_usd=4.99,
+                    billing_interval="month",
+                    unit_amount_minor=499,
+                    apple_product_id="com.triviapay.gold.monthly",
+                ),
+            ]
+        )
+        await session.commit()
+    statements.clear()
+    try:
+        yield maker, statements
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_repeated_lookups_are_served_from_one_load(catalog_db):
+    maker, statements = catalog_db
+    async with maker() as session:
+        gem = await get_product_info(session, "G001")
+        loads = len(statements)
+        assert loads > 0
+
+        avatar = await get_product_info(session, "A001")
+        assert await get_price_minor_for_product_id(session, "G001") == 499
+        assert len(statements) == loads
+
+    assert gem["product_type"] == "consumable"
+    assert gem["gems_amount"] == 100
+    assert avatar["price_minor"] == 199
+    assert avatar["product_type"] == "non_consumable"
+
+
+@pytest.mark.asyncio
+async def test_subscription_resolves_by_platform_product_id(catalog_db):
+    maker, _ = catalog_db
+    async with maker() as session:
+        info = await get_product_info(session, "com.triviapay.gold.monthly")
+        by_sub_id = await get_product_info(session, "SUB001")
+        with pytest.raises(HTTPException) as exc:
+            await get_product_info(session, "G999")
+
+    assert info["product_id"] == "com.triviapay.gold.monthly"
+    assert info["product_type"] == "subscription"
+    assert info["price_minor"] == 499
+    assert by_sub_id["plan_id"] == info["plan_id"]
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_commit_invalidates_catalog(catalog_db):
+    maker, _ = catalog_db
+    async with maker() as session:
+        assert await get_price_minor_for_product_id(session, "G001") == 499
+
+        gem = (
+            await session.execute(
+                select(GemPackageConfig).where(GemPackageConfig.product_id == "G001")
+            )
+        ).scalar_one()
+        gem.price_minor = 999
+        session.add(GemPackageConfig(product_id="G002", price_minor=1999, gems_amount=500))
+        await session.commit()
+
+        assert await get_price_minor_for_product_id(session, "G001") == 999
+        assert (await get_product_info(session, "G002"))["gems_amount"] == 500
@@ -0,0 +1,175 @@
+"""Tests for the profile read model shared by profile screens and chat profiles."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.profile_view as profile_view
+from models import Avatar, SubscriptionPlan, TriviaModeConfig, User, UserSubscription
+from routers.auth import service as auth_service
+from utils.chat_helpers import get_user_chat_profile_data
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+    real = profile_view._load_stmt
+    monkeypatch.setattr(
+        profile_view,
+        "_load_stmt",
+        lambda account_id, *args: calls.append(account_id) or real(account_id, *args),
+    )
+    return calls
+
+
+def _seed_profile(db):
+    user = db.query(User).first()
+    db.add_all(
+        [
+            Avatar(id="fox", name="Fox", bucket="b", object_key="fox.png"),
+            Avatar(id="owl", name="Owl", bucket="b", object_key="owl.png"),
+            TriviaModeConfig(
+                mode_id="bronze",
+                mode_name="Bronze Mode",
+                questions_count=1,
+                reward_distribution=json.dumps({}),
+                amount=5.0,
+                leaderboard_types=json.dumps(["daily"]),
+                badge_image_url="https://cdn.example.com/bronze.png",
+            ),
+        ]
+    )
+    plan = SubscriptionPlan(
+        name="Bronze", price_usd=5.0, billing_interval="month", unit_amount_minor=500
+    )
+    db.add(plan)
+    db.flush()
+    db.add(
+        UserSubscription(
+            user_id=user.account_id,
+            plan_id=plan.id,
+            status="active",
+            current_period_end=datetime.utcnow() + timedelta(days=30),
+        )
+    )
+    user.selected_avatar_id = "fox"
+    db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_profile_screens_share_one_cached_composite(test_db, fake_redis, loads):
+    user = _seed_profile(test_db)
+
+    summary = (await auth_service.get_profile_summary(test_db, user))["data"]
+    complete = (await auth_service.get_complete_profile(test_db, user))["data"]
+    chat = get_user_chat_profile_data(user, test_db)
+
+    assert len(loads) == 1
+    assert summary["avatar"]["id"] == "fox"
+    assert summary["subscription_badges"][0]["subscription_type"] == "bronze"
+    assert complete["subscription_badges"] == summary["subscription_badges"]
+    assert chat["subscription_badges"] == summary["subscription_badges"]
+    assert summary["level_progress"] == complete["level_progress"] == "0/100"
+
+    # A selection change on the user retires only that user's entry.
+    user.selected_avatar_id = "owl"
+    test_db.commit()
+    summary = (await auth_service.get_profile_summary(test_db, user))["data"]
+    assert summary["avatar"]["id"] == "owl"
+    assert len(loads) == 2
+
+    # Badge payloads come from the shared definitions, not from the cached entry.
+    test_db.query(TriviaModeConfig).filter_by(mode_id="bronze").one().mode_name = (
+        "Bronze+"
+    )
+    test_db.commit()
+    summary = (await auth_service.get_profile_summary(test_db, user))["data"]
+    assert summary["subscription_badges"][0]["name"] == "Bronze+"
+    assert len(loads) == 2
+
+    # Shared definitions (here an avatar) retire every entry.
+    test_db.query(Avatar).filter_by(id="owl").one().name = "Snowy Owl"
+    test_db.commit()
+    summary = (await auth_service.get_profile_summary(test_db, user))["data"]
+    assert summary["avatar"]["name"] == "Snowy Owl"
+    assert len(loads) == 3
+
+
+def test_fill_that_raced_a_subscription_change_is_never_served(test_db, fake_redis):
+    from utils.trivia_mode_service import get_active_draw_date
+
+    user = _seed_profile(test_db)
+    draw_date = get_active_draw_date()
+
+    lookup, cached = profile_view._cached(user.account_id, draw_date.isoformat())
+    stale = profile_view._from_row(
+        test_db.execute(
+            profile_view._load_stmt(user.account_id, draw_date, datetime.utcnow())
+        ).first()
+    )
+    test_db.query(UserSubscription).one().status = "canceled"
+    test_db.commit()
+    profile_view._profiles.store(
+        lookup,
+        {
+            user.account_id: {
+                "draw_date": draw_date.isoformat(),
+                "profile": stale,
+            }
+        },
+    )
+
+    assert cached is None and stale["subscription_tiers"] == ["bronze"]
+    assert (
+        profile_view.get_profile_view(test_db, user.account_id).subscription_badges
+        == []
+    )
+
+
+def test_free_mode_answer_retires_the_cached_profile(
+    test_db, fake_redis, loads, monkeypatch
+):
+    from datetime import date
+
+    import utils.daily_user_state as daily_user_state
+    import utils.user_level_service as user_level_service
+    from models import TriviaQuestionsFreeMode, TriviaQuestionsFreeModeDaily
+    from utils.trivia_mode_service import (
+        get_date_range_for_query,
+        submit_free_mode_answer,
+    )
+
+    monkeypatch.setattr(user_level_service, "get_sync_redis", lambda: None)
+    monkeypatch.setattr(daily_user_state, "get_sync_redis", lambda: None)
+    user = _seed_profile(test_db)
+    answer_date = date(2024, 1, 2)
+    question = TriviaQuestionsFreeMode(
+        question="Free question",
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="A",
+        category="general",
+        difficulty_level="easy",
+        question_hash="free-hash-profile",
+    )
+    test_db.add(question)
+    test_db.flush()
+    test_db.add(
+        TriviaQuestionsFreeModeDaily(
+            date=get_date_range_for_query(answer_date)[0],
+            question_id=question.id,
+            question_order=1,
+        )
+    )
+    test_db.commit()
+    assert profile_view.get_profile_view(test_db, user.account_id).total_correct == 0
+
+    result = submit_free_mode_answer(test_db, user, question.id, "A", answer_date)
+
+    assert result["is_correct"] is True
+    assert profile_view.get_profile_view(test_db, user.account_id).total_correct == 1
+    assert len(loads) == 2
@@ -0,0 +1,105 @@
+"""Tests for the streaming CSV question importer."""
+
+import io
+
+import pytest
+
+from models import TriviaQuestionsBronzeMode
+from utils.question_hash_utils import generate_question_hash
+from utils.question_upload_service import import_questions_csv
+
+HEADER = (
+    "question,option_a,option_b,option_c,option_d,correct_answer,"
+    "category,difficulty_level,hint\n"
+)
+
+
+def _row(question, correct="A", hint=""):
+    return f"{question},A,B,C,D,{correct},science,easy,{hint}\n"
+
+
+def _csv(*rows):
+    return io.BytesIO((HEADER + "".join(rows)).encode("utf-8"))
+
+
+def test_import_stages_chunks_and_reports_row_errors(test_db):
+    test_db.add(
+        TriviaQuestionsBronzeMode(
+            question="Already there?",
+            option_a="A",
+            option_b="B",
+            option_c="C",
+            option_d="D",
+            correct_answer="A",
+            category="science",
+            difficulty_level="easy",
+            question_hash=generate_question_hash("Already there?"),
+        )
+    )
+    test_db.commit()
+    upload = _csv(
+        _row("Q1?", hint="first"),
+        _row("Q2?"),
+        _row("Q1?"),  # repeated within the file
+        _row("Already there?"),  # repeated against the table
+        _row("Q3?", correct="E"),  # fails validation
+        "Q4?,A,B\n",  # missing fields
+        _row("Q5?"),
+    )
+    progress = []
+
+    result = import_questions_csv(
+        test_db, upload, "bronze", chunk_size=2, on_progress=progress.append
+    )
+
+    assert result["rows_processed"] == 7
+    assert result["saved_count"] == 3
+    assert result["duplicate_count"] == 2
+    assert result["error_count"] == 2
+    assert [error.split(":")[0] for error in result["errors"]] == [
+        "Row 4",
+        "Row 5",
+        "Row 6",
+        "Row 7",
+    ]
+    assert [p["saved_count"] for p in progress] == [2, 3]
+    assert not upload.closed
+
+    saved = {
+        q.question: q
+        for q in test_db.query(TriviaQuestionsBronzeMode).filter(
+            TriviaQuestionsBronzeMode.question.like("Q%")
+        )
+    }
+    assert set(saved) == {"Q1?", "Q2?", "Q5?"}
+    assert saved["Q1?"].hint == "first" and saved["Q2?"].hint is None
+    assert saved["Q1?"].is_used is False and saved["Q1?"].created_date is not None
+
+    # Re-uploading the same bank only reports duplicates.
+    again = import_questions_csv(test_db, _csv(_row("Q1?"), _row("Q2?")), "bronze")
+    assert again["saved_count"] == 0 and again["duplicate_count"] == 2
+
+
+def test_capped_errors_are_the_first_rows(test_db, monkeypatch):
+    import utils.question_upload_service as question_upload_service
+
+    monkeypatch.setattr(question_upload_service, "QUESTION_IMPORT_MAX_ERRORS", 2)
+    import_questions_csv(test_db, _csv(_row("Seen?")), "bronze")
+
+    result = import_questions_csv(
+        test_db,
+        _csv(_row("Seen?"), _row("Q1?"), "Q2?,A,B\n", "Q3?,A,B\n"),
+        "bronze",
+    )
+
+    # Row 2 is only known to repeat the table when its chunk is flushed at the end,
+    # after rows 4 and 5 already filled the cap.
+    assert result["error_count"] == 2 and result["duplicate_count"] == 1
+    assert [error.split(":")[0] for error in result["errors"]] == ["Row 2", "Row 4"]
+
+
+def test_import_rejects_header_without_required_columns(test_db):
+    with pytest.raises(ValueError, match="correct_answer"):
+        import_questions_csv(
+            test_db, io.BytesIO(b"question,option_a\nQ?,A\n"), "free_mode"
+        )
@@ -0,0 +1,28 @@
+"""Tests for the shared generation behind the in-process read models."""
+
+import pytest
+
+from core import read_models
+from core.read_models import SharedGeneration
+
+
+def test_bump_reaches_other_workers_after_the_check_interval(fake_redis, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(read_models.time, "monotonic", lambda: clock[0])
+    # Two instances on one key stand in for two workers.
+    committer = SharedGeneration("pack:generation", check_seconds=2)
+    other = SharedGeneration("pack:generation", check_seconds=2)
+    before = other.current()
+
+    committer.bump()
+
+    assert committer.current() > before
+    assert other.current() == before
+    clock[0] += 2
+    assert other.current() == committer.current()
+
+    # A bump without Redis still moves this worker, and never goes backwards.
+    monkeypatch.setattr(read_models, "get_sync_redis", lambda: None)
+    seen = committer.current()
+    committer.bump()
+    assert committer.current() > seen
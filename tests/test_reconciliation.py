@@ -1,101 +1,146 @@
 """Tests for wallet reconciliation service."""
 
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta
 
 import pytest
-
+import pytest_asyncio
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base as AsyncBase
+from app.models.user import User
+from app.models.wallet import (
+    WalletReconciliationCheckpoint,
+    WalletReconciliationMismatch,
+    WalletTransaction,
+)
+from app.services import reconciliation_service
 from app.services.reconciliation_service import run_wallet_reconciliation
 
-
-def _make_user_row(account_id, balance):
-    row = MagicMock()
-    row.account_id = account_id
-    row.wallet_balance_minor = balance
-    return row
-
-
-def _make_ledger_row(user_id, expected):
-    row = MagicMock()
-    row.user_id = user_id
-    row.expected = expected
-    return row
+SETTLED_AT = datetime.utcnow() - timedelta(days=1)
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path, monkeypatch):
+    # Two users per page so multi-user tests cross a page boundary.
+    monkeypatch.setattr(reconciliation_service, "BATCH_SIZE", 2)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'recon.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+async def _seed(session, account_id, balance, amounts, created_at=SETTLED_AT):
+    session.add(
+        User(
+            account_id=account_id,
+            email=f"recon_{account_id}@example.com",
+            username=f"recon_{account_id}",
+            wallet_balance_minor=balance,
+            wallet_currency="usd",
+        )
+    )
+    for amount in amounts:
+        session.add(
+            WalletTransaction(
+                user_id=account_id,
+                amount_minor=amount,
+                currency="usd",
+                kind="deposit",
+                created_at=created_at,
+            )
+        )
+    await session.commit()
 
 
 @pytest.mark.asyncio
-async def test_all_balances_match():
-    db = AsyncMock()
-
-    users = [_make_user_row(1, 500), _make_user_row(2, 1000)]
-    ledger = [_make_ledger_row(1, 500), _make_ledger_row(2, 1000)]
-
-    user_result = MagicMock()
-    user_result.all.return_value = users
-
-    ledger_result = MagicMock()
-    ledger_result.all.return_value = ledger
-
-    empty_result = MagicMock()
-    empty_result.all.return_value = []
-
-    # First call returns users, second returns ledger, third returns empty (end batch)
-    db.execute.side_effect = [user_result, ledger_result, empty_result]
-
-    summary = await run_wallet_reconciliation(db)
-
-    assert summary["checked"] == 2
-    assert summary["matched"] == 2
+async def test_all_balances_match(session_maker):
+    async with session_maker() as session:
+        await _seed(session, 1, 500, [500])
+        await _seed(session, 2, 1000, [700, 300])
+        await _seed(session, 3, 0, [])
+        summary = await run_wallet_reconciliation(session)
+
+    assert summary["checked"] == 3
+    assert summary["matched"] == 3
+    assert summary["mismatch_count"] == 0
     assert summary["mismatches"] == []
 
 
 @pytest.mark.asyncio
-async def test_detects_mismatch():
-    db = AsyncMock()
-
-    users = [_make_user_row(1, 500), _make_user_row(2, 800)]
-    ledger = [_make_ledger_row(1, 500), _make_ledger_row(2, 1000)]
-
-    user_result = MagicMock()
-    user_result.all.return_value = users
-
-    ledger_result = MagicMock()
-    ledger_result.all.return_value = ledger
-
-    empty_result = MagicMock()
-    empty_result.all.return_value = []
-
-    db.execute.side_effect = [user_result, ledger_result, empty_result]
-
-    summary = await run_wallet_reconciliation(db)
+async def test_detects_mismatch_and_writes_report(session_maker):
+    async with session_maker() as session:
+        await _seed(session, 1, 500, [500])
+        await _seed(session, 2, 800, [1000])
+        summary = await run_wallet_reconciliation(session)
+        rows = (
+            await session.execute(
+                select(WalletReconciliationMismatch).where(
+                    WalletReconciliationMismatch.run_id == summary["run_id"]
+                )
+            )
+        ).scalars().all()
 
     assert summary["checked"] == 2
     assert summary["matched"] == 1
-    assert len(summary["mismatches"]) == 1
-    assert summary["mismatches"][0]["user_id"] == 2
-    assert summary["mismatches"][0]["expected"] == 1000
-    assert summary["mismatches"][0]["actual"] == 800
-    assert summary["mismatches"][0]["diff"] == -200
+    assert summary["mismatches"] == [
+        {"user_id": 2, "expected": 1000, "actual": 800, "diff": -200}
+    ]
+    assert [(r.user_id, r.expected_minor, r.actual_minor, r.diff_minor) for r in rows] == [
+        (2, 1000, 800, -200)
+    ]
 
 
 @pytest.mark.asyncio
-async def test_user_with_no_transactions():
-    db = AsyncMock()
-
-    users = [_make_user_row(1, 0)]
-    ledger = []  # No transactions for this user
+async def test_incremental_run_folds_only_new_rows(session_maker):
+    async with session_maker() as session:
+        await _seed(session, 1, 500, [200, 300])
+        await run_wallet_reconciliation(session)
+        checkpoint = await session.get(WalletReconciliationCheckpoint, 1)
+        assert checkpoint.ledger_sum_minor == 500
+
+        # An already-folded row is not re-read by the incremental run...
+        first_id = (await session.execute(select(func.min(WalletTransaction.id)))).scalar()
+        await session.execute(
+            update(WalletTransaction)
+            .where(WalletTransaction.id == first_id)
+            .values(amount_minor=999)
+        )
+        session.add(
+            WalletTransaction(
+                user_id=1, amount_minor=100, currency="usd", kind="deposit",
+                created_at=SETTLED_AT,
+            )
+        )
+        await session.execute(
+            update(User).where(User.account_id == 1).values(wallet_balance_minor=600)
+        )
+        await session.commit()
+
+        summary = await run_wallet_reconciliation(session)
+        assert summary["mismatch_count"] == 0
+        await session.refresh(checkpoint)
+        assert checkpoint.ledger_sum_minor == 600
+
+        # ...but a full rescan rebuilds the checkpoint from the whole ledger.
+        summary = await run_wallet_reconciliation(session, full=True)
+        assert summary["mismatches"] == [
+            {"user_id": 1, "expected": 1399, "actual": 600, "diff": -799}
+        ]
+        await session.refresh(checkpoint)
+        assert checkpoint.ledger_sum_minor == 1399
 
-    user_result = MagicMock()
-    user_result.all.return_value = users
 
-    ledger_result = MagicMock()
-    ledger_result.all.return_value = ledger
-
-    empty_result = MagicMock()
-    empty_result.all.return_value = []
-
-    db.execute.side_effect = [user_result, ledger_result, empty_result]
-
-    summary = await run_wallet_reconciliation(db)
-
-    assert summary["checked"] == 1
-    assert summary["matched"] == 1  # 0 == 0
-    assert summary["mismatches"] == []
+@pytest.mark.asyncio
+async def test_unsettled_rows_are_checked_but_not_folded(session_maker):
+    async with session_maker() as session:
+        await _seed(session, 1, 500, [500])
+        await _seed(session, 2, 50, [50], created_at=datetime.utcnow())
+        summary = await run_wallet_reconciliation(session)
+
+        assert summary["mismatch_count"] == 0
+        assert (await session.get(WalletReconciliationCheckpoint, 1)).ledger_sum_minor == 500
+        assert await session.get(WalletReconciliationCheckpoint, 2) is None
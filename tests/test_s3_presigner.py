@@ -0,0 +1,148 @@
+"""Tests for the offline SigV4 presigner and `presign_get`."""
+
+import datetime
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import utils.s3_presigner as presigner
+import utils.storage as storage
+from core.cache import LRUCache
+from utils.s3_presigner import presign_get_url
+
+ACCESS_KEY = "AKIDEXAMPLE"
+SECRET_KEY = "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"
+NOW = datetime.datetime(2026, 10, 18, 12, 5, 42, tzinfo=datetime.timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "bucket,style", [("avatars", "virtual"), ("media.triviapay", "path")]
+)
+def test_matches_botocore_signature(monkeypatch, bucket, style):
+    boto3 = pytest.importorskip("boto3")
+    import botocore.auth
+    from botocore.config import Config
+
+    bucket_start = NOW.replace(minute=5, second=0)
+
+    class _FrozenDatetime(datetime.datetime):
+        @classmethod
+        def utcnow(cls):
+            return bucket_start.replace(tzinfo=None)
+
+    monkeypatch.setattr(botocore.auth.datetime, "datetime", _FrozenDatetime)
+    key = "frames/gold ring+ünï(1)~.png"
+    ours = presign_get_url(
+        access_key=ACCESS_KEY,
+        secret_key=SECRET_KEY,
+        bucket=bucket,
+        key=key,
+        region="us-east-2",
+        addressing_style=style,
+        expires=900,
+        bucket_seconds=300,
+        now=NOW.timestamp(),
+    )
+    client = boto3.session.Session().client(
+        "s3",
+        region_name="us-east-2",
+        aws_access_key_id=ACCESS_KEY,
+        aws_secret_access_key=SECRET_KEY,
+        endpoint_url="https://s3.us-east-2.amazonaws.com",
+        config=Config(signature_version="s3v4", s3={"addressing_style": style}),
+    )
+    expected = client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=int(parse_qs(urlparse(ours.url).query)["X-Amz-Expires"][0]),
+    )
+
+    assert ours.url == expected
+    assert ours.bucket_start == int(bucket_start.timestamp())
+
+
+def test_urls_are_identical_within_a_bucket_and_cover_the_lifetime():
+    def sign(now):
+        return presign_get_url(
+            access_key=ACCESS_KEY,
+            secret_key=SECRET_KEY,
+            bucket="avatars",
+            key="a/fox.png",
+            region="us-east-2",
+            expires=900,
+            bucket_seconds=300,
+            now=now,
+        )
+
+    start = 1_800_000_000 // 300 * 300
+    first, last, next_bucket = sign(start), sign(start + 299.9), sign(start + 300)
+    assert first.url == last.url
+    assert next_bucket.url != first.url
+
+    query = parse_qs(urlparse(last.url).query)
+    valid_until = last.bucket_start + int(query["X-Amz-Expires"][0])
+    assert valid_until >= start + 299 + 900
+
+
+def test_presign_get_reuses_url_until_bucket_ends(monkeypatch):
+    clock = {"now": 1_800_000_000 // 300 * 300 + 10}
+    monkeypatch.setattr(storage.time, "time", lambda: clock["now"])
+    monkeypatch.setattr(storage, "AWS_ACCESS_KEY_ID", ACCESS_KEY)
+    monkeypatch.setattr(storage, "AWS_SECRET_ACCESS_KEY", SECRET_KEY)
+    monkeypatch.setenv("S3_PRESIGN_ASSUME_REGION", "us-east-2")
+    monkeypatch.setattr(storage, "_presign_cache", LRUCache(max_keys=100))
+    monkeypatch.setattr(storage, "_bucket_regions", {})
+
+    first = storage.presign_get("avatars", "/a/fox.png", expires=900)
+    assert first.startswith("https://avatars.s3.us-east-2.amazonaws.com/a/fox.png?")
+    clock["now"] += 250
+    assert storage.presign_get("avatars", "/a/fox.png", expires=900) == first
+    clock["now"] += 50
+    assert storage.presign_get("avatars", "/a/fox.png", expires=900) != first
+
+
+def test_presign_many_signs_each_distinct_object_once(monkeypatch):
+    monkeypatch.setattr(storage, "AWS_ACCESS_KEY_ID", ACCESS_KEY)
+    monkeypatch.setattr(storage, "AWS_SECRET_ACCESS_KEY", SECRET_KEY)
+    monkeypatch.setenv("S3_PRESIGN_ASSUME_REGION", "us-east-2")
+    monkeypatch.setattr(storage, "_presign_cache", LRUCache(max_keys=100))
+    signed = []
+    real_sign = presigner.presign_get_url
+    monkeypatch.setattr(
+        storage,
+        "presign_get_url",
+        lambda **kw: signed.append(kw["key"]) or real_sign(**kw),
+    )
+
+    # A 100-message chat page where senders share a handful of avatars and frames.
+    page = [("avatars", f"a/{n % 7}.png") for n in range(100)]
+    page += [("frames", f"f/{n % 5}.png") for n in range(100)]
+    page += [("avatars", None), (None, "f/x.png")]
+    urls = storage.presign_many(page)
+
+    assert len(signed) == 12
+    assert set(urls) == {pair for pair in page if pair[0] and pair[1]}
+    assert all(urls.values())
+    assert storage.presign_get("avatars", "a/3.png") == urls[("avatars", "a/3.png")]
+
+    storage.presign_many(page)
+    assert len(signed) == 12
+    stats = storage.presign_cache_stats()
+    assert stats["misses"] == 12 and stats["hits"] == 13
+
+
+def test_lru_evicts_least_recently_used_entries_one_at_a_time():
+    cache = LRUCache(max_keys=3)
+    far = 1e12
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper(), expires_at=far)
+    assert cache.get("a") == "A"  # "b" is now the coldest entry
+    cache.set("d", "D", expires_at=far)
+
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in ("a", "c", "d")] == ["A", "C", "D"]
+    assert cache.stats()["evictions"] == 1
+
+    cache.set("e", "E", expires_at=0)
+    assert cache.get("e") is None
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,118 @@
+"""Tests for streaming S3 uploads and batched deletes in `utils.storage`."""
+
+import io
+
+import pytest
+
+import utils.storage as storage
+
+
+class _FakeS3:
+    def __init__(self, fail_on_part=None):
+        self.calls = []
+        self.fail_on_part = fail_on_part
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs["Key"], len(kwargs["Body"])))
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs["Key"], kwargs.get("ContentType")))
+        return {"UploadId": "up-1"}
+
+    def upload_part(self, **kwargs):
+        if kwargs["PartNumber"] == self.fail_on_part:
+            raise RuntimeError("connection reset")
+        self.calls.append(("upload_part", kwargs["PartNumber"], len(kwargs["Body"])))
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.calls.append(("complete", kwargs["MultipartUpload"]["Parts"]))
+
+    def abort_multipart_upload(self, **kwargs):
+        self.calls.append(("abort", kwargs["UploadId"]))
+
+    def delete_objects(self, **kwargs):
+        keys = [obj["Key"] for obj in kwargs["Delete"]["Objects"]]
+        self.calls.append(("delete_objects", len(keys)))
+        return {"Errors": []}
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    fake = _FakeS3()
+    monkeypatch.setattr(storage, "AWS_ACCESS_KEY_ID", "AKID")
+    monkeypatch.setattr(storage, "AWS_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setattr(storage, "_client_for_bucket", lambda bucket: fake)
+    monkeypatch.setattr(storage, "_MULTIPART_PART_SIZE", 4)
+    return fake
+
+
+def test_small_object_is_a_single_put(fake_s3):
+    assert storage.upload_fileobj("b", "/pics/1.jpg", io.BytesIO(b"abcd"), "image/jpeg")
+    assert fake_s3.calls == [("put_object", "pics/1.jpg", 4)]
+
+
+@pytest.mark.asyncio
+async def test_large_object_streams_parts_off_the_loop(fake_s3):
+    ok = await storage.upload_fileobj_async("b", "pics/1.jpg", io.BytesIO(b"x" * 10), "image/png")
+
+    assert ok
+    assert fake_s3.calls == [
+        ("create_multipart_upload", "pics/1.jpg", "image/png"),
+        ("upload_part", 1, 4),
+        ("upload_part", 2, 4),
+        ("upload_part", 3, 2),
+        (
+            "complete",
+            [{"ETag": f"etag-{n}", "PartNumber": n} for n in (1, 2, 3)],
+        ),
+    ]
+
+
+def test_failed_part_aborts_the_upload(fake_s3):
+    fake_s3.fail_on_part = 2
+    assert not storage.upload_fileobj("b", "k", io.BytesIO(b"x" * 10))
+    assert fake_s3.calls[-1] == ("abort", "up-1")
+
+
+def test_delete_files_batches_keys(fake_s3):
+    keys = [f"k/{n}" for n in range(2500)] + ["k/1", ""]
+    assert storage.delete_files("b", keys)
+    assert fake_s3.calls == [("delete_objects", 1000), ("delete_objects", 1000), ("delete_objects", 500)]
+
+
+def test_bootstrap_resolves_buckets_concurrently_and_pins_them(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(storage, "AWS_ACCESS_KEY_ID", "AKID")
+    monkeypatch.setattr(storage, "AWS_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.delenv("S3_PRESIGN_ASSUME_REGION", raising=False)
+    monkeypatch.setattr(storage, "_bucket_regions", {})
+    monkeypatch.setattr(storage, "_bucket_addressing_styles", {})
+    buckets = ["avatars", "frames", "media.triviapay"]
+    # Every lookup waits for all the others, so a serial bootstrap would time out.
+    all_in_flight = threading.Barrier(len(buckets), timeout=5)
+    lookups, clients = [], []
+
+    def _lookup(bucket):
+        lookups.append(bucket)
+        all_in_flight.wait()
+        return "eu-west-1" if bucket == "frames" else "us-east-2"
+
+    monkeypatch.setattr(storage, "_get_bucket_region", _lookup)
+    monkeypatch.setattr(
+        storage,
+        "_get_s3_client_for_region",
+        lambda region, style: clients.append((region, style)) or object(),
+    )
+
+    resolved = storage.bootstrap_buckets(buckets + ["avatars", None])
+
+    assert resolved == {
+        "avatars": ("us-east-2", "virtual"),
+        "frames": ("eu-west-1", "virtual"),
+        "media.triviapay": ("us-east-2", "path"),
+    }
+    assert sorted(lookups) == sorted(buckets)
+    assert sorted(clients) == sorted(resolved.values())
+    assert storage._bucket_regions == {b: r for b, (r, _) in resolved.items()}
@@ -5,7 +5,7 @@ from fastapi.testclient import TestClient
 
 from core.db import get_db
 from main import app
-from models import GemPackageConfig, User, UserGemPurchase
+from models import Avatar, GemPackageConfig, User, UserGemPurchase
 from routers.dependencies import get_current_user
 
 
@@ -53,6 +53,40 @@ def test_get_gem_packages_returns_prices(client, test_db):
     assert item["is_one_time"] is False
 
 
+def test_catalog_listings_revalidate_with_etag(client, test_db):
+    test_db.add(Avatar(id="fox", name="Fox", price_gems=10, is_premium=False))
+    test_db.commit()
+
+    first = client.get("/cosmetics/avatars", params={"include_urls": False})
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert [item["id"] for item in first.json()] == ["fox"]
+
+    cached = client.get(
+        "/cosmetics/avatars",
+        params={"include_urls": False},
+        headers={"If-None-Match": f'W/"stale", {etag}'},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    test_db.add(Avatar(id="owl", name="Owl", price_gems=20, is_premium=False))
+    test_db.commit()
+
+    changed = client.get(
+        "/cosmetics/avatars",
+        params={"include_urls": False},
+        headers={"If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert int(changed.headers["x-catalog-version"]) > int(
+        first.headers["x-catalog-version"]
+    )
+    assert {item["id"] for item in changed.json()} == {"fox", "owl"}
+
+
 def test_buy_gems_success(client, test_db, current_user):
     current_user.wallet_balance_minor = 700
     current_user.wallet_balance = 7.0
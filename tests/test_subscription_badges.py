@@ -0,0 +1,125 @@
+"""Tests for shared badge definitions and the per-user subscription tier cache."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+import utils.chat_helpers as chat_helpers
+import utils.subscription_badges as subscription_badges
+from models import SubscriptionPlan, TriviaModeConfig, User, UserSubscription
+
+
+@pytest.fixture
+def badge_queries(test_db):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "trivia_mode_config" in statement or "user_subscriptions" in statement:
+            statements.append(statement)
+
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def _mode_config(mode_id, mode_name):
+    return TriviaModeConfig(
+        mode_id=mode_id,
+        mode_name=mode_name,
+        questions_count=1,
+        reward_distribution=json.dumps({}),
+        amount=0.0,
+        leaderboard_types=json.dumps(["daily"]),
+        badge_image_url=f"https://cdn.example.com/{mode_id}.png",
+    )
+
+
+def _seed(db):
+    users = db.query(User).order_by(User.account_id).all()
+    db.add_all(
+        [
+            _mode_config("bronze", "Bronze Mode"),
+            _mode_config("silver_mode", "Silver Mode"),
+        ]
+    )
+    plans = [
+        SubscriptionPlan(
+            name="Bronze",
+            price_usd=5.0,
+            billing_interval="month",
+            unit_amount_minor=500,
+        ),
+        SubscriptionPlan(
+            name="Silver",
+            price_usd=10.0,
+            billing_interval="month",
+            unit_amount_minor=1000,
+        ),
+    ]
+    db.add_all(plans)
+    db.flush()
+    period_end = datetime.utcnow() + timedelta(days=30)
+    db.add_all(
+        [
+            UserSubscription(
+                user_id=users[0].account_id,
+                plan_id=plans[0].id,
+                status="active",
+                current_period_end=period_end,
+            ),
+            UserSubscription(
+                user_id=users[1].account_id,
+                plan_id=plans[1].id,
+                status="active",
+                current_period_end=period_end,
+            ),
+        ]
+    )
+    users[0].badge_id = "bronze"
+    db.commit()
+    return users
+
+
+def test_chat_pages_resolve_badges_without_per_user_queries(
+    test_db, fake_redis, badge_queries, monkeypatch
+):
+    # Bypass the short-lived page cache so both calls build the profiles.
+    monkeypatch.setattr(chat_helpers, "CHAT_PROFILE_CACHE_SECONDS", 0)
+    users = _seed(test_db)
+
+    first = chat_helpers.get_user_chat_profile_data_bulk(users, test_db)
+    badge_queries.clear()
+    second = chat_helpers.get_user_chat_profile_data_bulk(users, test_db)
+
+    assert badge_queries == []
+    assert second == first
+    assert first[users[0].account_id]["badge"]["id"] == "bronze"
+    assert [
+        b["subscription_type"]
+        for b in first[users[0].account_id]["subscription_badges"]
+    ] == ["bronze"]
+    # Silver has no candidate mode id; the mode-name fallback resolves it.
+    silver = first[users[1].account_id]["subscription_badges"]
+    assert [(b["id"], b["price"]) for b in silver] == [("silver_mode", 10.0)]
+
+
+def test_subscription_commit_retires_only_that_users_tiers(
+    test_db, fake_redis, badge_queries
+):
+    users = _seed(test_db)
+    ids = [user.account_id for user in users]
+    assert subscription_badges.get_subscription_tiers(test_db, ids) == {
+        ids[0]: frozenset({"bronze"}),
+        ids[1]: frozenset({"silver"}),
+    }
+
+    test_db.query(UserSubscription).filter_by(user_id=ids[0]).one().status = "canceled"
+    test_db.commit()
+    badge_queries.clear()
+    tiers = subscription_badges.get_subscription_tiers(test_db, ids)
+
+    assert tiers == {ids[0]: frozenset(), ids[1]: frozenset({"silver"})}
+    assert len(badge_queries) == 1 and str(ids[1]) not in str(badge_queries)
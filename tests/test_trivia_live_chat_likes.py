@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+import utils.trivia_live_chat_likes as likes
+from models import TriviaLiveChatLike, User
+
+
+@pytest.fixture
+def fake_redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(likes, "get_sync_redis", lambda: fake_redis)
+    return fake_redis
+
+
+def test_add_session_like_seeds_from_table_and_dedupes(test_db, fake_redis):
+    users = test_db.query(User).order_by(User.account_id).all()
+    draw_date = date(2024, 1, 2)
+    test_db.add(
+        TriviaLiveChatLike(user_id=users[0].account_id, draw_date=draw_date)
+    )
+    test_db.commit()
+
+    assert likes.add_session_like(
+        test_db, user_id=users[0].account_id, draw_date=draw_date
+    ) == (False, 1)
+    assert likes.add_session_like(
+        test_db, user_id=users[1].account_id, draw_date=draw_date
+    ) == (True, 2)
+    assert likes.get_session_like_state(
+        test_db, user_id=users[1].account_id, draw_date=draw_date
+    ) == (2, True)
+
+
+def test_like_counter_unavailable_without_redis(test_db, monkeypatch):
+    monkeypatch.setattr(likes, "get_sync_redis", lambda: None)
+    user = test_db.query(User).first()
+
+    assert (
+        likes.add_session_like(test_db, user_id=user.account_id, draw_date=date.today())
+        is None
+    )
+
+
+def test_broadcast_slot_is_claimed_once_per_window(fake_redis):
+    draw_date = date(2024, 1, 2)
+
+    assert likes.claim_like_broadcast_slot(draw_date, interval_ms=1000) is True
+    assert likes.claim_like_broadcast_slot(draw_date, interval_ms=1000) is False
+
+
+def test_broadcast_slot_local_fallback(monkeypatch):
+    monkeypatch.setattr(likes, "get_sync_redis", lambda: None)
+    monkeypatch.setattr(likes, "_local_broadcast_slots", {})
+    draw_date = date(2024, 1, 3)
+
+    assert likes.claim_like_broadcast_slot(draw_date, interval_ms=60_000) is True
+    assert likes.claim_like_broadcast_slot(draw_date, interval_ms=60_000) is False
+    assert likes.claim_like_broadcast_slot(date(2024, 1, 4), interval_ms=60_000) is True
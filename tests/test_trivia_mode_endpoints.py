@@ -921,11 +921,22 @@ def test_profile_send_referral_generates_code(
 
 def test_profile_upload_profile_pic(client, test_db, current_user, monkeypatch):
     monkeypatch.setattr(auth_service, "AWS_PROFILE_PIC_BUCKET", "test-bucket")
-    monkeypatch.setattr(auth_service, "upload_file", lambda **kwargs: True)
+    uploaded = {}
+    deleted = []
+
+    async def _upload(bucket, key, fileobj, content_type):
+        uploaded[key] = fileobj.read()
+        return True
+
+    monkeypatch.setattr(auth_service, "upload_fileobj_async", _upload)
     monkeypatch.setattr(
         auth_service, "presign_get", lambda **kwargs: "https://cdn.test/pic.jpg"
     )
-    monkeypatch.setattr(auth_service, "delete_file", lambda **kwargs: None)
+    monkeypatch.setattr(
+        auth_service,
+        "delete_files_in_background",
+        lambda bucket, keys: deleted.extend(keys),
+    )
 
     response = client.post(
         "/profile/upload-profile-pic",
@@ -939,6 +950,9 @@ def test_profile_upload_profile_pic(client, test_db, current_user, monkeypatch):
 
     test_db.refresh(current_user)
     assert current_user.profile_pic_url == "https://cdn.test/pic.jpg"
+    key = f"profile_pic/{current_user.account_id}.jpg"
+    assert uploaded == {key: b"fake-image"}
+    assert key not in deleted and len(deleted) == 4
 
 
 def test_profile_upload_profile_pic_rejects_type(client, monkeypatch):
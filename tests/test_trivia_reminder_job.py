@@ -0,0 +1,85 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+import config
+import routers.trivia.service as trivia_service
+import utils.job_checkpoint as job_checkpoint
+import utils.onesignal_client as onesignal_client
+from models import Notification, OneSignalPlayer, User
+
+
+@pytest.fixture
+def reminder_env(test_db, fake_redis, monkeypatch):
+    sent = []
+
+    async def _fake_send(player_ids, heading, content, data=None, url=None, is_in_app_notification=False):
+        sent.append(list(player_ids))
+        return True
+
+    monkeypatch.setattr(job_checkpoint, "get_sync_redis", lambda: fake_redis)
+    monkeypatch.setattr(onesignal_client, "send_push_notification_async", _fake_send)
+    monkeypatch.setattr(config, "TRIVIA_REMINDER_PAGE_SIZE", 1)
+    monkeypatch.setattr(config, "TRIVIA_REMINDER_MAX_CONCURRENT_BATCHES", 2)
+
+    users = test_db.query(User).order_by(User.account_id).all()
+    users[-1].notification_on = False
+    for i, user in enumerate(users):
+        for n in range(2 if i == 0 else 1):
+            test_db.add(
+                OneSignalPlayer(
+                    user_id=user.account_id,
+                    player_id=f"player-{user.account_id}-{n}",
+                    platform="ios",
+                )
+            )
+    test_db.commit()
+    return {"redis": fake_redis, "sent": sent, "users": users}
+
+
+def _run(test_db, draw_date):
+    asyncio.run(
+        trivia_service._run_trivia_reminder_pipeline(
+            test_db, draw_date, "Heads up", "Play today", False
+        )
+    )
+
+
+def test_reminder_streams_pages_and_skips_opted_out(test_db, reminder_env):
+    draw_date = date(2024, 1, 2)
+    _run(test_db, draw_date)
+
+    users = reminder_env["users"]
+    sent = [pid for batch in reminder_env["sent"] for pid in batch]
+    expected = [
+        p.player_id
+        for p in test_db.query(OneSignalPlayer).all()
+        if p.user_id != users[-1].account_id
+    ]
+    assert sorted(sent) == sorted(expected)
+    assert len(reminder_env["sent"]) > 1
+    assert all(len(batch) == 1 for batch in reminder_env["sent"])
+
+    notified = [n.user_id for n in test_db.query(Notification).all()]
+    assert sorted(notified) == sorted(u.account_id for u in users[:-1])
+    assert reminder_env["redis"].values == {}
+
+
+def test_reminder_resumes_from_checkpoint(test_db, reminder_env):
+    draw_date = date(2024, 1, 2)
+    first = (
+        test_db.query(OneSignalPlayer)
+        .order_by(OneSignalPlayer.user_id, OneSignalPlayer.id)
+        .first()
+    )
+    job_key = trivia_service._trivia_reminder_job_key(
+        draw_date, "Heads up", "Play today", False
+    )
+    job_checkpoint.save_checkpoint(job_key, (first.user_id, first.id))
+
+    _run(test_db, draw_date)
+
+    sent = [pid for batch in reminder_env["sent"] for pid in batch]
+    assert first.player_id not in sent
+    assert len(sent) == test_db.query(OneSignalPlayer).count() - 2
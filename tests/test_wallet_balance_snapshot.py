@@ -0,0 +1,141 @@
+"""Consistency tests for the wallet balance read model."""
+
+import asyncio
+import random
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import utils.wallet_balance_snapshot as snapshots
+from app.db import Base as AsyncBase
+from app.models.user import User
+from app.models.wallet import WalletTransaction
+from app.services.wallet_service import (
+    WalletCredit,
+    adjust_wallet_balance,
+    credit_wallets_batch,
+    get_wallet_balance,
+)
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'balances.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        for account_id in (1, 2):
+            session.add(
+                User(
+                    account_id=account_id,
+                    email=f"u{account_id}@example.com",
+                    username=f"user{account_id}",
+                    wallet_balance_minor=1000,
+                    wallet_currency="usd",
+                )
+            )
+        await session.commit()
+    try:
+        yield maker
+    finally:
+        await engine.dispose()
+
+
+async def _db_balance(maker, account_id):
+    async with maker() as session:
+        return (
+            await session.execute(
+                select(User.wallet_balance_minor).where(User.account_id == account_id)
+            )
+        ).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_fill_that_raced_a_commit_is_never_served(session_maker, fake_redis):
+    async with session_maker() as session:
+        assert await get_wallet_balance(session, 1) == 1000
+        assert snapshots._cached(1)[1].balance_minor == 1000
+
+        # A reader grabs the token and reads the row...
+        lookup, cached = snapshots._cached(1)
+        stale = snapshots._from_row(
+            (await session.execute(snapshots._load_stmt(1))).first()
+        )
+        await session.commit()
+
+    # ...a credit commits before the reader writes its snapshot back...
+    async with session_maker() as session:
+        await adjust_wallet_balance(session, 1, "usd", 250, "deposit", event_id="e1")
+        await session.commit()
+    snapshots._snapshots.store(lookup, {1: list(stale)})
+
+    # ...so the stale fill is treated as a miss.
+    async with session_maker() as session:
+        assert await get_wallet_balance(session, 1) == 1250
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_adjustment_keeps_snapshot(session_maker, fake_redis):
+    async with session_maker() as session:
+        assert await get_wallet_balance(session, 2) == 1000
+        token_before = fake_redis.get("wallet_balance:token:2")
+        await adjust_wallet_balance(session, 2, "usd", -100, "fee", event_id="r1")
+        await session.rollback()
+
+    assert fake_redis.get("wallet_balance:token:2") == token_before
+    async with session_maker() as session:
+        assert await get_wallet_balance(session, 2) == 1000
+
+
+@pytest.mark.asyncio
+async def test_concurrent_credits_and_debits_never_diverge(session_maker, fake_redis):
+    rng = random.Random(7)
+    # SQLite ignores FOR UPDATE; this lock stands in for the per-user row lock.
+    row_locks = {1: asyncio.Lock(), 2: asyncio.Lock()}
+    observed = []
+
+    async def writer(n):
+        account_id = rng.choice((1, 2))
+        async with row_locks[account_id]:
+            async with session_maker() as session:
+                if n % 5 == 0:
+                    await credit_wallets_batch(
+                        session, [WalletCredit(account_id, 40, f"batch-{n}")]
+                    )
+                else:
+                    delta = rng.choice((-30, -10, 15, 25))
+                    await adjust_wallet_balance(
+                        session, account_id, "usd", delta, "adjustment", event_id=f"w-{n}"
+                    )
+                await asyncio.sleep(0)
+                await session.commit()
+
+    async def reader():
+        for _ in range(20):
+            async with session_maker() as session:
+                observed.append(await get_wallet_balance(session, rng.choice((1, 2))))
+            await asyncio.sleep(0)
+
+    async with session_maker() as session:
+        for account_id in (1, 2):
+            assert await get_wallet_balance(session, account_id) == 1000
+
+    await asyncio.gather(*(writer(n) for n in range(60)), *(reader() for _ in range(6)))
+
+    async with session_maker() as session:
+        for account_id in (1, 2):
+            ledger = (
+                await session.execute(
+                    select(func.coalesce(func.sum(WalletTransaction.amount_minor), 0)).where(
+                        WalletTransaction.user_id == account_id
+                    )
+                )
+            ).scalar_one()
+            db_balance = await _db_balance(session_maker, account_id)
+            assert db_balance == 1000 + ledger
+            assert await get_wallet_balance(session, account_id) == db_balance
+            assert snapshots._cached(account_id)[1].balance_minor == db_balance
+    assert observed and all(balance >= 0 for balance in observed)
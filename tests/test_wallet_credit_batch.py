@@ -0,0 +1,128 @@
+"""Tests for batch wallet crediting used by draw payouts."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import false, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base as AsyncBase
+from app.models.user import User
+from app.models.wallet import WalletTransaction
+from app.services.wallet_service import (
+    WalletCredit,
+    adjust_wallet_balance,
+    credit_wallets_batch,
+)
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'credits.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+async def _seed_users(session, *account_ids):
+    for account_id in account_ids:
+        session.add(
+            User(
+                account_id=account_id,
+                email=f"winner_{account_id}@example.com",
+                username=f"winner_{account_id}",
+                wallet_balance_minor=100,
+                wallet_currency="usd",
+            )
+        )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_batch_credits_once_and_skips_existing_keys(session_maker):
+    async with session_maker() as session:
+        await _seed_users(session, 1, 2, 3)
+        # Winner 3 was already paid through the single-credit path.
+        await adjust_wallet_balance(
+            session, 3, "usd", 50, "deposit", event_id="draw:3", livemode=True
+        )
+        await session.commit()
+
+        credits = [
+            WalletCredit(2, 75, "draw:2"),
+            WalletCredit(1, 150, "draw:1"),
+            WalletCredit(3, 50, "draw:3"),
+            WalletCredit(1, 150, "draw:1"),
+        ]
+        result = await credit_wallets_batch(
+            session, credits, external_ref_type="draw_reward", external_ref_id="d1"
+        )
+        await session.commit()
+
+        assert sorted(result["credited"]) == ["draw:1", "draw:2"]
+        assert sorted(result["skipped"]) == ["draw:1", "draw:3"]
+        assert result["balances"] == {1: 250, 2: 175}
+
+        # Replaying the whole batch is a no-op.
+        replay = await credit_wallets_batch(session, credits)
+        await session.commit()
+        assert replay["credited"] == []
+
+        balances = dict(
+            (await session.execute(select(User.account_id, User.wallet_balance_minor))).all()
+        )
+        assert balances == {1: 250, 2: 175, 3: 150}
+        ledger_rows = (
+            await session.execute(select(func.count()).select_from(WalletTransaction))
+        ).scalar()
+        assert ledger_rows == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_unknown_user_without_partial_credit(session_maker):
+    async with session_maker() as session:
+        await _seed_users(session, 1)
+        with pytest.raises(ValueError, match="Users not found"):
+            await credit_wallets_batch(
+                session, [WalletCredit(1, 10, "k1"), WalletCredit(99, 10, "k99")]
+            )
+        await session.rollback()
+
+        user = await session.get(User, 1)
+        await session.refresh(user)
+        assert user.wallet_balance_minor == 100
+
+
+@pytest.mark.asyncio
+async def test_batch_skips_keys_committed_after_the_lookup(session_maker, monkeypatch):
+    async with session_maker() as session:
+        await _seed_users(session, 1, 2)
+        await adjust_wallet_balance(
+            session, 1, "usd", 150, "deposit", event_id="draw:1", livemode=True
+        )
+        await session.commit()
+
+        # The pre-lock lookup misses draw:1, as if another worker committed it since.
+        execute = session.execute
+        calls = []
+
+        async def _execute(statement, *args, **kwargs):
+            calls.append(statement)
+            if len(calls) == 1:
+                statement = statement.where(false())
+            return await execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(session, "execute", _execute)
+        result = await credit_wallets_batch(
+            session, [WalletCredit(1, 150, "draw:1"), WalletCredit(2, 75, "draw:2")]
+        )
+        await session.commit()
+
+        assert result["credited"] == ["draw:2"]
+        assert result["skipped"] == ["draw:1"]
+        assert result["balances"] == {2: 175}
+        user = await session.get(User, 1)
+        await session.refresh(user)
+        assert user.wallet_balance_minor == 250
@@ -0,0 +1,104 @@
+"""Tests for keyset-paginated wallet history and the NDJSON export."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.db as app_db
+import core.config as config
+from app.db import Base as AsyncBase
+from app.models.user import User
+from app.models.wallet import WalletTransaction
+from app.routers.payments.service import (
+    get_transaction_history,
+    stream_transaction_history_ndjson,
+)
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'history.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(app_db, "AsyncSessionLocal", maker)
+
+    base = datetime(2026, 4, 1, 12, 0, 0)
+    async with maker() as session:
+        session.add(User(account_id=1, email="p@example.com", username="player"))
+        for i in range(7):
+            session.add(
+                WalletTransaction(
+                    user_id=1,
+                    amount_minor=100 + i,
+                    currency="usd",
+                    kind="trivia_reward" if i % 2 else "deposit",
+                    # Pairs share a timestamp so the id tie-break is exercised.
+                    created_at=base + timedelta(minutes=i // 2),
+                )
+            )
+        await session.commit()
+    try:
+        yield maker
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_offset_order(session_maker):
+    async with session_maker() as session:
+        full = await get_transaction_history(
+            session, user_id=1, page=1, page_size=100, kind=None
+        )
+        expected = [t.id for t in full["transactions"]]
+        assert full["total"] == 7 and full["next_cursor"] is None
+
+        first = await get_transaction_history(
+            session, user_id=1, page=1, page_size=3, kind=None
+        )
+        seen = [t.id for t in first["transactions"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = await get_transaction_history(
+                session, user_id=1, page=1, page_size=3, kind=None, cursor=cursor
+            )
+            assert page["total"] is None and page["page"] is None
+            seen.extend(t.id for t in page["transactions"])
+            cursor = page["next_cursor"]
+
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(session_maker):
+    async with session_maker() as session:
+        with pytest.raises(HTTPException) as exc:
+            await get_transaction_history(
+                session, user_id=1, page=1, page_size=3, kind=None, cursor="garbage"
+            )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_streams_full_history_in_chunks(session_maker, monkeypatch):
+    monkeypatch.setattr(config, "WALLET_HISTORY_EXPORT_CHUNK_SIZE", 2)
+
+    chunks = [c async for c in stream_transaction_history_ndjson(user_id=1, kind=None)]
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+
+    assert len(chunks) == 4
+    assert len(rows) == 7
+    assert [r["amount_minor"] for r in rows] == sorted(
+        (r["amount_minor"] for r in rows), reverse=True
+    )
+
+    rewards = [
+        json.loads(line)
+        async for chunk in stream_transaction_history_ndjson(user_id=1, kind="trivia_reward")
+        for line in chunk.splitlines()
+    ]
+    assert {r["kind"] for r in rewards} == {"trivia_reward"} and len(rewards) == 3
@@ -0,0 +1,106 @@
+"""Tests for the payment webhook retry queue (next_attempt_at, backoff, dead-letter)."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.db as app_db
+from app.db import Base as AsyncBase
+from app.models.wallet import PayPalWebhookEvent
+from app.services import paypal_service, webhook_intake
+from app.services.paypal_service import retry_failed_paypal_events
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'webhooks.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AsyncBase.metadata.create_all)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(app_db, "AsyncSessionLocal", maker)
+    try:
+        yield maker
+    finally:
+        await engine.dispose()
+
+
+def _event(event_id, event_type, *, status="failed", attempts=0, next_attempt_at=None):
+    return PayPalWebhookEvent(
+        event_id=event_id,
+        event_type=event_type,
+        status=status,
+        attempts=attempts,
+        raw_payload=json.dumps({"id": event_id, "event_type": event_type, "resource": {}}),
+        received_at=datetime.utcnow() - timedelta(hours=1),
+        next_attempt_at=next_attempt_at,
+    )
+
+
+def test_backoff_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr(webhook_intake, "WEBHOOK_RETRY_BACKOFF_BASE_SECONDS", 60)
+    monkeypatch.setattr(webhook_intake, "WEBHOOK_RETRY_BACKOFF_MAX_SECONDS", 600)
+    for attempts in range(10):
+        delay = webhook_intake.backoff_delay_seconds(attempts)
+        assert 60 <= delay <= min(600, 60 * 2**attempts)
+
+
+@pytest.mark.asyncio
+async def test_retry_drains_only_due_events_and_dead_letters(session_maker, monkeypatch):
+    handled = []
+
+    async def ok(db, resource):
+        handled.append("ok")
+
+    async def fail(db, resource):
+        raise RuntimeError("still broken")
+
+    monkeypatch.setattr(
+        paypal_service, "_EVENT_HANDLERS", {"TEST.OK": ok, "TEST.FAIL": fail}
+    )
+    monkeypatch.setattr(webhook_intake, "WEBHOOK_RETRY_MAX_ATTEMPTS", 3)
+    now = datetime.utcnow()
+
+    async with session_maker() as session:
+        session.add_all(
+            [
+                _event("due-ok", "TEST.OK", next_attempt_at=now - timedelta(seconds=1)),
+                _event(
+                    "stuck-received", "TEST.OK", status="received",
+                    next_attempt_at=now - timedelta(seconds=1),
+                ),
+                _event("due-fail", "TEST.FAIL", next_attempt_at=now - timedelta(seconds=1)),
+                _event(
+                    "last-try", "TEST.FAIL", attempts=2,
+                    next_attempt_at=now - timedelta(seconds=1),
+                ),
+                _event("not-due", "TEST.OK", next_attempt_at=now + timedelta(hours=1)),
+                _event("done", "TEST.OK", status="processed"),
+            ]
+        )
+        await session.commit()
+
+        retried = await retry_failed_paypal_events(session)
+
+    assert retried == 2
+    assert handled == ["ok", "ok"]
+
+    async with session_maker() as session:
+        rows = {
+            row.event_id: row
+            for row in (await session.execute(select(PayPalWebhookEvent))).scalars()
+        }
+
+    assert rows["due-ok"].status == "processed"
+    assert rows["due-ok"].next_attempt_at is None
+    assert rows["stuck-received"].status == "processed"
+    assert rows["due-fail"].status == "failed"
+    assert rows["due-fail"].attempts == 1
+    assert rows["due-fail"].next_attempt_at > now
+    assert rows["last-try"].status == "dead_letter"
+    assert rows["last-try"].next_attempt_at is None
+    assert rows["not-due"].status == "failed"
+    assert rows["not-due"].attempts == 0
@@ -304,24 +304,33 @@ def schedule_draws() -> None:
         misfire_grace_time=3600,
     )
 
-    # Schedule Stripe webhook retry every 10 minutes
+    # Drain due Stripe webhook retries every minute (events carry their own backoff)
     scheduler.add_job(
         run_stripe_webhook_retry,
-        CronTrigger(minute="*/10", timezone="UTC"),
+        CronTrigger(minute="*", timezone="UTC"),
         id="stripe_webhook_retry",
         replace_existing=True,
         misfire_grace_time=300,
     )
 
-    # Schedule PayPal webhook retry every 10 minutes
+    # Drain due PayPal webhook retries every minute (events carry their own backoff)
     scheduler.add_job(
         run_paypal_webhook_retry,
-        CronTrigger(minute="*/10", timezone="UTC"),
+        CronTrigger(minute="*", timezone="UTC"),
         id="paypal_webhook_retry",
         replace_existing=True,
         misfire_grace_time=300,
     )
 
+    # Drain due Apple/Google notification retries every minute
+    scheduler.add_job(
+        run_iap_webhook_retry,
+        CronTrigger(minute="*", timezone="UTC"),
+        id="iap_webhook_retry",
+        replace_existing=True,
+        misfire_grace_time=300,
+    )
+
 
 # Legacy run_daily_draw removed - uses perform_draw which requires TriviaQuestionsWinners (deleted)
 # Use mode-specific draw functions instead (run_free_mode_draw, run_bronze_mode_draw, etc.)
@@ -338,10 +347,11 @@ async def run_wallet_reconciliation_job() -> None:
     try:
         async with AsyncSessionLocal() as session:
             summary = await run_wallet_reconciliation(session)
-            if summary["mismatches"]:
+            if summary["mismatch_count"]:
                 logger.error(
-                    "Wallet reconciliation: %d mismatches found out of %d users",
-                    len(summary["mismatches"]),
+                    "Wallet reconciliation %s: %d mismatches found out of %d users",
+                    summary["run_id"],
+                    summary["mismatch_count"],
                     summary["checked"],
                 )
             else:
@@ -395,6 +405,20 @@ async def run_paypal_webhook_retry() -> None:
         logger.error(f"PayPal webhook retry job failed: {e}", exc_info=True)
 
 
+async def run_iap_webhook_retry() -> None:
+    """Replay failed/stuck Apple and Google IAP notifications."""
+    from app.db import AsyncSessionLocal
+    from app.routers.payments.service import retry_failed_iap_events
+
+    try:
+        async with AsyncSessionLocal() as session:
+            retried = await retry_failed_iap_events(session)
+            if retried:
+                logger.info("IAP webhook retry: %d events reprocessed", retried)
+    except Exception as e:
+        logger.error(f"IAP webhook retry job failed: {e}", exc_info=True)
+
+
 async def run_monthly_subscription_reset() -> None:
     """
     Reset monthly subscription flags at 11:59 PM EST on the last day of each month.
@@ -0,0 +1,108 @@
+"""
+Versioned, pre-serialized snapshots of the store catalog listings.
+
+`/cosmetics/avatars`, `/cosmetics/frames` and `/store/gem-packages` are fetched on every
+store open while the catalog only changes through admin CRUD. Each listing is
+serialized once per catalog version into JSON bytes with a strong ETag (a digest of
+those bytes), so the endpoints can answer `If-None-Match` with `304 Not Modified`.
+
+The catalog version is the product catalog's generation
+(`app.services.product_catalog.CATALOG_GENERATION`), a monotonically increasing
+integer bumped by commits to any catalog table; other workers pick the new value up
+within `PRODUCT_CATALOG_VERSION_CHECK_SECONDS`.
+Snapshots that embed presigned URLs also expire with the presign time bucket, when
+the URLs would change anyway.
+"""
+
+import hashlib
+import time
+from typing import Callable, Hashable, NamedTuple, Optional
+
+from starlette.responses import Response
+
+from app.services.product_catalog import CATALOG_GENERATION
+from core.cache import LRUCache
+from core.config import PRODUCT_CATALOG_MAX_AGE_SECONDS
+
+# (version, listing, params) entries; old versions age out or get evicted.
+_MAX_SNAPSHOTS = 256
+
+_snapshots = LRUCache(max_keys=_MAX_SNAPSHOTS)
+
+
+class CatalogSnapshot(NamedTuple):
+    version: int
+    body: bytes
+    etag: str
+
+
+def catalog_version() -> int:
+    """Current catalog version as seen by this worker (never decreases)."""
+    return CATALOG_GENERATION.current()
+
+
+def get_catalog_snapshot(
+    listing: str,
+    params: Hashable,
+    build: Callable[[], bytes],
+    *,
+    expires_at: Optional[float] = None,
+) -> CatalogSnapshot:
+    """
+    Return the serialized `listing` for `params` at the current catalog version.
+
+    `build` produces the JSON body and only runs on a miss. Snapshots are kept until
+    the version changes, `expires_at` (for bodies with presigned URLs) or
+    `PRODUCT_CATALOG_MAX_AGE_SECONDS`, whichever comes first.
+    """
+    version = catalog_version()
+    cache_key = (version, listing, params)
+    snapshot = _snapshots.get(cache_key)
+    if snapshot is not None:
+        return snapshot
+
+    body = build()
+    snapshot = CatalogSnapshot(
+        version=version,
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
+    max_age_until = time.time() + PRODUCT_CATALOG_MAX_AGE_SECONDS
+    # A commit may have bumped the version while building; serve this body once
+    # but do not keep it under the old version.
+    if catalog_version() == version:
+        _snapshots.set(
+            cache_key,
+            snapshot,
+            expires_at=min(expires_at, max_age_until) if expires_at else max_age_until,
+        )
+    return snapshot
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2).
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def catalog_snapshot_response(
+    snapshot: CatalogSnapshot, if_none_match: Optional[str] = None
+) -> Response:
+    """200 with the pre-serialized body, or 304 when the client already has it."""
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "private, no-cache",
+        "X-Catalog-Version": str(snapshot.version),
+    }
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=snapshot.body, media_type="application/json", headers=headers
+    )
@@ -3,24 +3,17 @@ Helper functions for chat-related operations.
 """
 
 import logging
-from collections import defaultdict
-from datetime import datetime
 from typing import Any, Dict, List
 
-from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from core.cache import default_cache
-from core.config import CHAT_PROFILE_CACHE_SECONDS
-from models import (
-    Avatar,
-    Frame,
-    SubscriptionPlan,
-    TriviaModeConfig,
-    User,
-    UserSubscription,
-)
-from utils.storage import presign_get
+from core.config import AWS_PROFILE_PIC_BUCKET, CHAT_PROFILE_CACHE_SECONDS
+from models import Avatar, Frame, User
+from utils.image_derivatives import LIST_RENDITION_SIZE, rendition_key
+from utils.profile_view import ProfileView, cosmetic_image_urls, get_profile_view
+from utils.storage import presign_many
+from utils.subscription_badges import get_badge_definitions, get_subscription_tiers
 
 logger = logging.getLogger(__name__)
 
@@ -40,181 +33,34 @@ def get_user_chat_profile_data(user: User, db: Session) -> Dict:
         - frame_url: str or None (presigned S3 URL for selected frame)
         - badge: dict or None with id, name, image_url (public URL, no presigning needed)
     """
-    profile_pic_url = user.profile_pic_url
-
-    # Get avatar URL (presigned)
-    avatar_url = None
-    if user.selected_avatar_id:
-        avatar_obj = (
-            db.query(Avatar).filter(Avatar.id == user.selected_avatar_id).first()
-        )
-        if avatar_obj:
-            bucket = getattr(avatar_obj, "bucket", None)
-            object_key = getattr(avatar_obj, "object_key", None)
-            if bucket and object_key:
-                try:
-                    avatar_url = presign_get(bucket, object_key, expires=900)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to presign avatar {avatar_obj.id} for user {user.account_id}: {e}"
-                    )
-            else:
-                logger.debug(
-                    f"Avatar {avatar_obj.id} missing bucket/object_key for user {user.account_id}"
-                )
-
-    # Get frame URL (presigned)
-    frame_url = None
-    if user.selected_frame_id:
-        frame_obj = db.query(Frame).filter(Frame.id == user.selected_frame_id).first()
-        if frame_obj:
-            bucket = getattr(frame_obj, "bucket", None)
-            object_key = getattr(frame_obj, "object_key", None)
-            if bucket and object_key:
-                try:
-                    frame_url = presign_get(bucket, object_key, expires=900)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to presign frame {frame_obj.id} for user {user.account_id}: {e}"
-                    )
-            else:
-                logger.debug(
-                    f"Frame {frame_obj.id} missing bucket/object_key for user {user.account_id}"
-                )
-
-    # Get badge information (achievement badge) - now from TriviaModeConfig
-    badge_info = None
-    if user.badge_id:
-        mode_config = (
-            db.query(TriviaModeConfig)
-            .filter(TriviaModeConfig.mode_id == user.badge_id)
-            .first()
-        )
-        if mode_config and mode_config.badge_image_url:
-            badge_info = {
-                "id": mode_config.mode_id,
-                "name": mode_config.mode_name,
-                "image_url": mode_config.badge_image_url,  # Public URL, no presigning needed
-            }
-
-    # Get subscription badges
-    subscription_badges = []
-    active_subscriptions = (
-        db.query(SubscriptionPlan.unit_amount_minor, SubscriptionPlan.price_usd)
-        .join(UserSubscription)
-        .filter(
-            and_(
-                UserSubscription.user_id == user.account_id,
-                UserSubscription.status == "active",
-                UserSubscription.current_period_end > datetime.utcnow(),
-                or_(
-                    SubscriptionPlan.unit_amount_minor.in_([500, 1000]),
-                    SubscriptionPlan.price_usd.in_([5.0, 10.0]),
-                ),
-            )
-        )
-        .all()
-    )
-
-    has_bronze = any(
-        unit_amount_minor == 500 or price_usd == 5.0
-        for unit_amount_minor, price_usd in active_subscriptions
-    )
-    has_silver = any(
-        unit_amount_minor == 1000 or price_usd == 10.0
-        for unit_amount_minor, price_usd in active_subscriptions
-    )
-
-    badge_map = {}
-    if has_bronze or has_silver:
-        badge_candidates = [
-            "bronze",
-            "bronze_badge",
-            "brone_badge",
-            "brone",
-            "silver",
-            "silver_badge",
-        ]
-        badges = (
-            db.query(TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_id.in_(badge_candidates),
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .all()
-        )
-        badge_map = {badge.mode_id: badge for badge in badges}
-
-    bronze_badge = None
-    if has_bronze:
-        for mode_id in ["bronze", "bronze_badge", "brone_badge", "brone"]:
-            bronze_badge = badge_map.get(mode_id)
-            if bronze_badge:
-                break
-        if not bronze_badge:
-            bronze_badge = (
-                db.query(TriviaModeConfig)
-                .filter(
-                    TriviaModeConfig.mode_name.ilike("%bronze%"),
-                    TriviaModeConfig.badge_image_url.isnot(None),
-                )
-                .first()
-            )
-
-    if bronze_badge and bronze_badge.badge_image_url:
-        subscription_badges.append(
-            {
-                "id": bronze_badge.mode_id,
-                "name": bronze_badge.mode_name,
-                "image_url": bronze_badge.badge_image_url,
-                "subscription_type": "bronze",
-                "price": 5.0,
-            }
-        )
-
-    silver_badge = None
-    if has_silver:
-        for mode_id in ["silver", "silver_badge"]:
-            silver_badge = badge_map.get(mode_id)
-            if silver_badge:
-                break
-        if not silver_badge:
-            silver_badge = (
-                db.query(TriviaModeConfig)
-                .filter(
-                    TriviaModeConfig.mode_name.ilike("%silver%"),
-                    TriviaModeConfig.badge_image_url.isnot(None),
-                )
-                .first()
-            )
-
-    if silver_badge and silver_badge.badge_image_url:
-        subscription_badges.append(
-            {
-                "id": silver_badge.mode_id,
-                "name": silver_badge.mode_name,
-                "image_url": silver_badge.badge_image_url,
-                "subscription_type": "silver",
-                "price": 10.0,
-            }
-        )
-
-    # Get level and progress
     from utils.user_level_service import get_level_progress
 
-    level_progress = get_level_progress(user, db)
+    view = get_profile_view(db, user.account_id)
+    if view is None:
+        view = ProfileView(None, None, None, [], 0, 0.0)
+    avatar_url, frame_url = cosmetic_image_urls(view)
+    level_progress = get_level_progress(user, db, total_correct=view.total_correct)
 
     return {
-        "profile_pic_url": profile_pic_url,
+        "profile_pic_url": user.profile_pic_url,
         "avatar_url": avatar_url,
         "frame_url": frame_url,
-        "badge": badge_info,  # Achievement badge
-        "subscription_badges": subscription_badges,  # Array of subscription badge URLs
+        "badge": view.badge,  # Achievement badge
+        "subscription_badges": view.subscription_badges,  # Array of subscription badge URLs
         "level": level_progress["level"],
         "level_progress": level_progress["progress"],  # e.g., "2/100", "120/200"
     }
 
 
+def _list_image_key(obj):
+    """(bucket, key) of the list-size rendition of an avatar/frame, else the original."""
+    bucket = getattr(obj, "bucket", None)
+    base_key = getattr(obj, "rendition_key", None)
+    if base_key:
+        return (bucket, rendition_key(base_key, LIST_RENDITION_SIZE))
+    return (bucket, getattr(obj, "object_key", None))
+
+
 def get_user_chat_profile_data_bulk(
     users: List[User], db: Session
 ) -> Dict[int, Dict[str, Any]]:
@@ -243,7 +89,6 @@ def get_user_chat_profile_data_bulk(
 
     avatar_ids = [user.selected_avatar_id for user in users if user.selected_avatar_id]
     frame_ids = [user.selected_frame_id for user in users if user.selected_frame_id]
-    badge_ids = {user.badge_id for user in users if user.badge_id}
 
     avatars = {}
     if avatar_ids:
@@ -255,94 +100,30 @@ def get_user_chat_profile_data_bulk(
         frame_rows = db.query(Frame).filter(Frame.id.in_(frame_ids)).all()
         frames = {frame.id: frame for frame in frame_rows}
 
-    badge_map = {}
-    if badge_ids:
-        badge_rows = (
-            db.query(TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_id.in_(badge_ids),
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .all()
-        )
-        badge_map = {badge.mode_id: badge for badge in badge_rows}
+    badge_definitions = get_badge_definitions(db)
+    subscription_tiers = get_subscription_tiers(db, user_ids)
 
-    bronze_badge = None
-    for mode_id in ["bronze", "bronze_badge", "brone_badge", "brone"]:
-        bronze_badge = (
-            db.query(TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_id == mode_id,
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .first()
-        )
-        if bronze_badge:
-            break
-    if not bronze_badge:
-        bronze_badge = (
-            db.query(TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_name.ilike("%bronze%"),
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .first()
-        )
+    from utils.user_level_service import get_level_progress_for_users
 
-    silver_badge = None
-    for mode_id in ["silver", "silver_badge"]:
-        silver_badge = (
-            db.query(TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_id == mode_id,
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .first()
-        )
-        if silver_badge:
-            break
-    if not silver_badge:
-        silver_badge = (
-            db.query(TriviaModeConfig)
-            .filter(
-                TriviaModeConfig.mode_name.ilike("%silver%"),
-                TriviaModeConfig.badge_image_url.isnot(None),
-            )
-            .first()
-        )
+    level_progress_map = get_level_progress_for_users(users, db)
 
-    active_subscriptions = (
-        db.query(
-            UserSubscription.user_id,
-            SubscriptionPlan.unit_amount_minor,
-            SubscriptionPlan.price_usd,
+    # List screens draw these at thumbnail size: serve the rendition when one exists.
+    avatar_keys = {avatar_id: _list_image_key(obj) for avatar_id, obj in avatars.items()}
+    frame_keys = {frame_id: _list_image_key(obj) for frame_id, obj in frames.items()}
+    profile_pic_keys = {
+        user.account_id: (
+            AWS_PROFILE_PIC_BUCKET,
+            rendition_key(user.profile_pic_rendition_key, LIST_RENDITION_SIZE),
         )
-        .join(SubscriptionPlan)
-        .filter(
-            and_(
-                UserSubscription.user_id.in_(user_ids),
-                UserSubscription.status == "active",
-                UserSubscription.current_period_end > datetime.utcnow(),
-                or_(
-                    SubscriptionPlan.unit_amount_minor.in_([500, 1000]),
-                    SubscriptionPlan.price_usd.in_([5.0, 10.0]),
-                ),
-            )
-        )
-        .all()
+        for user in users
+        if user.profile_pic_url and getattr(user, "profile_pic_rendition_key", None)
+    }
+    presigned = presign_many(
+        list(avatar_keys.values())
+        + list(frame_keys.values())
+        + list(profile_pic_keys.values())
     )
 
-    subscription_types = defaultdict(set)
-    for user_id, unit_amount_minor, price_usd in active_subscriptions:
-        if unit_amount_minor == 500 or price_usd == 5.0:
-            subscription_types[user_id].add("bronze")
-        if unit_amount_minor == 1000 or price_usd == 10.0:
-            subscription_types[user_id].add("silver")
-
-    from utils.user_level_service import get_level_progress_for_users
-
-    level_progress_map = get_level_progress_for_users(users, db)
-
     for user in users:
         avatar_url = None
         if user.selected_avatar_id:
@@ -351,12 +132,7 @@ def get_user_chat_profile_data_bulk(
                 bucket = getattr(avatar_obj, "bucket", None)
                 object_key = getattr(avatar_obj, "object_key", None)
                 if bucket and object_key:
-                    try:
-                        avatar_url = presign_get(bucket, object_key, expires=900)
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to presign avatar {avatar_obj.id} for user {user.account_id}: {e}"
-                        )
+                    avatar_url = presigned.get(avatar_keys[avatar_obj.id])
                 else:
                     logger.debug(
                         f"Avatar {avatar_obj.id} missing bucket/object_key for user {user.account_id}"
@@ -369,65 +145,30 @@ def get_user_chat_profile_data_bulk(
                 bucket = getattr(frame_obj, "bucket", None)
                 object_key = getattr(frame_obj, "object_key", None)
                 if bucket and object_key:
-                    try:
-                        frame_url = presign_get(bucket, object_key, expires=900)
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to presign frame {frame_obj.id} for user {user.account_id}: {e}"
-                        )
+                    frame_url = presigned.get(frame_keys[frame_obj.id])
                 else:
                     logger.debug(
                         f"Frame {frame_obj.id} missing bucket/object_key for user {user.account_id}"
                     )
 
-        badge_info = None
-        if user.badge_id:
-            mode_config = badge_map.get(user.badge_id)
-            if mode_config and mode_config.badge_image_url:
-                badge_info = {
-                    "id": mode_config.mode_id,
-                    "name": mode_config.mode_name,
-                    "image_url": mode_config.badge_image_url,
-                }
-
-        subscription_badges = []
-        user_subscription_types = subscription_types.get(user.account_id, set())
-        if (
-            "bronze" in user_subscription_types
-            and bronze_badge
-            and bronze_badge.badge_image_url
-        ):
-            subscription_badges.append(
-                {
-                    "id": bronze_badge.mode_id,
-                    "name": bronze_badge.mode_name,
-                    "image_url": bronze_badge.badge_image_url,
-                    "subscription_type": "bronze",
-                    "price": 5.0,
-                }
-            )
-        if (
-            "silver" in user_subscription_types
-            and silver_badge
-            and silver_badge.badge_image_url
-        ):
-            subscription_badges.append(
-                {
-                    "id": silver_badge.mode_id,
-                    "name": silver_badge.mode_name,
-                    "image_url": silver_badge.badge_image_url,
-                    "subscription_type": "silver",
-                    "price": 10.0,
-                }
-            )
+        badge_info = badge_definitions.badge(user.badge_id)
+        subscription_badges = badge_definitions.subscription_badges(
+            subscription_tiers.get(user.account_id, ())
+        )
 
         level_info = level_progress_map.get(
             user.account_id,
             {"level": user.level if user.level else 1, "level_progress": "0/100"},
         )
 
+        profile_pic_url = user.profile_pic_url
+        if user.account_id in profile_pic_keys:
+            profile_pic_url = (
+                presigned.get(profile_pic_keys[user.account_id]) or profile_pic_url
+            )
+
         profile = {
-            "profile_pic_url": user.profile_pic_url,
+            "profile_pic_url": profile_pic_url,
             "avatar_url": avatar_url,
             "frame_url": frame_url,
             "badge": badge_info,
@@ -0,0 +1,233 @@
+"""
+Per-user daily trivia state (access + progress for every mode) behind one cache entry.
+
+The home screen calls `/trivia/modes/status`-style endpoints on every app open. The
+state is assembled from the subscription access check plus a single aggregate query
+over the mode configs and the three daily attempt tables, then cached per
+(user, draw date). Commits touching a user's attempts or subscriptions bump that
+user's generation (bounded in process, read from Redis on every call); mode config
+and plan changes bump a `core.read_models.SharedGeneration` that other workers see
+within `DAILY_USER_STATE_VERSION_CHECK_SECONDS`.
+"""
+
+import itertools
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.orm import Session
+
+from core.cache import LRUCache, TTLCache
+from core.config import (
+    DAILY_USER_STATE_CACHE_SECONDS,
+    DAILY_USER_STATE_VERSION_CHECK_SECONDS,
+)
+from core.model_events import on_committed_change
+from core.read_models import SharedGeneration
+from core.redis_sync import get_sync_redis, mark_sync_redis_failed
+
+logger = logging.getLogger(__name__)
+
+STATE_MODES = ("free_mode", "bronze", "silver")
+
+_DEFAULT_QUESTION_COUNTS = {"free_mode": 3, "bronze": 1, "silver": 1}
+_ANSWERED_STATUSES = ("answered_correct", "answered_wrong")
+
+_REDIS_USER_GENERATION_PREFIX = "daily_user_state:generation"
+_REDIS_USER_GENERATION_TTL_SECONDS = 2 * 24 * 3600
+_MAX_CACHED_STATES = 50_000
+
+# Separate from `default_cache` so per-user entries cannot evict shared hot reads.
+_state_cache = TTLCache(max_keys=_MAX_CACHED_STATES)
+_global_generation = SharedGeneration(
+    "daily_user_state:generation",
+    check_seconds=DAILY_USER_STATE_VERSION_CHECK_SECONDS,
+)
+# Local per-user generations only need to outlive the states cached before the bump
+# (`DAILY_USER_STATE_CACHE_SECONDS`), so they live in a bounded LRU. Values come from
+# one counter and are never reused. Users without an entry share a fallback that
+# changes whenever a live entry is evicted, so an eviction can never bring an older
+# state back.
+_local_user_generations = LRUCache(max_keys=_MAX_CACHED_STATES)
+_user_generation_counter = itertools.count(1)
+
+
+def _user_generation_key(account_id: int) -> str:
+    return f"{_REDIS_USER_GENERATION_PREFIX}:{account_id}"
+
+
+def _local_user_generation(account_id: int) -> str:
+    generation = _local_user_generations.get(account_id)
+    if generation is None:
+        return f"e{_local_user_generations.evictions}"
+    return str(generation)
+
+
+def _shared_user_generation(account_id: int) -> int:
+    client = get_sync_redis()
+    if client is None:
+        return 0
+    try:
+        return int(client.get(_user_generation_key(account_id)) or 0)
+    except Exception as exc:
+        logger.warning("Daily user state generation read failed: %s", exc)
+        mark_sync_redis_failed()
+        return 0
+
+
+def _cache_key(account_id: int, target_date: date) -> str:
+    return (
+        f"daily_user_state:{account_id}:{target_date.isoformat()}:"
+        f"{_global_generation.current()}:"
+        f"{_local_user_generation(account_id)}."
+        f"{_shared_user_generation(account_id)}"
+    )
+
+
+def _load_progress(
+    db: Session, account_id: int, target_date: date
+) -> Dict[str, Dict[str, int]]:
+    from models import (
+        TriviaModeConfig,
+        TriviaUserBronzeModeDaily,
+        TriviaUserFreeModeDaily,
+        TriviaUserSilverModeDaily,
+    )
+
+    def _questions_count(mode_id: str):
+        return (
+            select(TriviaModeConfig.questions_count)
+            .where(TriviaModeConfig.mode_id == mode_id)
+            .scalar_subquery()
+        )
+
+    free_total = func.coalesce(
+        _questions_count("free_mode"), _DEFAULT_QUESTION_COUNTS["free_mode"]
+    )
+    free_answered = (
+        select(func.count())
+        .where(
+            TriviaUserFreeModeDaily.account_id == account_id,
+            TriviaUserFreeModeDaily.date == target_date,
+            TriviaUserFreeModeDaily.status.in_(_ANSWERED_STATUSES),
+            TriviaUserFreeModeDaily.question_order.between(1, free_total),
+        )
+        .scalar_subquery()
+    )
+
+    def _submitted(model):
+        return exists().where(
+            and_(
+                model.account_id == account_id,
+                model.date == target_date,
+                model.submitted_at.isnot(None),
+            )
+        )
+
+    row = db.query(
+        free_total.label("free_total"),
+        free_answered.label("free_answered"),
+        func.coalesce(
+            _questions_count("bronze"), _DEFAULT_QUESTION_COUNTS["bronze"]
+        ).label("bronze_total"),
+        _submitted(TriviaUserBronzeModeDaily).label("bronze_submitted"),
+        func.coalesce(
+            _questions_count("silver"), _DEFAULT_QUESTION_COUNTS["silver"]
+        ).label("silver_total"),
+        _submitted(TriviaUserSilverModeDaily).label("silver_submitted"),
+    ).one()
+
+    return {
+        "free_mode": {
+            "questions_total": int(row.free_total),
+            "questions_answered": int(row.free_answered or 0),
+        },
+        "bronze": {
+            "questions_total": int(row.bronze_total),
+            "questions_answered": 1 if row.bronze_submitted else 0,
+        },
+        "silver": {
+            "questions_total": int(row.silver_total),
+            "questions_answered": 1 if row.silver_submitted else 0,
+        },
+    }
+
+
+def get_daily_user_state(
+    db: Session, user, target_date: date
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Return `{mode_id: {"access", "questions_total", "questions_answered"}}` for every
+    mode in `STATE_MODES` on `target_date`.
+    """
+    from utils.subscription_service import get_modes_access_status
+
+    key = _cache_key(user.account_id, target_date)
+    cached = _state_cache.get(key)
+    if cached is not None:
+        return cached
+
+    access_map = get_modes_access_status(db, user, list(STATE_MODES))
+    progress = _load_progress(db, user.account_id, target_date)
+    state = {
+        mode_id: {"access": access_map.get(mode_id, {}), **progress[mode_id]}
+        for mode_id in STATE_MODES
+    }
+    _state_cache.set(key, state, ttl_seconds=DAILY_USER_STATE_CACHE_SECONDS)
+    return state
+
+
+def invalidate_daily_user_state(account_ids: Optional[Set[Any]] = None) -> None:
+    """Drop cached state for `account_ids` (all users when None)."""
+    if account_ids is None:
+        _global_generation.bump()
+        return
+
+    expires_at = time.time() + DAILY_USER_STATE_CACHE_SECONDS
+    for account_id in account_ids:
+        _local_user_generations.set(
+            account_id, next(_user_generation_counter), expires_at=expires_at
+        )
+
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        for account_id in account_ids:
+            pipe.incr(_user_generation_key(account_id))
+            pipe.expire(
+                _user_generation_key(account_id), _REDIS_USER_GENERATION_TTL_SECONDS
+            )
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Daily user state invalidation failed: %s", exc)
+        mark_sync_redis_failed()
+
+
+def _invalidate_all(_changed: Set[Any]) -> None:
+    invalidate_daily_user_state()
+
+
+on_committed_change(
+    "trivia_user_free_mode_daily",
+    invalidate_daily_user_state,
+    key=lambda row: row.account_id,
+)
+on_committed_change(
+    "trivia_user_bronze_mode_daily",
+    invalidate_daily_user_state,
+    key=lambda row: row.account_id,
+)
+on_committed_change(
+    "trivia_user_silver_mode_daily",
+    invalidate_daily_user_state,
+    key=lambda row: row.account_id,
+)
+on_committed_change(
+    "user_subscriptions", invalidate_daily_user_state, key=lambda row: row.user_id
+)
+on_committed_change("subscription_plans", _invalidate_all)
+on_committed_change("trivia_mode_config", _invalidate_all)
@@ -0,0 +1,166 @@
+"""
+Per-user entitlement sets (owned avatars, frames and gem packages).
+
+Store screens check ownership for every item shown, and purchase / selection flows
+(sync store service, async Stripe/PayPal entitlement service) repeat the same
+checks. Each user's full ownership set is loaded with one query and cached in Redis,
+so those checks become dict lookups.
+
+Entries are a `core.read_models.TokenReadModel`, like the wallet balance read
+model: commits that grant or revoke something (ORM writes via `core.model_events`,
+Core deletes via `run_after_commit`) rotate the user's token, so an entry filled from
+a read that raced such a commit is a miss. Without Redis the set is loaded from the
+database on every call.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Hashable, NamedTuple, Optional, Set
+
+from sqlalchemy import String, cast, func, literal, select, union_all
+
+from core.config import ENTITLEMENT_CACHE_SECONDS
+from core.model_events import on_committed_change
+from core.read_models import TokenReadModel
+
+ENTITLEMENT_TABLES = ("user_avatars", "user_frames", "user_gem_purchases")
+
+_entitlements = TokenReadModel(
+    "entitlements", entry_name="set", ttl_seconds=ENTITLEMENT_CACHE_SECONDS
+)
+
+
+class Entitlements(NamedTuple):
+    """Ownership of one user; values are the (first) purchase dates."""
+
+    avatars: Dict[str, datetime]
+    frames: Dict[str, datetime]
+    packages: Dict[int, datetime]
+    product_ids: FrozenSet[str]  # product ids of owned avatars and frames
+
+    def owns_product(self, product_id: str) -> bool:
+        return product_id in self.product_ids
+
+
+def _encode(entitlements: Entitlements) -> Dict[str, Any]:
+    def dates(owned):
+        return {str(item_id): when.isoformat() for item_id, when in owned.items()}
+
+    return {
+        "avatars": dates(entitlements.avatars),
+        "frames": dates(entitlements.frames),
+        "packages": dates(entitlements.packages),
+        "products": sorted(entitlements.product_ids),
+    }
+
+
+def _decode(stored: Dict[str, Any]) -> Entitlements:
+    def dates(owned, id_type=str):
+        return {
+            id_type(item_id): datetime.fromisoformat(when)
+            for item_id, when in owned.items()
+        }
+
+    return Entitlements(
+        avatars=dates(stored["avatars"]),
+        frames=dates(stored["frames"]),
+        packages=dates(stored["packages"], int),
+        product_ids=frozenset(stored["products"]),
+    )
+
+
+def _cached(user_id: int):
+    """Return (lookup, entitlements-or-None)."""
+    lookup = _entitlements.lookup([user_id])
+    stored = lookup.entries.get(user_id)
+    if stored is None:
+        return lookup, None
+    try:
+        return lookup, _decode(stored)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return lookup, None
+
+
+def _load_stmt(user_id: int):
+    from models import Avatar, Frame, UserAvatar, UserFrame, UserGemPurchase
+
+    avatars = (
+        select(
+            literal("avatar").label("kind"),
+            cast(UserAvatar.avatar_id, String).label("item_id"),
+            UserAvatar.purchase_date.label("purchase_date"),
+            Avatar.product_id.label("product_id"),
+        )
+        .join(Avatar, Avatar.id == UserAvatar.avatar_id)
+        .where(UserAvatar.user_id == user_id)
+    )
+    frames = (
+        select(
+            literal("frame"),
+            cast(UserFrame.frame_id, String),
+            UserFrame.purchase_date,
+            Frame.product_id,
+        )
+        .join(Frame, Frame.id == UserFrame.frame_id)
+        .where(UserFrame.user_id == user_id)
+    )
+    packages = (
+        select(
+            literal("package"),
+            cast(UserGemPurchase.package_id, String),
+            func.min(UserGemPurchase.purchase_date),
+            literal(None, String),
+        )
+        .where(UserGemPurchase.user_id == user_id)
+        .group_by(UserGemPurchase.package_id)
+    )
+    return union_all(avatars, frames, packages)
+
+
+def _from_rows(rows) -> Entitlements:
+    avatars: Dict[str, datetime] = {}
+    frames: Dict[str, datetime] = {}
+    packages: Dict[int, datetime] = {}
+    product_ids: Set[str] = set()
+    for kind, item_id, purchase_date, product_id in rows:
+        if kind == "avatar":
+            avatars[item_id] = purchase_date
+        elif kind == "frame":
+            frames[item_id] = purchase_date
+        else:
+            packages[int(item_id)] = purchase_date
+        if product_id:
+            product_ids.add(product_id)
+    return Entitlements(avatars, frames, packages, frozenset(product_ids))
+
+
+def get_entitlements(db, user_id: int) -> Entitlements:
+    """Ownership set of `user_id` using a sync session."""
+    lookup, entitlements = _cached(user_id)
+    if entitlements is not None:
+        return entitlements
+    entitlements = _from_rows(db.execute(_load_stmt(user_id)).all())
+    _entitlements.store(lookup, {user_id: _encode(entitlements)})
+    return entitlements
+
+
+async def get_entitlements_async(db, user_id: int) -> Entitlements:
+    """Async-session variant of `get_entitlements`."""
+    lookup, entitlements = _cached(user_id)
+    if entitlements is not None:
+        return entitlements
+    entitlements = _from_rows((await db.execute(_load_stmt(user_id))).all())
+    _entitlements.store(lookup, {user_id: _encode(entitlements)})
+    return entitlements
+
+
+def invalidate_entitlements(user_ids: Set[Hashable]) -> None:
+    """Retire the current token (and cached set) of every user in `user_ids`."""
+    _entitlements.invalidate(user_ids)
+
+
+def _owner_key(row) -> Optional[int]:
+    return getattr(row, "user_id", None)
+
+
+for _table in ENTITLEMENT_TABLES:
+    on_committed_change(_table, invalidate_entitlements, key=_owner_key)
@@ -0,0 +1,87 @@
+"""
+Cached free mode question pack (question order + correct answer letter per draw date).
+
+Answer submission only needs to know which slot a question occupies on the draw date
+and which letter is correct. Both are loaded with one query per draw date and kept in
+process under a `core.read_models.SharedGeneration`: allocation or question edits
+committed through the ORM bump it, so the committing worker drops its packs at once
+and every other worker within `FREE_MODE_QUESTION_PACK_VERSION_CHECK_SECONDS`. A
+question missing from a cached pack triggers one reload, so packs cached before the
+day's questions were allocated never reject a valid submission.
+"""
+
+from datetime import date
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from core.cache import default_cache
+from core.config import (
+    FREE_MODE_QUESTION_PACK_CACHE_SECONDS,
+    FREE_MODE_QUESTION_PACK_VERSION_CHECK_SECONDS,
+)
+from core.model_events import on_committed_change
+from core.read_models import SharedGeneration
+
+_pack_generation = SharedGeneration(
+    "free_mode:question_pack:generation",
+    check_seconds=FREE_MODE_QUESTION_PACK_VERSION_CHECK_SECONDS,
+)
+
+
+def _cache_key(target_date: date) -> str:
+    return f"free_mode:question_pack:{_pack_generation.current()}:{target_date.isoformat()}"
+
+
+def _load_pack(db: Session, target_date: date) -> Dict[int, Dict[str, Any]]:
+    from models import TriviaQuestionsFreeMode, TriviaQuestionsFreeModeDaily
+    from utils.trivia_mode_service import (
+        get_correct_answer_letter,
+        get_date_range_for_query,
+    )
+
+    start_datetime, end_datetime = get_date_range_for_query(target_date)
+    rows = (
+        db.query(TriviaQuestionsFreeModeDaily.question_order, TriviaQuestionsFreeMode)
+        .join(
+            TriviaQuestionsFreeMode,
+            TriviaQuestionsFreeMode.id == TriviaQuestionsFreeModeDaily.question_id,
+        )
+        .filter(
+            TriviaQuestionsFreeModeDaily.date >= start_datetime,
+            TriviaQuestionsFreeModeDaily.date <= end_datetime,
+        )
+        .all()
+    )
+    return {
+        question.id: {
+            "question_order": question_order,
+            "correct_letter": get_correct_answer_letter(question),
+        }
+        for question_order, question in rows
+    }
+
+
+def get_free_mode_question_entry(
+    db: Session, target_date: date, question_id: int
+) -> Optional[Dict[str, Any]]:
+    """Return `{"question_order", "correct_letter"}` or None if not allocated on `target_date`."""
+    key = _cache_key(target_date)
+    pack = default_cache.get(key)
+    if pack is not None and question_id in pack:
+        return pack[question_id]
+
+    pack = _load_pack(db, target_date)
+    if pack:
+        default_cache.set(key, pack, ttl_seconds=FREE_MODE_QUESTION_PACK_CACHE_SECONDS)
+    return pack.get(question_id)
+
+
+def invalidate_free_mode_question_packs(_changed: Optional[Set[Any]] = None) -> None:
+    _pack_generation.bump()
+
+
+on_committed_change(
+    "trivia_questions_free_mode_daily", invalidate_free_mode_question_packs
+)
+on_committed_change("trivia_questions_free_mode", invalidate_free_mode_question_packs)
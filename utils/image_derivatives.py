@@ -0,0 +1,201 @@
+"""
+Thumbnail renditions for profile pictures, avatars and frames.
+
+Chat and leaderboard lists draw these images at thumbnail size, so every source image
+gets fixed-size WebP renditions (aspect ratio kept, transparency preserved for
+frames). Decoding and resizing are CPU-bound and run on a process pool; uploads go
+through the S3 transfer pool in `utils.storage`.
+
+Rendition keys are derived from the source key plus a digest of its bytes, so a
+replaced image never shares a URL (or a client/CDN cache entry) with the old one.
+The base key is stored on the row (`rendition_key` / `profile_pic_rendition_key`);
+None means no renditions and readers fall back to the original.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence
+
+from core.config import IMAGE_PIPELINE_MAX_WORKERS, IMAGE_RENDITION_WEBP_QUALITY
+from utils.storage import download_file, upload_fileobj, upload_fileobj_async
+
+try:
+    from PIL import Image, ImageOps
+except Exception:  # keep import-time safe where Pillow may not be installed yet
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+RENDITION_SIZES = (128, 256)
+# Size served by list screens (chat, leaderboards)
+LIST_RENDITION_SIZE = 128
+RENDITION_MIME_TYPE = "image/webp"
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn: forking a threaded server process is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(IMAGE_PIPELINE_MAX_WORKERS, 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def rendition_base_key(object_key: str, content: bytes) -> str:
+    directory, filename = posixpath.split(object_key.lstrip("/"))
+    stem = posixpath.splitext(filename)[0]
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return posixpath.join(directory, "renditions", f"{stem}-{digest}")
+
+
+def rendition_key(base_key: str, size: int = LIST_RENDITION_SIZE) -> str:
+    return f"{base_key}_{size}.webp"
+
+
+def render_renditions(
+    content: bytes,
+    sizes: Sequence[int] = RENDITION_SIZES,
+    quality: int = IMAGE_RENDITION_WEBP_QUALITY,
+) -> Dict[int, bytes]:
+    """Decode `content` and return WebP bytes per size. Runs in a worker process."""
+    if Image is None:
+        raise RuntimeError("Pillow is required for image renditions")
+    with Image.open(io.BytesIO(content)) as source:
+        image = ImageOps.exif_transpose(source)  # first frame for animated images
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    out: Dict[int, bytes] = {}
+    for size in sizes:
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)  # never upscales
+        buf = io.BytesIO()
+        resized.save(buf, format="WEBP", quality=quality, method=4)
+        out[size] = buf.getvalue()
+    return out
+
+
+async def store_renditions_async(
+    bucket: str, object_key: str, content: bytes
+) -> Optional[str]:
+    """Render and upload all sizes; returns the base key, or None if any step failed."""
+    if Image is None or not content:
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        renditions = await loop.run_in_executor(
+            _get_process_pool(), render_renditions, content
+        )
+    except Exception:
+        logger.warning("Rendering failed for key=%s", object_key, exc_info=True)
+        return None
+    base_key = rendition_base_key(object_key, content)
+    results = await asyncio.gather(
+        *(
+            upload_fileobj_async(
+                bucket,
+                rendition_key(base_key, size),
+                io.BytesIO(data),
+                RENDITION_MIME_TYPE,
+            )
+            for size, data in renditions.items()
+        )
+    )
+    return base_key if all(results) else None
+
+
+def store_renditions(bucket: str, object_key: str, content: bytes) -> Optional[str]:
+    """Blocking variant of `store_renditions_async` for background jobs."""
+    if Image is None or not content:
+        return None
+    try:
+        renditions = _get_process_pool().submit(render_renditions, content).result()
+    except Exception:
+        logger.warning("Rendering failed for key=%s", object_key, exc_info=True)
+        return None
+    base_key = rendition_base_key(object_key, content)
+    for size, data in renditions.items():
+        if not upload_fileobj(
+            bucket, rendition_key(base_key, size), io.BytesIO(data), RENDITION_MIME_TYPE
+        ):
+            return None
+    return base_key
+
+
+def generate_profile_picture_renditions(
+    account_id: int, bucket: str, object_key: str, upload_id: str
+) -> None:
+    """Background job: build renditions for an uploaded profile picture and record them.
+
+    Nothing is recorded if the user changed picture meanwhile (`profile_pic_upload_id`
+    differs), so a slow job never attaches thumbnails of an older upload.
+    """
+    from db import get_db
+    from models import User
+
+    if Image is None:
+        return
+    content = download_file(bucket, object_key)
+    if content is None:
+        return
+    base_key = store_renditions(bucket, object_key, content)
+    if not base_key:
+        return
+    db = next(get_db())
+    try:
+        # Row lock: a newer upload committing its token is ordered after this write.
+        user = (
+            db.query(User)
+            .filter(User.account_id == account_id)
+            .with_for_update()
+            .first()
+        )
+        if user is not None and user.profile_pic_upload_id == upload_id:
+            user.profile_pic_rendition_key = base_key
+            db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning(
+            "Recording profile picture renditions failed for user %s",
+            account_id,
+            exc_info=True,
+        )
+    finally:
+        db.close()
+
+
+def generate_cosmetic_renditions(kind: str, ids: Iterable[str]) -> None:
+    """Background job: build renditions for the given avatars/frames and record them."""
+    from db import get_db
+    from models import Avatar, Frame
+
+    model = {"avatars": Avatar, "frames": Frame}[kind]
+    ids = list(ids)
+    if not ids or Image is None:
+        return
+    db = next(get_db())
+    try:
+        for item in db.query(model).filter(model.id.in_(ids)).all():
+            if not item.bucket or not item.object_key:
+                continue
+            content = download_file(item.bucket, item.object_key)
+            if content is None:
+                continue
+            base_key = store_renditions(item.bucket, item.object_key, content)
+            if base_key:
+                item.rendition_key = base_key
+                db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Rendition job failed for %s %s", kind, ids, exc_info=True)
+    finally:
+        db.close()
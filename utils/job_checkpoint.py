@@ -0,0 +1,65 @@
+"""
+Resumable cursor checkpoints for long-running batch jobs (optional Redis).
+
+A job stores the last cursor it fully processed under a stable key; a re-run of the
+same job loads it and continues from there. Cursors are tuples of ints. Without
+Redis the helpers are no-ops and jobs simply start from the beginning.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from core.redis_sync import get_sync_redis, mark_sync_redis_failed
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "job_checkpoint"
+_DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+def _key(job_key: str) -> str:
+    return f"{_KEY_PREFIX}:{job_key}"
+
+
+def load_checkpoint(job_key: str) -> Optional[Tuple[int, ...]]:
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_key(job_key))
+    except Exception as exc:
+        logger.warning("Job checkpoint read failed: %s", exc)
+        mark_sync_redis_failed()
+        return None
+    if not raw:
+        return None
+    try:
+        return tuple(int(part) for part in raw.split(":"))
+    except ValueError:
+        return None
+
+
+def save_checkpoint(
+    job_key: str, cursor: Tuple[int, ...], *, ttl_seconds: int = _DEFAULT_TTL_SECONDS
+) -> None:
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        client.set(
+            _key(job_key), ":".join(str(part) for part in cursor), ex=ttl_seconds
+        )
+    except Exception as exc:
+        logger.warning("Job checkpoint write failed: %s", exc)
+        mark_sync_redis_failed()
+
+
+def clear_checkpoint(job_key: str) -> None:
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        client.delete(_key(job_key))
+    except Exception as exc:
+        logger.warning("Job checkpoint clear failed: %s", exc)
+        mark_sync_redis_failed()
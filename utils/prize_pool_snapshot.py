@@ -0,0 +1,159 @@
+"""
+Daily snapshot of the subscription-derived bronze/silver prize pools.
+
+`/draw/next` is polled constantly while these pools only move when a subscription or
+a mode config changes. The pools are computed once per draw date and stored in Redis
+(shared by all workers) behind a short in-process cache. Commits that touch
+`user_subscriptions` or `trivia_mode_config` bump a generation counter, which makes
+every stored snapshot stale without having to enumerate draw dates. Pools that could
+not be computed are served as empty but never cached, so the next poll retries.
+"""
+
+import json
+import logging
+from datetime import date
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from core.cache import default_cache
+from core.config import DRAW_PRIZE_POOL_CACHE_SECONDS
+from core.model_events import on_committed_change
+from core.redis_sync import get_sync_redis, mark_sync_redis_failed
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MODES = ("bronze", "silver")
+
+_REDIS_SNAPSHOT_KEY = "draw:mode_prize_pools"
+_REDIS_GENERATION_KEY = "draw:mode_prize_pools:generation"
+# Long enough to cover a draw day; a generation bump invalidates earlier.
+_REDIS_SNAPSHOT_TTL_SECONDS = 36 * 3600
+
+_local_generation = 0
+
+
+def _local_key(draw_date: date) -> str:
+    return f"draw:mode_prize_pools:{_local_generation}:{draw_date.isoformat()}"
+
+
+def _compute_snapshot(
+    db: Session, draw_date: date
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Fresh pools for every snapshot mode, or None if any of them failed."""
+    from rewards_logic import calculate_mode_prize_pool
+
+    try:
+        return {
+            mode_id: calculate_mode_prize_pool(
+                db, draw_date, mode_id, raise_errors=True
+            )
+            for mode_id in SNAPSHOT_MODES
+        }
+    except Exception as exc:
+        logger.error(
+            "Failed computing prize pool snapshot for %s: %s",
+            draw_date,
+            exc,
+            exc_info=True,
+        )
+        return None
+
+
+def _empty_pools() -> Dict[str, Dict[str, Any]]:
+    return {
+        mode_id: {"mode_id": mode_id, "daily_pool": 0.0, "subscriber_count": 0}
+        for mode_id in SNAPSHOT_MODES
+    }
+
+
+def _read_shared_snapshot(draw_date: date):
+    """Return (generation, snapshot-or-None); generation is None without Redis."""
+    client = get_sync_redis()
+    if client is None:
+        return None, None
+    try:
+        pipe = client.pipeline()
+        pipe.get(_REDIS_GENERATION_KEY)
+        pipe.hget(_REDIS_SNAPSHOT_KEY, draw_date.isoformat())
+        generation, raw = pipe.execute()
+    except Exception as exc:
+        logger.warning("Prize pool snapshot read failed: %s", exc)
+        mark_sync_redis_failed()
+        return None, None
+    generation = int(generation or 0)
+    if not raw:
+        return generation, None
+    try:
+        stored = json.loads(raw)
+    except ValueError:
+        return generation, None
+    if stored.get("generation") != generation:
+        return generation, None
+    return generation, stored.get("pools")
+
+
+def _write_shared_snapshot(
+    draw_date: date, generation: int, pools: Dict[str, Dict[str, Any]]
+) -> None:
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.hset(
+            _REDIS_SNAPSHOT_KEY,
+            draw_date.isoformat(),
+            json.dumps({"generation": generation, "pools": pools}),
+        )
+        pipe.expire(_REDIS_SNAPSHOT_KEY, _REDIS_SNAPSHOT_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Prize pool snapshot write failed: %s", exc)
+        mark_sync_redis_failed()
+
+
+def get_mode_prize_pool_snapshot(
+    db: Session, draw_date: date
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Return `calculate_mode_prize_pool` results for every snapshot mode on `draw_date`.
+
+    Lookup order: in-process cache, shared Redis snapshot, fresh computation (which
+    is then written back to both). If the computation fails, empty pools are returned
+    and nothing is cached.
+    """
+    local_key = _local_key(draw_date)
+    cached = default_cache.get(local_key)
+    if cached is not None:
+        return cached
+
+    generation, pools = _read_shared_snapshot(draw_date)
+    if pools is None:
+        pools = _compute_snapshot(db, draw_date)
+        if pools is None:
+            return _empty_pools()
+        if generation is not None:
+            _write_shared_snapshot(draw_date, generation, pools)
+
+    default_cache.set(local_key, pools, ttl_seconds=DRAW_PRIZE_POOL_CACHE_SECONDS)
+    return pools
+
+
+def invalidate_mode_prize_pool_snapshot(_changed: Optional[Set[Any]] = None) -> None:
+    """Drop all prize pool snapshots (this process immediately, other workers via Redis)."""
+    global _local_generation
+    _local_generation += 1
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        client.incr(_REDIS_GENERATION_KEY)
+    except Exception as exc:
+        logger.warning("Prize pool snapshot invalidation failed: %s", exc)
+        mark_sync_redis_failed()
+
+
+on_committed_change("user_subscriptions", invalidate_mode_prize_pool_snapshot)
+on_committed_change("subscription_plans", invalidate_mode_prize_pool_snapshot)
+on_committed_change("trivia_mode_config", invalidate_mode_prize_pool_snapshot)
@@ -0,0 +1,280 @@
+"""
+Per-user profile read model.
+
+Profile screens (`/profile/summary`, `/profile/complete`, gems, chat sender profiles)
+all need the same dependents of a user row: the selected avatar and frame, the
+achievement badge, subscription badges, the correct-answer count behind the level
+progress and the earnings of the current draw. They are loaded with one joined
+query and cached in Redis as a single composite entry; fields of the `users` row
+itself (names, address, balances) are read from the caller's already loaded user.
+Entries hold badge ids and subscription tiers; badge payloads come from the shared
+in-process definitions in `utils.subscription_badges` when the view is read.
+
+Entries are a `core.read_models.TokenReadModel`: commits touching the selection,
+subscriptions, answers or leaderboard rows of a user rotate that user's token, and
+commits to shared definitions (avatars, frames, subscription plans) bump the read
+model's generation instead. Entries are also dropped when the active draw date
+changes or the earliest subscription period behind them ends. Without Redis the
+query runs on every call.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import exists, func, inspect, or_, select, union_all
+
+from core.config import PROFILE_VIEW_CACHE_SECONDS
+from core.model_events import on_committed_change
+from core.read_models import TokenReadModel
+from utils.subscription_badges import (
+    SUBSCRIPTION_TIERS,
+    get_badge_definitions,
+    tier_clause,
+)
+
+_profiles = TokenReadModel(
+    "profile_view", ttl_seconds=PROFILE_VIEW_CACHE_SECONDS, generation=True
+)
+
+# Selection columns of `users` that the composite depends on.
+_USER_VIEW_COLUMNS = ("selected_avatar_id", "selected_frame_id", "badge_id")
+# Tables whose rows are shared by every profile.
+PROFILE_DEFINITION_TABLES = ("avatars", "frames", "subscription_plans")
+
+
+class ProfileView(NamedTuple):
+    avatar: Optional[Dict[str, Any]]  # id, name, bucket, object_key, mime_type
+    frame: Optional[Dict[str, Any]]
+    badge: Optional[Dict[str, Any]]  # id, name, image_url
+    subscription_badges: List[Dict[str, Any]]
+    total_correct: int
+    recent_draw_earnings: float
+
+
+def _cached(account_id: int, draw_date: str):
+    """Return (lookup, profile-or-None); entries of another draw date are misses."""
+    lookup = _profiles.lookup([account_id])
+    stored = lookup.entries.get(account_id)
+    if isinstance(stored, dict) and stored.get("draw_date") == draw_date:
+        return lookup, stored.get("profile")
+    return lookup, None
+
+
+def _load_stmt(account_id: int, draw_date, now: datetime):
+    from models import (
+        Avatar,
+        Frame,
+        SubscriptionPlan,
+        TriviaBronzeModeLeaderboard,
+        TriviaSilverModeLeaderboard,
+        TriviaUserBronzeModeDaily,
+        TriviaUserFreeModeDaily,
+        TriviaUserSilverModeDaily,
+        User,
+        UserSubscription,
+    )
+
+    correct = union_all(
+        select(TriviaUserFreeModeDaily.account_id).where(
+            TriviaUserFreeModeDaily.account_id == account_id,
+            TriviaUserFreeModeDaily.status == "answered_correct",
+            TriviaUserFreeModeDaily.is_correct.is_(True),
+        ),
+        select(TriviaUserBronzeModeDaily.account_id).where(
+            TriviaUserBronzeModeDaily.account_id == account_id,
+            TriviaUserBronzeModeDaily.submitted_at.isnot(None),
+            TriviaUserBronzeModeDaily.is_correct.is_(True),
+        ),
+        select(TriviaUserSilverModeDaily.account_id).where(
+            TriviaUserSilverModeDaily.account_id == account_id,
+            TriviaUserSilverModeDaily.submitted_at.isnot(None),
+            TriviaUserSilverModeDaily.is_correct.is_(True),
+        ),
+    ).subquery("correct_answers")
+
+    earnings = union_all(
+        select(TriviaBronzeModeLeaderboard.money_awarded.label("amount")).where(
+            TriviaBronzeModeLeaderboard.account_id == account_id,
+            TriviaBronzeModeLeaderboard.draw_date == draw_date,
+        ),
+        select(TriviaSilverModeLeaderboard.money_awarded.label("amount")).where(
+            TriviaSilverModeLeaderboard.account_id == account_id,
+            TriviaSilverModeLeaderboard.draw_date == draw_date,
+        ),
+    ).subquery("earnings")
+
+    def active_subscriptions(*columns):
+        return (
+            select(*columns)
+            .select_from(UserSubscription)
+            .join(SubscriptionPlan, SubscriptionPlan.id == UserSubscription.plan_id)
+            .where(
+                UserSubscription.user_id == account_id,
+                UserSubscription.status == "active",
+                UserSubscription.current_period_end > now,
+            )
+        )
+
+    return (
+        select(
+            Avatar.id.label("avatar_id"),
+            Avatar.name.label("avatar_name"),
+            Avatar.bucket.label("avatar_bucket"),
+            Avatar.object_key.label("avatar_object_key"),
+            Avatar.mime_type.label("avatar_mime_type"),
+            Frame.id.label("frame_id"),
+            Frame.name.label("frame_name"),
+            Frame.bucket.label("frame_bucket"),
+            Frame.object_key.label("frame_object_key"),
+            Frame.mime_type.label("frame_mime_type"),
+            User.badge_id,
+            select(func.count())
+            .select_from(correct)
+            .scalar_subquery()
+            .label("total_correct"),
+            select(func.coalesce(func.sum(earnings.c.amount), 0.0))
+            .scalar_subquery()
+            .label("recent_draw_earnings"),
+            *(
+                exists(
+                    active_subscriptions(UserSubscription.id).where(tier_clause(tier))
+                ).label(f"has_{tier}")
+                for tier in SUBSCRIPTION_TIERS
+            ),
+            active_subscriptions(func.min(UserSubscription.current_period_end))
+            .where(or_(*(tier_clause(tier) for tier in SUBSCRIPTION_TIERS)))
+            .scalar_subquery()
+            .label("valid_until"),
+        )
+        .select_from(User)
+        .outerjoin(Avatar, Avatar.id == User.selected_avatar_id)
+        .outerjoin(Frame, Frame.id == User.selected_frame_id)
+        .where(User.account_id == account_id)
+    )
+
+
+def _from_row(row) -> Dict[str, Any]:
+    def cosmetic(prefix: str) -> Optional[Dict[str, Any]]:
+        if getattr(row, f"{prefix}_id") is None:
+            return None
+        return {
+            field: getattr(row, f"{prefix}_{field}")
+            for field in ("id", "name", "bucket", "object_key", "mime_type")
+        }
+
+    return {
+        "avatar": cosmetic("avatar"),
+        "frame": cosmetic("frame"),
+        "badge_id": row.badge_id,
+        "subscription_tiers": [
+            tier for tier in SUBSCRIPTION_TIERS if getattr(row, f"has_{tier}")
+        ],
+        "total_correct": int(row.total_correct or 0),
+        "recent_draw_earnings": round(float(row.recent_draw_earnings or 0.0), 2),
+    }
+
+
+def _view(profile: Dict[str, Any], definitions) -> ProfileView:
+    return ProfileView(
+        avatar=profile["avatar"],
+        frame=profile["frame"],
+        badge=definitions.badge(profile["badge_id"]),
+        subscription_badges=definitions.subscription_badges(
+            profile["subscription_tiers"]
+        ),
+        total_correct=profile["total_correct"],
+        recent_draw_earnings=profile["recent_draw_earnings"],
+    )
+
+
+def get_profile_view(db, account_id: int) -> Optional[ProfileView]:
+    """Profile composite of `account_id`; None if the user does not exist."""
+    from utils.trivia_mode_service import get_active_draw_date
+
+    draw_date = get_active_draw_date()
+    definitions = get_badge_definitions(db)
+    lookup, profile = _cached(account_id, draw_date.isoformat())
+    if profile is not None:
+        return _view(profile, definitions)
+    row = db.execute(_load_stmt(account_id, draw_date, datetime.utcnow())).first()
+    if row is None:
+        return None
+    profile = _from_row(row)
+    _profiles.store(
+        lookup,
+        {account_id: {"draw_date": draw_date.isoformat(), "profile": profile}},
+        valid_until={account_id: row.valid_until},
+    )
+    return _view(profile, definitions)
+
+
+def cosmetic_image_urls(view: ProfileView) -> Tuple[Optional[str], Optional[str]]:
+    """Presigned (avatar_url, frame_url) of `view`; signed at response time, never cached."""
+    from utils.storage import presign_many
+
+    keys = [
+        (item["bucket"], item["object_key"]) if item else (None, None)
+        for item in (view.avatar, view.frame)
+    ]
+    presigned = presign_many(keys)
+    return tuple(presigned.get(key) for key in keys)
+
+
+def invalidate_profile_views(account_ids: Set[Hashable]) -> None:
+    """Retire the current token (and cached entry) of every user in `account_ids`."""
+    _profiles.invalidate(account_ids)
+
+
+def bump_profile_generation(_changed: Optional[Set[Any]] = None) -> None:
+    """Retire every cached profile after a shared definition changed."""
+    _profiles.bump_generation()
+
+
+def _selection_change_key(user) -> Optional[int]:
+    state = inspect(user)
+    if state.deleted:
+        return user.account_id
+    attrs = state.attrs
+    for name in _USER_VIEW_COLUMNS:
+        if attrs[name].history.has_changes():
+            return user.account_id
+    return None
+
+
+def _free_answer_key(row) -> Optional[int]:
+    return (
+        row.account_id if row.status in ("answered_correct", "answered_wrong") else None
+    )
+
+
+def _paid_answer_key(row) -> Optional[int]:
+    return row.account_id if row.submitted_at is not None else None
+
+
+def _user_id_key(row) -> Optional[int]:
+    return getattr(row, "user_id", None)
+
+
+def _account_id_key(row) -> Optional[int]:
+    return getattr(row, "account_id", None)
+
+
+on_committed_change("users", invalidate_profile_views, key=_selection_change_key)
+on_committed_change("user_subscriptions", invalidate_profile_views, key=_user_id_key)
+on_committed_change(
+    "trivia_user_free_mode_daily", invalidate_profile_views, key=_free_answer_key
+)
+on_committed_change(
+    "trivia_user_bronze_mode_daily", invalidate_profile_views, key=_paid_answer_key
+)
+on_committed_change(
+    "trivia_user_silver_mode_daily", invalidate_profile_views, key=_paid_answer_key
+)
+on_committed_change(
+    "trivia_bronze_mode_leaderboard", invalidate_profile_views, key=_account_id_key
+)
+on_committed_change(
+    "trivia_silver_mode_leaderboard", invalidate_profile_views, key=_account_id_key
+)
+for _table in PROFILE_DEFINITION_TABLES:
+    on_committed_change(_table, bump_profile_generation)
@@ -1,96 +1,138 @@
 """
 Service for handling CSV question uploads.
+
+Uploads are imported as a stream: the CSV is parsed incrementally from the uploaded
+file, rows are validated and hashed in chunks of `QUESTION_IMPORT_CHUNK_ROWS`, and
+each chunk is loaded into a temporary staging table (`COPY` on Postgres, multi-row
+inserts elsewhere) and merged into the mode's question table with one
+`INSERT ... SELECT ... ON CONFLICT (question_hash) DO NOTHING`. Memory stays bounded
+by the chunk size, and every chunk is committed on its own, so re-uploading a file
+after a failure only adds the rows that are still missing.
 """
 
 import csv
+import heapq
 import io
-from typing import Any, Dict, List
-
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    false,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from core.config import QUESTION_IMPORT_CHUNK_ROWS, QUESTION_IMPORT_MAX_ERRORS
+from core.model_events import run_after_commit
 from models import (
     TriviaQuestionsBronzeMode,
     TriviaQuestionsFreeMode,
     TriviaQuestionsSilverMode,
 )
-from utils.question_hash_utils import (
-    generate_question_hash,
-    get_existing_hashes_in_mode,
+from utils.question_hash_utils import generate_question_hash
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = (
+    "question",
+    "option_a",
+    "option_b",
+    "option_c",
+    "option_d",
+    "correct_answer",
+    "category",
+    "difficulty_level",
 )
+OPTIONAL_FIELDS = ("fill_in_answer", "hint", "explanation", "country", "picture_url")
+QUESTION_FIELDS = REQUIRED_FIELDS + OPTIONAL_FIELDS
+
+_QUESTION_MODELS = {
+    "free_mode": TriviaQuestionsFreeMode,
+    "bronze": TriviaQuestionsBronzeMode,
+    "silver": TriviaQuestionsSilverMode,
+}
+
+# Per-transaction staging table; Postgres drops it on commit.
+_stage = Table(
+    "question_import_stage",
+    MetaData(),
+    Column("row_num", Integer, nullable=False),
+    *(Column(field, String) for field in QUESTION_FIELDS),
+    Column("question_hash", String, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+_STAGE_COLUMNS = [column.name for column in _stage.columns]
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
 
 
-def parse_csv_questions(file_content: bytes, mode_id: str) -> List[Dict[str, Any]]:
+def iter_csv_questions(
+    fileobj,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
     """
-    Parse CSV file content into question dictionaries.
+    Parse a binary CSV file object row by row.
 
     Expected CSV columns (matching Trivia table):
     - question, option_a, option_b, option_c, option_d, correct_answer
     - fill_in_answer (optional), hint (optional), explanation (optional)
     - category, country (optional), difficulty_level, picture_url (optional)
 
-    Args:
-        file_content: Bytes content of the CSV file
-        mode_id: The mode identifier (e.g., 'free_mode')
-
-    Returns:
-        List of question dictionaries
+    Yields:
+        (row_num, question_data, error) for every data row; exactly one of
+        question_data and error is set. Row numbers count the header as row 1.
 
     Raises:
-        ValueError: If CSV format is invalid
+        ValueError: If the header lacks required columns
     """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
     try:
-        # Decode bytes to string
-        content = file_content.decode("utf-8")
-        csv_file = io.StringIO(content)
-
-        # Read CSV
-        reader = csv.DictReader(csv_file)
-        questions = []
-
-        required_fields = [
-            "question",
-            "option_a",
-            "option_b",
-            "option_c",
-            "option_d",
-            "correct_answer",
-            "category",
-            "difficulty_level",
+        reader = csv.DictReader(text)
+        missing_columns = [
+            field for field in REQUIRED_FIELDS if field not in (reader.fieldnames or [])
         ]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
 
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-            # Check required fields
-            missing_fields = [field for field in required_fields if not row.get(field)]
-            if missing_fields:
-                raise ValueError(
-                    f"Row {row_num}: Missing required fields: "
-                    f"{', '.join(missing_fields)}"
+        row_num = 1
+        try:
+            for row_num, row in enumerate(reader, start=2):
+                missing_fields = [
+                    field
+                    for field in REQUIRED_FIELDS
+                    if not (row.get(field) or "").strip()
+                ]
+                if missing_fields:
+                    yield row_num, None, (
+                        f"Missing required fields: {', '.join(missing_fields)}"
+                    )
+                    continue
+                question_data = {
+                    field: (row.get(field) or "").strip() for field in REQUIRED_FIELDS
+                }
+                question_data.update(
+                    {
+                        field: (row.get(field) or "").strip() or None
+                        for field in OPTIONAL_FIELDS
+                    }
                 )
-
-            question_data = {
-                "question": row["question"].strip(),
-                "option_a": row["option_a"].strip(),
-                "option_b": row["option_b"].strip(),
-                "option_c": row["option_c"].strip(),
-                "option_d": row["option_d"].strip(),
-                "correct_answer": row["correct_answer"].strip(),
-                "category": row["category"].strip(),
-                "difficulty_level": row["difficulty_level"].strip(),
-                "fill_in_answer": row.get("fill_in_answer", "").strip() or None,
-                "hint": row.get("hint", "").strip() or None,
-                "explanation": row.get("explanation", "").strip() or None,
-                "country": row.get("country", "").strip() or None,
-                "picture_url": row.get("picture_url", "").strip() or None,
-            }
-
-            questions.append(question_data)
-
-        return questions
-
-    except UnicodeDecodeError as e:
-        raise ValueError(f"Invalid file encoding: {str(e)}")
-    except Exception as e:
-        raise ValueError(f"Error parsing CSV: {str(e)}")
+                yield row_num, question_data, None
+        except UnicodeDecodeError as e:
+            yield row_num + 1, None, f"Invalid file encoding, import stopped: {e}"
+        except csv.Error as e:
+            yield row_num + 1, None, f"Malformed CSV, import stopped: {e}"
+    finally:
+        # Leave the underlying upload open for the caller.
+        text.detach()
 
 
 def validate_question(question_data: Dict[str, Any]) -> tuple[bool, str]:
@@ -104,18 +146,7 @@ def validate_question(question_data: Dict[str, Any]) -> tuple[bool, str]:
         Tuple of (is_valid, error_message)
     """
     # Check required fields
-    required_fields = [
-        "question",
-        "option_a",
-        "option_b",
-        "option_c",
-        "option_d",
-        "correct_answer",
-        "category",
-        "difficulty_level",
-    ]
-
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if not question_data.get(field):
             return False, f"Missing required field: {field}"
 
@@ -138,100 +169,185 @@ def validate_question(question_data: Dict[str, Any]) -> tuple[bool, str]:
     return True, ""
 
 
-def save_questions_to_mode(
+def _copy_rows(connection, rows: List[Tuple]) -> None:
+    """Bulk-load `rows` into the staging table of the session's connection."""
+    if connection.dialect.name != "postgresql":
+        connection.execute(
+            insert(_stage), [dict(zip(_STAGE_COLUMNS, row)) for row in rows]
+        )
+        return
+
+    copy_sql = f"COPY {_stage.name} ({', '.join(_STAGE_COLUMNS)}) FROM STDIN"
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(copy_sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        elif hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            cursor.copy_expert(f"{copy_sql} WITH (FORMAT csv)", buffer)
+        else:
+            connection.execute(
+                insert(_stage), [dict(zip(_STAGE_COLUMNS, row)) for row in rows]
+            )
+    finally:
+        cursor.close()
+
+
+def _merge_stage(connection, question_model) -> set:
+    """Insert staged rows whose hash is new; returns the inserted hashes."""
+    dialect_insert = (
+        postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    )
+    target_columns = list(QUESTION_FIELDS) + [
+        "question_hash",
+        "is_used",
+        "created_date",
+    ]
+    source = select(
+        *(_stage.c[field] for field in QUESTION_FIELDS),
+        _stage.c.question_hash,
+        false(),
+        literal(datetime.utcnow()),
+    ).order_by(_stage.c.row_num)
+    stmt = (
+        dialect_insert(question_model)
+        .from_select(target_columns, source)
+        .on_conflict_do_nothing(index_elements=["question_hash"])
+        .returning(question_model.question_hash)
+    )
+    return set(connection.execute(stmt).scalars())
+
+
+def _import_chunk(
+    db: Session, question_model, chunk: List[Tuple[int, Dict[str, Any], str]]
+) -> set:
+    connection = db.connection()
+    _stage.create(connection, checkfirst=True)
+    _copy_rows(
+        connection,
+        [
+            (row_num, *(data[field] for field in QUESTION_FIELDS), question_hash)
+            for row_num, data, question_hash in chunk
+        ],
+    )
+    inserted = _merge_stage(connection, question_model)
+    connection.execute(_stage.delete())
+    return inserted
+
+
+def import_questions_csv(
     db: Session,
-    questions: List[Dict[str, Any]],
+    fileobj,
     mode_id: str,
+    *,
+    chunk_size: int = QUESTION_IMPORT_CHUNK_ROWS,
+    on_progress: Optional[ProgressCallback] = None,
 ) -> Dict[str, Any]:
     """
-    Save questions to the appropriate mode table.
-    Validates questions, checks for duplicates, and inserts them.
+    Stream questions from a CSV file object into the mode's question table.
 
-    Args:
-        db: Database session
-        questions: List of question dictionaries
-        mode_id: The mode identifier (e.g., 'free_mode')
+    Rows failing validation, repeating a question earlier in the file or already
+    present in the table are skipped and reported with their CSV row number, in row
+    order (the first `QUESTION_IMPORT_MAX_ERRORS` rows; the counts cover every row).
+    `on_progress` is called with the running totals after each committed chunk.
 
     Returns:
-        Dictionary with 'saved_count', 'duplicate_count', 'error_count', and 'errors'
+        Dictionary with 'rows_processed', 'saved_count', 'duplicate_count',
+        'error_count' and 'errors'
+
+    Raises:
+        ValueError: If mode_id is unknown, the header is invalid or a chunk fails
     """
-    saved_count = 0
-    duplicate_count = 0
-    error_count = 0
-    errors = []
-    question_model = None
-    if mode_id == "free_mode":
-        question_model = TriviaQuestionsFreeMode
-    elif mode_id == "bronze":
-        question_model = TriviaQuestionsBronzeMode
-    elif mode_id == "silver":
-        question_model = TriviaQuestionsSilverMode
-    else:
+    question_model = _QUESTION_MODELS.get(mode_id)
+    if question_model is None:
         raise ValueError(f"Unknown mode_id '{mode_id}'")
 
-    question_hashes = []
-    for idx, question_data in enumerate(questions, start=1):
-        question_hashes.append(
-            (idx, question_data, generate_question_hash(question_data["question"]))
-        )
-
-    existing_hashes = get_existing_hashes_in_mode(
-        db, {qh for _, _, qh in question_hashes}, mode_id
-    )
-    seen_hashes = set()
-
-    for idx, question_data, question_hash in question_hashes:
+    result: Dict[str, Any] = {
+        "rows_processed": 0,
+        "saved_count": 0,
+        "duplicate_count": 0,
+        "error_count": 0,
+        "errors": [],
+    }
+    # Table duplicates are only known once their chunk is flushed, after later rows
+    # were validated, so the lowest rows are kept in a bounded max-heap and sorted.
+    errors: List[Tuple[int, str]] = []
+
+    def report(row_num: int, message: str) -> None:
+        entry = (-row_num, message)
+        if len(errors) < QUESTION_IMPORT_MAX_ERRORS:
+            heapq.heappush(errors, entry)
+        elif errors and entry > errors[0]:
+            heapq.heapreplace(errors, entry)
+
+    def flush(chunk) -> None:
         try:
-            # Validate question
-            is_valid, error_msg = validate_question(question_data)
-            if not is_valid:
-                error_count += 1
-                errors.append(f"Question {idx}: {error_msg}")
-                continue
-
-            # Check for duplicate (batch prefetch + in-file dedupe)
-            if question_hash in existing_hashes or question_hash in seen_hashes:
-                duplicate_count += 1
-                errors.append(
-                    f"Question {idx}: Duplicate question found "
-                    f"(hash: {question_hash[:8]}...)"
+            inserted = _import_chunk(db, question_model, chunk)
+            if inserted and mode_id == "free_mode":
+                from utils.free_mode_question_pack import (
+                    invalidate_free_mode_question_packs,
                 )
-                continue
-            seen_hashes.add(question_hash)
-
-            question = question_model(
-                question=question_data["question"],
-                option_a=question_data["option_a"],
-                option_b=question_data["option_b"],
-                option_c=question_data["option_c"],
-                option_d=question_data["option_d"],
-                correct_answer=question_data["correct_answer"],
-                fill_in_answer=question_data.get("fill_in_answer"),
-                hint=question_data.get("hint"),
-                explanation=question_data.get("explanation"),
-                category=question_data["category"],
-                country=question_data.get("country"),
-                difficulty_level=question_data["difficulty_level"],
-                picture_url=question_data.get("picture_url"),
-                question_hash=question_hash,
-                is_used=False,
-            )
-            db.add(question)
-            saved_count += 1
 
+                # Core INSERT bypasses the ORM change hooks.
+                run_after_commit(
+                    db,
+                    invalidate_free_mode_question_packs,
+                    {question_model.__tablename__},
+                )
+            db.commit()
         except Exception as e:
-            error_count += 1
-            errors.append(f"Question {idx}: Error saving - {str(e)}")
+            db.rollback()
+            raise ValueError(
+                f"Error importing rows {chunk[0][0]}-{chunk[-1][0]}: {str(e)}"
+            )
+        for row_num, _, question_hash in chunk:
+            if question_hash in inserted:
+                result["saved_count"] += 1
+            else:
+                result["duplicate_count"] += 1
+                report(
+                    row_num,
+                    f"Duplicate question found (hash: {question_hash[:8]}...)",
+                )
+        progress = {key: value for key, value in result.items() if key != "errors"}
+        logger.info(
+            "Question import into %s: %s", question_model.__tablename__, progress
+        )
+        if on_progress is not None:
+            on_progress(progress)
 
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise ValueError(f"Error committing questions to database: {str(e)}")
-
-    return {
-        "saved_count": saved_count,
-        "duplicate_count": duplicate_count,
-        "error_count": error_count,
-        "errors": errors,
-    }
+    seen_hashes = set()
+    chunk: List[Tuple[int, Dict[str, Any], str]] = []
+    for row_num, question_data, error in iter_csv_questions(fileobj):
+        result["rows_processed"] += 1
+        if error is None:
+            is_valid, error = validate_question(question_data)
+            if is_valid:
+                error = None
+        if error:
+            result["error_count"] += 1
+            report(row_num, error)
+            continue
+
+        question_hash = generate_question_hash(question_data["question"])
+        if question_hash in seen_hashes:
+            result["duplicate_count"] += 1
+            report(row_num, f"Duplicate question found (hash: {question_hash[:8]}...)")
+            continue
+        seen_hashes.add(question_hash)
+
+        chunk.append((row_num, question_data, question_hash))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    result["errors"] = [
+        f"Row {-neg_row}: {message}" for neg_row, message in sorted(errors, reverse=True)
+    ]
+    return result
@@ -0,0 +1,121 @@
+"""
+Offline SigV4 query-string presigning for S3 GET URLs.
+
+Produces the same URLs as boto3's `generate_presigned_url("get_object", ...)` but
+without a client: the per-day signing key is derived once per (date, region) and
+each URL costs one SHA-256 and one HMAC.
+
+`X-Amz-Date` is aligned to the start of a time bucket, so every request for the
+same object within a bucket gets a byte-identical URL that clients and CDNs can
+cache. `X-Amz-Expires` is extended by the bucket length so a URL is still valid for
+at least the requested lifetime from any moment inside the bucket.
+"""
+
+import hashlib
+import hmac
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+MAX_EXPIRES_SECONDS = 604800  # SigV4 maximum (7 days)
+
+_UNRESERVED = "-_.~"
+_signing_keys: Dict[Tuple[str, str, str, str], bytes] = {}
+
+
+class PresignedUrl(NamedTuple):
+    url: str
+    bucket_start: int
+    bucket_end: int
+
+
+def s3_host_and_path(bucket: str, key: str, region: str, addressing_style: str):
+    """Regional host and canonical (already encoded) path for `bucket`/`key`."""
+    encoded_key = quote(key, safe="/" + _UNRESERVED)
+    if addressing_style == "path":
+        return (
+            f"s3.{region}.amazonaws.com",
+            f"/{quote(bucket, safe=_UNRESERVED)}/{encoded_key}",
+        )
+    return f"{bucket}.s3.{region}.amazonaws.com", f"/{encoded_key}"
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _signing_key(
+    access_key: str, secret_key: str, date_stamp: str, region: str
+) -> bytes:
+    cache_key = (access_key, secret_key, date_stamp, region)
+    derived = _signing_keys.get(cache_key)
+    if derived is None:
+        derived = _hmac(
+            _hmac(
+                _hmac(_hmac(f"AWS4{secret_key}".encode("utf-8"), date_stamp), region),
+                "s3",
+            ),
+            "aws4_request",
+        )
+        # Keys from previous days (or rotated credentials) are never needed again.
+        if any(existing[2] != date_stamp for existing in _signing_keys):
+            _signing_keys.clear()
+        _signing_keys[cache_key] = derived
+    return derived
+
+
+def presign_get_url(
+    *,
+    access_key: str,
+    secret_key: str,
+    bucket: str,
+    key: str,
+    region: str,
+    addressing_style: str = "virtual",
+    expires: int = 900,
+    bucket_seconds: int = 300,
+    now: Optional[float] = None,
+) -> PresignedUrl:
+    """Presign a GET for `bucket`/`key`, with `X-Amz-Date` floored to a `bucket_seconds` bucket."""
+    now = time.time() if now is None else now
+    bucket_seconds = max(int(bucket_seconds), 1)
+    bucket_start = int(now) // bucket_seconds * bucket_seconds
+    expires = min(int(expires) + bucket_seconds - 1, MAX_EXPIRES_SECONDS)
+
+    amz_date = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(bucket_start))
+    date_stamp = amz_date[:8]
+    scope = f"{date_stamp}/{region}/s3/aws4_request"
+    host, path = s3_host_and_path(bucket, key, region, addressing_style)
+
+    query = "&".join(
+        f"{name}={quote(value, safe=_UNRESERVED)}"
+        for name, value in (
+            ("X-Amz-Algorithm", ALGORITHM),
+            ("X-Amz-Credential", f"{access_key}/{scope}"),
+            ("X-Amz-Date", amz_date),
+            ("X-Amz-Expires", str(expires)),
+            ("X-Amz-SignedHeaders", "host"),
+        )
+    )
+    canonical_request = "\n".join(
+        ["GET", path, query, f"host:{host}", "", "host", "UNSIGNED-PAYLOAD"]
+    )
+    string_to_sign = "\n".join(
+        [
+            ALGORITHM,
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ]
+    )
+    signature = hmac.new(
+        _signing_key(access_key, secret_key, date_stamp, region),
+        string_to_sign.encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    return PresignedUrl(
+        url=f"https://{host}{path}?{query}&X-Amz-Signature={signature}",
+        bucket_start=bucket_start,
+        bucket_end=bucket_start + bucket_seconds,
+    )
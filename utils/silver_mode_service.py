@@ -13,6 +13,7 @@ from typing import Any, Dict, List
 from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
+from core.queue import enqueue_task
 from models import (
     SubscriptionPlan,
     TriviaModeConfig,
@@ -224,6 +225,7 @@ def distribute_rewards_to_winners_silver_mode(
 
     distributed_count = 0
     total_distributed = 0.0
+    credits: List[Dict[str, Any]] = []
 
     for i, winner in enumerate(winners):
         reward_amount = rewards[i]
@@ -238,19 +240,15 @@ def distribute_rewards_to_winners_silver_mode(
         )
         db.add(winner_record)
 
-        # Enqueue wallet credit via background worker
+        # Wallet credits for the whole draw settle in one worker transaction
         reward_minor = int(round(reward_amount * 100))
         if reward_minor > 0:
-            from core.queue import enqueue_task
-
-            enqueue_task(
-                name="wallet.credit_winner",
-                payload={
+            credits.append(
+                {
                     "account_id": winner["account_id"],
                     "amount_minor": reward_minor,
-                    "reason": f"silver_draw_{draw_date}",
                     "idempotency_key": f"draw_reward:silver:{draw_date}:{winner['account_id']}",
-                },
+                }
             )
 
         # Update or create leaderboard entry
@@ -280,6 +278,14 @@ def distribute_rewards_to_winners_silver_mode(
         distributed_count += 1
         total_distributed += reward_amount
 
+    # Enqueue before committing, so a queue failure leaves the draw unrecorded and a
+    # rerun retries it.
+    if credits:
+        enqueue_task(
+            name="wallet.credit_winners_batch",
+            payload={"reason": f"silver_draw_{draw_date}", "credits": credits},
+        )
+
     db.commit()
 
     logger.info(
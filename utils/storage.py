@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import os
 import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
 
 try:
     import boto3
@@ -12,6 +15,9 @@ except Exception:  # keep import-time safe where boto3 may not be installed yet
     Config = None
     ClientError = None
 
+from core.cache import LRUCache
+from utils.s3_presigner import MAX_EXPIRES_SECONDS, presign_get_url
+
 # AWS S3 configuration
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -91,8 +97,26 @@ _bucket_addressing_styles: Dict[str, str] = (
     {}
 )  # Cache addressing style per bucket (virtual or path)
 _cached_creds = None  # Tuple of (access_key_id, secret_key) for cache invalidation
-_presign_cache: Dict[str, tuple[str, float]] = {}
 _PRESIGN_CACHE_TTL_SECONDS = int(os.getenv("PRESIGN_CACHE_TTL_SECONDS", "300"))
+# Shared by presign_get / presign_many, keyed by (bucket, key, expires)
+_presign_cache = LRUCache(
+    max_keys=int(os.getenv("PRESIGN_CACHE_MAX_ENTRIES", "10000"))
+)
+# Presigned URLs share one X-Amz-Date per bucket of this many seconds
+_PRESIGN_TIME_BUCKET_SECONDS = int(os.getenv("PRESIGN_TIME_BUCKET_SECONDS", "300"))
+
+# Blocking S3 transfers for async callers run here, never on the event loop
+_transfer_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("S3_TRANSFER_MAX_WORKERS", "8")),
+    thread_name_prefix="s3-transfer",
+)
+_MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum for every part but the last
+_MULTIPART_PART_SIZE = max(
+    int(os.getenv("S3_MULTIPART_PART_SIZE_BYTES", str(_MIN_PART_SIZE))), _MIN_PART_SIZE
+)
+_DELETE_OBJECTS_MAX_KEYS = 1000
+# Upper bound on how long startup waits for bucket region resolution
+_BOOTSTRAP_TIMEOUT_SECONDS = float(os.getenv("S3_BOOTSTRAP_TIMEOUT_SECONDS", "10"))
 
 
 def _invalidate_client(region: str, addressing_style: str = "virtual"):
@@ -110,35 +134,30 @@ def _preferred_addressing_for_bucket(bucket: str) -> str:
     return "path" if "." in bucket else "virtual"
 
 
-def _get_presign_cache_key(bucket: str, key: str, expires: int) -> str:
-    return f"{bucket}:{key}:{expires}"
-
-
 def _get_cached_presign_url(bucket: str, key: str, expires: int) -> Optional[str]:
-    cache_key = _get_presign_cache_key(bucket, key, expires)
-    cached = _presign_cache.get(cache_key)
-    if not cached:
-        return None
-    url, expires_at = cached
-    if expires_at > time.time():
-        return url
-    _presign_cache.pop(cache_key, None)
-    return None
+    return _presign_cache.get((bucket, key, expires))
 
 
-def _set_cached_presign_url(bucket: str, key: str, expires: int, url: str) -> None:
-    ttl = min(expires, _PRESIGN_CACHE_TTL_SECONDS)
-    if ttl <= 0:
+def _set_cached_presign_url(
+    bucket: str, key: str, expires: int, url: str, bucket_end: float
+) -> None:
+    # Serve the URL until its time bucket ends; the next bucket signs a new one.
+    cache_until = min(bucket_end, time.time() + _PRESIGN_CACHE_TTL_SECONDS)
+    if cache_until <= time.time():
         return
-    cache_key = _get_presign_cache_key(bucket, key, expires)
-    _presign_cache[cache_key] = (url, time.time() + ttl)
-    if len(_presign_cache) > 1000:
-        now = time.time()
-        for key_name, (_, expires_at) in list(_presign_cache.items()):
-            if expires_at <= now:
-                _presign_cache.pop(key_name, None)
-        if len(_presign_cache) > 1000:
-            _presign_cache.clear()
+    _presign_cache.set((bucket, key, expires), url, expires_at=cache_until)
+
+
+def presign_cache_stats() -> Dict[str, int]:
+    """Size and hit/miss/eviction counters of the shared presigned URL cache."""
+    return _presign_cache.stats()
+
+
+def presign_bucket_end(now: Optional[float] = None) -> int:
+    """End of the current presign time bucket; URLs signed after it differ."""
+    now = time.time() if now is None else now
+    bucket_seconds = max(_PRESIGN_TIME_BUCKET_SECONDS, 1)
+    return int(now) // bucket_seconds * bucket_seconds + bucket_seconds
 
 
 def _endpoint_for_region(region: str) -> Optional[str]:
@@ -206,71 +225,6 @@ def _assert_client_endpoint(client, region: str):
         # Don't raise on verification failure, but log it
 
 
-def _assert_presigned_host(url: str, region: str):
-    """
-    Validate that a presigned URL uses a regional S3 host, not the global endpoint.
-    Raises RuntimeError if the URL host is invalid (indicates a bug in URL generation).
-
-    This is a defensive check to catch any case where presigned URLs might be generated
-    with the wrong host (global endpoint instead of regional).
-
-    Args:
-        url: Presigned URL string to validate
-        region: Expected AWS region
-
-    Raises:
-        RuntimeError: If URL host doesn't match expected regional pattern
-    """
-    try:
-        from urllib.parse import urlparse
-
-        parsed = urlparse(url)
-        host = parsed.netloc.lower()
-
-        # Acceptable patterns:
-        # 1. Virtual-hosted style: bucket.s3.region.amazonaws.com
-        # 2. Path-style: s3.region.amazonaws.com
-        # 3. For us-east-1 specifically: bucket.s3.amazonaws.com or s3.amazonaws.com (global endpoint is valid for us-east-1)
-
-        is_valid = False
-
-        if region == "us-east-1":
-            # For us-east-1, global endpoint is acceptable
-            is_valid = (
-                host.endswith(
-                    ".s3.amazonaws.com"
-                )  # bucket.s3.amazonaws.com (global us-east-1)
-                or host == "s3.amazonaws.com"  # s3.amazonaws.com (global)
-                or host.endswith(
-                    ".s3.us-east-1.amazonaws.com"
-                )  # bucket.s3.us-east-1.amazonaws.com (regional)
-                or host
-                == "s3.us-east-1.amazonaws.com"  # s3.us-east-1.amazonaws.com (regional)
-            )
-        else:
-            # For all other regions, MUST use regional endpoint
-            is_valid = (
-                host.endswith(
-                    f".s3.{region}.amazonaws.com"
-                )  # bucket.s3.region.amazonaws.com
-                or host == f"s3.{region}.amazonaws.com"  # s3.region.amazonaws.com
-            )
-
-        if not is_valid:
-            raise RuntimeError(
-                f"Presigned URL has invalid S3 host '{host}' for region '{region}'. "
-                f"Expected regional endpoint (e.g., 's3.{region}.amazonaws.com' or '*.s3.{region}.amazonaws.com'). "
-                f"Full URL host: {host}. This indicates a bug in presigned URL generation."
-            )
-
-        logging.debug(f"Presigned URL host validated: {host} (region: {region})")
-    except RuntimeError:
-        raise
-    except Exception as e:
-        logging.warning(f"Could not validate presigned URL host: {e}")
-        # Don't raise on validation failure (might be non-S3 URL), but log it
-
-
 def clear_bucket_region_cache(bucket: Optional[str] = None):
     """
     Clear cached bucket region(s) and addressing styles.
@@ -449,6 +403,69 @@ def _get_bucket_region(bucket: str) -> str:
         return region
 
 
+def _resolve_bucket(bucket: str) -> Tuple[str, str]:
+    """Detect and pin the region and addressing style of `bucket`, creating its client."""
+    region = os.getenv("S3_PRESIGN_ASSUME_REGION") or _get_bucket_region(bucket)
+    _bucket_regions[bucket] = region
+    addressing_style = _bucket_addressing_styles.setdefault(
+        bucket, _preferred_addressing_for_bucket(bucket)
+    )
+    # Creating the client verifies its regional endpoint once; requests reuse it.
+    _get_s3_client_for_region(region, addressing_style)
+    return region, addressing_style
+
+
+def bootstrap_buckets(buckets: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Resolve every bucket in `buckets` concurrently (one GetBucketLocation each).
+
+    Regions, addressing styles and verified regional clients are pinned in the
+    module caches, so request handlers never pay S3 metadata latency for these
+    buckets. Buckets that fail to resolve are logged and left to lazy detection.
+
+    Returns:
+        Mapping of each resolved bucket to its (region, addressing_style)
+    """
+    names = sorted({bucket for bucket in buckets if bucket})
+    if not names:
+        return {}
+    if boto3 is None or not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        logging.info("S3 bootstrap skipped: boto3 or AWS credentials unavailable")
+        return {}
+
+    resolved: Dict[str, Tuple[str, str]] = {}
+    with ThreadPoolExecutor(
+        max_workers=min(len(names), 16), thread_name_prefix="s3-bootstrap"
+    ) as pool:
+        futures = {bucket: pool.submit(_resolve_bucket, bucket) for bucket in names}
+        for bucket, future in futures.items():
+            try:
+                resolved[bucket] = future.result()
+            except Exception as e:
+                logging.error(f"S3 bootstrap failed for bucket '{bucket}': {e}")
+    logging.info(
+        "S3 buckets pinned: "
+        + ", ".join(f"{b}={region}/{style}" for b, (region, style) in resolved.items())
+    )
+    return resolved
+
+
+async def bootstrap_buckets_async(
+    buckets: Iterable[str], timeout: float = _BOOTSTRAP_TIMEOUT_SECONDS
+) -> Dict[str, Tuple[str, str]]:
+    """`bootstrap_buckets` off the event loop; gives up waiting after `timeout` seconds."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, bootstrap_buckets, list(buckets)), timeout
+        )
+    except asyncio.TimeoutError:
+        logging.warning(
+            f"S3 bootstrap did not finish within {timeout}s; remaining buckets resolve lazily"
+        )
+        return {}
+
+
 def _get_s3_client_for_region(region: str, addressing_style: str = "virtual"):
     """Get or create S3 client for a specific region
 
@@ -537,43 +554,16 @@ def _get_s3_client_for_region(region: str, addressing_style: str = "virtual"):
     return client
 
 
-def presign_get(bucket: str, key: str, expires: int = 900) -> Optional[str]:
-    """
-    Generate a presigned URL for an S3 object.
-    Auto-detects the bucket region to avoid PermanentRedirect errors.
-
-    Args:
-        bucket: S3 bucket name
-        key: S3 object key (path)
-        expires: URL expiration time in seconds (default 15 minutes, max 7 days = 604800)
-
-    Returns:
-        Presigned URL string or None if generation fails
-    """
-    if not bucket or not key:
-        return None
-    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
-        logging.warning(
-            "AWS_ACCESS_KEY_ID or AWS_SECRET_ACCESS_KEY not set - cannot generate presigned URLs"
-        )
-        return None
-
-    cached_url = _get_cached_presign_url(bucket, key, expires)
-    if cached_url:
-        return cached_url
-
-    # Normalize key: strip leading slash to avoid // in URLs
-    if key.startswith("/"):
-        key = key[1:]
-        logging.debug(f"Normalized key by removing leading slash: {key}")
+def _presign(bucket: str, key: str, expires: int) -> Optional[str]:
+    """Sign one GET URL for an already-normalized key (no cache lookup); None on failure."""
+    cache_expires = expires
 
     # Validate expires (AWS SigV4 max is 7 days = 604800 seconds)
-    max_expires = 604800  # 7 days
-    if expires > max_expires:
+    if expires > MAX_EXPIRES_SECONDS:
         logging.warning(
-            f"Expires {expires} exceeds AWS max {max_expires}, clamping to {max_expires}"
+            f"Expires {expires} exceeds AWS max {MAX_EXPIRES_SECONDS}, clamping to {MAX_EXPIRES_SECONDS}"
         )
-        expires = max_expires
+        expires = MAX_EXPIRES_SECONDS
 
     try:
         # Auto-detect bucket region to avoid PermanentRedirect errors (allow override for performance)
@@ -589,247 +579,89 @@ def presign_get(bucket: str, key: str, expires: int = 900) -> Optional[str]:
             bucket, _preferred_addressing_for_bucket(bucket)
         )
 
-        s3 = _get_s3_client_for_region(bucket_region, addressing_style)
-
-        # CRITICAL: Verify endpoint before generating URL - raise error if wrong
-        # This catches environment variable overrides, proxy issues, or SDK misconfigurations
-        _assert_client_endpoint(s3, bucket_region)
-
-        # Double-check the endpoint right before presigning (defensive)
-        final_endpoint = getattr(s3.meta, "endpoint_url", "")
-        if bucket_region == "us-east-2":
-            final_host = _extract_hostname(final_endpoint)
-            allowed_hosts = {
-                "s3.us-east-2.amazonaws.com",
-                "s3.dualstack.us-east-2.amazonaws.com",
-            }
-            if not final_host or final_host not in allowed_hosts:
-                raise RuntimeError(
-                    f"Endpoint verification failed immediately before presigning: {final_endpoint} "
-                    f"(host: {final_host}, expected one of: {sorted(allowed_hosts)}). "
-                    "This indicates an endpoint override or SDK misconfiguration."
-                )
-
-        # Generate presigned URL
-        url = s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": bucket, "Key": key},
-            ExpiresIn=expires,
+        presigned = presign_get_url(
+            access_key=AWS_ACCESS_KEY_ID,
+            secret_key=AWS_SECRET_ACCESS_KEY,
+            bucket=bucket,
+            key=key,
+            region=bucket_region,
+            addressing_style=addressing_style,
+            expires=expires,
+            bucket_seconds=_PRESIGN_TIME_BUCKET_SECONDS,
         )
+    except Exception as e:
+        logging.error(
+            f"Error generating presigned URL for bucket={bucket}, key={key}: {e}",
+            exc_info=True,
+        )
+        return None
 
-        # CRITICAL: Validate the presigned URL host to ensure it's regional (not global)
-        # This catches any bugs in URL generation before the URL is returned to clients
-        _assert_presigned_host(url, bucket_region)
-
-        # Log the generated URL's host for debugging (without query params)
-        try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(url)
-            host = parsed.hostname.lower() if parsed.hostname else ""
-            logging.debug(
-                f"Generated presigned URL for bucket={bucket}, key={key}, region={bucket_region}, style={addressing_style}, host={host}"
-            )
-
-            # Warn if we detect global endpoint in generated URL (should never happen with our fixes)
-            is_global_host = host == "s3.amazonaws.com" or host.endswith(
-                ".s3.amazonaws.com"
-            )
-            if bucket_region != "us-east-1" and is_global_host:
-                logging.error(
-                    f"WARNING: Presigned URL contains global endpoint in host '{host}' for non-us-east-1 region '{bucket_region}'. "
-                    f"This should never happen - investigate immediately!"
-                )
-        except Exception:
-            logging.debug(
-                f"Generated presigned URL for bucket={bucket}, key={key}, region={bucket_region}, style={addressing_style}"
-            )
-
-        _set_cached_presign_url(bucket, key, expires, url)
-        return url
-
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "")
-        error_message = e.response.get("Error", {}).get("Message", "")
-        error_region = e.response.get("Error", {}).get("Region", "")
+    _set_cached_presign_url(
+        bucket, key, cache_expires, presigned.url, presigned.bucket_end
+    )
+    return presigned.url
 
-        # Log x-amz-bucket-region header if present (S3 tells us the actual bucket region)
-        try:
-            hdrs = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
-            amz_region = hdrs.get("x-amz-bucket-region")
-            if amz_region:
-                logging.warning(
-                    f"S3 says bucket '{bucket}' region is: {amz_region} (via x-amz-bucket-region header)"
-                )
-        except Exception:
-            pass
 
-        if error_code in ("PermanentRedirect", "AuthorizationQueryParametersError"):
-            # Force fresh region detection before falling back
-            # This ensures we get the correct region from S3 if detection was wrong
-            old_region = _bucket_regions.pop(bucket, None)
-            old_style = _bucket_addressing_styles.get(bucket, "virtual")
+def presign_get(bucket: str, key: str, expires: int = 900) -> Optional[str]:
+    """
+    Generate a presigned URL for an S3 object.
+    Auto-detects the bucket region to avoid PermanentRedirect errors.
 
-            # Invalidate old client to force rebuild
-            if old_region:
-                _invalidate_client(old_region, old_style)
+    Signing is done offline (`utils/s3_presigner.py`) with `X-Amz-Date` aligned to
+    `PRESIGN_TIME_BUCKET_SECONDS`, so repeated calls within a bucket return the same URL.
 
-            endpoint_hint = e.response.get("Error", {}).get("Endpoint", "")
-            bucket_region = None
-            addressing_style = "virtual"
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key (path)
+        expires: Minimum URL lifetime in seconds (default 15 minutes, max 7 days = 604800)
 
-            # Try to re-detect region from S3
-            try:
-                detected_region = _get_bucket_region(bucket)
-                if detected_region:
-                    bucket_region = detected_region
-                    logging.info(
-                        f"Redetected region after redirect error: {bucket_region}"
-                    )
-            except Exception as detect_error:
-                logging.warning(f"Region re-detection failed: {detect_error}")
-
-            # Check if error specifies s3.amazonaws.com (global endpoint format)
-            if (
-                endpoint_hint == "s3.amazonaws.com"
-                and error_code == "PermanentRedirect"
-            ):
-                # PermanentRedirect with global endpoint hint suggests wrong endpoint was used
-                # User confirmed bucket is in us-east-2, try path-style addressing
-                if not bucket_region:
-                    bucket_region = (
-                        AWS_REGION  # Use default (us-east-2) - user confirmed this
-                    )
-                addressing_style = (
-                    "path"  # Path-style: s3.us-east-2.amazonaws.com/avatars/key
-                )
-                logging.info(
-                    f"PermanentRedirect with global endpoint hint for bucket '{bucket}', trying path-style addressing with region {bucket_region}"
-                )
-            else:
-                # For AuthorizationQueryParametersError, extract region from error response
-                if not bucket_region and error_region:
-                    bucket_region = error_region
-                    logging.info(
-                        f"Using region from error response Region field: {bucket_region}"
-                    )
+    Returns:
+        Presigned URL string or None if generation fails
+    """
+    if not bucket or not key:
+        return None
+    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        logging.warning(
+            "AWS_ACCESS_KEY_ID or AWS_SECRET_ACCESS_KEY not set - cannot generate presigned URLs"
+        )
+        return None
 
-                # Otherwise, try to extract from error message
-                if not bucket_region and "expecting" in error_message.lower():
-                    import re
+    # Normalize key: strip leading slash to avoid // in URLs
+    key = key.lstrip("/")
+    cached_url = _get_cached_presign_url(bucket, key, expires)
+    if cached_url:
+        return cached_url
+    return _presign(bucket, key, expires)
 
-                    region_match = re.search(
-                        r"expecting\s+['\"]?([a-z0-9-]+)['\"]?",
-                        error_message,
-                        re.IGNORECASE,
-                    )
-                    if region_match:
-                        bucket_region = region_match.group(1)
-                        logging.info(
-                            f"Extracted expected region from error message: {bucket_region}"
-                        )
-
-                # Fall back to default if we couldn't extract region
-                if not bucket_region:
-                    bucket_region = AWS_REGION
-                    logging.warning(
-                        f"Could not extract region from error, using default: {bucket_region}"
-                    )
 
-            # Cache new region and addressing style, then retry
-            try:
-                _bucket_regions[bucket] = bucket_region
-                _bucket_addressing_styles[bucket] = addressing_style
-                s3 = _get_s3_client_for_region(bucket_region, addressing_style)
-
-                # Verify endpoint before generating URL
-                _assert_client_endpoint(s3, bucket_region)
-
-                # Final endpoint check before presigning
-                final_endpoint = getattr(s3.meta, "endpoint_url", "")
-                if (
-                    bucket_region == "us-east-2"
-                    and "s3.us-east-2.amazonaws.com" not in final_endpoint
-                ):
-                    raise RuntimeError(f"Endpoint mismatch in retry: {final_endpoint}")
-
-                url = s3.generate_presigned_url(
-                    "get_object",
-                    Params={"Bucket": bucket, "Key": key},
-                    ExpiresIn=expires,
-                )
+def presign_many(
+    objects: Iterable[Tuple[Optional[str], Optional[str]]], expires: int = 900
+) -> Dict[Tuple[str, str], Optional[str]]:
+    """
+    Presign GET URLs for many (bucket, key) pairs at once.
 
-                # Validate the presigned URL host after retry
-                _assert_presigned_host(url, bucket_region)
+    Duplicates are signed once and every pair goes through the shared URL cache, so
+    a page listing the same few avatars/frames many times costs one HMAC per distinct
+    object per time bucket. Pairs with a missing bucket or key are skipped.
 
-                logging.info(
-                    f"Successfully generated presigned URL after correction: bucket={bucket}, region={bucket_region}, style={addressing_style}"
-                )
-                return url
-            except Exception as retry_error:
-                # If path-style didn't work, try virtual style with detected region
-                if addressing_style == "path":
-                    logging.info(
-                        f"Path-style failed, trying virtual-hosted style with {bucket_region}"
-                    )
-                    try:
-                        _invalidate_client(
-                            bucket_region, "path"
-                        )  # Clear failed path-style client
-                        s3 = _get_s3_client_for_region(bucket_region, "virtual")
-
-                        # Verify endpoint before generating URL
-                        _assert_client_endpoint(s3, bucket_region)
-
-                        # Final endpoint check before presigning
-                        final_endpoint = getattr(s3.meta, "endpoint_url", "")
-                        if (
-                            bucket_region == "us-east-2"
-                            and "s3.us-east-2.amazonaws.com" not in final_endpoint
-                        ):
-                            raise RuntimeError(
-                                f"Endpoint mismatch in retry: {final_endpoint}"
-                            )
-
-                        url = s3.generate_presigned_url(
-                            "get_object",
-                            Params={"Bucket": bucket, "Key": key},
-                            ExpiresIn=expires,
-                        )
-
-                        # Validate the presigned URL host after retry
-                        _assert_presigned_host(url, bucket_region)
-
-                        # Cache virtual style if it works
-                        _bucket_addressing_styles[bucket] = "virtual"
-                        logging.info(
-                            f"Successfully generated presigned URL with virtual-hosted style: bucket={bucket}, region={bucket_region}"
-                        )
-                        return url
-                    except Exception as second_retry_error:
-                        logging.error(
-                            f"Both addressing styles failed for bucket={bucket}, key={key}: {second_retry_error}",
-                            exc_info=True,
-                        )
-                        return None
-                else:
-                    logging.error(
-                        f"Retry failed for bucket={bucket}, key={key}: {retry_error}",
-                        exc_info=True,
-                    )
-                    return None
-        else:
-            logging.error(
-                f"ClientError generating presigned URL for bucket={bucket}, key={key}: {e}",
-                exc_info=True,
-            )
-            return None
-    except Exception as e:
-        logging.error(
-            f"Error generating presigned URL for bucket={bucket}, key={key}: {e}",
-            exc_info=True,
+    Returns:
+        Mapping of each (bucket, key) pair as passed in to its URL (None if signing failed)
+    """
+    pairs = {(bucket, key) for bucket, key in objects if bucket and key}
+    if not pairs:
+        return {}
+    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        logging.warning(
+            "AWS_ACCESS_KEY_ID or AWS_SECRET_ACCESS_KEY not set - cannot generate presigned URLs"
         )
-        return None
+        return {pair: None for pair in pairs}
+
+    urls: Dict[Tuple[str, str], Optional[str]] = {}
+    for bucket, key in pairs:
+        normalized = key.lstrip("/")
+        url = _get_cached_presign_url(bucket, normalized, expires)
+        urls[(bucket, key)] = url or _presign(bucket, normalized, expires)
+    return urls
 
 
 def upload_file(
@@ -873,9 +705,6 @@ def upload_file(
 
         s3 = _get_s3_client_for_region(bucket_region, addressing_style)
 
-        # Verify endpoint before uploading
-        _assert_client_endpoint(s3, bucket_region)
-
         # Prepare upload parameters
         upload_params = {
             "Bucket": bucket,
@@ -947,9 +776,6 @@ def delete_file(bucket: str, key: str) -> bool:
 
         s3 = _get_s3_client_for_region(bucket_region, addressing_style)
 
-        # Verify endpoint before deleting
-        _assert_client_endpoint(s3, bucket_region)
-
         # Delete file
         s3.delete_object(Bucket=bucket, Key=key)
 
@@ -976,3 +802,175 @@ def delete_file(bucket: str, key: str) -> bool:
             f"Error deleting file from bucket={bucket}, key={key}: {e}", exc_info=True
         )
         return False
+
+
+def _client_for_bucket(bucket: str):
+    """Regional client for `bucket` (region auto-detected, endpoint verified on creation)."""
+    bucket_region = _get_bucket_region(bucket)
+    addressing_style = _bucket_addressing_styles.get(
+        bucket, _preferred_addressing_for_bucket(bucket)
+    )
+    return _get_s3_client_for_region(bucket_region, addressing_style)
+
+
+def upload_fileobj(
+    bucket: str, key: str, fileobj: BinaryIO, content_type: Optional[str] = None
+) -> bool:
+    """
+    Upload a file-like object to S3 without reading it into memory first.
+
+    Objects that fit in one part (`S3_MULTIPART_PART_SIZE_BYTES`) are sent with a
+    single `put_object`; larger ones are streamed part by part with multipart upload,
+    which is aborted on failure. Returns once S3 has acknowledged the object.
+
+    Returns:
+        True if upload succeeded, False otherwise
+    """
+    if not bucket or not key:
+        logging.error("Bucket and key are required for upload")
+        return False
+    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        logging.error(
+            "AWS_ACCESS_KEY_ID or AWS_SECRET_ACCESS_KEY not set - cannot upload to S3"
+        )
+        return False
+
+    key = key.lstrip("/")
+    extra = {"ContentType": content_type} if content_type else {}
+    upload_id = None
+    s3 = None
+    try:
+        s3 = _client_for_bucket(bucket)
+        chunk = fileobj.read(_MULTIPART_PART_SIZE)
+        next_chunk = fileobj.read(_MULTIPART_PART_SIZE) if chunk else b""
+        if not next_chunk:
+            s3.put_object(Bucket=bucket, Key=key, Body=chunk, **extra)
+        else:
+            upload_id = s3.create_multipart_upload(Bucket=bucket, Key=key, **extra)[
+                "UploadId"
+            ]
+            parts: List[Dict[str, object]] = []
+            while chunk:
+                part_number = len(parts) + 1
+                response = s3.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+                chunk, next_chunk = next_chunk, (
+                    fileobj.read(_MULTIPART_PART_SIZE) if next_chunk else b""
+                )
+            s3.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        logging.info(f"Successfully uploaded file to S3: bucket={bucket}, key={key}")
+        return True
+    except Exception as e:
+        logging.error(
+            f"Error uploading file to bucket={bucket}, key={key}: {e}", exc_info=True
+        )
+        if upload_id and s3 is not None:
+            try:
+                s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            except Exception:
+                logging.warning(
+                    f"Failed to abort multipart upload {upload_id} for key={key}",
+                    exc_info=True,
+                )
+        return False
+
+
+async def upload_fileobj_async(
+    bucket: str, key: str, fileobj: BinaryIO, content_type: Optional[str] = None
+) -> bool:
+    """`upload_fileobj` on the S3 transfer pool, for use from async endpoints."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _transfer_executor, partial(upload_fileobj, bucket, key, fileobj, content_type)
+    )
+
+
+def delete_files(bucket: str, keys: Iterable[str]) -> bool:
+    """
+    Delete many objects with batched `delete_objects` calls (1000 keys per call).
+    Missing keys are not errors.
+
+    Returns:
+        True if every key was deleted (or did not exist), False otherwise
+    """
+    keys = sorted({key.lstrip("/") for key in keys if key})
+    if not bucket or not keys:
+        return True
+    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        logging.error(
+            "AWS_ACCESS_KEY_ID or AWS_SECRET_ACCESS_KEY not set - cannot delete from S3"
+        )
+        return False
+
+    try:
+        s3 = _client_for_bucket(bucket)
+        ok = True
+        for start in range(0, len(keys), _DELETE_OBJECTS_MAX_KEYS):
+            batch = keys[start : start + _DELETE_OBJECTS_MAX_KEYS]
+            response = s3.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            for error in response.get("Errors", []):
+                ok = False
+                logging.error(
+                    f"Failed to delete bucket={bucket}, key={error.get('Key')}: "
+                    f"{error.get('Code')} - {error.get('Message')}"
+                )
+        return ok
+    except Exception as e:
+        logging.error(
+            f"Error deleting {len(keys)} files from bucket={bucket}: {e}", exc_info=True
+        )
+        return False
+
+
+def delete_files_in_background(bucket: str, keys: Iterable[str]) -> None:
+    """Queue `delete_files` on the S3 transfer pool without waiting for it."""
+    _transfer_executor.submit(delete_files, bucket, list(keys))
+
+
+def download_file(bucket: str, key: str) -> Optional[bytes]:
+    """
+    Read an S3 object into memory.
+
+    Returns:
+        Object bytes, or None if it does not exist or the read failed
+    """
+    if not bucket or not key:
+        return None
+    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+        logging.error(
+            "AWS_ACCESS_KEY_ID or AWS_SECRET_ACCESS_KEY not set - cannot read from S3"
+        )
+        return None
+
+    key = key.lstrip("/")
+    try:
+        s3 = _client_for_bucket(bucket)
+        return s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "")
+        if error_code in ("NoSuchKey", "404"):
+            logging.debug(f"File does not exist in S3: bucket={bucket}, key={key}")
+        else:
+            logging.error(
+                f"ClientError reading file from bucket={bucket}, key={key}: {error_code}"
+            )
+        return None
+    except Exception as e:
+        logging.error(
+            f"Error reading file from bucket={bucket}, key={key}: {e}", exc_info=True
+        )
+        return None
@@ -0,0 +1,57 @@
+"""
+Startup resolution of the S3 buckets the app reads and writes.
+
+Without this, the first request touching each bucket pays a `GetBucketLocation`
+round trip and S3 client construction inside the request handler. At startup we
+collect every bucket in use (the profile picture bucket plus the buckets referenced
+by avatars, frames and gem packages) and resolve them concurrently with
+`utils.storage.bootstrap_buckets`, which pins regions, addressing styles and
+endpoint-verified clients. Buckets added later are still detected lazily.
+"""
+
+import logging
+from typing import Dict, Set, Tuple
+
+from sqlalchemy import select, union
+
+from core.config import AWS_PROFILE_PIC_BUCKET
+from utils import storage
+
+logger = logging.getLogger(__name__)
+
+
+def configured_buckets() -> Set[str]:
+    """Profile picture bucket plus every bucket referenced by the store catalog."""
+    from core.db import get_db_context
+    from models import Avatar, Frame, GemPackageConfig
+
+    buckets = {AWS_PROFILE_PIC_BUCKET} if AWS_PROFILE_PIC_BUCKET else set()
+    try:
+        with get_db_context() as db:
+            rows = db.execute(
+                union(
+                    *(
+                        select(model.bucket).where(model.bucket.isnot(None)).distinct()
+                        for model in (Avatar, Frame, GemPackageConfig)
+                    )
+                )
+            ).scalars()
+            buckets.update(bucket for bucket in rows if bucket)
+    except Exception as exc:
+        logger.warning("Could not list catalog buckets for S3 bootstrap: %s", exc)
+    return buckets
+
+
+async def bootstrap_storage() -> Dict[str, Tuple[str, str]]:
+    """Resolve and pin every configured bucket; never raises."""
+    from fastapi.concurrency import run_in_threadpool
+
+    if not storage.AWS_ACCESS_KEY_ID or not storage.AWS_SECRET_ACCESS_KEY:
+        logger.info("S3 bootstrap skipped: AWS credentials not set")
+        return {}
+    try:
+        buckets = await run_in_threadpool(configured_buckets)
+        return await storage.bootstrap_buckets_async(buckets)
+    except Exception:
+        logger.warning("S3 bootstrap failed", exc_info=True)
+        return {}
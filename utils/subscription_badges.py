@@ -0,0 +1,246 @@
+"""
+Shared badge definitions and per-user subscription tiers.
+
+Profile and chat rendering show an achievement badge (`users.badge_id`) and one badge
+per active subscription tier. Badge definitions live in `trivia_mode_config` and
+change only through admin edits, so they are resolved once into an immutable
+in-process map (achievement badges by mode id, subscription badges by tier, with the
+historic candidate ids and mode-name fallback applied at load time). The map is
+versioned by a `core.read_models.SharedGeneration`: commits to `trivia_mode_config`
+bump it, and other workers reload within `BADGE_DEFINITIONS_VERSION_CHECK_SECONDS`.
+
+Active subscription tiers are kept per user in Redis and can be loaded for a whole
+page of users at once: one pipeline round trip for the cached ones and one query for
+the rest. Entries are a `core.read_models.TokenReadModel` (commits to a user's
+`user_subscriptions` rows rotate the token; `subscription_plans` commits bump its
+generation) and lapse when the earliest subscription period behind them ends.
+"""
+
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from sqlalchemy import or_, select
+
+from core.config import (
+    BADGE_DEFINITIONS_MAX_AGE_SECONDS,
+    BADGE_DEFINITIONS_VERSION_CHECK_SECONDS,
+    SUBSCRIPTION_TIER_CACHE_SECONDS,
+)
+from core.model_events import on_committed_change
+from core.read_models import SharedGeneration, TokenReadModel
+
+SUBSCRIPTION_TIERS = ("bronze", "silver")
+# (unit_amount_minor, price_usd) identifying the plans of each tier.
+TIER_PRICES = {"bronze": (500, 5.0), "silver": (1000, 10.0)}
+_TIER_BADGE_IDS = {
+    "bronze": ("bronze", "bronze_badge", "brone_badge", "brone"),
+    "silver": ("silver", "silver_badge"),
+}
+
+_definitions_generation = SharedGeneration(
+    "badge_definitions:generation",
+    check_seconds=BADGE_DEFINITIONS_VERSION_CHECK_SECONDS,
+)
+_definitions: Optional["BadgeDefinitions"] = None
+_tiers = TokenReadModel(
+    "subscription_tiers", ttl_seconds=SUBSCRIPTION_TIER_CACHE_SECONDS, generation=True
+)
+
+
+class BadgeDefinitions(NamedTuple):
+    version: int
+    loaded_at: float
+    by_mode_id: Mapping[str, Mapping[str, Any]]  # id, name, image_url
+    by_tier: Mapping[str, Mapping[str, Any]]  # plus subscription_type, price
+
+    def badge(self, mode_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Achievement badge payload for `mode_id`, or None."""
+        badge = self.by_mode_id.get(mode_id) if mode_id else None
+        return dict(badge) if badge else None
+
+    def subscription_badges(self, tiers: Iterable[str]) -> List[Dict[str, Any]]:
+        """Subscription badge payloads for `tiers`, in tier order."""
+        tiers = set(tiers)
+        return [
+            dict(self.by_tier[tier])
+            for tier in SUBSCRIPTION_TIERS
+            if tier in tiers and tier in self.by_tier
+        ]
+
+
+def tier_of(unit_amount_minor: Optional[int], price_usd: Optional[float]) -> Set[str]:
+    """Tiers a plan with these prices grants."""
+    return {
+        tier
+        for tier, (minor, usd) in TIER_PRICES.items()
+        if unit_amount_minor == minor or price_usd == usd
+    }
+
+
+def tier_clause(tier: str):
+    """SQL condition matching the subscription plans of `tier`."""
+    from models import SubscriptionPlan
+
+    minor, usd = TIER_PRICES[tier]
+    return or_(
+        SubscriptionPlan.unit_amount_minor == minor, SubscriptionPlan.price_usd == usd
+    )
+
+
+def _load_definitions(db, version: int) -> BadgeDefinitions:
+    from models import TriviaModeConfig
+
+    rows = db.execute(
+        select(
+            TriviaModeConfig.mode_id,
+            TriviaModeConfig.mode_name,
+            TriviaModeConfig.badge_image_url,
+        )
+        .where(TriviaModeConfig.badge_image_url.isnot(None))
+        .order_by(TriviaModeConfig.mode_id)
+    ).all()
+    by_mode_id = {
+        row.mode_id: MappingProxyType(
+            {"id": row.mode_id, "name": row.mode_name, "image_url": row.badge_image_url}
+        )
+        for row in rows
+        if row.badge_image_url
+    }
+
+    by_tier = {}
+    for tier in SUBSCRIPTION_TIERS:
+        badge = next(
+            (
+                by_mode_id[mode_id]
+                for mode_id in _TIER_BADGE_IDS[tier]
+                if mode_id in by_mode_id
+            ),
+            None,
+        ) or next(
+            (
+                badge
+                for badge in by_mode_id.values()
+                if tier in (badge["name"] or "").lower()
+            ),
+            None,
+        )
+        if badge:
+            by_tier[tier] = MappingProxyType(
+                {**badge, "subscription_type": tier, "price": TIER_PRICES[tier][1]}
+            )
+
+    return BadgeDefinitions(
+        version=version,
+        loaded_at=time.monotonic(),
+        by_mode_id=MappingProxyType(by_mode_id),
+        by_tier=MappingProxyType(by_tier),
+    )
+
+
+def get_badge_definitions(db) -> BadgeDefinitions:
+    """Current badge definitions, loading them with one query if stale."""
+    global _definitions
+    version = _definitions_generation.current()
+    definitions = _definitions
+    if (
+        definitions is not None
+        and definitions.version == version
+        and time.monotonic() - definitions.loaded_at < BADGE_DEFINITIONS_MAX_AGE_SECONDS
+    ):
+        return definitions
+    definitions = _load_definitions(db, version)
+    # A commit may have bumped the generation while loading; use the result for
+    # this call only.
+    if definitions.version == _definitions_generation.current():
+        _definitions = definitions
+    return definitions
+
+
+def invalidate_badge_definitions(_changed: Optional[Set[Any]] = None) -> None:
+    _definitions_generation.bump()
+
+
+def _load_tiers(db, account_ids: List[int]):
+    from models import SubscriptionPlan, UserSubscription
+
+    rows = db.execute(
+        select(
+            UserSubscription.user_id,
+            SubscriptionPlan.unit_amount_minor,
+            SubscriptionPlan.price_usd,
+            UserSubscription.current_period_end,
+        )
+        .join(SubscriptionPlan, SubscriptionPlan.id == UserSubscription.plan_id)
+        .where(
+            UserSubscription.user_id.in_(account_ids),
+            UserSubscription.status == "active",
+            UserSubscription.current_period_end > datetime.utcnow(),
+            or_(*(tier_clause(tier) for tier in SUBSCRIPTION_TIERS)),
+        )
+    ).all()
+    tiers: Dict[int, Set[str]] = {account_id: set() for account_id in account_ids}
+    valid_until: Dict[int, datetime] = {}
+    for user_id, unit_amount_minor, price_usd, period_end in rows:
+        tiers[user_id] |= tier_of(unit_amount_minor, price_usd)
+        if user_id not in valid_until or period_end < valid_until[user_id]:
+            valid_until[user_id] = period_end
+    return {
+        account_id: frozenset(found) for account_id, found in tiers.items()
+    }, valid_until
+
+
+def get_subscription_tiers(db, account_ids: Iterable[int]) -> Dict[int, FrozenSet[str]]:
+    """Active subscription tiers of every user in `account_ids` (empty set if none)."""
+    account_ids = list(dict.fromkeys(account_ids))
+    if not account_ids:
+        return {}
+    lookup = _tiers.lookup(account_ids)
+    result = {
+        account_id: frozenset(tiers) for account_id, tiers in lookup.entries.items()
+    }
+    missing = [account_id for account_id in account_ids if account_id not in result]
+    if not missing:
+        return result
+
+    loaded, valid_until = _load_tiers(db, missing)
+    result.update(loaded)
+    _tiers.store(
+        lookup,
+        {account_id: sorted(tiers) for account_id, tiers in loaded.items()},
+        valid_until=valid_until,
+    )
+    return result
+
+
+def invalidate_subscription_tiers(account_ids: Set[Hashable]) -> None:
+    """Retire the current token (and cached tiers) of every user in `account_ids`."""
+    _tiers.invalidate(account_ids)
+
+
+def bump_subscription_tier_generation(_changed: Optional[Set[Any]] = None) -> None:
+    """Retire every cached tier set after a subscription plan changed."""
+    _tiers.bump_generation()
+
+
+def _subscriber_key(row) -> Optional[int]:
+    return getattr(row, "user_id", None)
+
+
+on_committed_change("trivia_mode_config", invalidate_badge_definitions)
+on_committed_change(
+    "user_subscriptions", invalidate_subscription_tiers, key=_subscriber_key
+)
+on_committed_change("subscription_plans", bump_subscription_tier_generation)
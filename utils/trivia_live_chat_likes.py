@@ -0,0 +1,155 @@
+"""
+Redis-backed session like counters for trivia live chat.
+
+Likes for a draw date live in a Redis set (`SADD` dedupes, `SCARD` is the total), so
+a like storm during the live draw costs Redis round-trips instead of DB count
+queries. `TriviaLiveChatLike` rows are still written, but asynchronously by the
+caller. The set is seeded from the table the first time a draw date is touched, so
+Redis restarts or evictions do not lose likes. All helpers return None when Redis is
+unavailable; callers then fall back to the repository queries.
+"""
+
+import logging
+import time
+from datetime import date
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.redis_sync import get_sync_redis, mark_sync_redis_failed
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "trivia_live:likes"
+# Live chat windows span a few hours around the draw; keep the set a bit longer.
+_SET_TTL_SECONDS = 2 * 24 * 3600
+
+_local_broadcast_lock = Lock()
+_local_broadcast_slots: Dict[str, float] = {}
+
+
+def _likes_key(draw_date: date) -> str:
+    return f"{_KEY_PREFIX}:{draw_date.isoformat()}"
+
+
+def _seeded_key(draw_date: date) -> str:
+    return f"{_KEY_PREFIX}:{draw_date.isoformat()}:seeded"
+
+
+def _broadcast_key(draw_date: date) -> str:
+    return f"{_KEY_PREFIX}:{draw_date.isoformat()}:broadcast"
+
+
+def _ensure_seeded(client, db: Session, draw_date: date) -> None:
+    if client.exists(_seeded_key(draw_date)):
+        return
+    from models import TriviaLiveChatLike
+
+    user_ids = [
+        row[0]
+        for row in db.query(TriviaLiveChatLike.user_id)
+        .filter(
+            TriviaLiveChatLike.draw_date == draw_date,
+            TriviaLiveChatLike.message_id.is_(None),
+        )
+        .all()
+    ]
+    pipe = client.pipeline()
+    if user_ids:
+        pipe.sadd(_likes_key(draw_date), *user_ids)
+    pipe.expire(_likes_key(draw_date), _SET_TTL_SECONDS)
+    pipe.set(_seeded_key(draw_date), "1", ex=_SET_TTL_SECONDS)
+    pipe.execute()
+
+
+def add_session_like(
+    db: Session, *, user_id: int, draw_date: date
+) -> Optional[Tuple[bool, int]]:
+    """Record a like; returns (newly_added, total_likes) or None without Redis."""
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        _ensure_seeded(client, db, draw_date)
+        pipe = client.pipeline()
+        pipe.sadd(_likes_key(draw_date), user_id)
+        pipe.scard(_likes_key(draw_date))
+        added, total = pipe.execute()
+    except Exception as exc:
+        logger.warning("Trivia live like counter unavailable: %s", exc)
+        mark_sync_redis_failed()
+        return None
+    return bool(added), int(total)
+
+
+def get_session_like_state(
+    db: Session, *, user_id: int, draw_date: date
+) -> Optional[Tuple[int, bool]]:
+    """Return (total_likes, user_liked) or None without Redis."""
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        _ensure_seeded(client, db, draw_date)
+        pipe = client.pipeline()
+        pipe.scard(_likes_key(draw_date))
+        pipe.sismember(_likes_key(draw_date), user_id)
+        total, liked = pipe.execute()
+    except Exception as exc:
+        logger.warning("Trivia live like counter unavailable: %s", exc)
+        mark_sync_redis_failed()
+        return None
+    return int(total), bool(liked)
+
+
+def get_session_like_count(db: Session, *, draw_date: date) -> Optional[int]:
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        _ensure_seeded(client, db, draw_date)
+        return int(client.scard(_likes_key(draw_date)))
+    except Exception as exc:
+        logger.warning("Trivia live like counter unavailable: %s", exc)
+        mark_sync_redis_failed()
+        return None
+
+
+def read_session_like_count(draw_date: date) -> Optional[int]:
+    """SCARD without seeding, for broadcasters that run after a like was recorded."""
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        return int(client.scard(_likes_key(draw_date)))
+    except Exception as exc:
+        logger.warning("Trivia live like counter unavailable: %s", exc)
+        mark_sync_redis_failed()
+        return None
+
+
+def claim_like_broadcast_slot(draw_date: date, *, interval_ms: int) -> bool:
+    """
+    Return True for the first caller in each `interval_ms` window (across workers when
+    Redis is available). The winner is expected to broadcast once at the end of the
+    window, covering every like recorded inside it.
+    """
+    client = get_sync_redis()
+    if client is not None:
+        try:
+            return bool(
+                client.set(_broadcast_key(draw_date), "1", nx=True, px=int(interval_ms))
+            )
+        except Exception as exc:
+            logger.warning("Trivia live like throttle unavailable: %s", exc)
+            mark_sync_redis_failed()
+
+    now = time.monotonic()
+    key = draw_date.isoformat()
+    with _local_broadcast_lock:
+        expires_at = _local_broadcast_slots.get(key)
+        if expires_at and expires_at > now:
+            return False
+        _local_broadcast_slots[key] = now + interval_ms / 1000.0
+        return True
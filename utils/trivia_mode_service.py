@@ -462,6 +462,7 @@ def submit_answer_for_mode(
     answer: str,
     target_date: Optional[date] = None,
     is_ad_retry: bool = False,
+    background_tasks=None,
 ) -> Dict[str, Any]:
     """
     Submit an answer for a question in a specific mode.
@@ -474,6 +475,7 @@ def submit_answer_for_mode(
         answer: User's answer
         target_date: Optional target date
         is_ad_retry: Whether this is a retry after watching an ad
+        background_tasks: Optional FastAPI BackgroundTasks for deferred work
 
     Returns:
         Dictionary with result status
@@ -482,18 +484,55 @@ def submit_answer_for_mode(
         target_date = get_active_draw_date()
 
     if mode_id == "free_mode":
-        return submit_free_mode_answer(db, user, question_id, answer, target_date, is_ad_retry=is_ad_retry)
+        return submit_free_mode_answer(
+            db, user, question_id, answer, target_date,
+            is_ad_retry=is_ad_retry, background_tasks=background_tasks,
+        )
 
     return {"status": "error", "message": f"Unknown mode: {mode_id}"}
 
 
+def _free_mode_attempt_rejection(attempt, is_ad_retry: bool) -> Dict[str, Any]:
+    """Error payload for a submission the upsert refused to apply."""
+    if is_ad_retry and (attempt is None or attempt.status != "answered_wrong"):
+        return {
+            "status": "error",
+            "message": "Cannot use ad retry without a prior wrong answer",
+            "is_correct": False,
+        }
+    if attempt is not None and attempt.status == "answered_correct":
+        return {
+            "status": "error",
+            "message": "Question already answered correctly",
+            "is_correct": True,
+        }
+    if attempt is not None and attempt.status == "answered_wrong" and not is_ad_retry:
+        return {
+            "status": "error",
+            "message": "Question already answered incorrectly",
+            "is_correct": False,
+            "can_retry_with_ad": not attempt.ad_retry_used,
+        }
+    return {
+        "status": "error",
+        "message": "Ad retry already used for this question",
+        "is_correct": False,
+        "can_retry_with_ad": False,
+    }
+
+
 def submit_free_mode_answer(
     db: Session, user: User, question_id: int, answer: str, target_date: date,
-    is_ad_retry: bool = False,
+    is_ad_retry: bool = False, background_tasks=None,
 ) -> Dict[str, Any]:
     """
     Submit answer for free mode question.
 
+    The question slot and correct letter come from the cached question pack and the
+    attempt is written with a single conditional upsert, so an accepted answer costs
+    one statement plus the commit. Level bookkeeping is read from a Redis counter and
+    any level change is persisted in the background.
+
     Args:
         db: Database session
         user: User object
@@ -501,139 +540,154 @@ def submit_free_mode_answer(
         answer: User's answer
         target_date: Target date
         is_ad_retry: Whether this is a retry after watching an ad
+        background_tasks: Optional FastAPI BackgroundTasks for the level update
 
     Returns:
         Dictionary with result
     """
-    # Get the question
-    question = (
-        db.query(TriviaQuestionsFreeMode)
-        .filter(TriviaQuestionsFreeMode.id == question_id)
-        .first()
+    from sqlalchemy import and_, literal, select, update
+    from sqlalchemy.dialects.postgresql import insert
+
+    from core.model_events import run_after_commit
+    from utils.daily_user_state import invalidate_daily_user_state
+    from utils.free_mode_question_pack import get_free_mode_question_entry
+    from utils.profile_view import invalidate_profile_views
+    from utils.user_level_service import (
+        record_answer_for_level,
+        schedule_user_level_update,
+        track_answer_and_update_level,
     )
 
-    if not question:
-        return {
-            "status": "error",
-            "message": "Question not found",
-            "is_correct": False,
-        }
-
-    # Find or create user attempt
-    start_datetime, end_datetime = get_date_range_for_query(target_date)
-    daily_q = (
-        db.query(TriviaQuestionsFreeModeDaily)
-        .filter(
-            TriviaQuestionsFreeModeDaily.date >= start_datetime,
-            TriviaQuestionsFreeModeDaily.date <= end_datetime,
-            TriviaQuestionsFreeModeDaily.question_id == question_id,
+    entry = get_free_mode_question_entry(db, target_date, question_id)
+    if not entry:
+        question_exists = (
+            db.query(TriviaQuestionsFreeMode.id)
+            .filter(TriviaQuestionsFreeMode.id == question_id)
+            .first()
         )
-        .first()
-    )
-
-    if not daily_q:
         return {
             "status": "error",
-            "message": "Question not available for today",
+            "message": (
+                "Question not available for today" if question_exists else "Question not found"
+            ),
             "is_correct": False,
         }
 
-    user_attempt = (
-        db.query(TriviaUserFreeModeDaily)
-        .filter(
-            TriviaUserFreeModeDaily.account_id == user.account_id,
-            TriviaUserFreeModeDaily.date == target_date,
-            TriviaUserFreeModeDaily.question_order == daily_q.question_order,
-        )
-        .first()
+    # Read before commit expires `user`, so the level path needs no reload.
+    account_id = user.account_id
+    current_level = user.level
+    question_order = entry["question_order"]
+    submitted_letter = (answer or "").strip().lower()
+    is_correct = submitted_letter == entry["correct_letter"]
+    status_value = "answered_correct" if is_correct else "answered_wrong"
+    now = datetime.utcnow()
+    attempt_table = TriviaUserFreeModeDaily.__table__
+    slot_filter = and_(
+        attempt_table.c.account_id == account_id,
+        attempt_table.c.date == target_date,
+        attempt_table.c.question_order == question_order,
     )
 
-    if not user_attempt:
-        # Create new attempt
-        user_attempt = TriviaUserFreeModeDaily(
-            account_id=user.account_id,
+    if is_ad_retry:
+        # Ad retries only ever rewrite an existing wrong answer.
+        stmt = (
+            update(attempt_table)
+            .where(
+                slot_filter,
+                attempt_table.c.status == "answered_wrong",
+                attempt_table.c.ad_retry_used.is_(False),
+            )
+            .values(
+                user_answer=answer,
+                is_correct=is_correct,
+                answered_at=now,
+                status=status_value,
+                ad_retry_used=True,
+            )
+            .returning(attempt_table.c.question_order)
+        )
+    else:
+        stmt = insert(attempt_table).values(
+            account_id=account_id,
             date=target_date,
-            question_order=daily_q.question_order,
+            question_order=question_order,
             question_id=question_id,
-            status="viewed",
+            user_answer=answer,
+            is_correct=is_correct,
+            answered_at=now,
+            status=status_value,
+            third_question_completed_at=now if is_correct and question_order == 3 else None,
+            ad_retry_used=False,
         )
-        db.add(user_attempt)
-
-    # Reject ad retry on first submission (no prior wrong answer)
-    if is_ad_retry and user_attempt.status not in ["answered_wrong"]:
-        return {
-            "status": "error",
-            "message": "Cannot use ad retry without a prior wrong answer",
-            "is_correct": False,
-        }
-
-    # Check if already answered
-    if user_attempt.status == "answered_correct":
-        return {
-            "status": "error",
-            "message": "Question already answered correctly",
-            "is_correct": True,
-        }
-
-    if user_attempt.status == "answered_wrong":
-        if not is_ad_retry:
-            return {
-                "status": "error",
-                "message": "Question already answered incorrectly",
-                "is_correct": False,
-                "can_retry_with_ad": not user_attempt.ad_retry_used,
-            }
-        if user_attempt.ad_retry_used:
-            return {
-                "status": "error",
-                "message": "Ad retry already used for this question",
-                "is_correct": False,
-                "can_retry_with_ad": False,
-            }
-        # Ad retry allowed — fall through to answer check
-
-    # Check answer (compare normalized letters)
-    correct_letter = get_correct_answer_letter(question)
-    submitted_letter = (answer or "").strip().lower()
-    is_correct = submitted_letter == correct_letter
-
-    # Update attempt
-    user_attempt.user_answer = answer
-    user_attempt.is_correct = is_correct
-    user_attempt.answered_at = datetime.utcnow()
-    user_attempt.status = "answered_correct" if is_correct else "answered_wrong"
-
-    if is_ad_retry:
-        user_attempt.ad_retry_used = True
-
-    # If this is the 3rd question and it's correct (first attempt), set completion time
-    if is_correct and daily_q.question_order == 3 and not is_ad_retry:
-        user_attempt.third_question_completed_at = datetime.utcnow()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                attempt_table.c.account_id,
+                attempt_table.c.date,
+                attempt_table.c.question_order,
+            ],
+            set_={
+                "user_answer": stmt.excluded.user_answer,
+                "is_correct": stmt.excluded.is_correct,
+                "answered_at": stmt.excluded.answered_at,
+                "status": stmt.excluded.status,
+                "third_question_completed_at": func.coalesce(
+                    stmt.excluded.third_question_completed_at,
+                    attempt_table.c.third_question_completed_at,
+                ),
+            },
+            where=attempt_table.c.status.notin_(["answered_correct", "answered_wrong"]),
+        ).returning(attempt_table.c.question_order)
 
-    # On ad retry that makes answer correct, check if all 3 are now correct
-    # and update third_question_completed_at to reflect actual all-correct time
-    if is_correct and is_ad_retry:
-        all_attempts = (
+    applied = db.execute(stmt).first()
+    if applied is None:
+        attempt = (
             db.query(TriviaUserFreeModeDaily)
             .filter(
-                TriviaUserFreeModeDaily.account_id == user.account_id,
+                TriviaUserFreeModeDaily.account_id == account_id,
                 TriviaUserFreeModeDaily.date == target_date,
+                TriviaUserFreeModeDaily.question_order == question_order,
             )
-            .all()
+            .first()
         )
-        q123 = [a for a in all_attempts if a.question_order in (1, 2, 3)]
-        all_correct = len(q123) == 3 and all(a.status == "answered_correct" for a in q123)
-        if all_correct:
-            q3 = next((a for a in q123 if a.question_order == 3), None)
-            if q3:
-                q3.third_question_completed_at = datetime.utcnow()
+        return _free_mode_attempt_rejection(attempt, is_ad_retry)
 
-    db.commit()
+    if is_correct and is_ad_retry:
+        # An ad retry that completes all three questions moves the completion time
+        # to now, matching the ranking rule for first-try completions.
+        correct_count = (
+            select(func.count())
+            .where(
+                attempt_table.c.account_id == account_id,
+                attempt_table.c.date == target_date,
+                attempt_table.c.question_order.in_((1, 2, 3)),
+                attempt_table.c.status == "answered_correct",
+            )
+            .scalar_subquery()
+        )
+        db.execute(
+            update(attempt_table)
+            .where(
+                attempt_table.c.account_id == account_id,
+                attempt_table.c.date == target_date,
+                attempt_table.c.question_order == 3,
+                correct_count == literal(3),
+            )
+            .values(third_question_completed_at=now)
+        )
 
-    # Track answer and update user level
-    from utils.user_level_service import track_answer_and_update_level
+    # Core statements skip the ORM commit hooks; retire the cached profile (answer
+    # totals, level progress) on commit and drop the cached daily state here.
+    run_after_commit(db, invalidate_profile_views, {account_id})
+    db.commit()
+    invalidate_daily_user_state({account_id})
 
-    level_info = track_answer_and_update_level(user, db)
+    level_info = record_answer_for_level(
+        db, account_id=account_id, current_level=current_level, is_correct=is_correct
+    )
+    if level_info is None:
+        level_info = track_answer_and_update_level(user, db)
+    elif level_info["level_increased"]:
+        schedule_user_level_update(background_tasks, account_id)
 
     result = {
         "status": "success",
@@ -4,11 +4,14 @@ Level increases by 1 for every 100 CORRECT answers across all modes.
 """
 
 import logging
+import os
 from typing import Dict, List, Optional
 
 from sqlalchemy import and_, func, select, union_all
 from sqlalchemy.orm import Session
 
+from core.model_events import on_committed_change
+from core.redis_sync import get_sync_redis, mark_sync_redis_failed
 from models import (
     TriviaUserBronzeModeDaily,
     TriviaUserFreeModeDaily,
@@ -20,6 +23,9 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+_CORRECT_COUNTER_PREFIX = "user_level:correct"
+_CORRECT_COUNTER_TTL_SECONDS = 7 * 24 * 3600
+
 
 def count_total_correct_answers(user: User, db: Session) -> int:
     """
@@ -33,18 +39,22 @@ def count_total_correct_answers(user: User, db: Session) -> int:
     Returns:
         Total count of CORRECT questions answered
     """
+    return _count_correct_answers_for_account(db, user.account_id)
+
+
+def _count_correct_answers_for_account(db: Session, account_id: int) -> int:
     free_query = select(TriviaUserFreeModeDaily.account_id).where(
-        TriviaUserFreeModeDaily.account_id == user.account_id,
+        TriviaUserFreeModeDaily.account_id == account_id,
         TriviaUserFreeModeDaily.status == "answered_correct",
         TriviaUserFreeModeDaily.is_correct.is_(True),
     )
     bronze_query = select(TriviaUserBronzeModeDaily.account_id).where(
-        TriviaUserBronzeModeDaily.account_id == user.account_id,
+        TriviaUserBronzeModeDaily.account_id == account_id,
         TriviaUserBronzeModeDaily.submitted_at.isnot(None),
         TriviaUserBronzeModeDaily.is_correct.is_(True),
     )
     silver_query = select(TriviaUserSilverModeDaily.account_id).where(
-        TriviaUserSilverModeDaily.account_id == user.account_id,
+        TriviaUserSilverModeDaily.account_id == account_id,
         TriviaUserSilverModeDaily.submitted_at.isnot(None),
         TriviaUserSilverModeDaily.is_correct.is_(True),
     )
@@ -58,7 +68,7 @@ def count_total_correct_answers(user: User, db: Session) -> int:
     total_count = db.execute(count_stmt).scalar() or 0
 
     logger.debug(
-        f"User {user.account_id} has {total_count} CORRECT answers "
+        f"User {account_id} has {total_count} CORRECT answers "
         f"(computed via union query)"
     )
 
@@ -256,3 +266,127 @@ def track_answer_and_update_level(user: User, db: Session) -> dict:
         Dictionary with level update information
     """
     return update_user_level(user, db)
+
+
+def _correct_counter_key(account_id: int) -> str:
+    return f"{_CORRECT_COUNTER_PREFIX}:{account_id}"
+
+
+def _level_info_from_total(current_level: Optional[int], total_correct: int) -> dict:
+    current_level = current_level or 1
+    expected_level = max(current_level, 1 + (total_correct // 100))
+    # Progress is reported against the level the answer leaves the user at, so a
+    # level-up shows the new level at 0/100 rather than the old one at 100/100.
+    current_level_correct = max(total_correct - ((expected_level - 1) * 100), 0)
+    return {
+        "level_increased": expected_level > current_level,
+        "new_level": expected_level,
+        "total_correct_answers": total_correct,
+        "correct_answers_until_next_level": 100 - (total_correct % 100),
+        "progress": {
+            "level": expected_level,
+            "current_correct_answers": current_level_correct,
+            "target_correct_answers": 100,
+            "progress": f"{current_level_correct}/100",
+            "total_correct_answers": total_correct,
+        },
+    }
+
+
+def record_answer_for_level(
+    db: Session, *, account_id: int, current_level: Optional[int], is_correct: bool
+) -> Optional[dict]:
+    """
+    Level info for an answer already committed, from a Redis correct-answer counter.
+
+    Takes plain values so callers can pass what they read before committing instead
+    of reloading the user. Returns the same shape as `update_user_level` without
+    touching the users row; when `level_increased` is set the caller is expected to
+    persist the level with `schedule_user_level_update`. Returns None without Redis.
+    """
+    client = get_sync_redis()
+    if client is None:
+        return None
+    key = _correct_counter_key(account_id)
+    try:
+        total_correct = None
+        if client.get(key) is None:
+            # Seeded after the attempt commit, so the count already includes it.
+            # SET NX lets exactly one concurrent request seed; the others fall
+            # through to the atomic INCR below.
+            seeded = _count_correct_answers_for_account(db, account_id)
+            if client.set(key, seeded, ex=_CORRECT_COUNTER_TTL_SECONDS, nx=True):
+                total_correct = seeded
+        if total_correct is None:
+            total_correct = int(client.incr(key) if is_correct else client.get(key) or 0)
+    except Exception as exc:
+        logger.warning("Correct answer counter unavailable: %s", exc)
+        mark_sync_redis_failed()
+        return None
+    return _level_info_from_total(current_level, total_correct)
+
+
+def persist_user_level(account_id: int) -> None:
+    """Recount correct answers and store the resulting level (background task)."""
+    from db import get_db
+
+    db = next(get_db())
+    try:
+        user = db.query(User).filter(User.account_id == account_id).first()
+        if user:
+            update_user_level(user, db)
+    finally:
+        db.close()
+
+
+def schedule_user_level_update(background_tasks, account_id: int) -> None:
+    if background_tasks is None:
+        persist_user_level(account_id)
+        return
+    if os.getenv("USE_WORKER_QUEUE", "false").lower() == "true":
+        from core.queue import enqueue_task
+
+        background_tasks.add_task(
+            enqueue_task, name="user.update_level", payload={"account_id": account_id}
+        )
+    else:
+        background_tasks.add_task(persist_user_level, account_id)
+
+
+def invalidate_correct_answer_counters(account_ids) -> None:
+    """Drop counters for users whose attempts changed outside `record_answer_for_level`."""
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        client.delete(*[_correct_counter_key(account_id) for account_id in account_ids])
+    except Exception as exc:
+        logger.warning("Correct answer counter invalidation failed: %s", exc)
+        mark_sync_redis_failed()
+
+
+def _free_mode_counter_key(row):
+    # Viewed/locked slots do not change the count; skip them so the daily
+    # question fetch does not reset every counter.
+    return row.account_id if row.status in ("answered_correct", "answered_wrong") else None
+
+
+def _paid_mode_counter_key(row):
+    return row.account_id if row.submitted_at is not None else None
+
+
+on_committed_change(
+    "trivia_user_free_mode_daily",
+    invalidate_correct_answer_counters,
+    key=_free_mode_counter_key,
+)
+on_committed_change(
+    "trivia_user_bronze_mode_daily",
+    invalidate_correct_answer_counters,
+    key=_paid_mode_counter_key,
+)
+on_committed_change(
+    "trivia_user_silver_mode_daily",
+    invalidate_correct_answer_counters,
+    key=_paid_mode_counter_key,
+)
@@ -0,0 +1,99 @@
+"""
+Wallet balance read model.
+
+Balance screens (wallet, profile, withdrawal pre-checks) read a per-user snapshot of
+`wallet_balance_minor` / `wallet_currency` from Redis instead of the `users` row.
+
+Snapshots are a `core.read_models.TokenReadModel`: commits that change a user's
+balance (ORM writes via `core.model_events`, Core batch updates via
+`run_after_commit`) rotate the user's token, so an entry can only be served if no
+balance commit landed between the token read that preceded its DB read and the
+lookup.
+
+Writes that move money still lock the row (`adjust_wallet_balance`); the snapshot is
+only for display and pre-checks. Without Redis every read goes to the database.
+"""
+
+from typing import Hashable, NamedTuple, Optional, Set
+
+from sqlalchemy import inspect, select
+
+from core.config import WALLET_BALANCE_CACHE_SECONDS
+from core.model_events import on_committed_change
+from core.read_models import TokenReadModel
+
+_snapshots = TokenReadModel(
+    "wallet_balance", entry_name="snapshot", ttl_seconds=WALLET_BALANCE_CACHE_SECONDS
+)
+
+
+class WalletSnapshot(NamedTuple):
+    balance_minor: Optional[int]
+    legacy_balance: Optional[float]
+    currency: Optional[str]
+
+
+def _cached(account_id: int):
+    """Return (lookup, snapshot-or-None)."""
+    lookup = _snapshots.lookup([account_id])
+    payload = lookup.entries.get(account_id)
+    return lookup, WalletSnapshot(*payload) if payload is not None else None
+
+
+def _load_stmt(account_id: int):
+    from models import User
+
+    return select(
+        User.wallet_balance_minor, User.wallet_balance, User.wallet_currency
+    ).where(User.account_id == account_id)
+
+
+def _from_row(row) -> Optional[WalletSnapshot]:
+    if row is None:
+        return None
+    return WalletSnapshot(
+        balance_minor=row.wallet_balance_minor,
+        legacy_balance=row.wallet_balance,
+        currency=row.wallet_currency,
+    )
+
+
+def get_wallet_snapshot(db, account_id: int) -> Optional[WalletSnapshot]:
+    """Balance snapshot for `account_id` using a sync session; None if the user is missing."""
+    lookup, snapshot = _cached(account_id)
+    if snapshot is not None:
+        return snapshot
+    snapshot = _from_row(db.execute(_load_stmt(account_id)).first())
+    if snapshot is not None:
+        _snapshots.store(lookup, {account_id: list(snapshot)})
+    return snapshot
+
+
+async def get_wallet_snapshot_async(db, account_id: int) -> Optional[WalletSnapshot]:
+    """Async-session variant of `get_wallet_snapshot`."""
+    lookup, snapshot = _cached(account_id)
+    if snapshot is not None:
+        return snapshot
+    snapshot = _from_row((await db.execute(_load_stmt(account_id))).first())
+    if snapshot is not None:
+        _snapshots.store(lookup, {account_id: list(snapshot)})
+    return snapshot
+
+
+def invalidate_wallet_snapshots(account_ids: Set[Hashable]) -> None:
+    """Retire the current token (and snapshot) of every user in `account_ids`."""
+    _snapshots.invalidate(account_ids)
+
+
+def _balance_change_key(user) -> Optional[int]:
+    state = inspect(user)
+    if state.deleted:
+        return user.account_id
+    attrs = state.attrs
+    for name in ("wallet_balance_minor", "wallet_balance", "wallet_currency"):
+        if attrs[name].history.has_changes():
+            return user.account_id
+    return None
+
+
+on_committed_change("users", invalidate_wallet_snapshots, key=_balance_change_key)
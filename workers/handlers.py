@@ -3,31 +3,69 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 
+def _credit_winner(payload: Dict[str, Any]) -> None:
+    import asyncio
+
+    from app.db import AsyncSessionLocal
+    from app.services.wallet_service import adjust_wallet_balance
+
+    async def _credit() -> None:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await adjust_wallet_balance(
+                    db=session,
+                    user_id=payload["account_id"],
+                    currency="usd",
+                    delta_minor=payload["amount_minor"],
+                    kind="deposit",
+                    external_ref_type="draw_reward",
+                    external_ref_id=payload["reason"],
+                    event_id=payload["idempotency_key"],
+                    livemode=True,
+                )
+
+    asyncio.run(_credit())
+
+
+def _credit_winners_batch(payload: Dict[str, Any]) -> None:
+    import asyncio
+
+    from app.db import AsyncSessionLocal
+    from app.services.wallet_service import WalletCredit, credit_wallets_batch
+
+    credits = [
+        WalletCredit(
+            user_id=int(c["account_id"]),
+            amount_minor=int(c["amount_minor"]),
+            idempotency_key=str(c["idempotency_key"]),
+        )
+        for c in payload["credits"]
+    ]
+
+    async def _credit_batch() -> None:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await credit_wallets_batch(
+                    session,
+                    credits,
+                    currency="usd",
+                    kind="deposit",
+                    external_ref_type="draw_reward",
+                    external_ref_id=payload["reason"],
+                    livemode=True,
+                )
+
+    asyncio.run(_credit_batch())
+
+
 def handle_task(name: str, payload: Dict[str, Any]) -> None:
     if name == "noop":
         return
     if name == "wallet.credit_winner":
-        import asyncio
-
-        from app.db import AsyncSessionLocal
-        from app.services.wallet_service import adjust_wallet_balance
-
-        async def _credit() -> None:
-            async with AsyncSessionLocal() as session:
-                async with session.begin():
-                    await adjust_wallet_balance(
-                        db=session,
-                        user_id=payload["account_id"],
-                        currency="usd",
-                        delta_minor=payload["amount_minor"],
-                        kind="deposit",
-                        external_ref_type="draw_reward",
-                        external_ref_id=payload["reason"],
-                        event_id=payload["idempotency_key"],
-                        livemode=True,
-                    )
-
-        asyncio.run(_credit())
+        _credit_winner(payload)
+        return
+    if name == "wallet.credit_winners_batch":
+        _credit_winners_batch(payload)
         return
     if name == "push.trivia_live_chat":
         from routers.trivia.service import send_push_for_trivia_live_chat_sync
@@ -41,6 +79,18 @@ def handle_task(name: str, payload: Dict[str, Any]) -> None:
             created_at=str(payload.get("created_at")),
         )
         return
+    if name == "trivia.persist_live_chat_like":
+        from routers.trivia.service import persist_trivia_live_chat_session_like
+
+        persist_trivia_live_chat_session_like(
+            int(payload["user_id"]), str(payload["draw_date"])
+        )
+        return
+    if name == "user.update_level":
+        from utils.user_level_service import persist_user_level
+
+        persist_user_level(int(payload["account_id"]))
+        return
     if name == "pusher.trivia_live_chat":
         from routers.trivia.service import publish_to_pusher_trivia_live
 